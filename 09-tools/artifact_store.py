@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Sequence
 from datetime import date
 from pathlib import Path
 
@@ -16,13 +17,23 @@ def write_log_event(
     thread_id: str,
     event: dict,
     run_date: str | None = None,
+) -> Path:
+    return append_log_events(output_root, project_id, thread_id, [event], run_date=run_date)
+
+
+def append_log_events(
+    output_root: Path,
+    project_id: str,
+    thread_id: str,
+    events: Sequence[dict],
+    run_date: str | None = None,
 ) -> Path:
     run_dir = _run_dir(output_root, project_id, thread_id, run_date=run_date)
     run_dir.mkdir(parents=True, exist_ok=True)
 
     log_path = run_dir / "execution-log.jsonl"
     with log_path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+        handle.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
 
     return log_path
 
@@ -36,6 +47,11 @@ def write_artifact_file(
     run_date: str | None = None,
 ) -> Path:
     artifact_path = _run_dir(output_root, project_id, thread_id, run_date=run_date) / relative_path
+    data = content.encode("utf-8")
+    # Retries and reruns regenerate identical reports; skip the rewrite.
+    if artifact_path.exists() and artifact_path.stat().st_size == len(data):
+        if artifact_path.read_bytes() == data:
+            return artifact_path
     artifact_path.parent.mkdir(parents=True, exist_ok=True)
-    artifact_path.write_text(content, encoding="utf-8")
+    artifact_path.write_bytes(data)
     return artifact_path
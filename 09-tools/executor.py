@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime, timezone
 import json
+import os
 from pathlib import Path
 from typing import Any
 
-from artifact_store import write_artifact_file, write_log_event
+from artifact_store import write_artifact_file
 from pipeline_models import build_initial_state
+from pipeline_store import open_pipeline_store
 from providers.firecrawl_client import run_firecrawl_extract
 from providers.free_fallback import run_research_with_fallback
+from providers.orchestrator import fan_out, timed_call
 from providers.perplexity_client import run_perplexity_research
-from stack_loader import load_stack
-from state_store import load_state, save_state
+from stack_loader import CompiledStack, load_compiled_stack
+
+# Seconds the premium chain may run before the free path is raced against it
+# (default 20). A premium call that loses the race is abandoned, not awaited.
+# Set VIBE_RESEARCH_HEDGE_SECONDS=0 to disable hedging: premium then runs to
+# completion and the free path only runs when it fails.
+RESEARCH_HEDGE_AFTER_SECONDS = (
+    float(os.environ.get("VIBE_RESEARCH_HEDGE_SECONDS", "20")) or None
+)
+MAX_EXTRACT_URLS = 8
 
 
 def _now_iso() -> str:
@@ -28,17 +40,8 @@ def _default_free_research(query: str) -> dict:
     }
 
 
-def _next_stage_id(sequence: list[dict], current_stage_id: str) -> str | None:
-    stage_ids = [stage["id"] for stage in sequence]
-    try:
-        current_index = stage_ids.index(current_stage_id)
-    except ValueError:
-        return None
-
-    next_index = current_index + 1
-    if next_index >= len(stage_ids):
-        return None
-    return stage_ids[next_index]
+def _next_stage_id(stack: CompiledStack, current_stage_id: str) -> str | None:
+    return stack.next_stage_id(current_stage_id)
 
 
 def _extract_urls(payload: dict[str, Any]) -> list[str]:
@@ -53,15 +56,25 @@ def _extract_urls(payload: dict[str, Any]) -> list[str]:
 
 
 def _run_premium_research(query: str) -> dict:
-    perplexity_payload = run_perplexity_research(query)
-    urls = _extract_urls(perplexity_payload)[:8]
-    firecrawl_payload = run_firecrawl_extract(urls)
-    firecrawl_urls = firecrawl_payload.get("urls", []) if isinstance(firecrawl_payload, dict) else []
+    perplexity_payload = timed_call("perplexity", run_perplexity_research, query)
+    urls = _extract_urls(perplexity_payload)[:MAX_EXTRACT_URLS]
 
     sources: list[str] = []
-    for url in urls + list(firecrawl_urls):
-        if isinstance(url, str) and url and url not in sources:
-            sources.append(url)
+    seen: set[str] = set()
+
+    def add_sources(candidates: list[Any]) -> None:
+        for url in candidates:
+            if isinstance(url, str) and url and url not in seen:
+                seen.add(url)
+                sources.append(url)
+
+    add_sources(urls)
+    if urls:
+        firecrawl_payload = _extract_pages(urls, add_sources)
+    else:
+        firecrawl_payload = timed_call("firecrawl", run_firecrawl_extract, [])
+        if isinstance(firecrawl_payload, dict):
+            add_sources(list(firecrawl_payload.get("urls", [])))
 
     return {
         "provider": "perplexity+firecrawl",
@@ -73,6 +86,39 @@ def _run_premium_research(query: str) -> dict:
     }
 
 
+def _extract_pages(urls: list[str], add_sources: Callable[[list[Any]], None]) -> dict:
+    """Extract each url in its own Firecrawl call; merged in url order."""
+    extract = run_firecrawl_extract
+    by_index: dict[int, dict] = {}
+    errors: dict[str, str] = {}
+    first_error: Exception | None = None
+    for index, payload, error in fan_out(
+        "firecrawl", lambda url: extract([url]), urls, max_workers=MAX_EXTRACT_URLS
+    ):
+        if error is not None:
+            errors[urls[index]] = str(error)
+            first_error = first_error or error
+            continue
+        if isinstance(payload, dict):
+            by_index[index] = payload
+            add_sources(list(payload.get("urls", [])))
+
+    if not by_index and first_error is not None:
+        # Nothing extracted: let the caller fall back to the free path.
+        raise first_error
+
+    merged_urls: list[str] = []
+    pages: list[Any] = []
+    for index in sorted(by_index):
+        payload = by_index[index]
+        merged_urls.extend(url for url in payload.get("urls", []) if url not in merged_urls)
+        pages.extend(payload.get("pages", []))
+    merged: dict[str, Any] = {"provider": "firecrawl", "urls": merged_urls, "pages": pages}
+    if errors:
+        merged["errors"] = errors
+    return merged
+
+
 def _run_date_from_iso(iso_ts: str) -> str:
     return iso_ts[:10]
 
@@ -200,14 +246,13 @@ def run_until_gate(
     output_root: Path = Path("08-output"),
 ) -> dict:
     output_root = Path(output_root).expanduser().resolve()
-    stack = load_stack(stack_path)
-    sequence = stack["sequence"]
-    stage_ids = [stage["id"] for stage in sequence]
-    auto_stage = stack.get("execution", {}).get("auto_start_stage", stage_ids[0])
+    stack = load_compiled_stack(stack_path)
+    stage_ids = stack.stage_ids
+    auto_stage = stack.auto_start_stage
     run_started_at = _now_iso()
     run_date = _run_date_from_iso(run_started_at)
 
-    state = build_initial_state(project_id, thread_id, stack["name"], stage_ids)
+    state = build_initial_state(project_id, thread_id, stack.name, stage_ids)
     state["current_stage"] = auto_stage
     state["stack_path"] = stack_path
     state["query"] = query
@@ -225,6 +270,7 @@ def run_until_gate(
     data = run_research_with_fallback(
         premium_runner=lambda: _run_premium_research(query),
         free_runner=lambda: _default_free_research(query),
+        hedge_after_seconds=RESEARCH_HEDGE_AFTER_SECONDS,
     )
     state["stages"][auto_stage]["status"] = "completed"
     state["provider_used"][auto_stage] = data.get("provider", "unknown")
@@ -243,35 +289,36 @@ def run_until_gate(
         run_date=run_date,
         content=_build_research_report(query, data, state["provider_chain"][auto_stage]),
     )
-    write_log_event(
-        output_root=output_root,
-        project_id=project_id,
-        thread_id=thread_id,
-        run_date=run_date,
-        event={
-            "stage": auto_stage,
-            "status": "completed",
-            "provider": state["provider_used"][auto_stage],
-            "provider_chain": state["provider_chain"][auto_stage],
-            "fallback_used": state["fallback_used"][auto_stage],
-            "premium_error": state["provider_errors"].get(auto_stage),
-            "timestamp": _now_iso(),
-        },
-    )
+    event = {
+        "stage": auto_stage,
+        "status": "completed",
+        "provider": state["provider_used"][auto_stage],
+        "provider_chain": state["provider_chain"][auto_stage],
+        "fallback_used": state["fallback_used"][auto_stage],
+        "premium_error": state["provider_errors"].get(auto_stage),
+        "timestamp": _now_iso(),
+    }
 
-    next_stage_id = _next_stage_id(sequence, auto_stage)
+    next_stage_id = _next_stage_id(stack, auto_stage)
     state["current_stage"] = next_stage_id
     if next_stage_id is None:
         state["status"] = "completed"
     else:
-        next_stage = next(stage for stage in sequence if stage["id"] == next_stage_id)
-        if next_stage.get("approval_required", False):
+        next_stage = stack.stages[stack.stage_index[next_stage_id]]
+        if next_stage.approval_required:
             state["status"] = "waiting_approval"
         else:
             state["status"] = "running"
     state["updated_at"] = _now_iso()
 
-    save_state(Path(runtime_root), project_id, thread_id, state)
+    open_pipeline_store(Path(runtime_root)).commit(
+        project_id,
+        thread_id,
+        state,
+        events=[event],
+        output_root=output_root,
+        run_date=run_date,
+    )
     return state
 
 
@@ -285,23 +332,22 @@ def _artifact_for_stage(stage_id: str) -> str:
     return mapping.get(stage_id, f"strategy/{stage_id}.md")
 
 
-def _load_stack_from_state(state: dict) -> dict:
+def _load_stack_from_state(state: dict) -> CompiledStack:
     stack_path = state.get("stack_path")
     if not stack_path:
         raise RuntimeError("stack_path missing from state")
-    return load_stack(stack_path)
+    return load_compiled_stack(stack_path)
 
 
 def approve_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id: str) -> dict:
-    state = load_state(Path(runtime_root), project_id, thread_id)
+    store = open_pipeline_store(Path(runtime_root))
+    state, version = store.load(project_id, thread_id)
     output_root = _state_output_root(state)
     run_date = _state_run_date(state)
     state["output_root"] = str(output_root)
     state["run_date"] = run_date
     stack = _load_stack_from_state(state)
-    sequence = stack["sequence"]
-    stage_ids = [stage["id"] for stage in sequence]
-    if stage_id not in stage_ids:
+    if stage_id not in stack.stage_index:
         raise ValueError(f"Unknown stage: {stage_id}")
 
     current_stage = state.get("current_stage")
@@ -325,7 +371,7 @@ def approve_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id:
         content=_build_stage_artifact_content(stage_id, state),
     )
 
-    next_stage_id = _next_stage_id(sequence, stage_id)
+    next_stage_id = _next_stage_id(stack, stage_id)
     state["current_stage"] = next_stage_id
     if next_stage_id is None:
         state["status"] = "completed"
@@ -340,33 +386,37 @@ def approve_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id:
             content=_build_foundation_brief(state),
         )
     else:
-        next_stage = next(stage for stage in sequence if stage["id"] == next_stage_id)
-        state["status"] = "waiting_approval" if next_stage.get("approval_required", False) else "running"
+        next_stage = stack.stages[stack.stage_index[next_stage_id]]
+        state["status"] = "waiting_approval" if next_stage.approval_required else "running"
 
     state["updated_at"] = _now_iso()
-    write_log_event(
+    event = {
+        "stage": stage_id,
+        "status": "completed",
+        "next_stage": next_stage_id,
+        "pipeline_status": state["status"],
+        "timestamp": state["updated_at"],
+    }
+    store.commit(
+        project_id,
+        thread_id,
+        state,
+        events=[event],
         output_root=output_root,
-        project_id=project_id,
-        thread_id=thread_id,
         run_date=run_date,
-        event={
-            "stage": stage_id,
-            "status": "completed",
-            "next_stage": next_stage_id,
-            "pipeline_status": state["status"],
-            "timestamp": state["updated_at"],
-        },
+        expected_version=version,
     )
-    save_state(Path(runtime_root), project_id, thread_id, state)
     return state
 
 
 def get_status(runtime_root: Path, project_id: str, thread_id: str) -> dict:
-    return load_state(Path(runtime_root), project_id, thread_id)
+    state, _ = open_pipeline_store(Path(runtime_root)).load(project_id, thread_id)
+    return state
 
 
 def retry_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id: str) -> dict:
-    state = load_state(Path(runtime_root), project_id, thread_id)
+    store = open_pipeline_store(Path(runtime_root))
+    state, version = store.load(project_id, thread_id)
     output_root = _state_output_root(state)
     run_date = _state_run_date(state)
     state["output_root"] = str(output_root)
@@ -383,6 +433,7 @@ def retry_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id: s
         data = run_research_with_fallback(
             premium_runner=lambda: _run_premium_research(query),
             free_runner=lambda: _default_free_research(query),
+            hedge_after_seconds=RESEARCH_HEDGE_AFTER_SECONDS,
         )
         state.setdefault("provider_used", {})[stage_id] = data.get("provider", "unknown")
         state.setdefault("provider_chain", {})[stage_id] = data.get(
@@ -401,21 +452,22 @@ def retry_stage(runtime_root: Path, project_id: str, thread_id: str, stage_id: s
         )
     stage_state["status"] = "completed"
     state["updated_at"] = _now_iso()
-    write_log_event(
+    event = {
+        "stage": stage_id,
+        "status": "retried",
+        "attempt": stage_state["attempts"],
+        "provider": state.get("provider_used", {}).get(stage_id),
+        "timestamp": state["updated_at"],
+    }
+    store.commit(
+        project_id,
+        thread_id,
+        state,
+        events=[event],
         output_root=output_root,
-        project_id=project_id,
-        thread_id=thread_id,
         run_date=run_date,
-        event={
-            "stage": stage_id,
-            "status": "retried",
-            "attempt": stage_state["attempts"],
-            "provider": state.get("provider_used", {}).get(stage_id),
-            "timestamp": state["updated_at"],
-        },
+        expected_version=version,
     )
-
-    save_state(Path(runtime_root), project_id, thread_id, state)
     return state
 
 
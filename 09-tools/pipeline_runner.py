@@ -7,6 +7,7 @@ import argparse
 from pathlib import Path
 
 from executor import approve_stage, dump_json, get_status, retry_stage, run_until_gate
+from pipeline_store import open_pipeline_store
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -44,6 +45,10 @@ def build_parser() -> argparse.ArgumentParser:
     retry_parser.add_argument("--thread-id", required=True)
     retry_parser.add_argument("--stage", required=True)
 
+    export_parser = sub.add_parser("export", help="Write state.json/execution-log.jsonl files")
+    export_parser.add_argument("--project-id")
+    export_parser.add_argument("--thread-id")
+
     return parser
 
 
@@ -93,6 +98,14 @@ def main() -> int:
         print(dump_json(result))
         return 0
 
+    if args.command == "export":
+        paths = open_pipeline_store(runtime_root).export_json_layout(
+            project_id=args.project_id,
+            thread_id=args.thread_id,
+        )
+        print(dump_json({"exported": [str(path) for path in paths]}))
+        return 0
+
     return 0
 
 
@@ -0,0 +1,222 @@
+"""SQLite-backed state and execution log for the threaded pipeline.
+
+Each stage transition writes the thread state and its log events in a single
+transaction on one long-lived connection per runtime root (WAL journal), instead
+of rewriting ``state.json`` and reopening ``execution-log.jsonl`` per line. The
+same commit still appends its events to the run's ``execution-log.jsonl`` in one
+write. ``export_json_layout`` reproduces the legacy file layout for tooling that
+reads it, and threads that only exist as ``state.json`` are imported on first read.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+from artifact_store import append_log_events
+from state_store import _state_path, save_state
+
+DB_FILENAME = "pipeline.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS thread_state (
+    project_id TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    state_json TEXT NOT NULL,
+    updated_at TEXT,
+    PRIMARY KEY (project_id, thread_id)
+);
+CREATE TABLE IF NOT EXISTS execution_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id TEXT NOT NULL,
+    thread_id TEXT NOT NULL,
+    output_root TEXT NOT NULL,
+    run_date TEXT NOT NULL,
+    event_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_execution_log_thread ON execution_log (project_id, thread_id, seq);
+"""
+
+
+class StateNotFoundError(FileNotFoundError):
+    """No state for the thread; a ``FileNotFoundError`` like the JSON store raised."""
+
+
+class StateConflictError(RuntimeError):
+    """The thread state changed since it was loaded."""
+
+
+class PipelineStore:
+    def __init__(self, runtime_root: Path) -> None:
+        self.runtime_root = Path(runtime_root)
+        self.runtime_root.mkdir(parents=True, exist_ok=True)
+        self.path = self.runtime_root / DB_FILENAME
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(_SCHEMA)
+
+    def load(self, project_id: str, thread_id: str) -> tuple[dict, int]:
+        """Return ``(state, version)``; raises ``StateNotFoundError`` when absent."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state_json, version FROM thread_state WHERE project_id = ? AND thread_id = ?",
+                (project_id, thread_id),
+            ).fetchone()
+        if row is not None:
+            return json.loads(row[0]), row[1]
+
+        legacy = _state_path(self.runtime_root, project_id, thread_id)
+        if not legacy.exists():
+            raise StateNotFoundError(f"no pipeline state for {project_id}/{thread_id}")
+        state = json.loads(legacy.read_text(encoding="utf-8"))
+        try:
+            return state, self.commit(project_id, thread_id, state, expected_version=0)
+        except StateConflictError:
+            # Imported concurrently by another caller.
+            return self.load(project_id, thread_id)
+
+    def commit(
+        self,
+        project_id: str,
+        thread_id: str,
+        state: dict,
+        *,
+        events: Sequence[dict] = (),
+        output_root: Path | None = None,
+        run_date: str | None = None,
+        expected_version: int | None = None,
+    ) -> int:
+        """Write ``state`` and append ``events`` atomically; returns the new version.
+
+        ``expected_version`` makes the write conditional on the version returned by
+        ``load`` (``0`` means the thread must not exist yet). Once committed, the
+        events are also appended to the run's ``execution-log.jsonl``.
+        """
+        if events and (output_root is None or run_date is None):
+            raise ValueError("output_root and run_date are required to log events")
+        state_json = json.dumps(state, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT version FROM thread_state WHERE project_id = ? AND thread_id = ?",
+                    (project_id, thread_id),
+                ).fetchone()
+                current = row[0] if row is not None else 0
+                if expected_version is not None and current != expected_version:
+                    raise StateConflictError(
+                        f"state for {project_id}/{thread_id} is at version {current}, "
+                        f"expected {expected_version}"
+                    )
+                version = current + 1
+                self._conn.execute(
+                    "INSERT INTO thread_state (project_id, thread_id, version, state_json, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (project_id, thread_id) DO UPDATE SET "
+                    "version = excluded.version, state_json = excluded.state_json, "
+                    "updated_at = excluded.updated_at",
+                    (project_id, thread_id, version, state_json, state.get("updated_at")),
+                )
+                if events:
+                    self._conn.executemany(
+                        "INSERT INTO execution_log "
+                        "(project_id, thread_id, output_root, run_date, event_json) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        [
+                            (
+                                project_id,
+                                thread_id,
+                                str(output_root),
+                                run_date,
+                                json.dumps(event, ensure_ascii=False),
+                            )
+                            for event in events
+                        ],
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if events:
+                # Still under the lock so concurrent commits keep the file in seq order.
+                append_log_events(output_root, project_id, thread_id, events, run_date=run_date)
+        return version
+
+    def events(self, project_id: str, thread_id: str) -> list[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_json FROM execution_log "
+                "WHERE project_id = ? AND thread_id = ? ORDER BY seq",
+                (project_id, thread_id),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def threads(self, project_id: str | None = None) -> list[tuple[str, str]]:
+        query = "SELECT project_id, thread_id FROM thread_state"
+        params: tuple[Any, ...] = ()
+        if project_id is not None:
+            query += " WHERE project_id = ?"
+            params = (project_id,)
+        with self._lock:
+            return [(row[0], row[1]) for row in self._conn.execute(query + " ORDER BY 1, 2", params)]
+
+    def export_json_layout(
+        self, project_id: str | None = None, thread_id: str | None = None
+    ) -> list[Path]:
+        """Write ``state.json`` and ``execution-log.jsonl`` files as the JSON stores did."""
+        written: list[Path] = []
+        for project, thread in self.threads(project_id):
+            if thread_id is not None and thread != thread_id:
+                continue
+            state, _ = self.load(project, thread)
+            written.append(save_state(self.runtime_root, project, thread, state))
+
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT output_root, run_date, event_json FROM execution_log "
+                    "WHERE project_id = ? AND thread_id = ? ORDER BY seq",
+                    (project, thread),
+                ).fetchall()
+            logs: dict[Path, list[str]] = {}
+            for output_root, run_date, event_json in rows:
+                log_path = Path(output_root) / run_date / project / thread / "execution-log.jsonl"
+                logs.setdefault(log_path, []).append(event_json)
+            for log_path, lines in logs.items():
+                log_path.parent.mkdir(parents=True, exist_ok=True)
+                log_path.write_text("".join(line + "\n" for line in lines), encoding="utf-8")
+                written.append(log_path)
+        return written
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_stores: dict[Path, PipelineStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_pipeline_store(runtime_root: Path) -> PipelineStore:
+    """Process-wide store for ``runtime_root``; the connection stays open."""
+    key = Path(runtime_root).resolve()
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = PipelineStore(key)
+        return store
+
+
+def close_pipeline_stores() -> None:
+    with _stores_lock:
+        for store in _stores.values():
+            store.close()
+        _stores.clear()
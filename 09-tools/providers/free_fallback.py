@@ -2,17 +2,34 @@ from __future__ import annotations
 
 from collections.abc import Callable
 
+from providers.orchestrator import ProviderStats, hedged_call, timed_call
+
 
 def run_research_with_fallback(
     premium_runner: Callable[[], dict],
     free_runner: Callable[[], dict],
+    *,
+    hedge_after_seconds: float | None = None,
+    stats: ProviderStats | None = None,
 ) -> dict:
+    if hedge_after_seconds is not None:
+        payload, fallback_used, premium_error = hedged_call(
+            premium_runner,
+            free_runner,
+            hedge_after_seconds=hedge_after_seconds,
+            stats=stats,
+        )
+        payload["fallback_used"] = fallback_used
+        if premium_error is not None:
+            payload["premium_error"] = str(premium_error)
+        return payload
+
     try:
-        payload = premium_runner()
+        payload = timed_call("premium", premium_runner, stats=stats)
         payload["fallback_used"] = False
         return payload
     except Exception as exc:
-        payload = free_runner()
+        payload = timed_call("free", free_runner, stats=stats)
         payload["fallback_used"] = True
         payload["premium_error"] = str(exc)
         return payload
@@ -0,0 +1,185 @@
+"""Concurrent research provider orchestration.
+
+``hedged_call`` starts the premium runner and, if it has not answered within
+the latency budget, races the free runner against it; the first success wins.
+``fan_out`` runs one provider call per item on a thread pool and hands results
+back as they complete so callers can merge incrementally. Every call made
+through ``timed_call`` lands in ``ProviderStats`` (per-provider success counts
+and a cumulative latency histogram).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+LATENCY_BUCKETS_SECONDS: tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class ProviderStats:
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS_SECONDS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._providers: dict[str, dict[str, Any]] = {}
+
+    def record(self, provider: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            entry = self._providers.get(provider)
+            if entry is None:
+                entry = self._providers[provider] = {
+                    "calls": 0,
+                    "successes": 0,
+                    "failures": 0,
+                    "latency_sum": 0.0,
+                    "latency_counts": [0] * (len(self.buckets) + 1),
+                }
+            entry["calls"] += 1
+            entry["successes" if ok else "failures"] += 1
+            entry["latency_sum"] += seconds
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    break
+            else:
+                index = len(self.buckets)
+            entry["latency_counts"][index] += 1
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Per-provider counters with a cumulative ``le`` latency histogram."""
+        labels = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        with self._lock:
+            result: dict[str, dict[str, Any]] = {}
+            for provider, entry in self._providers.items():
+                cumulative = 0
+                histogram: dict[str, int] = {}
+                for label, count in zip(labels, entry["latency_counts"]):
+                    cumulative += count
+                    histogram[label] = cumulative
+                result[provider] = {
+                    "calls": entry["calls"],
+                    "successes": entry["successes"],
+                    "failures": entry["failures"],
+                    "success_rate": entry["successes"] / entry["calls"],
+                    "latency_sum": entry["latency_sum"],
+                    "latency_histogram": histogram,
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._providers.clear()
+
+
+provider_stats = ProviderStats()
+
+
+def timed_call(
+    provider: str,
+    func: Callable[..., T],
+    *args: Any,
+    stats: ProviderStats | None = None,
+) -> T:
+    sink = stats if stats is not None else provider_stats
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception:
+        sink.record(provider, time.perf_counter() - started, ok=False)
+        raise
+    sink.record(provider, time.perf_counter() - started, ok=True)
+    return result
+
+
+def fan_out(
+    provider: str,
+    func: Callable[[Any], T],
+    items: Iterable[Any],
+    *,
+    max_workers: int = 8,
+    stats: ProviderStats | None = None,
+) -> Iterator[tuple[int, T | None, Exception | None]]:
+    """Call ``func(item)`` concurrently; yield ``(index, result, error)`` as each finishes."""
+    items = list(items)
+    if not items:
+        return
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(items))),
+        thread_name_prefix=f"vm-{provider}",
+    ) as pool:
+        futures = {
+            pool.submit(timed_call, provider, func, item, stats=stats): index
+            for index, item in enumerate(items)
+        }
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    yield futures[future], None, error  # type: ignore[misc]
+                else:
+                    yield futures[future], future.result(), None
+
+
+def hedged_call(
+    premium: Callable[[], T],
+    free: Callable[[], T],
+    *,
+    hedge_after_seconds: float,
+    stats: ProviderStats | None = None,
+) -> tuple[T, bool, Exception | None]:
+    """Return ``(result, fallback_used, premium_error)``.
+
+    The free runner starts when premium fails or outlives the budget. Both
+    runners execute on daemon threads, so a premium call that loses the race
+    is abandoned: its result is discarded and it never holds up interpreter
+    exit. If both fail, the free runner's error is raised.
+    """
+    premium_future = _start_daemon("premium", premium, stats)
+    done, _ = wait([premium_future], timeout=hedge_after_seconds)
+    if done and premium_future.exception() is None:
+        return premium_future.result(), False, None
+
+    free_future = _start_daemon("free", free, stats)
+    pending = {premium_future, free_future}
+    free_error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in (premium_future, free_future):
+            if future not in done:
+                continue
+            error = future.exception()
+            if error is None:
+                if future is premium_future:
+                    return future.result(), False, None
+                premium_error = _premium_error(premium_future, hedge_after_seconds)
+                return future.result(), True, premium_error
+            if future is free_future:
+                free_error = error
+    assert free_error is not None
+    raise free_error
+
+
+def _start_daemon(provider: str, func: Callable[[], T], stats: ProviderStats | None) -> Future:
+    # ThreadPoolExecutor workers are joined at exit; a daemon thread is not.
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            future.set_result(timed_call(provider, func, stats=stats))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name=f"vm-research-hedge-{provider}", daemon=True).start()
+    return future
+
+
+def _premium_error(future: Future, hedge_after_seconds: float) -> Exception:
+    if future.done() and future.exception() is not None:
+        return future.exception()  # type: ignore[return-value]
+    return TimeoutError(f"premium research exceeded hedge budget of {hedge_after_seconds:g}s")
@@ -4,8 +4,11 @@
 from __future__ import annotations
 
 import argparse
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 REQUIRED_FILES = [
     "research/market-landscape.md",
@@ -58,6 +61,19 @@ SOURCE_PATTERNS = [
     re.compile(r"fonte:?", re.IGNORECASE),
 ]
 
+BUZZWORD_TARGETS = ["assets", "strategy"]
+CHOSEN_ANGLE_FILE = "strategy/chosen-angle.md"
+
+# All phrases in one alternation (longest first), matched against the
+# lowercased text in a single pass instead of one str.count per phrase.
+BUZZWORD_PATTERN = re.compile(
+    "|".join(re.escape(phrase) for phrase in sorted(BUZZWORDS, key=len, reverse=True))
+)
+SOURCE_PATTERN = re.compile("|".join(pattern.pattern for pattern in SOURCE_PATTERNS), re.IGNORECASE)
+
+# Below this many files a process pool costs more to start than it saves.
+PARALLEL_MIN_FILES = 64
+
 
 class GateResult:
     def __init__(self) -> None:
@@ -79,43 +95,120 @@ def check_required_files(workspace: Path, result: GateResult) -> None:
 
 
 
-def check_research_sources(workspace: Path, result: GateResult) -> None:
+class FileScan(NamedTuple):
+    rel: str
+    buzzwords: dict[str, int] | None
+    has_source: bool
+    stripped_length: int
+
+
+def scan_file(workspace: str, rel: str, buzzwords: bool, sources: bool) -> FileScan:
+    """Read ``rel`` once and collect everything the gates need from it."""
+    content = (Path(workspace) / rel).read_text()
+    counts: dict[str, int] | None = None
+    if buzzwords:
+        counts = {}
+        for match in BUZZWORD_PATTERN.finditer(content.lower()):
+            phrase = match.group(0)
+            counts[phrase] = counts.get(phrase, 0) + 1
+    has_source = bool(SOURCE_PATTERN.search(content)) if sources else False
+    return FileScan(rel, counts, has_source, len(content.strip()))
+
+
+def _buzzword_files(workspace: Path) -> list[str]:
+    files: list[str] = []
+    for name in BUZZWORD_TARGETS:
+        target = workspace / name
+        if target.exists():
+            files.extend(str(path.relative_to(workspace)) for path in target.rglob("*.md"))
+    return files
+
+
+def scan_workspace(
+    workspace: Path,
+    *,
+    buzzwords: bool = True,
+    sources: bool = True,
+    chosen_angle: bool = True,
+    workers: int | None = None,
+) -> dict[str, FileScan]:
+    """Scan every gated file once; fans out to processes for large workspaces."""
+    plan: dict[str, list[bool]] = {}
+    if sources:
+        for rel in RESEARCH_FILES:
+            if (workspace / rel).exists():
+                plan.setdefault(rel, [False, False])[1] = True
+    if buzzwords:
+        for rel in _buzzword_files(workspace):
+            plan.setdefault(rel, [False, False])[0] = True
+    if chosen_angle and (workspace / CHOSEN_ANGLE_FILE).exists():
+        plan.setdefault(CHOSEN_ANGLE_FILE, [False, False])
+
+    jobs = [(str(workspace), rel, flags[0], flags[1]) for rel, flags in plan.items()]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+    if workers > 1 and len(jobs) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            scans = list(
+                pool.map(scan_file, *zip(*jobs), chunksize=max(1, len(jobs) // (workers * 4)))
+            )
+    else:
+        scans = [scan_file(*job) for job in jobs]
+    return {scan.rel: scan for scan in scans}
+
+
+def _report_research_sources(scans: dict[str, FileScan], result: GateResult) -> None:
     for rel in RESEARCH_FILES:
-        path = workspace / rel
-        if not path.exists():
-            continue
-        content = path.read_text()
-        has_source = any(pattern.search(content) for pattern in SOURCE_PATTERNS)
-        if not has_source:
+        scan = scans.get(rel)
+        if scan is not None and not scan.has_source:
             result.add_warning(f"No explicit source marker found in: {rel}")
 
 
+def _report_buzzwords(scans: dict[str, FileScan], result: GateResult) -> None:
+    # Scans keep the rglob order of the buzzword targets.
+    for scan in scans.values():
+        if scan.buzzwords is None:
+            continue
+        for phrase in BUZZWORDS:
+            count = scan.buzzwords.get(phrase, 0)
+            if count > 0:
+                result.add_warning(f"Buzzword flag in {Path(scan.rel)}: '{phrase}' x{count}")
+
+
+def _report_chosen_angle(scans: dict[str, FileScan], result: GateResult) -> None:
+    scan = scans.get(CHOSEN_ANGLE_FILE)
+    # Require a minimum body size to avoid placeholder files passing.
+    if scan is not None and scan.stripped_length < 200:
+        result.add_warning("strategy/chosen-angle.md looks too short (<200 chars)")
+
+
+
+def check_research_sources(workspace: Path, result: GateResult) -> None:
+    scans = scan_workspace(workspace, buzzwords=False, chosen_angle=False, workers=1)
+    _report_research_sources(scans, result)
+
+
 
 def check_buzzwords(workspace: Path, result: GateResult) -> None:
-    targets = [workspace / "assets", workspace / "strategy"]
-    for target in targets:
-        if not target.exists():
-            continue
-        for md_file in target.rglob("*.md"):
-            content = md_file.read_text().lower()
-            for phrase in BUZZWORDS:
-                count = content.count(phrase)
-                if count > 0:
-                    rel = md_file.relative_to(workspace)
-                    result.add_warning(
-                        f"Buzzword flag in {rel}: '{phrase}' x{count}"
-                    )
+    scans = scan_workspace(workspace, sources=False, chosen_angle=False)
+    _report_buzzwords(scans, result)
 
 
 
 def check_chosen_angle(workspace: Path, result: GateResult) -> None:
-    path = workspace / "strategy/chosen-angle.md"
-    if not path.exists():
-        return
-    content = path.read_text().strip()
-    # Require a minimum body size to avoid placeholder files passing.
-    if len(content) < 200:
-        result.add_warning("strategy/chosen-angle.md looks too short (<200 chars)")
+    scans = scan_workspace(workspace, buzzwords=False, sources=False, workers=1)
+    _report_chosen_angle(scans, result)
+
+
+
+def run_quality_gates(workspace: Path, workers: int | None = None) -> GateResult:
+    """All gates over a single scan of the workspace."""
+    result = GateResult()
+    check_required_files(workspace, result)
+    scans = scan_workspace(workspace, workers=workers)
+    _report_research_sources(scans, result)
+    _report_buzzwords(scans, result)
+    _report_chosen_angle(scans, result)
+    return result
 
 
 
@@ -127,6 +220,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Fail on warnings in addition to errors",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for large workspaces (default: CPU count; 1 disables the pool)",
+    )
     return parser.parse_args()
 
 
@@ -134,12 +233,7 @@ def parse_args() -> argparse.Namespace:
 def main() -> int:
     args = parse_args()
     workspace = Path(args.workspace).expanduser().resolve()
-    result = GateResult()
-
-    check_required_files(workspace, result)
-    check_research_sources(workspace, result)
-    check_buzzwords(workspace, result)
-    check_chosen_angle(workspace, result)
+    result = run_quality_gates(workspace, workers=args.workers)
 
     print(f"Workspace: {workspace}")
     print(f"Errors: {len(result.errors)}")
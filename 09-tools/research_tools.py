@@ -4,22 +4,328 @@ Vibe Marketing - Research Tools
 Ferramentas gratuitas de pesquisa de mercado
 """
 
+import asyncio
+import codecs
+import hashlib
+import os
 import requests
 import json
 import time
-from urllib.parse import quote_plus
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import quote_plus, urlsplit
 from bs4 import BeautifulSoup
 import re
 
+import httpx
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # pragma: no cover - lxml é opcional
+    lxml_etree = None
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+PRICE_PATTERN = re.compile(r'R\$[\s]?[\d.]+[,\d]+|[\d.]+[,\d]+')
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get('VIBE_RESEARCH_CACHE_DIR', Path.home() / '.cache' / 'vibe-marketing' / 'research')
+)
+
+
+class HttpCache:
+    """
+    Cache HTTP persistente em disco (um JSON por URL).
+    
+    Guarda a extração junto com ETag/Last-Modified; a próxima busca envia
+    If-None-Match/If-Modified-Since e reaproveita a extração num 304.
+    """
+    
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, url):
+        return self.root / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.json"
+    
+    def get(self, url):
+        try:
+            entry = json.loads(self._path(url).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get('url') == url else None
+    
+    def put(self, url, *, etag, last_modified, data):
+        path = self._path(url)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps({
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'stored_at': time.time(),
+            'data': data,
+        }, ensure_ascii=False), encoding='utf-8')
+        os.replace(tmp, path)
+
+
+class _PageExtractor:
+    """Extração incremental de título, meta description e headings."""
+    
+    def __init__(self, max_h1, max_h2):
+        self.max_h1 = max_h1
+        self.max_h2 = max_h2
+        self.title = ''
+        self.description = ''
+        self.h1_tags = []
+        self.h2_tags = []
+        self.head_closed = False
+    
+    @property
+    def done(self):
+        return (
+            self.head_closed
+            and len(self.h1_tags) >= self.max_h1
+            and len(self.h2_tags) >= self.max_h2
+        )
+    
+    def _heading(self, tag, text):
+        if tag == 'h1' and len(self.h1_tags) < self.max_h1:
+            self.h1_tags.append(text)
+        elif tag == 'h2' and len(self.h2_tags) < self.max_h2:
+            self.h2_tags.append(text)
+    
+    def _meta(self, attrs):
+        if (attrs.get('name') or '').lower() == 'description' and not self.description:
+            self.description = attrs.get('content') or ''
+
+
+class _LxmlExtractor(_PageExtractor):
+    """Caminho rápido: pull parser do lxml (C)."""
+    
+    def __init__(self, max_h1, max_h2):
+        super().__init__(max_h1, max_h2)
+        self._parser = lxml_etree.HTMLPullParser(events=('start', 'end'))
+    
+    def feed(self, text):
+        self._parser.feed(text)
+        for event, element in self._parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ''
+            if event == 'start':
+                if tag == 'meta':
+                    self._meta(element.attrib)
+                elif tag == 'body':
+                    self.head_closed = True
+            elif tag == 'title' and not self.title:
+                self.title = ''.join(element.itertext()).strip()
+            elif tag in ('h1', 'h2'):
+                self._heading(tag, ' '.join(''.join(element.itertext()).split()))
+            elif tag == 'head':
+                self.head_closed = True
+
+
+class _StdlibExtractor(_PageExtractor, HTMLParser):
+    """Fallback sem lxml: html.parser da stdlib, também incremental."""
+    
+    def __init__(self, max_h1, max_h2):
+        _PageExtractor.__init__(self, max_h1, max_h2)
+        HTMLParser.__init__(self, convert_charrefs=True)
+        self._capture = None
+        self._buffer = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'meta':
+            self._meta(dict(attrs))
+        elif tag == 'body':
+            self.head_closed = True
+        elif tag in ('title', 'h1', 'h2') and self._capture is None:
+            self._capture = tag
+            self._buffer = []
+    
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.head_closed = True
+        if tag != self._capture:
+            return
+        text = ' '.join(''.join(self._buffer).split())
+        if tag == 'title':
+            self.title = self.title or text
+        else:
+            self._heading(tag, text)
+        self._capture = None
+    
+    def handle_data(self, data):
+        if self._capture is not None:
+            self._buffer.append(data)
+
+
+def _make_extractor(max_h1, max_h2):
+    if lxml_etree is not None:
+        return _LxmlExtractor(max_h1, max_h2)
+    return _StdlibExtractor(max_h1, max_h2)
+
+
+def _run_sync(coro):
+    """Executa uma coroutine a partir de código síncrono, mesmo com loop ativo."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+class CompetitorFetcher:
+    """
+    Busca páginas de concorrentes em paralelo (asyncio + httpx).
+    
+    - Limite global de conexões simultâneas e, por host, de concorrência e
+      intervalo mínimo entre requisições (substitui o sleep global).
+    - Cache HTTP persistente com revalidação por ETag/Last-Modified.
+    - Leitura em streaming: para quando o <head> fechou e os headings
+      necessários já apareceram, ou ao atingir ``max_bytes``.
+    """
+    
+    def __init__(
+        self,
+        *,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_concurrency=16,
+        per_host_concurrency=2,
+        per_host_interval=1.0,
+        timeout=15.0,
+        max_bytes=256 * 1024,
+        max_h1=5,
+        max_h2=5,
+    ):
+        self.cache = HttpCache(cache_dir) if cache_dir else None
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_interval = per_host_interval
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_h1 = max_h1
+        self.max_h2 = max_h2
+        self.stats = {'fetched': 0, 'revalidated': 0, 'errors': 0, 'bytes_read': 0}
+    
+    def fetch_many(self, urls):
+        """Versão síncrona de :meth:`fetch_many_async`."""
+        return _run_sync(self.fetch_many_async(urls))
+    
+    async def fetch_many_async(self, urls):
+        """
+        Busca e extrai várias URLs; o resultado segue a ordem de ``urls``.
+        
+        URLs repetidas são buscadas uma vez só.
+        """
+        unique = list(dict.fromkeys(urls))
+        limiter = asyncio.Semaphore(self.max_concurrency)
+        hosts = {}
+        async with httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.max_concurrency),
+        ) as client:
+            results = await asyncio.gather(
+                *(self._fetch_one(client, url, limiter, hosts) for url in unique)
+            )
+        by_url = dict(zip(unique, results))
+        return [dict(by_url[url]) for url in urls]
+    
+    async def _host_slot(self, hosts, host):
+        state = hosts.get(host)
+        if state is None:
+            state = hosts[host] = {
+                'semaphore': asyncio.Semaphore(self.per_host_concurrency),
+                'lock': asyncio.Lock(),
+                'next_at': 0.0,
+            }
+        await state['semaphore'].acquire()
+        async with state['lock']:
+            now = time.monotonic()
+            start_at = max(now, state['next_at'])
+            state['next_at'] = start_at + self.per_host_interval
+        if start_at > now:
+            await asyncio.sleep(start_at - now)
+        return state['semaphore']
+    
+    async def _fetch_one(self, client, url, limiter, hosts):
+        # Uma URL ruim (host inválido, charset desconhecido, rede) vira um
+        # resultado com 'error' sem derrubar o gather das demais.
+        try:
+            return await self._fetch(client, url, limiter, hosts)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Erro ao fazer scraping de {url}: {e}")
+            return {'url': url, 'error': str(e)}
+    
+    async def _fetch(self, client, url, limiter, hosts):
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached:
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        async with limiter:
+            host_semaphore = await self._host_slot(hosts, urlsplit(url).netloc)
+            try:
+                async with client.stream('GET', url, headers=headers) as response:
+                    if response.status_code == 304 and cached:
+                        self.stats['revalidated'] += 1
+                        return cached['data']
+                    data = await self._extract(url, response)
+                    etag = response.headers.get('etag')
+                    last_modified = response.headers.get('last-modified')
+            finally:
+                host_semaphore.release()
+        
+        self.stats['fetched'] += 1
+        if self.cache and response.status_code == 200 and (etag or last_modified):
+            self.cache.put(url, etag=etag, last_modified=last_modified, data=data)
+        return data
+    
+    async def _extract(self, url, response):
+        extractor = _make_extractor(self.max_h1, self.max_h2)
+        try:
+            decoder_factory = codecs.getincrementaldecoder(response.charset_encoding or 'utf-8')
+        except LookupError:
+            decoder_factory = codecs.getincrementaldecoder('utf-8')
+        decoder = decoder_factory(errors='replace')
+        consumed = []
+        size = 0
+        async for chunk in response.aiter_bytes():
+            text = decoder.decode(chunk)
+            extractor.feed(text)
+            consumed.append(text)
+            size += len(chunk)
+            if extractor.done or size >= self.max_bytes:
+                break
+        self.stats['bytes_read'] += size
+        
+        # Preços: mesmo padrão de antes, sobre o trecho efetivamente lido
+        prices = PRICE_PATTERN.findall(''.join(consumed))
+        return {
+            'url': url,
+            'title': extractor.title,
+            'description': extractor.description,
+            'h1_tags': extractor.h1_tags,
+            'h2_tags': extractor.h2_tags,
+            'prices_found': list(dict.fromkeys(prices))[:10],  # Primeiros 10 únicos
+            'status_code': response.status_code
+        }
+
 
 class MarketResearch:
     """Classe principal para pesquisa de mercado"""
     
-    def __init__(self):
+    def __init__(self, fetcher=None):
         self.session = requests.Session()
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': USER_AGENT
         })
+        self.fetcher = fetcher or CompetitorFetcher()
     
     def search_duckduckgo(self, query, max_results=10):
         """
@@ -65,39 +371,7 @@ class MarketResearch:
         Returns:
             Dicionário com informações extraídas
         """
-        try:
-            response = self.session.get(url, timeout=15)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extrair título
-            title = soup.find('title')
-            title_text = title.get_text(strip=True) if title else ''
-            
-            # Extrair meta description
-            meta_desc = soup.find('meta', attrs={'name': 'description'})
-            description = meta_desc.get('content', '') if meta_desc else ''
-            
-            # Extrair headings
-            h1_tags = [h.get_text(strip=True) for h in soup.find_all('h1')]
-            h2_tags = [h.get_text(strip=True) for h in soup.find_all('h2')]
-            
-            # Extrair preços (padrão comum)
-            price_pattern = r'R\$[\s]?[\d.]+[,\d]+|[\d.]+[,\d]+'
-            prices = re.findall(price_pattern, response.text)
-            
-            return {
-                'url': url,
-                'title': title_text,
-                'description': description,
-                'h1_tags': h1_tags,
-                'h2_tags': h2_tags,
-                'prices_found': list(set(prices))[:10],  # Primeiros 10 únicos
-                'status_code': response.status_code
-            }
-            
-        except Exception as e:
-            print(f"Erro ao fazer scraping de {url}: {e}")
-            return {'url': url, 'error': str(e)}
+        return self.fetcher.fetch_many([url])[0]
     
     def analyze_competitor(self, url):
         """
@@ -109,9 +383,23 @@ class MarketResearch:
         Returns:
             Análise estruturada
         """
-        data = self.scrape_website(url)
+        return self._build_analysis(url, self.scrape_website(url))
+    
+    def analyze_competitors(self, urls):
+        """
+        Analisa vários concorrentes em paralelo
         
-        analysis = {
+        Args:
+            urls: Lista de URLs de concorrentes
+            
+        Returns:
+            Lista de análises, na ordem de ``urls``
+        """
+        pages = self.fetcher.fetch_many(urls)
+        return [self._build_analysis(url, data) for url, data in zip(urls, pages)]
+    
+    def _build_analysis(self, url, data):
+        return {
             'url': url,
             'title': data.get('title', ''),
             'description': data.get('description', ''),
@@ -120,8 +408,6 @@ class MarketResearch:
             'prices': data.get('prices_found', []),
             'positioning': self._extract_positioning(data)
         }
-        
-        return analysis
     
     def _extract_positioning(self, data):
         """Extrai elementos de posicionamento do conteúdo"""
@@ -163,10 +449,8 @@ class MarketResearch:
         competitor_analysis = []
         if competitor_urls:
             print(f"📊 Analisando {len(competitor_urls)} concorrentes...")
-            for url in competitor_urls:
-                analysis = self.analyze_competitor(url)
-                competitor_analysis.append(analysis)
-                time.sleep(1)  # Respeitar rate limit
+            # Rate limit por host fica a cargo do fetcher
+            competitor_analysis = self.analyze_competitors(competitor_urls)
         
         # Compilar relatório
         report = {
@@ -65,6 +65,17 @@ def parse_args() -> argparse.Namespace:
         default="",
         help="Staging URL for testing (if empty, report will be marked as SKIPPED)",
     )
+    parser.add_argument(
+        "--columnar-dir",
+        type=Path,
+        help="Root of a `python -m vm_webapp export-columnar` export (optional)",
+    )
+    parser.add_argument(
+        "--history-days",
+        type=int,
+        default=30,
+        help="History window aggregated from the columnar export",
+    )
     return parser.parse_args()
 
 
@@ -749,6 +760,59 @@ def generate_outcome_roi_section() -> list[str]:
     return lines
 
 
+def load_ops_analytics(columnar_dir: Path | None, history_days: int) -> dict[str, Any] | None:
+    """Aggregate event, onboarding and first-run history from a columnar export."""
+    if columnar_dir is None:
+        return None
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from vm_webapp.ops_columnar import build_ops_analytics, history_window
+
+    since, until = history_window(history_days)
+    analytics = build_ops_analytics(columnar_dir, since=since, until=until)
+    analytics["history_days"] = history_days
+    return analytics
+
+
+def generate_ops_analytics_section(analytics: dict[str, Any]) -> list[str]:
+    """Generate the ops analytics section from columnar export aggregates."""
+    events = analytics["event_log"]
+    onboarding = analytics["onboarding"]
+    first_runs = analytics["first_runs"]
+    ttfv_p50 = onboarding["ttfv"]["p50_ms"]
+    ttfv_p90 = onboarding["ttfv"]["p90_ms"]
+
+    lines = [
+        f"## Ops Analytics (last {analytics['history_days']} days)",
+        "",
+        "| Metric | Value |",
+        "|--------|-------|",
+        f"| Event Log Events | {events['total']} |",
+        f"| Active Brands | {events['active_brands']} |",
+        f"| Onboarding Started | {onboarding['started']} |",
+        f"| Onboarding Completed | {onboarding['completed']} ({onboarding['completion_rate']:.1%}) |",
+        f"| TTFV p50 / p90 | "
+        + (f"{ttfv_p50 / 1000:.1f}s / {ttfv_p90 / 1000:.1f}s" if ttfv_p50 is not None else "n/a")
+        + " |",
+        f"| First Runs | {first_runs['total']} |",
+        f"| First-Run Success (24h) | {first_runs['success_rate']:.1%} |",
+        "",
+    ]
+    if first_runs["by_profile_mode"]:
+        lines.extend([
+            "### First-Run Outcomes by Profile/Mode",
+            "",
+            "| Profile | Mode | Runs | Success | Avg Quality |",
+            "|---------|------|------|---------|-------------|",
+        ])
+        for row in first_runs["by_profile_mode"][:10]:
+            lines.append(
+                f"| {row['profile']} | {row['mode']} | {row['runs']} "
+                f"| {row['success_rate']:.1%} | {row['avg_quality_score']:.2f} |"
+            )
+        lines.append("")
+    return lines
+
+
 def generate_skipped_notice(has_staging_url: bool, has_real_data: bool) -> list[str]:
     """Generate SKIPPED notice when appropriate."""
     lines = []
@@ -791,6 +855,7 @@ def generate_markdown_report(
     top_risks: list[tuple[str, int, str, str]],
     generated_at: datetime,
     has_staging_url: bool = True,
+    ops_analytics: dict[str, Any] | None = None,
 ) -> str:
     """Generate markdown report from aggregated metrics."""
     has_real_data = metrics["total_threads"] > 0 and not all(
@@ -970,6 +1035,9 @@ def generate_markdown_report(
             "",
         ] + [f"- {alert}" for alert in alerts] + [""])
     
+    if ops_analytics:
+        lines.extend(generate_ops_analytics_section(ops_analytics))
+    
     lines.extend([
         "---",
         "",
@@ -1113,6 +1181,7 @@ def main() -> int:
     deltas = calculate_forecast_deltas(forecasts, previous_scores)
     top_risks = get_top_risk_threads(forecasts)
     metrics = aggregate_metrics(insights)
+    ops_analytics = load_ops_analytics(args.columnar_dir, args.history_days)
     generated_at = datetime.now(timezone.utc)
     
     if args.format == "json":
@@ -1129,12 +1198,14 @@ def main() -> int:
                 ],
                 "staging_url": staging_url,
                 "has_staging_url": has_staging_url,
+                "ops_analytics": ops_analytics,
             },
             indent=2,
         )
     else:
         output = generate_markdown_report(
-            metrics, forecasts, signal_quality, deltas, top_risks, generated_at, has_staging_url
+            metrics, forecasts, signal_quality, deltas, top_risks, generated_at, has_staging_url,
+            ops_analytics=ops_analytics,
         )
     
     if args.output:
@@ -8,20 +8,42 @@ Gera relatório noturno com:
 - Rollbacks acionados
 - Top segmentos em risco
 - Recovery Orchestration v28 (NEW)
+- Ops analytics sobre o export colunar (opcional, --columnar-dir)
 """
 
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any
+import argparse
 import json
+import sys
 
 UTC = timezone.utc
 
 
+def build_ops_analytics_section(columnar_dir: Path, history_days: int, date: datetime) -> dict[str, Any]:
+    """
+    Agrega o histórico exportado por ``python -m vm_webapp export-columnar``.
+
+    A agregação é vetorizada (pandas/NumPy) e lê apenas as partições
+    data/brand da janela, então meses de histórico cabem em segundos.
+    """
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from vm_webapp.ops_columnar import build_ops_analytics, history_window
+
+    since, until = history_window(history_days, now=date)
+    section = build_ops_analytics(columnar_dir, since=since, until=until)
+    section["history_days"] = history_days
+    return section
+
+
 def generate_nightly_report(
     audit_store=None,
     safety_engine=None,
     recovery_metrics=None,
-    date=None
+    date=None,
+    columnar_dir=None,
+    history_days=30,
 ) -> dict[str, Any]:
     """
     Gera relatório noturno de automação de decisões.
@@ -31,6 +53,8 @@ def generate_nightly_report(
         safety_engine: Engine de safety gates (opcional)
         recovery_metrics: Métricas de recovery v28 (opcional)
         date: Data do relatório (default: ontem)
+        columnar_dir: Raiz do export colunar; inclui a seção ops_analytics
+        history_days: Dias de histórico agregados na seção ops_analytics
         
     Returns:
         Dict com estrutura do relatório
@@ -252,7 +276,10 @@ def generate_nightly_report(
             ]
         }
     }
-    
+
+    if columnar_dir is not None:
+        report["ops_analytics"] = build_ops_analytics_section(Path(columnar_dir), history_days, date)
+
     return report
 
 
@@ -376,13 +403,35 @@ Recent Executions:
             auto_str = "[AUTO]" if exec.get('auto_executed') else "[MANUAL]"
             print(f"  - {exec['run_id']}: {exec['incident_type']} [{exec['severity']}] {auto_str} -> {exec['status']}")
     
+    analytics = report.get('ops_analytics')
+    if analytics:
+        onboarding = analytics['onboarding']
+        first_runs = analytics['first_runs']
+        ttfv_p50 = onboarding['ttfv']['p50_ms']
+        print(f"""
+📈 OPS ANALYTICS (last {analytics['history_days']} days)
+────────────────────────────────────────────────────────────────────
+Event Log Events:       {analytics['event_log']['total']}
+Active Brands:          {analytics['event_log']['active_brands']}
+Onboarding Started:     {onboarding['started']}
+Onboarding Completed:   {onboarding['completed']} ({onboarding['completion_rate']:.1%})
+TTFV p50:               {f"{ttfv_p50 / 1000:.1f}s" if ttfv_p50 is not None else "n/a"}
+First Runs:             {first_runs['total']}
+First-Run Success 24h:  {first_runs['success_rate']:.1%}
+""")
+
     print(f"""
 Report generated at:    {report['generated_at']}
 """)
 
 
 if __name__ == "__main__":
-    report = generate_nightly_report()
+    parser = argparse.ArgumentParser(description="VM Studio nightly report v18")
+    parser.add_argument("--columnar-dir", type=Path, help="Columnar export root (optional)")
+    parser.add_argument("--history-days", type=int, default=30, help="History window for ops analytics")
+    args = parser.parse_args()
+
+    report = generate_nightly_report(columnar_dir=args.columnar_dir, history_days=args.history_days)
     print_report(report)
     
     # Também salva como JSON
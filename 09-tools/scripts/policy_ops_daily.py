@@ -28,6 +28,7 @@ import argparse
 import json
 import logging
 import sys
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -107,6 +108,33 @@ Examples:
     return parser.parse_args()
 
 
+def summarize_results(results: list[Any]) -> dict[str, int]:
+    """Count recommendation actions and pending promotions in one pass.
+    
+    Args:
+        results: List of EvaluationResult objects
+        
+    Returns:
+        Dict with promote/hold/rollback/pending_approval counts
+    """
+    actions: Counter = Counter()
+    pending = 0
+    for r in results:
+        actions[r.recommendation.action] += 1
+        pending += _is_pending_promotion(r)
+    return {
+        "promote": actions[RecommendationAction.PROMOTE],
+        "hold": actions[RecommendationAction.HOLD],
+        "rollback": actions[RecommendationAction.ROLLBACK],
+        "pending_approval": pending,
+    }
+
+
+def _is_pending_promotion(result: Any) -> bool:
+    rec = result.recommendation
+    return rec.status == RecommendationStatus.PENDING and rec.action == RecommendationAction.PROMOTE
+
+
 def generate_markdown_report(
     results: list[Any],
     output_dir: Path,
@@ -145,14 +173,12 @@ def generate_markdown_report(
     if not results:
         lines.append("No active experiments found for evaluation.\n")
     else:
-        promote_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.PROMOTE)
-        hold_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.HOLD)
-        rollback_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.ROLLBACK)
+        summary = summarize_results(results)
         
-        lines.append(f"- **Promote:** {promote_count}")
-        lines.append(f"- **Hold:** {hold_count}")
-        lines.append(f"- **Rollback:** {rollback_count}")
-        lines.append(f"- **Pending Approval:** {len([r for r in results if r.recommendation.status == RecommendationStatus.PENDING and r.recommendation.action == RecommendationAction.PROMOTE])}\n")
+        lines.append(f"- **Promote:** {summary['promote']}")
+        lines.append(f"- **Hold:** {summary['hold']}")
+        lines.append(f"- **Rollback:** {summary['rollback']}")
+        lines.append(f"- **Pending Approval:** {summary['pending_approval']}\n")
     
     # Action Items
     lines.append("## Action Items\n")
@@ -204,7 +230,7 @@ def generate_markdown_report(
         lines.append("")
     
     # Pending Approvals Section
-    pending = [r for r in results if r.recommendation.status == RecommendationStatus.PENDING and r.recommendation.action == RecommendationAction.PROMOTE]
+    pending = [r for r in results if _is_pending_promotion(r)]
     if pending:
         lines.append("## Pending Approvals (SUPERVISED Mode)\n")
         lines.append("The following experiments are awaiting manual approval:\n")
@@ -261,12 +287,7 @@ def generate_json_report(
             "dry_run": dry_run,
             "total_experiments": len(results),
         },
-        "summary": {
-            "promote": sum(1 for r in results if r.recommendation.action == RecommendationAction.PROMOTE),
-            "hold": sum(1 for r in results if r.recommendation.action == RecommendationAction.HOLD),
-            "rollback": sum(1 for r in results if r.recommendation.action == RecommendationAction.ROLLBACK),
-            "pending_approval": len([r for r in results if r.recommendation.status == RecommendationStatus.PENDING and r.recommendation.action == RecommendationAction.PROMOTE]),
-        },
+        "summary": summarize_results(results),
         "results": [
             {
                 "experiment_id": r.experiment_id,
@@ -292,7 +313,7 @@ def generate_json_report(
                 "rationale": r.recommendation.rationale,
             }
             for r in results
-            if r.recommendation.status == RecommendationStatus.PENDING and r.recommendation.action == RecommendationAction.PROMOTE
+            if _is_pending_promotion(r)
         ],
     }
     
@@ -352,13 +373,12 @@ def main() -> int:
         print("=" * 60)
         print(f"Experiments evaluated: {len(results)}")
         
-        promote_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.PROMOTE)
-        hold_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.HOLD)
-        rollback_count = sum(1 for r in results if r.recommendation.action == RecommendationAction.ROLLBACK)
-        pending_count = len([r for r in results if r.recommendation.status == RecommendationStatus.PENDING and r.recommendation.action == RecommendationAction.PROMOTE])
+        summary = summarize_results(results)
+        rollback_count = summary["rollback"]
+        pending_count = summary["pending_approval"]
         
-        print(f"  Promote:   {promote_count}")
-        print(f"  Hold:      {hold_count}")
+        print(f"  Promote:   {summary['promote']}")
+        print(f"  Hold:      {summary['hold']}")
         print(f"  Rollback:  {rollback_count}")
         print(f"  Pending:   {pending_count}")
         
@@ -1,10 +1,199 @@
+"""Stack loading through a process-wide compiled registry.
+
+Stack YAML is read on every run start, approval and retry. ``CompiledFileRegistry``
+parses a file once and serves the compiled value until its ``(mtime_ns, size)``
+changes; a changed stat whose sha256 still matches only refreshes the stamp.
+``start_watcher`` polls registered files in the background so edits are
+recompiled before the next request instead of on it.
+"""
+
 from __future__ import annotations
 
+import copy
+import hashlib
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any, Generic, TypeVar
 
 import yaml
 
+T = TypeVar("T")
 
-def load_stack(path: str) -> dict:
-    return yaml.safe_load(Path(path).read_text(encoding="utf-8"))
 
+@dataclass
+class _Entry(Generic[T]):
+    stamp: tuple[int, int]
+    digest: str
+    value: T
+
+
+class CompiledFileRegistry(Generic[T]):
+    def __init__(self, compile_fn: Callable[[Path, bytes], T]) -> None:
+        self._compile = compile_fn
+        self._entries: dict[Path, _Entry[T]] = {}
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.compilations = 0
+
+    def get(self, path: str | Path) -> T:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(resolved)
+            if entry is not None and entry.stamp == stamp:
+                return entry.value
+        return self._refresh(resolved, entry)
+
+    def _refresh(self, path: Path, entry: _Entry[T] | None) -> T:
+        # Stat before reading: a write in between is caught by the next get.
+        stat = path.stat()
+        raw = path.read_bytes()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        digest = hashlib.sha256(raw).hexdigest()
+        if entry is not None and entry.digest == digest:
+            # Touched but unchanged: keep the compiled value.
+            value = entry.value
+        else:
+            value = self._compile(path, raw)
+            self.compilations += 1
+        with self._lock:
+            self._entries[path] = _Entry(stamp=stamp, digest=digest, value=value)
+        return value
+
+    def poll(self) -> list[Path]:
+        """Recompile registered files whose stamp changed; returns their paths."""
+        with self._lock:
+            entries = list(self._entries.items())
+        changed: list[Path] = []
+        for path, entry in entries:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                with self._lock:
+                    self._entries.pop(path, None)
+                continue
+            if (stat.st_mtime_ns, stat.st_size) == entry.stamp:
+                continue
+            try:
+                self._refresh(path, entry)
+            except (OSError, ValueError, yaml.YAMLError):
+                # Keep serving the last good version until the file is fixed.
+                continue
+            changed.append(path)
+        return changed
+
+    def start_watcher(self, interval_seconds: float = 2.0) -> None:
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch,
+                args=(interval_seconds,),
+                name="vm-compiled-file-watcher",
+                daemon=True,
+            )
+            self._watcher.start()
+
+    def stop_watcher(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.join(timeout=timeout)
+        self._watcher = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _watch(self, interval_seconds: float) -> None:
+        while not self._stop.wait(interval_seconds):
+            self.poll()
+
+
+@dataclass(frozen=True)
+class StackStage:
+    id: str
+    position: int
+    approval_required: bool
+    spec: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class CompiledStack:
+    name: str
+    path: Path
+    stages: tuple[StackStage, ...]
+    auto_start_stage: str
+    spec: dict[str, Any]
+    stage_index: dict[str, int] = field(repr=False)
+
+    @property
+    def stage_ids(self) -> list[str]:
+        return [stage.id for stage in self.stages]
+
+    def stage(self, stage_id: str) -> StackStage | None:
+        index = self.stage_index.get(stage_id)
+        return None if index is None else self.stages[index]
+
+    def next_stage_id(self, stage_id: str) -> str | None:
+        index = self.stage_index.get(stage_id)
+        if index is None or index + 1 >= len(self.stages):
+            return None
+        return self.stages[index + 1].id
+
+
+def compile_stack(path: Path, raw: bytes) -> CompiledStack:
+    spec = yaml.safe_load(raw.decode("utf-8"))
+    if not isinstance(spec, dict):
+        raise ValueError(f"stack file must be a mapping: {path}")
+    sequence = spec.get("sequence")
+    if not isinstance(sequence, list) or not sequence:
+        raise ValueError(f"stack `sequence` must be a non-empty list: {path}")
+
+    stages: list[StackStage] = []
+    stage_index: dict[str, int] = {}
+    for position, item in enumerate(sequence):
+        if not isinstance(item, dict):
+            raise ValueError(f"stack stages must be objects: {path}")
+        stage_id = str(item.get("id", f"stage-{position + 1}"))
+        if stage_id in stage_index:
+            raise ValueError(f"duplicated stack stage id: {stage_id}")
+        stage_index[stage_id] = position
+        stages.append(
+            StackStage(
+                id=stage_id,
+                position=position,
+                approval_required=bool(item.get("approval_required", False)),
+                spec=item,
+            )
+        )
+
+    execution = spec.get("execution") or {}
+    auto_start_stage = str(execution.get("auto_start_stage", stages[0].id))
+    if auto_start_stage not in stage_index:
+        raise ValueError(f"stack auto_start_stage `{auto_start_stage}` is not in the sequence")
+    return CompiledStack(
+        name=str(spec.get("name", path.parent.name)),
+        path=path,
+        stages=tuple(stages),
+        auto_start_stage=auto_start_stage,
+        spec=spec,
+        stage_index=stage_index,
+    )
+
+
+stack_registry: CompiledFileRegistry[CompiledStack] = CompiledFileRegistry(compile_stack)
+
+
+def load_compiled_stack(path: str | Path) -> CompiledStack:
+    return stack_registry.get(path)
+
+
+def load_stack(path: str) -> dict:
+    # Callers get their own copy; the compiled spec is shared process-wide.
+    return copy.deepcopy(load_compiled_stack(path).spec)
@@ -0,0 +1,145 @@
+"""Scalar vs batch scoring benchmark for the ROI, hybrid ROI and quality optimizers.
+
+Scores the same synthetic segments through each engine's scalar API (one call
+per segment) and its NumPy batch API, checks the results are identical, and
+reports the speedup.
+
+Usage:
+    PYTHONPATH=09-tools python -m tests.simulations.batch_scoring_benchmark --segments 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+from vm_webapp.hybrid_roi_engine import HybridROIEngine
+from vm_webapp.quality_optimizer import QualityOptimizer
+from vm_webapp.roi_optimizer import RoiScoreCalculator, RoiScoreInput, RoiScoreInputBatch
+
+
+@dataclass
+class BatchScoringBenchmarkConfig:
+    """Configuration for a benchmark pass."""
+    segments: int = 10_000
+    seed: int = 42
+
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def _result(segments: int, scalar: float, batch: float) -> Dict[str, float]:
+    return {
+        "segments": segments,
+        "scalar_seconds": round(scalar, 4),
+        "batch_seconds": round(batch, 4),
+        "speedup": round(scalar / batch, 2) if batch > 0 else 0.0,
+    }
+
+
+def _roi_pass(rng: random.Random, count: int) -> Dict[str, float]:
+    inputs = [
+        RoiScoreInput(
+            approval_without_regen_24h=rng.random(),
+            revenue_attribution_usd=rng.uniform(0, 900_000),
+            regen_per_job=rng.uniform(0, 3),
+            quality_score_avg=rng.random(),
+            avg_latency_ms=rng.uniform(0, 800),
+            cost_per_job_usd=rng.uniform(0, 0.3),
+            incident_rate=rng.uniform(0, 0.06),
+        )
+        for _ in range(count)
+    ]
+    batch_input = RoiScoreInputBatch.from_inputs(inputs)
+    calculator = RoiScoreCalculator()
+
+    scalar, scalar_seconds = _timed(lambda: [calculator.calculate(item).total_score for item in inputs])
+    batch, batch_seconds = _timed(lambda: calculator.calculate_batch(batch_input).total_score)
+    assert np.array_equal(np.array(scalar), batch)
+    return _result(count, scalar_seconds, batch_seconds)
+
+
+def _hybrid_pass(rng: random.Random, count: int) -> Dict[str, float]:
+    financial = [
+        {"revenue": rng.uniform(0, 10_000), "cost": rng.uniform(1, 5_000), "activations": rng.randint(1, 500)}
+        for _ in range(count)
+    ]
+    operational = [
+        {"activations": rng.randint(1, 500), "successes": rng.randint(0, 500), "human_minutes": rng.uniform(1, 900)}
+        for _ in range(count)
+    ]
+
+    def columns(rows: list[dict]) -> dict:
+        return {key: np.array([row[key] for row in rows]) for key in rows[0]}
+
+    financial_columns, operational_columns = columns(financial), columns(operational)
+    engine = HybridROIEngine()
+
+    def scalar_scores() -> List[float]:
+        return [
+            engine.calculate_hybrid_score(
+                engine.calculate_financial_metrics(fin),
+                engine.calculate_operational_metrics(ops),
+            ).penalized_index
+            for fin, ops in zip(financial, operational)
+        ]
+
+    scalar, scalar_seconds = _timed(scalar_scores)
+    batch, batch_seconds = _timed(
+        lambda: engine.calculate_hybrid_scores_batch(financial_columns, operational_columns).penalized_index
+    )
+    assert np.array_equal(np.array(scalar), batch)
+    return _result(count, scalar_seconds, batch_seconds)
+
+
+def _quality_pass(rng: random.Random, count: int) -> Dict[str, float]:
+    v1 = np.array([rng.uniform(0, 100) for _ in range(count)])
+    approval = np.array([rng.random() for _ in range(count)])
+    incidents = np.array([rng.uniform(0, 0.4) for _ in range(count)])
+    rows = list(zip(v1.tolist(), approval.tolist(), incidents.tolist()))
+    optimizer = QualityOptimizer()
+
+    scalar, scalar_seconds = _timed(
+        lambda: [optimizer.calculate_quality_score(a, b, c).overall for a, b, c in rows]
+    )
+    batch, batch_seconds = _timed(
+        lambda: optimizer.calculate_quality_scores_batch(v1, approval, incidents).overall
+    )
+    assert np.array_equal(np.array(scalar), batch)
+    return _result(count, scalar_seconds, batch_seconds)
+
+
+def run_batch_scoring_benchmark(config: BatchScoringBenchmarkConfig) -> Dict[str, Any]:
+    """Run the scalar and batch passes for every engine."""
+    rng = random.Random(config.seed)
+    return {
+        "config": asdict(config),
+        "roi_optimizer": _roi_pass(rng, config.segments),
+        "hybrid_roi_engine": _hybrid_pass(rng, config.segments),
+        "quality_optimizer": _quality_pass(rng, config.segments),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scalar vs batch optimizer scoring benchmark")
+    parser.add_argument("--segments", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    result = run_batch_scoring_benchmark(
+        BatchScoringBenchmarkConfig(segments=args.segments, seed=args.seed)
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
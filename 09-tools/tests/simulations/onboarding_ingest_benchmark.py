@@ -0,0 +1,148 @@
+"""Onboarding telemetry ingest throughput benchmark.
+
+Compares the previous one-transaction-per-event path with bulk inserts
+(executemany) issued directly and through ``OnboardingEventBuffer``.
+
+Usage:
+    PYTHONPATH=09-tools python -m tests.simulations.onboarding_ingest_benchmark --events 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.models_onboarding import OnboardingEvent
+from vm_webapp.onboarding_ingest import OnboardingEventBuffer, build_event_row, insert_event_rows
+
+
+@dataclass
+class OnboardingIngestBenchmarkConfig:
+    """Configuration for a benchmark pass."""
+    events: int = 5000
+    burst_size: int = 20
+    max_batch: int = 500
+
+
+def _events(count: int) -> List[Dict[str, Any]]:
+    steps = ["welcome", "workspace_setup", "template_select", "first_run"]
+    return [
+        {
+            "event": "step_completed",
+            "user_id": f"user-{index % 250}",
+            "brand_id": f"brand-{index % 10}",
+            "session_id": f"session-{index % 250}",
+            "step": steps[index % len(steps)],
+            "duration_ms": 1000 + index,
+            "metadata": {"burst": index // 20},
+        }
+        for index in range(count)
+    ]
+
+
+def _count(engine) -> int:
+    with session_scope(engine) as session:
+        return int(session.scalar(select(func.count()).select_from(OnboardingEvent)) or 0)
+
+
+def _result(events: int, elapsed: float) -> Dict[str, float]:
+    return {
+        "events": events,
+        "elapsed_seconds": round(elapsed, 4),
+        "events_per_second": round(events / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def _per_event_pass(root: Path, events: List[Dict[str, Any]]) -> Dict[str, float]:
+    engine = build_engine(root / "per_event.sqlite3")
+    init_db(engine)
+    started = time.perf_counter()
+    for event in events:
+        with session_scope(engine) as session:
+            session.add(OnboardingEvent(**build_event_row(event)))
+    elapsed = time.perf_counter() - started
+    assert _count(engine) == len(events)
+    return _result(len(events), elapsed)
+
+
+def _batch_pass(root: Path, events: List[Dict[str, Any]], burst_size: int) -> Dict[str, float]:
+    engine = build_engine(root / "batch.sqlite3")
+    init_db(engine)
+    started = time.perf_counter()
+    for offset in range(0, len(events), burst_size):
+        insert_event_rows(engine, [build_event_row(e) for e in events[offset : offset + burst_size]])
+    elapsed = time.perf_counter() - started
+    assert _count(engine) == len(events)
+    return _result(len(events), elapsed)
+
+
+def _buffered_pass(
+    root: Path, events: List[Dict[str, Any]], config: OnboardingIngestBenchmarkConfig
+) -> Dict[str, float]:
+    engine = build_engine(root / "buffered.sqlite3")
+    init_db(engine)
+    buffer = OnboardingEventBuffer(
+        engine,
+        max_batch=config.max_batch,
+        max_pending=max(config.max_batch, len(events)),
+    )
+    started = time.perf_counter()
+    for offset in range(0, len(events), config.burst_size):
+        buffer.offer([build_event_row(e) for e in events[offset : offset + config.burst_size]])
+    buffer.close()
+    elapsed = time.perf_counter() - started
+    assert _count(engine) == len(events)
+    return _result(len(events), elapsed)
+
+
+def run_onboarding_ingest_benchmark(
+    config: OnboardingIngestBenchmarkConfig,
+    *,
+    root: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the three ingest passes and return throughput numbers."""
+    events = _events(config.events)
+    with tempfile.TemporaryDirectory() as tmp:
+        base = root or Path(tmp)
+        per_event = _per_event_pass(base, events)
+        batch = _batch_pass(base, events, config.burst_size)
+        buffered = _buffered_pass(base, events, config)
+
+    baseline = per_event["events_per_second"]
+    return {
+        "config": asdict(config),
+        "per_event_commit": per_event,
+        "batch_endpoint": batch,
+        "write_buffer": buffered,
+        "batch_speedup": round(batch["events_per_second"] / baseline, 2) if baseline else 0.0,
+        "buffer_speedup": round(buffered["events_per_second"] / baseline, 2) if baseline else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Onboarding telemetry ingest benchmark")
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--burst-size", type=int, default=20)
+    parser.add_argument("--max-batch", type=int, default=500)
+    args = parser.parse_args()
+
+    result = run_onboarding_ingest_benchmark(
+        OnboardingIngestBenchmarkConfig(
+            events=args.events,
+            burst_size=args.burst_size,
+            max_batch=args.max_batch,
+        )
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
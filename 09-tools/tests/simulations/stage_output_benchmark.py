@@ -0,0 +1,138 @@
+"""Stage post-processing throughput benchmark.
+
+Compares ``write_stage_outputs`` executed inline on the calling threads with
+the process-pool offload, across many concurrent runs writing large research
+artifacts.
+
+Usage:
+    PYTHONPATH=09-tools python -m tests.simulations.stage_output_benchmark --runs 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from vm_webapp.artifacts import build_stage_output_executor, write_stage_outputs_offloaded
+
+
+@dataclass
+class StageOutputBenchmarkConfig:
+    """Configuration for a benchmark pass."""
+    runs: int = 64
+    stages_per_run: int = 3
+    artifact_kb: int = 512
+    concurrency: int = 16
+    process_workers: int = 4
+
+
+def _research_artifact(run_index: int, stage_index: int, size_kb: int) -> str:
+    line = f"- competitor insight {run_index}-{stage_index}: pricing, positioning, channels\n"
+    repeats = max(1, (size_kb * 1024) // len(line))
+    return "# Research report\n\n" + line * repeats
+
+
+def _write_run(root: Path, executor, config: StageOutputBenchmarkConfig, run_index: int) -> int:
+    for stage_index in range(config.stages_per_run):
+        artifact = _research_artifact(run_index, stage_index, config.artifact_kb)
+        write_stage_outputs_offloaded(
+            executor,
+            stage_dir=root / f"run-{run_index}" / "stages" / f"{stage_index + 1:02d}-research",
+            run_id=f"run-{run_index}",
+            thread_id="t-bench",
+            stage_key="research",
+            stage_position=stage_index + 1,
+            attempt=1,
+            input_payload={"request_text": "benchmark", "skills": ["research"]},
+            output_payload={
+                "summary": "done",
+                "findings": [
+                    {"index": index, "text": text, "tags": ["research", "competitor"]}
+                    for index, text in enumerate(artifact.splitlines())
+                ],
+            },
+            artifacts={"research.md": artifact},
+            event_id=f"evt-bench-{run_index}-{stage_index}",
+            status="completed",
+        )
+    return config.stages_per_run
+
+
+def _timed_pass(root: Path, executor, config: StageOutputBenchmarkConfig) -> Dict[str, float]:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=config.concurrency) as threads:
+        stages = sum(
+            threads.map(
+                lambda index: _write_run(root, executor, config, index),
+                range(config.runs),
+            )
+        )
+    elapsed = time.perf_counter() - started
+    return {
+        "stages": stages,
+        "elapsed_seconds": round(elapsed, 4),
+        "stages_per_second": round(stages / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def run_stage_output_benchmark(
+    config: StageOutputBenchmarkConfig,
+    *,
+    root: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the inline and process-pool passes and return throughput numbers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = root or Path(tmp)
+        inline = _timed_pass(base / "inline", None, config)
+        executor = build_stage_output_executor(config.process_workers)
+        try:
+            # Warm the pool so worker spawn time is not billed to the first pass.
+            if executor is not None:
+                list(executor.map(abs, range(config.process_workers)))
+            offloaded = _timed_pass(base / "process_pool", executor, config)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    speedup = (
+        offloaded["stages_per_second"] / inline["stages_per_second"]
+        if inline["stages_per_second"]
+        else 0.0
+    )
+    return {
+        "config": asdict(config),
+        "inline": inline,
+        "process_pool": offloaded,
+        "speedup": round(speedup, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stage post-processing throughput benchmark")
+    parser.add_argument("--runs", type=int, default=64)
+    parser.add_argument("--stages-per-run", type=int, default=3)
+    parser.add_argument("--artifact-kb", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--process-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    result = run_stage_output_benchmark(
+        StageOutputBenchmarkConfig(
+            runs=args.runs,
+            stages_per_run=args.stages_per_run,
+            artifact_kb=args.artifact_kb,
+            concurrency=args.concurrency,
+            process_workers=args.process_workers,
+        )
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
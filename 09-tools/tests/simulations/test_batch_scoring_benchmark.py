@@ -0,0 +1,14 @@
+"""Scalar vs batch optimizer scoring benchmark tests."""
+
+from tests.simulations.batch_scoring_benchmark import (
+    BatchScoringBenchmarkConfig,
+    run_batch_scoring_benchmark,
+)
+
+
+def test_batch_scoring_matches_scalar_and_is_faster():
+    result = run_batch_scoring_benchmark(BatchScoringBenchmarkConfig(segments=10_000))
+
+    for engine in ("roi_optimizer", "hybrid_roi_engine", "quality_optimizer"):
+        assert result[engine]["segments"] == 10_000
+        assert result[engine]["speedup"] > 1
@@ -0,0 +1,18 @@
+"""Onboarding telemetry ingest benchmark tests."""
+
+from tests.simulations.onboarding_ingest_benchmark import (
+    OnboardingIngestBenchmarkConfig,
+    run_onboarding_ingest_benchmark,
+)
+
+
+def test_benchmark_reports_throughput_for_all_paths(tmp_path):
+    config = OnboardingIngestBenchmarkConfig(events=200, burst_size=10, max_batch=50)
+
+    result = run_onboarding_ingest_benchmark(config, root=tmp_path)
+
+    assert result["per_event_commit"]["events"] == 200
+    assert result["batch_endpoint"]["events"] == 200
+    assert result["write_buffer"]["events_per_second"] > 0
+    assert result["batch_speedup"] > 1
+    assert result["buffer_speedup"] > 1
@@ -0,0 +1,23 @@
+"""Stage post-processing benchmark tests."""
+
+from tests.simulations.stage_output_benchmark import (
+    StageOutputBenchmarkConfig,
+    run_stage_output_benchmark,
+)
+
+
+def test_benchmark_reports_throughput_for_both_modes(tmp_path):
+    config = StageOutputBenchmarkConfig(
+        runs=4,
+        stages_per_run=2,
+        artifact_kb=16,
+        concurrency=2,
+        process_workers=1,
+    )
+
+    result = run_stage_output_benchmark(config, root=tmp_path)
+
+    assert result["inline"]["stages"] == 8
+    assert result["process_pool"]["stages"] == 8
+    assert result["process_pool"]["stages_per_second"] > 0
+    assert list((tmp_path / "process_pool").rglob("manifest.json"))
@@ -15,3 +15,37 @@ def test_write_log_event_appends_jsonl(tmp_path) -> None:
     assert len(content) == 1
     assert '"stage": "research"' in content[0]
 
+
+def test_append_log_events_appends_jsonl_in_one_write(tmp_path) -> None:
+    from artifact_store import append_log_events
+
+    kwargs = dict(output_root=tmp_path, project_id="acme", thread_id="th-001")
+    append_log_events(events=[{"stage": "research", "status": "completed"}], **kwargs)
+    log_path = append_log_events(
+        events=[{"stage": "brand-voice", "status": "completed"}, {"stage": "x"}], **kwargs
+    )
+
+    content = log_path.read_text(encoding="utf-8").strip().splitlines()
+    assert len(content) == 3
+    assert '"stage": "brand-voice"' in content[1]
+
+
+def test_write_artifact_file_skips_identical_rewrite(tmp_path) -> None:
+    from artifact_store import write_artifact_file
+
+    kwargs = dict(
+        output_root=tmp_path,
+        project_id="acme",
+        thread_id="th-001",
+        relative_path="research/research-report.md",
+        content="# Research\n",
+        run_date="2026-01-01",
+    )
+    path = write_artifact_file(**kwargs)
+    first_mtime = path.stat().st_mtime_ns
+
+    assert write_artifact_file(**kwargs) == path
+    assert path.stat().st_mtime_ns == first_mtime
+
+    write_artifact_file(**{**kwargs, "content": "# Research v2\n"})
+    assert path.read_text(encoding="utf-8") == "# Research v2\n"
@@ -196,6 +196,73 @@ class TestOnboardingEventsEndpoints:
         assert data["success"] is True
 
 
+class TestOnboardingEventBatchEndpoints:
+    """Test batched onboarding telemetry ingest."""
+
+    def _events(self, count):
+        return [
+            {
+                "event": "onboarding_started",
+                "user_id": f"user-{i}",
+                "timestamp": "2026-03-02T12:00:00Z",
+                "metadata": {"i": i},
+            }
+            for i in range(count)
+        ]
+
+    def test_batch_endpoint_inserts_all_events(self, client):
+        response = client.post("/api/v2/onboarding/events/batch", json={"events": self._events(5)})
+        assert response.status_code == 200
+        assert response.json() == {"success": True, "accepted": 5, "buffered": False}
+
+        metrics = client.get("/api/v2/onboarding/metrics").json()
+        assert metrics["total_started"] == 5
+
+    def test_batch_endpoint_rejects_empty_batch(self, client):
+        response = client.post("/api/v2/onboarding/events/batch", json={"events": []})
+        assert response.status_code == 422
+
+    def test_buffered_events_are_visible_to_metrics_and_flushed_on_shutdown(self, tmp_path):
+        from vm_webapp.app import create_app
+        from vm_webapp.settings import Settings
+
+        settings = Settings(
+            vm_workspace_root=str(tmp_path / "workspace"),
+            vm_db_path=tmp_path / "workspace" / "test.sqlite3",
+            vm_onboarding_event_buffer_enabled=True,
+            vm_onboarding_event_buffer_max_batch=2,
+            vm_onboarding_event_buffer_max_pending=4,
+            vm_onboarding_event_buffer_flush_ms=60000,
+        )
+        app = create_app(settings=settings, enable_in_process_worker=False)
+        buffer = app.state.onboarding_event_buffer
+
+        with TestClient(app) as buffered_client:
+            response = buffered_client.post(
+                "/api/v2/onboarding/events/batch", json={"events": self._events(3)}
+            )
+            assert response.json()["buffered"] is True
+            assert buffered_client.get("/api/v2/onboarding/metrics").json()["total_started"] == 3
+
+            # Hold the flush lock so nothing drains while the buffer fills up.
+            with buffer._flush_lock:
+                assert buffered_client.post(
+                    "/api/v2/onboarding/events/batch", json={"events": self._events(4)}
+                ).status_code == 200
+                full = buffered_client.post(
+                    "/api/v2/onboarding/events/batch", json={"events": self._events(1)}
+                )
+            assert full.status_code == 429
+            assert full.headers["retry-after"] == "1"
+            buffer.flush()
+            buffered_client.post("/api/v2/onboarding/events", json=self._events(1)[0])
+
+        snapshot = buffer.snapshot()
+        assert snapshot["pending"] == 0
+        assert snapshot["flushed_total"] == 8
+        assert snapshot["rejected_total"] == 1
+
+
 class TestOnboardingMetricsEndpoints:
     """Test onboarding metrics endpoints."""
 
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from executor import approve_stage, get_status, run_until_gate
+from pipeline_store import (
+    DB_FILENAME,
+    PipelineStore,
+    StateConflictError,
+    StateNotFoundError,
+    open_pipeline_store,
+)
+from state_store import save_state
+
+STACK = "06-stacks/foundation-stack/stack.yaml"
+
+
+def test_commit_writes_state_and_events_in_one_transaction(tmp_path: Path) -> None:
+    store = PipelineStore(tmp_path)
+    state = {"project_id": "acme", "thread_id": "th-001", "status": "running"}
+
+    assert store.commit("acme", "th-001", state) == 1
+    version = store.commit(
+        "acme",
+        "th-001",
+        {**state, "status": "completed"},
+        events=[{"stage": "research"}, {"stage": "brand-voice"}],
+        output_root=tmp_path / "out",
+        run_date="2026-01-01",
+        expected_version=1,
+    )
+
+    assert version == 2
+    assert store.load("acme", "th-001") == ({**state, "status": "completed"}, 2)
+    assert [event["stage"] for event in store.events("acme", "th-001")] == ["research", "brand-voice"]
+
+
+def test_stale_version_is_rejected_without_partial_writes(tmp_path: Path) -> None:
+    store = PipelineStore(tmp_path)
+    store.commit("acme", "th-001", {"status": "running"})
+    store.commit("acme", "th-001", {"status": "waiting_approval"}, expected_version=1)
+
+    with pytest.raises(StateConflictError):
+        store.commit(
+            "acme",
+            "th-001",
+            {"status": "completed"},
+            events=[{"stage": "keywords"}],
+            output_root=tmp_path,
+            run_date="2026-01-01",
+            expected_version=1,
+        )
+
+    assert store.load("acme", "th-001") == ({"status": "waiting_approval"}, 2)
+    assert store.events("acme", "th-001") == []
+
+
+def test_missing_thread_raises_file_not_found(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        PipelineStore(tmp_path).load("acme", "missing")
+    assert issubclass(StateNotFoundError, FileNotFoundError)
+
+
+def test_legacy_state_json_is_imported_on_first_read(tmp_path: Path) -> None:
+    save_state(tmp_path, "acme", "th-legacy", {"status": "waiting_approval"})
+    store = PipelineStore(tmp_path)
+
+    assert store.load("acme", "th-legacy") == ({"status": "waiting_approval"}, 1)
+    assert store.threads() == [("acme", "th-legacy")]
+
+
+def test_executor_transitions_go_through_one_database(tmp_path: Path) -> None:
+    runtime_root = tmp_path / "runtime"
+    output_root = tmp_path / "out"
+    run_until_gate(runtime_root, "acme", "th-001", STACK, "crm", output_root=output_root)
+    approve_stage(runtime_root, "acme", "th-001", "brand-voice")
+
+    assert (runtime_root / DB_FILENAME).exists()
+    assert not (runtime_root / "projects").exists()
+    store = open_pipeline_store(runtime_root)
+    assert get_status(runtime_root, "acme", "th-001") == store.load("acme", "th-001")[0]
+    assert [event["stage"] for event in store.events("acme", "th-001")] == ["research", "brand-voice"]
+    (log_path,) = output_root.rglob("execution-log.jsonl")
+    logged = [json.loads(line) for line in log_path.read_text(encoding="utf-8").splitlines()]
+    assert logged == store.events("acme", "th-001")
+
+
+def test_export_reproduces_json_layout(tmp_path: Path) -> None:
+    runtime_root = tmp_path / "runtime"
+    output_root = tmp_path / "out"
+    state = run_until_gate(runtime_root, "acme", "th-001", STACK, "crm", output_root=output_root)
+    state = approve_stage(runtime_root, "acme", "th-001", "brand-voice")
+
+    paths = open_pipeline_store(runtime_root).export_json_layout()
+
+    state_path = runtime_root / "projects" / "acme" / "threads" / "th-001" / "state.json"
+    log_path = output_root.resolve() / state["run_date"] / "acme" / "th-001" / "execution-log.jsonl"
+    assert paths == [state_path.resolve(), log_path]
+    assert json.loads(state_path.read_text(encoding="utf-8")) == state
+    lines = log_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["status"] for line in lines] == ["completed", "completed"]
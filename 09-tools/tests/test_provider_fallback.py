@@ -1,6 +1,13 @@
 from __future__ import annotations
 
+import threading
+import time
+
+import pytest
+
+import executor
 from providers.free_fallback import run_research_with_fallback
+from providers.orchestrator import ProviderStats
 
 
 def test_fallback_runs_when_premium_raises() -> None:
@@ -15,3 +22,131 @@ def test_fallback_runs_when_premium_raises() -> None:
     assert data["provider"] == "free"
     assert data["fallback_used"] is True
 
+
+
+def test_slow_premium_is_hedged_with_free_path() -> None:
+    release = threading.Event()
+
+    def premium() -> dict:
+        release.wait(5)
+        return {"provider": "premium"}
+
+    def free() -> dict:
+        return {"provider": "free"}
+
+    stats = ProviderStats()
+    started = time.perf_counter()
+    data = run_research_with_fallback(
+        premium_runner=premium, free_runner=free, hedge_after_seconds=0.05, stats=stats
+    )
+    release.set()
+
+    assert time.perf_counter() - started < 1.0
+    assert data["provider"] == "free"
+    assert data["fallback_used"] is True
+    assert "hedge budget" in data["premium_error"]
+    assert stats.snapshot()["free"]["successes"] == 1
+
+
+def test_losing_premium_call_does_not_block_interpreter_exit() -> None:
+    release = threading.Event()
+    premium_threads: list[threading.Thread] = []
+
+    def premium() -> dict:
+        premium_threads.append(threading.current_thread())
+        release.wait(5)
+        return {"provider": "premium"}
+
+    data = run_research_with_fallback(
+        premium_runner=premium,
+        free_runner=lambda: {"provider": "free"},
+        hedge_after_seconds=0.01,
+    )
+
+    assert data["provider"] == "free"
+    assert premium_threads[0].is_alive()
+    assert premium_threads[0].daemon is True
+    release.set()
+
+
+def test_premium_finishing_during_hedge_still_wins() -> None:
+    def premium() -> dict:
+        time.sleep(0.1)
+        return {"provider": "premium"}
+
+    def free() -> dict:
+        raise RuntimeError("free down")
+
+    data = run_research_with_fallback(
+        premium_runner=premium, free_runner=free, hedge_after_seconds=0.01
+    )
+
+    assert data["provider"] == "premium"
+    assert data["fallback_used"] is False
+    assert "premium_error" not in data
+
+
+def test_hedged_failure_of_both_raises_free_error() -> None:
+    def premium() -> dict:
+        raise RuntimeError("premium down")
+
+    def free() -> dict:
+        raise RuntimeError("free down")
+
+    with pytest.raises(RuntimeError, match="free down"):
+        run_research_with_fallback(premium_runner=premium, free_runner=free, hedge_after_seconds=1.0)
+
+
+def test_provider_stats_histogram_is_cumulative() -> None:
+    stats = ProviderStats(buckets=(0.1, 1.0))
+    stats.record("perplexity", 0.05, ok=True)
+    stats.record("perplexity", 0.5, ok=False)
+    stats.record("perplexity", 3.0, ok=True)
+
+    snapshot = stats.snapshot()["perplexity"]
+
+    assert snapshot["calls"] == 3
+    assert snapshot["failures"] == 1
+    assert snapshot["latency_histogram"] == {"0.1": 1, "1": 2, "+Inf": 3}
+
+
+def test_premium_research_extracts_urls_concurrently(monkeypatch) -> None:
+    urls = [f"https://example.com/{index}" for index in range(8)]
+
+    def perplexity(query: str) -> dict:
+        results = [{"url": url} for url in urls + urls[:2]]
+        return {"provider": "perplexity", "query": query, "results": results}
+
+    def firecrawl(batch: list[str]) -> dict:
+        time.sleep(0.2)
+        if batch == [urls[3]]:
+            raise RuntimeError("blocked")
+        return {"provider": "firecrawl", "urls": batch, "pages": [{"url": u} for u in batch]}
+
+    monkeypatch.setattr(executor, "run_perplexity_research", perplexity)
+    monkeypatch.setattr(executor, "run_firecrawl_extract", firecrawl)
+
+    started = time.perf_counter()
+    data = executor._run_premium_research("crm")
+
+    # Sequential extraction would take 8 x 0.2 s.
+    assert time.perf_counter() - started < 1.0
+    assert data["sources"] == urls
+    assert data["firecrawl"]["urls"] == [url for url in urls if url != urls[3]]
+    assert data["firecrawl"]["errors"] == {urls[3]: "blocked"}
+
+
+def test_premium_research_fails_when_no_url_is_extracted(monkeypatch) -> None:
+    monkeypatch.setattr(
+        executor,
+        "run_perplexity_research",
+        lambda query: {"results": [{"url": "https://example.com/a"}]},
+    )
+
+    def firecrawl(batch: list[str]) -> dict:
+        raise RuntimeError("FIRECRAWL_API_KEY missing")
+
+    monkeypatch.setattr(executor, "run_firecrawl_extract", firecrawl)
+
+    with pytest.raises(RuntimeError, match="FIRECRAWL_API_KEY"):
+        executor._run_premium_research("crm")
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import quality_check
+from quality_check import (
+    BUZZWORDS,
+    REQUIRED_FILES,
+    GateResult,
+    check_buzzwords,
+    check_chosen_angle,
+    check_research_sources,
+    run_quality_gates,
+)
+
+
+def _reference_buzzwords(workspace: Path) -> list[str]:
+    # The per-phrase str.count scan the single-pass scanner replaces.
+    warnings: list[str] = []
+    for target in (workspace / "assets", workspace / "strategy"):
+        for md_file in target.rglob("*.md"):
+            content = md_file.read_text().lower()
+            for phrase in BUZZWORDS:
+                count = content.count(phrase)
+                if count > 0:
+                    warnings.append(
+                        f"Buzzword flag in {md_file.relative_to(workspace)}: '{phrase}' x{count}"
+                    )
+    return warnings
+
+
+def _workspace(tmp_path: Path, extra_assets: int = 0) -> Path:
+    workspace = tmp_path / "ws"
+    for rel in REQUIRED_FILES:
+        path = workspace / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(f"# {rel}\nConteúdo sem marcadores.\n", encoding="utf-8")
+    (workspace / "research/market-landscape.md").write_text(
+        "Mercado em alta. Fonte: IBGE 2025\n", encoding="utf-8"
+    )
+    (workspace / "research/pricing-packaging.md").write_text(
+        "Ver [source] https://example.com\n", encoding="utf-8"
+    )
+    (workspace / "assets/landing-page-copy.md").write_text(
+        "A Revolutionary, cutting-edge CRM. Revolutionary synergy!\n"
+        "No cenário atual, POTENCIALIZE suas vendas com sinergia.\n",
+        encoding="utf-8",
+    )
+    (workspace / "strategy/chosen-angle.md").write_text(
+        "Ângulo: " + "prova social com dados reais e sinergia. " * 10, encoding="utf-8"
+    )
+    for index in range(extra_assets):
+        (workspace / f"assets/variant-{index}.md").write_text(
+            f"Variant {index}: delve into game-changing ideas x{index}.\n", encoding="utf-8"
+        )
+    return workspace
+
+
+def test_buzzword_scan_matches_per_phrase_counts(tmp_path: Path) -> None:
+    workspace = _workspace(tmp_path, extra_assets=3)
+    result = GateResult()
+
+    check_buzzwords(workspace, result)
+
+    assert result.warnings == _reference_buzzwords(workspace)
+    assert "Buzzword flag in assets/landing-page-copy.md: 'revolutionary' x2" in result.warnings
+
+
+def test_run_quality_gates_reports_same_messages_as_individual_checks(tmp_path: Path) -> None:
+    workspace = _workspace(tmp_path)
+    (workspace / "review/rejection-notes.md").unlink()
+    (workspace / "strategy/chosen-angle.md").write_text("curto", encoding="utf-8")
+
+    expected = GateResult()
+    quality_check.check_required_files(workspace, expected)
+    check_research_sources(workspace, expected)
+    check_buzzwords(workspace, expected)
+    check_chosen_angle(workspace, expected)
+
+    result = run_quality_gates(workspace, workers=1)
+
+    assert result.errors == expected.errors == ["Missing required file: review/rejection-notes.md"]
+    assert result.warnings == expected.warnings
+    assert "No explicit source marker found in: research/competitor-gaps.md" in result.warnings
+    assert not any("market-landscape" in item for item in result.warnings)
+    assert result.warnings[-1] == "strategy/chosen-angle.md looks too short (<200 chars)"
+
+
+def test_process_pool_fan_out_matches_inline_scan(tmp_path: Path, monkeypatch) -> None:
+    workspace = _workspace(tmp_path, extra_assets=40)
+    inline = run_quality_gates(workspace, workers=1)
+
+    monkeypatch.setattr(quality_check, "PARALLEL_MIN_FILES", 8)
+    pooled = run_quality_gates(workspace, workers=2)
+
+    assert pooled.warnings == inline.warnings
+    assert pooled.errors == inline.errors
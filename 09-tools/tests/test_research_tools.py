@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import research_tools
+from research_tools import CompetitorFetcher, MarketResearch, _StdlibExtractor
+
+
+PAGE = """<!doctype html>
+<html><head>
+<title>Acme CRM | Clínicas</title>
+<meta name="description" content="CRM para clínicas a partir de R$ 99,90">
+</head><body>
+<h1>Agenda <b>cheia</b></h1>
+<h2>Planos</h2><p>Básico R$ 99,90 · Pro R$ 199,90</p>
+<h2>Depoimentos</h2>
+{filler}
+</body></html>
+"""
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Aceita as rajadas de conexões dos testes de concorrência.
+    request_queue_size = 128
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.hits: dict[str, int] = {}
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _FixtureServer
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        path, _, query = self.path.partition("?")
+        with self.server.lock:
+            self.server.hits[path] = self.server.hits.get(path, 0) + 1
+        if "delay" in query:
+            time.sleep(float(query.split("delay=")[1]))
+        etag = f'"{path}-v1"'
+        if path.startswith("/etag") and self.headers.get("If-None-Match") == etag:
+            with self.server.lock:
+                self.server.not_modified += 1
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        filler = "<p>lorem ipsum</p>" * (20_000 if path.startswith("/big") else 1)
+        body = PAGE.format(filler=filler).encode("utf-8")
+        self.send_response(200)
+        charset = "bogus-charset" if path.startswith("/bogus") else "utf-8"
+        self.send_header("Content-Type", f"text/html; charset={charset}")
+        self.send_header("Content-Length", str(len(body)))
+        if path.startswith("/etag"):
+            self.send_header("ETag", etag)
+        self.end_headers()
+        try:
+            for offset in range(0, len(body), 16_384):
+                self.wfile.write(body[offset : offset + 16_384])
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped reading early
+
+
+@pytest.fixture
+def server():
+    srv = _FixtureServer()
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _fetcher(tmp_path, **kwargs) -> CompetitorFetcher:
+    options = {
+        "cache_dir": tmp_path / "cache",
+        "per_host_concurrency": 64,
+        "per_host_interval": 0.0,
+        "max_concurrency": 64,
+    }
+    options.update(kwargs)
+    return CompetitorFetcher(**options)
+
+
+def test_scrape_extracts_head_headings_and_prices(server, tmp_path) -> None:
+    research = MarketResearch(fetcher=_fetcher(tmp_path))
+
+    analysis = research.analyze_competitor(_url(server, "/page"))
+
+    assert analysis["title"] == "Acme CRM | Clínicas"
+    assert analysis["description"].startswith("CRM para clínicas")
+    assert analysis["main_headlines"] == ["Agenda cheia"]
+    assert analysis["sub_headlines"] == ["Planos", "Depoimentos"]
+    assert "R$ 199,90" in analysis["prices"]
+    assert analysis["positioning"]["tagline"] == "Acme CRM"
+
+
+def test_stdlib_extractor_matches_lxml_path(server, tmp_path, monkeypatch) -> None:
+    expected = _fetcher(tmp_path).fetch_many([_url(server, "/page")])[0]
+    monkeypatch.setattr(research_tools, "lxml_etree", None)
+    assert isinstance(research_tools._make_extractor(5, 5), _StdlibExtractor)
+
+    assert _fetcher(tmp_path, cache_dir=None).fetch_many([_url(server, "/page")])[0] == expected
+
+
+def test_streaming_stops_once_headings_are_collected(server, tmp_path) -> None:
+    fetcher = _fetcher(tmp_path, max_h1=1, max_h2=2)
+
+    data = fetcher.fetch_many([_url(server, "/big")])[0]
+
+    assert data["h2_tags"] == ["Planos", "Depoimentos"]
+    full_size = len(PAGE.format(filler="<p>lorem ipsum</p>" * 20_000).encode("utf-8"))
+    assert fetcher.stats["bytes_read"] < full_size // 4
+
+
+def test_etag_revalidation_reuses_persistent_cache(server, tmp_path) -> None:
+    url = _url(server, "/etag-page")
+    first = _fetcher(tmp_path).fetch_many([url])[0]
+
+    # A new fetcher (new process) reads the same cache directory.
+    fetcher = _fetcher(tmp_path)
+    second = fetcher.fetch_many([url])[0]
+
+    assert second == first
+    assert server.not_modified == 1
+    assert fetcher.stats == {"fetched": 0, "revalidated": 1, "errors": 0, "bytes_read": 0}
+
+
+def test_fifty_competitors_fetch_concurrently(server, tmp_path) -> None:
+    urls = [_url(server, f"/competitor-{index}?delay=0.2") for index in range(50)]
+    research = MarketResearch(fetcher=_fetcher(tmp_path, cache_dir=None))
+
+    started = time.perf_counter()
+    report = research.analyze_competitors(urls + urls[:5])
+    elapsed = time.perf_counter() - started
+
+    # Serially this is >= 10 s of server latency alone (plus the old 1 s sleeps).
+    assert elapsed < 3.0
+    assert len(report) == 55
+    assert all(item["title"] == "Acme CRM | Clínicas" for item in report)
+    assert sum(server.hits.values()) == 50
+
+
+def test_per_host_interval_spaces_requests(server, tmp_path) -> None:
+    urls = [_url(server, f"/spaced-{index}") for index in range(4)]
+    fetcher = _fetcher(tmp_path, cache_dir=None, per_host_interval=0.1)
+
+    started = time.perf_counter()
+    fetcher.fetch_many(urls)
+
+    assert time.perf_counter() - started >= 0.3
+
+
+def test_connection_errors_are_reported_per_url(server, tmp_path) -> None:
+    fetcher = _fetcher(tmp_path, cache_dir=None, timeout=2.0)
+
+    results = fetcher.fetch_many(["http://127.0.0.1:9/unreachable", _url(server, "/page")])
+
+    assert "error" in results[0]
+    assert results[1]["title"] == "Acme CRM | Clínicas"
+    assert fetcher.stats["errors"] == 1
+
+
+def test_bad_url_or_unknown_charset_does_not_abort_the_batch(server, tmp_path) -> None:
+    fetcher = _fetcher(tmp_path, cache_dir=None)
+
+    results = fetcher.fetch_many(["http://[bad/", _url(server, "/bogus"), _url(server, "/page")])
+
+    assert "error" in results[0]
+    assert results[1]["title"] == "Acme CRM | Clínicas"
+    assert results[2]["title"] == "Acme CRM | Clínicas"
+    assert fetcher.stats["errors"] == 1
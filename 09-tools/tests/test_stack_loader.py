@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from stack_loader import load_stack
+import os
+from pathlib import Path
+
+import pytest
+
+from stack_loader import CompiledFileRegistry, compile_stack, load_compiled_stack, load_stack
 
 
 def test_foundation_stack_has_manual_gates_after_research() -> None:
@@ -12,3 +17,76 @@ def test_foundation_stack_has_manual_gates_after_research() -> None:
     assert gates["positioning"] is True
     assert gates["keywords"] is True
 
+
+
+STACK_YAML = """
+name: tiny-stack
+sequence:
+  - id: research
+    approval_required: false
+  - id: review
+    approval_required: true
+"""
+
+
+def _write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_compiled_stack_indexes_stages() -> None:
+    stack = load_compiled_stack("06-stacks/foundation-stack/stack.yaml")
+
+    assert stack.auto_start_stage == "research"
+    assert stack.next_stage_id("research") == "brand-voice"
+    assert stack.next_stage_id("keywords") is None
+    assert stack.stage("positioning").position == 2
+    assert stack is load_compiled_stack("06-stacks/foundation-stack/stack.yaml")
+
+
+def test_load_stack_returns_private_copies() -> None:
+    first = load_stack("06-stacks/foundation-stack/stack.yaml")
+    first["sequence"].clear()
+
+    assert len(load_stack("06-stacks/foundation-stack/stack.yaml")["sequence"]) == 4
+
+
+def test_registry_recompiles_only_when_content_changes(tmp_path: Path) -> None:
+    registry = CompiledFileRegistry(compile_stack)
+    path = tmp_path / "stack.yaml"
+    _write(path, STACK_YAML, 1_000_000_000)
+
+    first = registry.get(path)
+    assert registry.get(path) is first
+
+    # Touched, same bytes: the stamp moves but nothing is reparsed.
+    _write(path, STACK_YAML, 2_000_000_000)
+    assert registry.get(path) is first
+    assert registry.compilations == 1
+
+    _write(path, STACK_YAML.replace("tiny-stack", "renamed"), 3_000_000_000)
+    assert registry.get(path).name == "renamed"
+    assert registry.compilations == 2
+
+
+def test_poll_keeps_last_good_version_on_invalid_edit(tmp_path: Path) -> None:
+    registry = CompiledFileRegistry(compile_stack)
+    path = tmp_path / "stack.yaml"
+    _write(path, STACK_YAML, 1_000_000_000)
+    good = registry.get(path)
+
+    _write(path, "sequence: []\n", 2_000_000_000)
+    assert registry.poll() == []
+    _write(path, STACK_YAML.replace("review", "publish"), 3_000_000_000)
+    assert registry.poll() == [path.resolve()]
+
+    assert good.stage_ids == ["research", "review"]
+    assert registry.get(path).stage_ids == ["research", "publish"]
+
+
+def test_invalid_stack_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / "stack.yaml"
+    path.write_text(STACK_YAML.replace("review", "research"), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="duplicated stack stage id"):
+        load_compiled_stack(path)
@@ -6,8 +6,12 @@ Coverage:
 - Priority scorer  
 - Batching engine
 - Batch guards
+- Indexed priority queue
 """
 
+import random
+import time
+
 import pytest
 from datetime import datetime, timedelta, timezone
 
@@ -19,6 +23,7 @@ from vm_webapp.approval_optimizer import (
     BatchingEngine,
     BatchGuard,
     BatchSizeLimits,
+    IndexedPriorityQueue,
 )
 
 
@@ -466,3 +471,130 @@ class TestMetrics:
         # Verify types
         assert isinstance(snapshot["batches_created_total"], int)
         assert isinstance(snapshot["human_minutes_saved"], (int, float))
+
+
+class TestIndexedPriorityQueue:
+    """Test heap-backed approval queue"""
+
+    def _request(self, i, **overrides):
+        rng = random.Random(i)
+        data = {
+            "request_id": f"req-{i}",
+            "run_id": "run-001",
+            "node_id": f"node-{i}",
+            "node_type": rng.choice(["email_send", "publish", "deploy"]),
+            "risk_level": rng.choice(["low", "medium", "high", "critical"]),
+            "brand_id": f"brand-{i % 3}",
+            "impact_score": rng.choice([0.1, 0.5, 0.9]),
+            "created_at": f"2026-01-01T00:00:{i % 60:02d}+00:00",
+        }
+        data.update(overrides)
+        return data
+
+    def test_queue_matches_full_sort_ordering(self):
+        """Heap order should match PriorityScorer.order_queue"""
+        optimizer = ApprovalOptimizer()
+        added = [optimizer.add_request(self._request(i)) for i in range(300)]
+
+        expected = [r["request_id"] for r in PriorityScorer().order_queue(added)]
+
+        assert [r["request_id"] for r in optimizer.get_queue()] == expected
+        assert [r["request_id"] for r in optimizer.get_queue(limit=25)] == expected[:25]
+
+    def test_pop_top_k_removes_highest_priority(self):
+        optimizer = ApprovalOptimizer()
+        for i in range(50):
+            optimizer.add_request(self._request(i))
+        expected = [r["request_id"] for r in optimizer.get_queue()]
+
+        popped = optimizer.pop_top_k(10)
+
+        assert [r["request_id"] for r in popped] == expected[:10]
+        assert [r["request_id"] for r in optimizer.get_queue()] == expected[10:]
+
+    def test_update_rescores_only_on_risk_inputs(self, monkeypatch):
+        optimizer = ApprovalOptimizer()
+        optimizer.add_request(self._request(1, risk_level="low", impact_score=0.1))
+        optimizer.add_request(self._request(2, risk_level="medium", impact_score=0.5))
+
+        calls = []
+        original = optimizer._priority_scorer.calculate_priority
+        monkeypatch.setattr(
+            optimizer._priority_scorer,
+            "calculate_priority",
+            lambda request: calls.append(request) or original(request),
+        )
+
+        optimizer.update_request("req-1", node_id="node-renamed")
+        assert calls == []
+
+        updated = optimizer.update_request("req-1", risk_level="critical", impact_score=1.0)
+        assert len(calls) == 1
+        assert optimizer.get_queue()[0]["request_id"] == "req-1"
+        assert updated["node_id"] == "node-renamed"
+
+    def test_completed_requests_are_evicted(self):
+        optimizer = ApprovalOptimizer()
+        for i in range(3):
+            optimizer.add_request(self._request(i))
+
+        assert optimizer.complete_request("req-1")
+        assert optimizer.update_request("req-2", status="approved")["status"] == "approved"
+        assert not optimizer.complete_request("req-1")
+        assert [r["request_id"] for r in optimizer.get_queue()] == ["req-0"]
+        assert optimizer.get_stats()["queue_length"] == 1
+
+    def test_heap_invariant_survives_random_operations(self):
+        rng = random.Random(7)
+        queue = IndexedPriorityQueue()
+        reference = {}
+        for step in range(2000):
+            item_id = f"i{rng.randrange(200)}"
+            if rng.random() < 0.3:
+                queue.remove(item_id)
+                reference.pop(item_id, None)
+            else:
+                key = (rng.random(), step)
+                queue.push(item_id, key, {"id": item_id})
+                reference[item_id] = key
+
+        expected = [item_id for item_id, _ in sorted(reference.items(), key=lambda kv: kv[1])]
+        assert [item["id"] for item in queue.top_k(None)] == expected
+        assert [item["id"] for item in queue.top_k(10)] == expected[:10]
+        odd = [item_id for item_id in expected if int(item_id[1:]) % 2]
+        assert [
+            item["id"] for item in queue.top_k(5, where=lambda item: int(item["id"][1:]) % 2 == 1)
+        ] == odd[:5]
+        assert len(queue) == len(reference)
+
+    def test_create_batch_reads_brand_candidates_from_heap(self, monkeypatch):
+        optimizer = ApprovalOptimizer()
+        for i in range(60):
+            optimizer.add_request(self._request(i, risk_level="low", node_type="email_send"))
+        expected = [
+            r["request_id"] for r in optimizer.get_queue(limit=60) if r["brand_id"] == "brand-1"
+        ]
+        seen = []
+        monkeypatch.setattr(
+            optimizer._batching_engine,
+            "create_batch",
+            lambda candidates: seen.append(candidates) or {"batch_id": "b1"},
+        )
+        monkeypatch.setattr(optimizer, "get_queue", None)  # must not copy the whole queue
+
+        assert optimizer.create_batch(brand_id="brand-1", max_size=4) == {"batch_id": "b1"}
+        assert [r["request_id"] for r in seen[0]] == expected[:4]
+
+    def test_top_k_read_stays_fast_at_100k(self):
+        optimizer = ApprovalOptimizer()
+        for i in range(100_000):
+            optimizer.add_request(self._request(i % 500, request_id=f"bulk-{i}"))
+
+        started = time.perf_counter()
+        for _ in range(100):
+            top = optimizer.get_queue(limit=50)
+        elapsed = time.perf_counter() - started
+
+        assert len(top) == 50
+        assert elapsed < 1.0
+
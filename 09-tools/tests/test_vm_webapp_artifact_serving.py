@@ -0,0 +1,172 @@
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from vm_webapp.app import create_app
+from vm_webapp.artifacts import write_stage_outputs
+from vm_webapp.db import session_scope
+from vm_webapp.repo import create_run
+from vm_webapp.settings import Settings
+
+
+def _build_client(tmp_path: Path, **overrides) -> TestClient:
+    app = create_app(
+        settings=Settings(
+            vm_workspace_root=tmp_path / "runtime" / "vm",
+            vm_db_path=tmp_path / "runtime" / "vm" / "workspace.sqlite3",
+            **overrides,
+        ),
+        enable_in_process_worker=False,
+    )
+    return TestClient(app)
+
+
+def _seed_artifact(client: TestClient, body: str) -> dict:
+    stage_dir = client.app.state.workspace.root / "runs" / "run-1" / "stages" / "01-research"
+    return write_stage_outputs(
+        stage_dir=stage_dir,
+        run_id="run-1",
+        thread_id="t1",
+        stage_key="research",
+        stage_position=1,
+        attempt=1,
+        input_payload={},
+        output_payload={"summary": "Done"},
+        artifacts={"research.md": body},
+        event_id="evt-1",
+        status="completed",
+        blob_store=client.app.state.blob_store,
+    )
+
+
+PARAMS = {"stage_dir": "01-research", "artifact_path": "artifacts/research.md"}
+
+
+def test_artifact_content_sets_strong_etag_and_honors_if_none_match(tmp_path: Path) -> None:
+    client = _build_client(tmp_path)
+    manifest = _seed_artifact(client, "# Report")
+    etag = f'"{manifest["artifacts"][0]["sha256"]}"'
+
+    first = client.get("/api/v2/workflow-runs/run-1/artifact-content", params=PARAMS)
+    assert first.status_code == 200
+    assert first.headers["etag"] == etag
+    assert first.json()["content"] == "# Report"
+
+    cached = client.get(
+        "/api/v2/workflow-runs/run-1/artifact-content",
+        params=PARAMS,
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_artifact_content_streams_body_in_chunks(tmp_path: Path, monkeypatch) -> None:
+    import sys
+
+    # vm_webapp.api is a package that loads api.py under this name.
+    monkeypatch.setattr(sys.modules["_api_module"], "ARTIFACT_STREAM_CHUNK", 7)
+    client = _build_client(tmp_path)
+    body = '# Relatório "final"\n\tcafé ☕ \\ ' * 20
+    _seed_artifact(client, body)
+
+    response = client.get("/api/v2/workflow-runs/run-1/artifact-content", params=PARAMS)
+
+    assert response.status_code == 200
+    assert "content-length" not in response.headers
+    assert response.json() == {
+        "run_id": "run-1",
+        "stage_dir": "01-research",
+        "artifact_path": "artifacts/research.md",
+        "content": body,
+    }
+
+
+def test_artifact_raw_serves_file_with_range_support(tmp_path: Path) -> None:
+    client = _build_client(tmp_path)
+    body = "0123456789" * 100
+    manifest = _seed_artifact(client, body)
+
+    full = client.get("/api/v2/workflow-runs/run-1/artifact-raw", params=PARAMS)
+    assert full.status_code == 200
+    assert full.text == body
+    assert full.headers["etag"] == f'"{manifest["artifacts"][0]["sha256"]}"'
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-type"].startswith("text/markdown")
+
+    partial = client.get(
+        "/api/v2/workflow-runs/run-1/artifact-raw",
+        params=PARAMS,
+        headers={"Range": "bytes=10-19"},
+    )
+    assert partial.status_code == 206
+    assert partial.text == "0123456789"
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(body)}"
+
+
+def test_artifact_raw_returns_304_without_reading_body(tmp_path: Path) -> None:
+    client = _build_client(tmp_path)
+    manifest = _seed_artifact(client, "# Report")
+    stage_dir = client.app.state.workspace.root / "runs" / "run-1" / "stages" / "01-research"
+    (stage_dir / "artifacts" / "research.md").unlink()
+
+    response = client.get(
+        "/api/v2/workflow-runs/run-1/artifact-raw",
+        params=PARAMS,
+        headers={"If-None-Match": f'"{manifest["artifacts"][0]["sha256"]}"'},
+    )
+
+    assert response.status_code == 304
+
+
+def test_artifact_raw_serves_cas_blobs(tmp_path: Path) -> None:
+    client = _build_client(tmp_path, vm_artifact_cas_enabled=True)
+    _seed_artifact(client, "# From CAS")
+
+    response = client.get(
+        "/api/v2/workflow-runs/run-1/artifact-raw",
+        params={**PARAMS},
+        headers={"Range": "bytes=2-5"},
+    )
+
+    assert response.status_code == 206
+    assert response.text == "From"
+
+
+def test_artifact_raw_rejects_path_traversal(tmp_path: Path) -> None:
+    client = _build_client(tmp_path)
+    _seed_artifact(client, "# Report")
+
+    response = client.get(
+        "/api/v2/workflow-runs/run-1/artifact-raw",
+        params={"stage_dir": "01-research", "artifact_path": "../../../../secret.txt"},
+    )
+
+    assert response.status_code == 400
+
+
+def test_cas_artifacts_stay_listed_and_readable_after_cas_is_disabled(tmp_path: Path) -> None:
+    _seed_artifact(_build_client(tmp_path, vm_artifact_cas_enabled=True), "# From CAS")
+    client = _build_client(tmp_path)
+    with session_scope(client.app.state.engine) as session:
+        create_run(
+            session,
+            run_id="run-1",
+            brand_id="b1",
+            product_id="p1",
+            thread_id="t1",
+            stack_path="stack",
+            user_request="plan",
+        )
+
+    listed = client.get("/api/v2/workflow/runs/run-1/artifacts").json()["artifacts"]
+    content = client.get("/api/v2/workflow-runs/run-1/artifact-content", params=PARAMS)
+
+    assert {
+        "stage": "01-research",
+        "name": "research.md",
+        "path": "01-research/artifacts/research.md",
+    } in listed
+    assert "manifest.json" in {item["name"] for item in listed}
+    assert content.status_code == 200
+    assert content.json()["content"] == "# From CAS"
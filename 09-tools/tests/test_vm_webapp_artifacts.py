@@ -1,6 +1,10 @@
 from pathlib import Path
 
-from vm_webapp.artifacts import write_stage_outputs
+from vm_webapp.artifacts import (
+    build_stage_output_executor,
+    write_stage_outputs,
+    write_stage_outputs_offloaded,
+)
 
 
 def test_write_stage_outputs_creates_manifest_with_hashes(tmp_path: Path) -> None:
@@ -48,3 +52,34 @@ def test_write_stage_outputs_uses_atomic_writes(tmp_path: Path) -> None:
 
     leftovers = list(stage_dir.rglob("*.tmp"))
     assert leftovers == []
+
+
+def test_offloaded_stage_outputs_match_inline_manifest(tmp_path: Path) -> None:
+    kwargs = dict(
+        run_id="run-3",
+        thread_id="t3",
+        stage_key="research",
+        stage_position=1,
+        attempt=1,
+        input_payload={"request_text": "Research"},
+        output_payload={"summary": "Done"},
+        artifacts={"research.md": "# Research\n\n" + "insight\n" * 2000},
+        event_id="evt-3",
+        status="completed",
+    )
+    inline = write_stage_outputs_offloaded(None, stage_dir=tmp_path / "inline", **kwargs)
+
+    executor = build_stage_output_executor(1)
+    try:
+        offloaded = write_stage_outputs_offloaded(
+            executor, stage_dir=tmp_path / "offloaded", **kwargs
+        )
+    finally:
+        executor.shutdown()
+
+    assert offloaded == inline
+    assert (tmp_path / "offloaded" / "artifacts" / "research.md").exists()
+
+
+def test_build_stage_output_executor_disabled_by_default() -> None:
+    assert build_stage_output_executor(0) is None
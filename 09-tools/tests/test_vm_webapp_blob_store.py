@@ -0,0 +1,122 @@
+from pathlib import Path
+
+import pytest
+
+from vm_webapp.artifacts import read_artifact_bytes, write_stage_outputs
+from vm_webapp.blob_store import BlobStore, zstandard
+
+
+def _write(stage_dir: Path, blob_store: BlobStore, artifacts: dict[str, str], attempt: int = 1):
+    return write_stage_outputs(
+        stage_dir=stage_dir,
+        run_id="run-1",
+        thread_id="t1",
+        stage_key="research",
+        stage_position=1,
+        attempt=attempt,
+        input_payload={"request_text": "Research"},
+        output_payload={"summary": "Done"},
+        artifacts=artifacts,
+        event_id=f"evt-{attempt}",
+        status="completed",
+        blob_store=blob_store,
+    )
+
+
+def test_put_deduplicates_identical_content(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "cas")
+
+    first = store.put(b"same body")
+    second = store.put(b"same body")
+
+    assert first.sha256 == second.sha256
+    assert first.created is True
+    assert second.created is False
+    assert store.refcount(first.sha256) == 2
+    assert store.read_bytes(first.sha256) == b"same body"
+    assert len(list((tmp_path / "cas" / "objects").rglob("*"))) == 2  # fan-out dir + blob
+
+
+def test_gc_removes_only_unreferenced_blobs(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "cas")
+    kept = store.put(b"kept")
+    dropped = store.put(b"dropped")
+
+    store.release(dropped.sha256)
+    result = store.gc()
+
+    assert result == {"blobs_removed": 1, "bytes_reclaimed": len(b"dropped")}
+    assert store.exists(kept.sha256)
+    assert not store.exists(dropped.sha256)
+
+
+def test_stage_outputs_reference_blobs_instead_of_copies(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "cas")
+    body = "# Research\n\n" + "insight\n" * 1000
+
+    manifest_a = _write(tmp_path / "runs" / "a" / "01-research", store, {"research.md": body})
+    manifest_b = _write(tmp_path / "runs" / "b" / "01-research", store, {"research.md": body})
+
+    item = manifest_a["artifacts"][0]
+    assert item["blob"]["sha256"] == item["sha256"] == manifest_b["artifacts"][0]["sha256"]
+    assert not (tmp_path / "runs" / "a" / "01-research" / "artifacts" / "research.md").exists()
+    assert store.stats()["blobs"] == 1
+    assert store.stats()["references"] == 2
+    assert read_artifact_bytes(tmp_path / "runs" / "a" / "01-research", item, blob_store=store) == body.encode()
+
+
+def test_rerun_releases_blobs_of_replaced_manifest(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "cas")
+    stage_dir = tmp_path / "runs" / "a" / "01-research"
+
+    first = _write(stage_dir, store, {"research.md": "attempt one"}, attempt=1)
+    _write(stage_dir, store, {"research.md": "attempt two"}, attempt=2)
+
+    assert store.refcount(first["artifacts"][0]["sha256"]) == 0
+    assert store.gc()["blobs_removed"] == 1
+    assert store.stats()["blobs"] == 1
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard not installed")
+def test_zstd_blobs_round_trip(tmp_path: Path) -> None:
+    store = BlobStore(tmp_path / "cas", compression="zstd")
+    body = b"repetitive " * 5000
+
+    ref = store.put(body)
+
+    assert ref.stored_size < ref.size
+    assert store.read_bytes(ref.sha256) == body
+
+
+def test_zstd_requires_optional_dependency(tmp_path: Path, monkeypatch) -> None:
+    import vm_webapp.blob_store as blob_store_module
+
+    monkeypatch.setattr(blob_store_module, "zstandard", None)
+    with pytest.raises(RuntimeError):
+        BlobStore(tmp_path / "cas", compression="zstd")
+
+
+def test_artifact_content_endpoint_reads_from_cas(tmp_path: Path) -> None:
+    from fastapi.testclient import TestClient
+
+    from vm_webapp.app import create_app
+    from vm_webapp.settings import Settings
+
+    app = create_app(
+        settings=Settings(
+            vm_workspace_root=tmp_path / "runtime" / "vm",
+            vm_db_path=tmp_path / "runtime" / "vm" / "workspace.sqlite3",
+            vm_artifact_cas_enabled=True,
+        ),
+        enable_in_process_worker=False,
+    )
+    stage_dir = app.state.workspace.root / "runs" / "run-1" / "stages" / "01-research"
+    _write(stage_dir, app.state.blob_store, {"research.md": "# From CAS"})
+
+    response = TestClient(app).get(
+        "/api/v2/workflow-runs/run-1/artifact-content",
+        params={"stage_dir": "01-research", "artifact_path": "artifacts/research.md"},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["content"] == "# From CAS"
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from vm_webapp.stacking import ContextBudget, estimate_tokens, pack_context
+
+SOUL = "# Soul\nAcme: evidence-led."
+ESSENCE = "# Essence\nWidget: simple."
+
+
+def _chunk(title: str, words: int, seed: str, score: float = 0.0) -> dict:
+    text = " ".join(f"{seed}{index}" for index in range(words))
+    return {"title": title, "text": text, "score": score}
+
+
+def _pack(chunks: list[dict], request: str = "Create landing copy.", **budget) -> object:
+    return pack_context(
+        brand_soul_md=SOUL,
+        product_essence_md=ESSENCE,
+        retrieved=chunks,
+        stage_contract="Write output in Markdown.",
+        user_request=request,
+        budget=ContextBudget(**budget) if budget else None,
+    )
+
+
+def test_stable_sections_come_first_and_prefix_hash_ignores_variable_parts() -> None:
+    first = _pack([_chunk("a", 20, "alpha")], request="Create landing copy.")
+    second = _pack([_chunk("b", 400, "beta")], request="Write an email sequence.")
+
+    assert first.text.startswith(first.prefix)
+    assert first.text.index("# Stage Contract") < first.text.index("# Retrieved Context")
+    assert first.text.rstrip().endswith("Create landing copy.")
+    assert first.prefix_hash == second.prefix_hash
+    assert first.text != second.text
+
+
+def test_overlapping_chunks_are_deduplicated() -> None:
+    base = _chunk("doc#1", 60, "w")
+    overlapping = {"title": "doc#2", "text": " ".join(base["text"].split()[5:] + ["tail"])}
+    distinct = _chunk("other", 30, "x")
+
+    pack = _pack([base, overlapping, distinct, {"title": "empty", "text": "  "}])
+
+    assert pack.dropped_chunks == ["doc#2", "empty"]
+    assert "### doc#1" in pack.text
+    assert "### other" in pack.text
+
+
+def test_retrieved_chunks_are_packed_by_priority_within_budget() -> None:
+    chunks = [
+        _chunk("low", 200, "l", score=0.1),
+        _chunk("high", 200, "h", score=0.9),
+        _chunk("mid", 200, "m", score=0.5),
+    ]
+
+    pack = _pack(chunks, retrieved=500)
+
+    assert pack.text.index("### high") < pack.text.index("### mid")
+    assert "### low" not in pack.text
+    assert pack.dropped_chunks == ["low"]
+    assert pack.section_tokens["retrieved"] <= 500
+    assert "retrieved" in pack.truncated_sections
+
+
+def test_total_budget_shrinks_stable_sections_in_priority_order() -> None:
+    soul = "soul line\n" * 800
+    essence = "essence line\n" * 400
+
+    pack = pack_context(
+        brand_soul_md=soul,
+        product_essence_md=essence,
+        retrieved=[_chunk("a", 200, "a")],
+        stage_contract="Write output in Markdown.",
+        user_request="Create landing copy.",
+        budget=ContextBudget(total=1500, user_request=200),
+    )
+
+    # Essence gives way completely before the soul is cut below its own budget.
+    assert pack.truncated_sections[:2] == ["brand_soul", "product_essence"]
+    assert pack.section_tokens["product_essence"] <= 5
+    assert 1000 < pack.section_tokens["brand_soul"] < 1500
+    assert "Write output in Markdown." in pack.text
+    assert estimate_tokens(pack.text) <= 1500 + 50  # section headers are not budgeted
+
+
+def test_long_user_request_is_kept_whole_and_retrieved_gives_way() -> None:
+    request = " ".join(f"req{index}" for index in range(1900))
+    chunks = [_chunk("a", 300, "a", score=0.9), _chunk("b", 300, "b", score=0.5)]
+
+    short = _pack(chunks, total=4000, user_request=200)
+    long = _pack(chunks, request=request, total=4000, user_request=200)
+
+    assert long.text.rstrip().endswith(request)
+    assert "user_request" not in long.truncated_sections
+    assert long.prefix_hash == short.prefix_hash
+    assert long.section_tokens["retrieved"] < short.section_tokens["retrieved"]
+    assert "retrieved" in long.truncated_sections
@@ -39,3 +39,112 @@ def test_context_resolver_applies_allowed_overrides_only(session: Session) -> No
     # Resolve brand -> campaign -> task (should fail)
     with pytest.raises(ContextPolicyError, match="brand_name"):
         resolve_hierarchical_context(session, brand_id="b1", campaign_id="c1", task_id="t1")
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    from vm_webapp import context_resolver
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'ctx.sqlite3'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    context_resolver.clear_context_cache()
+
+
+def _seed(engine) -> None:
+    with Session(engine) as session:
+        append_context_version(session, scope="brand", scope_id="b1", payload={
+            "tone": "formal", "brand_name": "Acme", "channels": ["email"],
+        })
+        append_context_version(session, scope="campaign", scope_id="c1", payload={"objective": "launch"})
+        session.commit()
+
+
+def test_repeat_resolution_is_served_without_queries(file_engine) -> None:
+    from sqlalchemy import event
+
+    _seed(file_engine)
+    with Session(file_engine) as session:
+        first = resolve_hierarchical_context(session, brand_id="b1", campaign_id="c1")
+        statements = []
+        event.listen(file_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        second = resolve_hierarchical_context(session, brand_id="b1", campaign_id="c1")
+
+    assert statements == []
+    assert second == first == {
+        "tone": "formal", "brand_name": "Acme", "channels": ["email"], "objective": "launch",
+    }
+    # Callers get a private copy.
+    second["channels"].append("sms")
+    with Session(file_engine) as session:
+        assert resolve_hierarchical_context(session, brand_id="b1", campaign_id="c1")["channels"] == ["email"]
+
+
+def test_new_version_invalidates_cached_context(file_engine) -> None:
+    _seed(file_engine)
+    reader = Session(file_engine)
+    assert resolve_hierarchical_context(reader, brand_id="b1", campaign_id="c1")["objective"] == "launch"
+    reader.rollback()
+
+    with Session(file_engine) as writer:
+        append_context_version(writer, scope="campaign", scope_id="c1", payload={"objective": "retain"})
+        # Uncommitted writes are visible to the writer only.
+        assert resolve_hierarchical_context(writer, brand_id="b1", campaign_id="c1")["objective"] == "retain"
+        assert resolve_hierarchical_context(reader, brand_id="b1", campaign_id="c1")["objective"] == "launch"
+        reader.rollback()
+        writer.commit()
+
+    assert resolve_hierarchical_context(reader, brand_id="b1", campaign_id="c1")["objective"] == "retain"
+    reader.close()
+
+
+def test_out_of_process_write_is_seen_after_ttl(file_engine, monkeypatch) -> None:
+    from sqlalchemy import text
+    from vm_webapp import context_resolver
+
+    _seed(file_engine)
+    with Session(file_engine) as session:
+        assert resolve_hierarchical_context(session, brand_id="b1")["tone"] == "formal"
+
+    # Another process appends without touching this process' generation counter.
+    with file_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO context_versions (version_id, scope, scope_id, payload_json, created_at) "
+            "VALUES ('ctxv-remote', 'brand', 'b1', '{\"tone\": \"casual\"}', '2999-01-01T00:00:00+00:00')"
+        ))
+        conn.execute(text(
+            "UPDATE context_latest_versions SET version_id = 'ctxv-remote' "
+            "WHERE scope = 'brand' AND scope_id = 'b1'"
+        ))
+
+    monkeypatch.setattr(context_resolver, "CONTEXT_CACHE_TTL_SECONDS", 0.0)
+    with Session(file_engine) as session:
+        assert resolve_hierarchical_context(session, brand_id="b1") == {"tone": "casual"}
+
+
+def test_rows_without_pointer_fall_back_to_latest_row(file_engine) -> None:
+    from sqlalchemy import text
+
+    with file_engine.begin() as conn:
+        for version_id, created_at, tone in (("v1", "2024-01-01", "old"), ("v2", "2024-02-01", "new")):
+            conn.execute(text(
+                "INSERT INTO context_versions (version_id, scope, scope_id, payload_json, created_at) "
+                f"VALUES ('{version_id}', 'brand', 'legacy', '{{\"tone\": \"{tone}\"}}', '{created_at}')"
+            ))
+
+    with Session(file_engine) as session:
+        assert resolve_hierarchical_context(session, brand_id="legacy") == {"tone": "new"}
+        assert resolve_hierarchical_context(session, brand_id="missing") == {}
+
+
+def test_cache_is_bounded(file_engine, monkeypatch) -> None:
+    from vm_webapp import context_resolver
+
+    monkeypatch.setattr(context_resolver, "CONTEXT_CACHE_SIZE", 2)
+    _seed(file_engine)
+    with Session(file_engine) as session:
+        for campaign_id in ("c1", "c2", "c3", None):
+            resolve_hierarchical_context(session, brand_id="b1", campaign_id=campaign_id)
+        cache = context_resolver._caches[session.get_bind()]
+
+    assert list(cache._entries) == [("b1", "c3", None), ("b1", None, None)]
@@ -273,3 +273,80 @@ class TestRegressionSentinel:
         assert "version" in status
         assert "monitored_runs" in status
         assert "total_signals_generated" in status
+
+
+class TestStreamingBaselines:
+    """Ring buffer history with incremental per-window statistics."""
+
+    def test_rolling_stats_match_brute_force_over_sliding_window(self):
+        import random
+        import statistics
+
+        rng = random.Random(3)
+        sentinel = RegressionSentinel()
+        values = []
+        for _ in range(1000):
+            value = rng.gauss(60, 5)
+            values.append(value)
+            sentinel.add_metric_point("run-001", {"v1_score": value})
+
+            for window, points in (("short", 4), ("medium", 15), ("long", 60)):
+                tail = values[-points:]
+                stats = sentinel.get_baseline_stats("run-001", window)["v1_score"]
+                assert stats["count"] == len(tail)
+                assert stats["mean"] == pytest.approx(statistics.fmean(tail), rel=1e-9)
+                if len(tail) > 1:
+                    assert stats["std"] == pytest.approx(statistics.stdev(tail), rel=1e-6)
+
+    def test_history_is_bounded_and_memory_constant(self):
+        sentinel = RegressionSentinel(history_points=50)
+        for index in range(10):
+            sentinel.add_metric_point("run-001", {"v1_score": float(index)})
+        size_after_10 = sentinel.get_status()["history_bytes"]
+
+        for index in range(10, 500):
+            sentinel.add_metric_point("run-001", {"v1_score": float(index)})
+
+        history = sentinel.get_metric_history("run-001")
+        assert [point["v1_score"] for point in history] == [float(i) for i in range(450, 500)]
+        assert sentinel.get_status()["history_bytes"] == size_after_10
+
+    def test_window_selects_baseline_horizon(self, sentinel):
+        # 60 stable points, then 4 degraded ones: only the short window has
+        # absorbed the degradation.
+        for _ in range(56):
+            sentinel.add_metric_point("run-001", {"v1_score": 80.0})
+        for _ in range(4):
+            sentinel.add_metric_point("run-001", {"v1_score": 60.0})
+
+        current = {"v1_score": 60.0}
+        assert sentinel.detect_regression("run-001", current, window="short") == []
+
+        signals = sentinel.detect_regression("run-002", current, window="long")
+        assert signals == []  # unknown run has no baseline yet
+
+        long_signals = sentinel.detect_regression("run-001", current, window="long")
+        assert [s.metric_name for s in long_signals] == ["v1_score"]
+        assert long_signals[0].baseline == pytest.approx((55 * 80.0 + 5 * 60.0) / 60)
+
+    def test_ewma_and_missing_metrics(self, sentinel):
+        sentinel.add_metric_point("run-001", {"v1_score": 10.0})
+        sentinel.add_metric_point("run-001", {"approval_rate": 0.5})
+        sentinel.add_metric_point("run-001", {"v1_score": 20.0})
+
+        stats = sentinel.get_baseline_stats("run-001", "short")
+        assert stats["v1_score"]["count"] == 2
+        assert stats["v1_score"]["ewma"] == pytest.approx(0.2 * 20.0 + 0.8 * 10.0)
+        assert stats["approval_rate"]["count"] == 1
+        assert "incident_rate" not in stats
+        assert "approval_rate" not in sentinel.get_metric_history("run-001")[0]
+
+    def test_forget_run_releases_state(self, sentinel, sample_metrics):
+        sentinel.add_metric_point("run-001", sample_metrics)
+        sentinel.detect_regression("run-001", {**sample_metrics, "v1_score": 40.0})
+
+        sentinel.forget_run("run-001")
+
+        assert sentinel.get_metric_history("run-001") == []
+        assert sentinel.get_active_signals("run-001") == []
+        assert sentinel.get_status()["monitored_runs"] == 0
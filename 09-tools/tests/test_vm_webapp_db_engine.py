@@ -3,6 +3,9 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any
 
+import pytest
+from sqlalchemy import text
+
 import vm_webapp.db as db_module
 from vm_webapp.db import build_engine
 
@@ -37,3 +40,38 @@ def test_build_engine_accepts_sqlite_path_and_postgres_url(tmp_path: Path, monke
     assert captured["url"] == postgres_url
     assert captured["kwargs"]["pool_pre_ping"] is True
     assert "connect_args" not in captured["kwargs"]
+
+
+def test_init_db_only_runs_ddl_for_missing_tables(tmp_path: Path) -> None:
+    engine = build_engine(db_path=tmp_path / "workspace.sqlite3")
+    try:
+        with pytest.raises(db_module.SchemaNotReadyError, match="runs"):
+            db_module.init_db(engine, create_missing=False)
+
+        created = db_module.init_db(engine)
+        assert "runs" in created and "quality_scores" in created
+        assert db_module.pending_tables(engine) == []
+        assert db_module.init_db(engine) == []
+        assert db_module.init_db(engine, create_missing=False) == []
+    finally:
+        engine.dispose()
+
+
+def test_init_db_adds_indexes_missing_from_existing_tables(tmp_path: Path) -> None:
+    engine = build_engine(db_path=tmp_path / "workspace.sqlite3")
+    try:
+        db_module.init_db(engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_context_versions_scope_created"))
+            conn.execute(text("DROP INDEX ix_runs_status"))
+
+        diff = db_module.pending_schema(engine)
+        assert diff.tables == [] and diff.columns == []
+        assert diff.indexes == ["ix_context_versions_scope_created", "ix_runs_status"]
+        with pytest.raises(db_module.SchemaNotReadyError, match="ix_runs_status"):
+            db_module.init_db(engine, create_missing=False)
+
+        assert db_module.init_db(engine) == diff.indexes
+        assert not db_module.pending_schema(engine)
+    finally:
+        engine.dispose()
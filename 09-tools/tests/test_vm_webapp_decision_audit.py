@@ -17,6 +17,7 @@ from vm_webapp.decision_audit import (
     simulate_decision,
     get_decision_history,
     record_decision_execution,
+    record_decision_executions,
 )
 from vm_webapp.safety_gates import SafetyGateResult, RiskLevel, GateType
 
@@ -317,6 +318,24 @@ class TestDecisionAuditStore:
         assert len(results) == 2  # Today and yesterday
 
 
+    def test_queries_return_insertion_order_not_timestamp_order(self):
+        """In-memory queries return logs in the order they were stored."""
+        store = DecisionAuditStore()
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        for i in (2, 0, 1):
+            store.store(_audit_log(i, base + timedelta(days=i)))
+        store.store(_audit_log(2, base + timedelta(days=2)))  # regravar mantém a posição
+        
+        expected = ["audit_0002", "audit_0000", "audit_0001"]
+        assert [log.audit_id for log in store.query_by_segment("brand1:awareness")] == expected
+        assert [log.audit_id for log in store.query_by_brand("brand1")] == expected
+        assert [
+            log.audit_id for log in store.query_by_date_range(
+                base.isoformat(), (base + timedelta(days=3)).isoformat()
+            )
+        ] == expected
+
+
 class TestAuditPagination:
     """Test audit log pagination."""
     
@@ -675,3 +694,139 @@ class TestEdgeCases:
         
         assert len(results) == 0
         assert total == 5
+
+
+def _audit_log(index, base, segment_key="brand1:awareness", brand_id="brand1", actor="auto"):
+    return DecisionAuditLog(
+        audit_id=f"audit_{index:04d}",
+        segment_key=segment_key,
+        brand_id=brand_id,
+        input_metrics={"i": index},
+        suggested_decision="expand",
+        gates_applied=["sample_size"],
+        gate_results=[{"gate": "sample_size", "allowed": True}],
+        final_decision="expand" if index % 2 else "hold",
+        actor=actor,
+        # Pares de logs compartilham o mesmo timestamp para exercitar o desempate por audit_id
+        executed_at=(base + timedelta(seconds=index // 2)).isoformat(),
+    )
+
+
+@pytest.fixture(params=["memory", "sql"])
+def audit_store(request, tmp_path):
+    if request.param == "memory":
+        return DecisionAuditStore()
+    from vm_webapp.db import build_engine, init_db
+    engine = build_engine(tmp_path / "audit.sqlite3")
+    init_db(engine)
+    return DecisionAuditStore(engine)
+
+
+class TestKeysetPagination:
+    """Test cursor pagination and bulk inserts on both backends."""
+    
+    def test_cursor_pages_match_offset_pages(self, audit_store):
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        audit_store.store_many([
+            _audit_log(i, base, segment_key="s1" if i % 3 else "s2") for i in range(50)
+        ])
+        
+        expected, total = audit_store.query_paginated(
+            segment_key="s1", pagination=AuditPagination(page=1, page_size=100)
+        )
+        pages = []
+        cursor = None
+        while True:
+            page = audit_store.query_page(segment_key="s1", limit=7, cursor=cursor)
+            pages.append(page.logs)
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        
+        assert [log.audit_id for page in pages for log in page] == [log.audit_id for log in expected]
+        assert total == len(expected) == 33
+        assert all(len(page) == 7 for page in pages[:-1])
+        ordering = [(log.executed_at, log.audit_id) for log in expected]
+        assert ordering == sorted(ordering, reverse=True)
+    
+    def test_offset_page_and_filters(self, audit_store):
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        audit_store.store_many([
+            _audit_log(i, base, brand_id="b1" if i < 20 else "b2",
+                       actor="manual" if i % 5 == 0 else "auto")
+            for i in range(30)
+        ])
+        
+        page, total = audit_store.query_paginated(
+            brand_id="b1", pagination=AuditPagination(page=2, page_size=5)
+        )
+        assert total == 20
+        assert [log.audit_id for log in page] == [f"audit_{i:04d}" for i in range(14, 9, -1)]
+        
+        start = (base + timedelta(seconds=5)).isoformat()
+        end = (base + timedelta(seconds=9)).isoformat()
+        in_range = audit_store.query_by_date_range(start, end)
+        assert sorted(log.audit_id for log in in_range) == [f"audit_{i:04d}" for i in range(10, 20)]
+        
+        manual = audit_store.query(AuditQuery(brand_id="b1", actor="manual", start_date=start))
+        assert [log.audit_id for log in manual] == ["audit_0015", "audit_0010"]
+        assert manual[0].gate_results == [{"gate": "sample_size", "allowed": True}]
+    
+    def test_bulk_insert_then_duplicate_replaces(self, audit_store):
+        audit_ids = record_decision_executions([
+            {
+                "segment_key": "s1",
+                "brand_id": "b1",
+                "input_metrics": {"n": n},
+                "suggested_decision": "expand",
+                "final_decision": "expand",
+            }
+            for n in range(3)
+        ], store=audit_store)
+        
+        assert len(set(audit_ids)) == 3
+        assert sorted(log.input_metrics["n"] for log in audit_store.query_by_segment("s1")) == [0, 1, 2]
+        
+        replaced = audit_store.get(audit_ids[0])
+        replaced.final_decision = "rollback"
+        audit_store.store_many([replaced])
+        
+        assert audit_store.get(audit_ids[0]).final_decision == "rollback"
+        assert len(audit_store.query_by_segment("s1")) == 3
+    
+    def test_segment_and_brand_queries_keep_insertion_order(self, audit_store):
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        audit_store.store_many([_audit_log(i, base) for i in range(6)])
+        expected = [f"audit_{i:04d}" for i in range(6)]
+        
+        assert [log.audit_id for log in audit_store.query_by_segment("brand1:awareness")] == expected
+        assert [log.audit_id for log in audit_store.query_by_brand("brand1")] == expected
+        assert [
+            log.audit_id for log in audit_store.query_by_date_range(
+                base.isoformat(), (base + timedelta(seconds=2)).isoformat()
+            )
+        ] == expected
+    
+    def test_invalid_cursor_rejected(self, audit_store):
+        with pytest.raises(ValueError):
+            audit_store.query_page(cursor="not-a-cursor")
+    
+    def test_sql_store_survives_restart_and_uses_index(self, tmp_path):
+        from sqlalchemy import text
+        from vm_webapp.db import build_engine, init_db
+        engine = build_engine(tmp_path / "audit.sqlite3")
+        init_db(engine)
+        base = datetime(2026, 1, 1, tzinfo=UTC)
+        DecisionAuditStore(engine).store_many([_audit_log(i, base) for i in range(10)])
+        
+        restarted = DecisionAuditStore(engine)
+        assert len(restarted.query_by_brand("brand1")) == 10
+        
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM decision_audit_log WHERE segment_key = 's1' "
+                "ORDER BY executed_at DESC, audit_id DESC LIMIT 20"
+            )).fetchall()
+        detail = " ".join(str(row[-1]) for row in plan)
+        assert "ix_decision_audit_segment_executed" in detail
+        assert "TEMP B-TREE" not in detail
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from vm_webapp.__main__ import build_parser
+from vm_webapp.app import create_app
+from vm_webapp.feature_routers import (
+    FEATURE_AREAS,
+    RouterMounter,
+    resolve_feature_areas,
+    route_paths,
+)
+from vm_webapp.import_profile import format_report, parse_importtime, total_seconds
+from vm_webapp.settings import Settings
+
+
+def _settings(tmp_path: Path, **overrides) -> Settings:
+    return Settings(
+        vm_workspace_root=tmp_path / "runtime" / "vm",
+        vm_db_path=tmp_path / "runtime" / "vm" / "workspace.sqlite3",
+        **overrides,
+    )
+
+
+@pytest.mark.parametrize("area", FEATURE_AREAS, ids=lambda area: area.name)
+def test_declared_paths_cover_every_route_of_the_area(area) -> None:
+    app = FastAPI(openapi_url=None, docs_url=None, redoc_url=None)
+    RouterMounter(app, [area]).mount()
+
+    paths = route_paths(app.routes)
+
+    assert paths
+    assert [path for path in paths if not area.serves(path)] == []
+
+
+def test_lazy_mode_mounts_areas_on_first_matching_request(tmp_path: Path) -> None:
+    eager = create_app(_settings(tmp_path / "eager"), enable_in_process_worker=False)
+    app = create_app(
+        _settings(tmp_path / "lazy", vm_lazy_routers=True), enable_in_process_worker=False
+    )
+    mounter = app.state.router_mounter
+    client = TestClient(app)
+
+    assert mounter.mounted == []
+    assert client.get("/health").json() == {"ok": True}
+    assert mounter.mounted == ["core"]
+
+    response = client.get("/api/v2/optimizer/queue")
+    assert response.status_code != 404
+    assert mounter.mounted == ["core", "approval_optimizer"]
+    assert "agent_dag" not in mounter.mounted
+
+    assert client.get("/openapi.json").status_code == 200
+    assert mounter.mounted == mounter.enabled
+    assert route_paths(app.routes) == route_paths(eager.routes)
+
+
+def test_lazy_mode_only_offloads_requests_that_mount_something(tmp_path: Path, monkeypatch) -> None:
+    from vm_webapp import feature_routers
+
+    offloaded: list[tuple] = []
+    real_run_in_threadpool = feature_routers.run_in_threadpool
+
+    async def recording_run_in_threadpool(func, *args):
+        offloaded.append(args)
+        return await real_run_in_threadpool(func, *args)
+
+    monkeypatch.setattr(feature_routers, "run_in_threadpool", recording_run_in_threadpool)
+    app = create_app(
+        _settings(tmp_path, vm_lazy_routers=True), enable_in_process_worker=False
+    )
+    client = TestClient(app)
+
+    client.get("/health")
+    client.get("/health")
+    client.get("/no-area-serves-this")
+
+    assert offloaded == [(["core"],)]
+    assert app.state.router_mounter.pending
+
+
+def test_feature_list_limits_mounted_areas(tmp_path: Path) -> None:
+    app = create_app(_settings(tmp_path, vm_features=["core"]), enable_in_process_worker=False)
+    client = TestClient(app)
+
+    assert app.state.router_mounter.mounted == ["core"]
+    assert client.get("/health").status_code == 200
+    assert client.get("/api/v2/dag/approvals/pending").status_code == 404
+
+    with pytest.raises(ValueError, match="unknown feature areas: nope"):
+        resolve_feature_areas(["core", "nope"])
+    assert resolve_feature_areas(["all"]) == FEATURE_AREAS
+
+
+def test_importtime_report_parses_nested_timings() -> None:
+    output = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     json.decoder",
+            "import time:       300 |        420 |   json",
+            "import time:       500 |        920 | vm_webapp.app",
+            "import time:        80 |         80 | site",
+        ]
+    )
+
+    timings = parse_importtime(output)
+
+    assert [(item.module, item.depth) for item in timings] == [
+        ("json.decoder", 2),
+        ("json", 1),
+        ("vm_webapp.app", 0),
+        ("site", 0),
+    ]
+    assert total_seconds(timings) == pytest.approx(0.001)
+    assert format_report(timings, top=2).splitlines()[2].endswith("vm_webapp.app")
+    assert build_parser().parse_args(["profile-imports", "--top", "5"]).top == 5
@@ -468,3 +468,70 @@ class TestHybridROIEngine:
         assert "total_proposals" in summary
         assert "avg_hybrid_index" in summary
         assert "by_risk_level" in summary
+
+
+class TestHybridROIBatch:
+    """Batch hybrid scoring must match the scalar path exactly."""
+
+    def test_batch_scores_and_risk_levels_equal_scalar(self):
+        import random
+
+        import numpy as np
+
+        rng = random.Random(11)
+        count = 400
+        financial = [
+            {
+                "revenue": rng.choice([0, rng.uniform(0, 10000)]),
+                "cost": rng.choice([0, rng.uniform(0, 5000)]),
+                "activations": rng.choice([0, rng.randint(1, 500)]),
+            }
+            for _ in range(count)
+        ]
+        operational = [
+            {
+                "activations": rng.choice([0, rng.randint(1, 500)]),
+                "successes": rng.randint(0, 500),
+                "human_minutes": rng.choice([0, rng.uniform(0, 900)]),
+            }
+            for _ in range(count)
+        ]
+        penalties = [rng.choice([None, QualityPenalty.for_incident("high")]) for _ in range(count)]
+
+        def columns(rows: list[dict]) -> dict:
+            return {key: np.array([row[key] for row in rows]) for key in rows[0]}
+
+        engine = HybridROIEngine()
+        batch = engine.calculate_hybrid_scores_batch(columns(financial), columns(operational), penalties)
+        levels = batch.risk_levels()
+
+        for index in range(count):
+            scalar = engine.calculate_hybrid_score(
+                engine.calculate_financial_metrics(financial[index]),
+                engine.calculate_operational_metrics(operational[index]),
+                penalties[index],
+            )
+            assert batch.at(index) == scalar
+            assert batch.penalized_index[index] == scalar.penalized_index
+            assert levels[index] == ProposalRiskLevel.from_hybrid_score(scalar.penalized_index)
+
+    def test_generate_proposals_batch_registers_proposals(self):
+        engine = HybridROIEngine()
+        scores, proposals = engine.generate_proposals_batch(
+            brand_ids=["b1", "b2"],
+            touchpoint_types=[TouchpointType.ONBOARDING_STEP, TouchpointType.NUDGE],
+            actions=["a", "b"],
+            expected_impacts=[{}, {}],
+            financial_data={"revenue": [1000, 200], "cost": [100, 100], "activations": 10},
+            operational_data={"activations": 10, "successes": [9, 5], "human_minutes": [30, 60]},
+        )
+
+        assert len(scores) == 2
+        assert [p.brand_id for p in proposals] == ["b1", "b2"]
+        assert engine.get_roi_summary()["total_proposals"] == 2
+        assert proposals[0].score.penalized_index == scores.penalized_index[0]
+
+    def test_batch_rejects_mismatched_columns(self):
+        engine = HybridROIEngine()
+        with pytest.raises(ValueError, match="mismatched"):
+            engine.calculate_hybrid_scores_batch({"revenue": [1, 2]}, {"successes": [1, 2, 3]})
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from vm_webapp.memory import MemoryIndex
@@ -14,3 +15,31 @@ def test_memory_index_retrieves_brand_soul(tmp_path: Path) -> None:
     hits = index.search("evidence clarity", filters={"brand_id": "b1"}, top_k=3)
     assert hits
     assert "evidence-led" in hits[0].text
+
+
+def test_memory_index_loads_corpus_on_first_search(tmp_path: Path) -> None:
+    MemoryIndex(root=tmp_path / "zvec").upsert_doc(
+        doc_id="brand:b1:soul", text="Acme is evidence-led.", meta={"brand_id": "b1"}
+    )
+
+    index = MemoryIndex(root=tmp_path / "zvec")
+    assert not index.loaded
+
+    hits = index.search("evidence", filters={"brand_id": "b1"}, top_k=1)
+    assert index.loaded
+    assert [hit.doc_id for hit in hits] == ["brand:b1:soul"]
+
+
+def test_memory_index_concurrent_upserts_persist_every_doc(tmp_path: Path) -> None:
+    index = MemoryIndex(root=tmp_path / "zvec")
+
+    def upsert(worker: int) -> None:
+        for n in range(50):
+            index.upsert_doc(doc_id=f"{worker}:{n}", text="calm clarity", meta={"w": worker})
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(upsert, range(4)))
+
+    reloaded = MemoryIndex(root=tmp_path / "zvec")
+    assert len(reloaded.search("", filters={}, top_k=1000)) == 200
+    assert [path.name for path in (tmp_path / "zvec").iterdir()] == ["docs.json"]
@@ -0,0 +1,157 @@
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.models_onboarding import OnboardingEvent, OnboardingEventRollup
+from vm_webapp.onboarding_ingest import build_event_row, insert_event_rows
+from vm_webapp.onboarding_rollups import (
+    QuantileSketch,
+    backfill_rollups_if_empty,
+    load_window,
+    merge_by,
+    rebuild_rollups,
+)
+from vm_webapp.repo_onboarding import (
+    get_events_by_template,
+    get_funnel_metrics,
+    get_onboarding_metrics,
+    get_time_to_first_value_stats,
+)
+
+
+@pytest.fixture
+def engine(tmp_path: Path):
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    return engine
+
+
+def _rows(count: int, *, now: datetime, seed: int = 3) -> list[dict]:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        row = build_event_row(
+            {
+                "event": rng.choice(
+                    ["onboarding_started", "onboarding_completed", "time_to_first_value", "onboarding_dropoff"]
+                ),
+                "user_id": f"u{index}",
+                "brand_id": rng.choice(["b1", "b2", None]),
+                "step": rng.choice(["welcome", "setup", None]),
+                "template_id": rng.choice(["blog-post", None]),
+                "duration_ms": rng.choice([None, 0, rng.randint(1_000, 600_000)]),
+            }
+        )
+        row["created_at"] = now - timedelta(minutes=rng.randint(0, 4 * 24 * 60))
+        rows.append(row)
+    return rows
+
+
+def _raw_counts(rows, since, brand_id=None):
+    counts = {}
+    for row in rows:
+        if row["created_at"] < since or (brand_id and row["brand_id"] != brand_id):
+            continue
+        counts[row["event_type"]] = counts.get(row["event_type"], 0) + 1
+    return counts
+
+
+def test_window_matches_raw_scan_across_bucket_edges(engine) -> None:
+    now = datetime.now(timezone.utc)
+    rows = _rows(2000, now=now)
+    insert_event_rows(engine, rows)
+
+    since = now - timedelta(days=2, minutes=37)
+    with session_scope(engine) as session:
+        for brand_id in (None, "b1"):
+            window = load_window(session, since=since, brand_id=brand_id)
+            counts = {k: v.event_count for k, v in merge_by(window, group="event_type").items()}
+            assert counts == _raw_counts(rows, since, brand_id)
+
+        ttfv = [
+            row["duration_ms"]
+            for row in rows
+            if row["event_type"] == "time_to_first_value"
+            and row["created_at"] >= since
+            and row["duration_ms"]
+        ]
+        stats = get_time_to_first_value_stats(session, days=2)
+        window_stats = merge_by(
+            load_window(session, since=since, event_types=["time_to_first_value"])
+        )[""]
+        assert window_stats.duration_count == len(ttfv)
+        assert window_stats.duration_sum_ms == sum(ttfv)
+        assert window_stats.duration_min_ms == min(ttfv)
+        assert stats["count"] > 0
+        assert stats["min_ms"] <= stats["p50_ms"] <= stats["p95_ms"] <= stats["max_ms"] * 1.02
+
+
+def test_rollup_rows_do_not_grow_with_traffic(engine) -> None:
+    for _ in range(10):
+        insert_event_rows(
+            engine,
+            [build_event_row({"event": "onboarding_started", "user_id": f"u{i}"}) for i in range(100)],
+        )
+
+    with session_scope(engine) as session:
+        rollups = session.scalar(select(func.count()).select_from(OnboardingEventRollup))
+        metrics = get_onboarding_metrics(session)
+
+    assert rollups <= 4  # one hour + one day bucket (two of each across an hour edge)
+    assert metrics["total_started"] == 1000
+
+
+def test_rebuild_backfills_events_written_without_rollups(engine) -> None:
+    now = datetime.now(timezone.utc)
+    rows = _rows(300, now=now, seed=9)
+    with session_scope(engine) as session:
+        session.add_all(OnboardingEvent(**row) for row in rows)
+
+    with session_scope(engine) as session:
+        assert get_onboarding_metrics(session, days=10)["total_events"] == 0
+        assert rebuild_rollups(session) == 300
+
+    with session_scope(engine) as session:
+        metrics = get_onboarding_metrics(session, days=10)
+        funnel = get_funnel_metrics(session, days=10)
+        templates = get_events_by_template(session, days=10)
+        assert metrics["total_events"] == 300
+        assert sum(funnel["steps"].values()) == sum(1 for row in rows if row["step"])
+        assert templates == {"blog-post": sum(1 for row in rows if row["template_id"])}
+
+        # A partial rebuild replaces, rather than doubles, the recent buckets.
+        rebuild_rollups(session, since=now - timedelta(days=1))
+    with session_scope(engine) as session:
+        assert get_onboarding_metrics(session, days=10)["total_events"] == 300
+
+
+def test_startup_backfills_rollups_only_when_table_is_empty(engine) -> None:
+    rows = _rows(50, now=datetime.now(timezone.utc), seed=5)
+    with session_scope(engine) as session:
+        assert backfill_rollups_if_empty(session) == 0
+        session.add_all(OnboardingEvent(**row) for row in rows)
+
+    with session_scope(engine) as session:
+        assert backfill_rollups_if_empty(session) == 50
+    with session_scope(engine) as session:
+        assert backfill_rollups_if_empty(session) == 0
+        assert get_onboarding_metrics(session, days=10)["total_events"] == 50
+
+
+def test_quantile_sketch_is_accurate_and_mergeable() -> None:
+    rng = random.Random(1)
+    values = [rng.lognormvariate(10, 1) for _ in range(5000)]
+    left, right = QuantileSketch(), QuantileSketch()
+    for index, value in enumerate(values):
+        (left if index % 2 else right).add(value)
+    left.merge(QuantileSketch.from_json(right.to_json()))
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(left.quantile(q) - exact) / exact < 0.02
+    assert left.count == len(values)
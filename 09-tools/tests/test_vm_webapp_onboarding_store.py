@@ -0,0 +1,159 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from vm_webapp.db import build_engine, init_db
+from vm_webapp.onboarding_experiments import (
+    Experiment,
+    ExperimentRegistry,
+    RolloutMode,
+    RolloutPolicy,
+    RolloutPolicyStatus,
+    Variant,
+    _rollout_policy_registry,
+    get_variant_with_policy,
+)
+from vm_webapp.onboarding_fast_lane import (
+    clear_fast_lane_events,
+    get_fast_lane_events,
+    track_fast_lane_event,
+)
+from vm_webapp.onboarding_progress import ProgressStore, get_progress, save_progress
+from vm_webapp.onboarding_store import DurableStore, configure_onboarding_storage
+
+
+def _json_store(engine, **kwargs) -> DurableStore[dict]:
+    return DurableStore("test", encode=json.dumps, decode=json.loads, engine=engine, **kwargs)
+
+
+@pytest.fixture
+def engine(tmp_path: Path):
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    return engine
+
+
+@pytest.fixture
+def durable_onboarding(engine):
+    configure_onboarding_storage(engine)
+    try:
+        yield engine
+    finally:
+        configure_onboarding_storage(None)
+
+
+def test_unbound_store_behaves_like_dict() -> None:
+    store = DurableStore("test", encode=json.dumps, decode=json.loads, cache_size=1)
+    store["a"] = {"n": 1}
+    store["b"] = {"n": 2}
+    store["a"] = {"n": 3}
+
+    assert store.keys() == ["a", "b"]
+    assert store["a"] == {"n": 3}
+    assert len(store) == 2
+    del store["b"]
+    assert "b" not in store
+    with pytest.raises(KeyError):
+        del store["b"]
+
+
+def test_writes_are_visible_to_other_workers(engine) -> None:
+    worker_a = _json_store(engine)
+    worker_b = _json_store(engine, cache_ttl_seconds=0.0)
+
+    worker_a["user-1"] = {"step": "welcome"}
+    assert worker_b["user-1"] == {"step": "welcome"}
+
+    worker_a["user-1"] = {"step": "brand"}
+    assert worker_b["user-1"] == {"step": "brand"}
+
+    del worker_a["user-1"]
+    assert worker_b.get("user-1") is None
+
+
+def test_cache_is_bounded_and_serves_hits_without_db(engine) -> None:
+    store = _json_store(engine, cache_size=2, cache_ttl_seconds=60.0)
+    for index in range(5):
+        store[f"k{index}"] = {"n": index}
+
+    assert store.cache_stats()["cached"] == 2
+    assert store["k4"] == {"n": 4}
+    assert store["k0"] == {"n": 0}
+    stats = store.cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert len(store) == 5
+
+
+def test_progress_survives_process_restart(durable_onboarding) -> None:
+    save_progress(user_id="u1", current_step="step_1", step_data={"a": 1}, completed_steps=[])
+    save_progress(user_id="u1", current_step="step_2", step_data={"a": 2}, completed_steps=["step_1"])
+
+    # A fresh binding drops every cached entry, as a restarted worker would.
+    configure_onboarding_storage(durable_onboarding)
+
+    progress = get_progress("u1")
+    assert progress is not None
+    assert progress.current_step == "step_2"
+    assert progress.version == 2
+    assert [record.user_id for record in ProgressStore._progress.values()] == ["u1"]
+    ProgressStore.clear()
+    assert get_progress("u1") is None
+
+
+def test_fast_lane_events_keep_order_and_filters(durable_onboarding) -> None:
+    clear_fast_lane_events()
+    track_fast_lane_event("u1", "presented", {})
+    track_fast_lane_event("u2", "presented", {})
+    track_fast_lane_event("u1", "accepted", {"skip": 2})
+
+    configure_onboarding_storage(durable_onboarding)
+
+    assert [event["event_type"] for event in get_fast_lane_events(user_id="u1")] == [
+        "presented",
+        "accepted",
+    ]
+    assert len(get_fast_lane_events(event_type="presented")) == 2
+    clear_fast_lane_events()
+    assert get_fast_lane_events() == []
+
+
+def test_assignments_and_policies_are_shared_across_registries(engine) -> None:
+    experiment = Experiment(
+        experiment_id="exp1",
+        name="Exp",
+        variants=[
+            Variant(variant_id="control", name="Control"),
+            Variant(variant_id="treatment", name="Treatment"),
+        ],
+    )
+    first = ExperimentRegistry()
+    second = ExperimentRegistry()
+    for registry in (first, second):
+        registry._assignments.bind(engine)
+        registry.register(experiment)
+
+    assignment = first.get_assignment("exp1", "u1", "ws1")
+    assert second.get_assignment_count("exp1") == 1
+    assert second.get_assignment("exp1", "u1", "ws1") == assignment
+    second.clear_assignments("exp1")
+    assert first.get_assignment_count() == 0
+
+    _rollout_policy_registry.bind(engine)
+    try:
+        _rollout_policy_registry["p1"] = RolloutPolicy(
+            policy_id="p1",
+            experiment_id="exp1",
+            active_variant="treatment",
+            mode=RolloutMode.AUTO,
+            status=RolloutPolicyStatus.ACTIVE,
+        )
+        _rollout_policy_registry.bind(engine)
+
+        variant_id, policy, source = get_variant_with_policy("u1", experiment)
+        assert (variant_id, source) == ("treatment", "policy_auto")
+        assert policy is not None and policy.status is RolloutPolicyStatus.ACTIVE
+    finally:
+        _rollout_policy_registry.clear()
+        _rollout_policy_registry.bind(None)
@@ -0,0 +1,171 @@
+import gzip
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+from vm_webapp.__main__ import build_parser
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.models import EventLog, FirstRunOutcomeView
+from vm_webapp.onboarding_ingest import build_event_row, insert_event_rows
+from vm_webapp.ops_columnar import (
+    build_ops_analytics,
+    export_columnar,
+    history_window,
+    read_columnar,
+)
+
+NOW = datetime(2026, 3, 10, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def engine(tmp_path: Path):
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    days = range(5)
+    with session_scope(engine) as session:
+        for day in days:
+            for index in range(4):
+                brand = "b1" if index % 2 else None
+                occurred = (NOW - timedelta(days=day, minutes=index)).isoformat()
+                session.add(
+                    EventLog(
+                        event_id=f"evt-{day}-{index}",
+                        event_type="RunCompleted" if index else "ThreadCreated",
+                        aggregate_type="thread",
+                        aggregate_id="t1",
+                        stream_id="thread:t1",
+                        stream_version=day * 10 + index,
+                        actor_type="agent" if index else "human",
+                        actor_id="a1",
+                        brand_id=brand,
+                        thread_id="t1",
+                        occurred_at=occurred,
+                    )
+                )
+                session.add(
+                    FirstRunOutcomeView(
+                        outcome_id=f"out-{day}-{index}",
+                        run_id=f"run-{day}-{index}",
+                        thread_id="t1",
+                        brand_id="b1" if index % 2 else "b2",
+                        project_id="p1",
+                        profile="blog",
+                        mode="fast" if index < 2 else "deep",
+                        approved=index % 2 == 0,
+                        success_24h=index != 3,
+                        quality_score=0.5 + index / 10,
+                        duration_ms=1000.0 * (index + 1),
+                        completed_at=occurred,
+                    )
+                )
+    rows = []
+    for day in days:
+        for event, duration in (
+            ("onboarding_started", None),
+            ("time_to_first_value", 60_000 + day * 1000),
+            ("onboarding_completed", None),
+        ):
+            row = build_event_row({"event": event, "user_id": f"u{day}", "brand_id": "b1", "duration_ms": duration})
+            row["created_at"] = NOW - timedelta(days=day)
+            rows.append(row)
+    insert_event_rows(engine, rows)
+    return engine
+
+
+def test_export_partitions_by_date_and_brand(engine, tmp_path: Path) -> None:
+    root = tmp_path / "export"
+    manifest = export_columnar(engine, root, fmt="csv")
+
+    assert manifest["tables"]["event_log"] == {"rows": 20, "partitions": 10}
+    assert manifest["tables"]["onboarding_events"]["rows"] == 15
+    day_dir = root / "event_log" / "date=2026-03-10"
+    assert sorted(p.name for p in day_dir.iterdir()) == ["brand_id=__none__", "brand_id=b1"]
+    part = next((day_dir / "brand_id=b1").iterdir())
+    with gzip.open(part, "rt") as handle:
+        assert handle.readline().startswith("event_id,event_type")
+
+    frame = read_columnar(root, "event_log", brand_ids=["b1"])
+    assert len(frame) == 10
+    assert set(frame["brand_id"]) == {"b1"}
+
+
+def test_incremental_export_replaces_only_recent_partitions(engine, tmp_path: Path) -> None:
+    root = tmp_path / "export"
+    export_columnar(engine, root, fmt="csv")
+    export_columnar(engine, root, fmt="csv", since=NOW - timedelta(days=1))
+
+    assert len(read_columnar(root, "event_log")) == 20
+    assert len(read_columnar(root, "first_run_outcomes_view")) == 20
+
+
+def test_window_reads_prune_partitions_and_filter_timestamps(engine, tmp_path: Path) -> None:
+    root = tmp_path / "export"
+    export_columnar(engine, root, fmt="csv")
+
+    since, until = history_window(2, now=NOW)
+    frame = read_columnar(root, "onboarding_events", since=since, until=until)
+    assert len(frame) == 6
+    assert frame["created_at"].min() >= since
+
+    clipped = read_columnar(root, "event_log", since=NOW - timedelta(minutes=2), until=NOW)
+    assert sorted(clipped["event_id"]) == ["evt-0-1", "evt-0-2"]
+
+
+def test_ops_analytics_aggregates(engine, tmp_path: Path) -> None:
+    root = tmp_path / "export"
+    export_columnar(engine, root, fmt="csv")
+    analytics = build_ops_analytics(root, since=NOW - timedelta(days=10))
+
+    assert analytics["event_log"]["total"] == 20
+    assert analytics["event_log"]["by_actor_type"] == {"agent": 15, "human": 5}
+    assert analytics["event_log"]["active_brands"] == 1
+
+    onboarding = analytics["onboarding"]
+    assert (onboarding["started"], onboarding["completed"]) == (5, 5)
+    assert onboarding["completion_rate"] == 1.0
+    assert onboarding["ttfv"]["p50_ms"] == 62_000
+    assert onboarding["by_brand"]["b1"]["onboarding_started"] == 5
+
+    first_runs = analytics["first_runs"]
+    assert first_runs["total"] == 20
+    assert first_runs["success_rate"] == pytest.approx(0.75)
+    assert first_runs["approval_rate"] == pytest.approx(0.5)
+    by_mode = {row["mode"]: row for row in first_runs["by_profile_mode"]}
+    assert by_mode["fast"]["success_rate"] == 1.0
+    assert by_mode["deep"]["success_rate"] == 0.5
+
+
+def test_empty_export_yields_zeroed_sections(tmp_path: Path) -> None:
+    analytics = build_ops_analytics(tmp_path / "missing")
+    assert analytics["event_log"]["total"] == 0
+    assert analytics["onboarding"]["ttfv"]["p50_ms"] is None
+    assert analytics["first_runs"]["by_profile_mode"] == []
+
+
+def test_parquet_round_trip(engine, tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    root = tmp_path / "export"
+    manifest = export_columnar(engine, root, fmt="parquet")
+    assert manifest["format"] == "parquet"
+    assert next((root / "event_log").rglob("*.parquet"))
+    assert len(read_columnar(root, "first_run_outcomes_view")) == 20
+
+
+def test_nightly_report_includes_columnar_section(engine, tmp_path: Path) -> None:
+    root = tmp_path / "export"
+    export_columnar(engine, root, fmt="csv")
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+    from nightly_report_v18 import generate_nightly_report
+
+    report = generate_nightly_report(columnar_dir=root, history_days=7, date=NOW)
+    assert report["ops_analytics"]["first_runs"]["total"] == 20
+    assert "ops_analytics" not in generate_nightly_report()
+
+
+def test_cli_parses_export_columnar() -> None:
+    args = build_parser().parse_args(
+        ["export-columnar", "--out", "exports", "--since-days", "3", "--table", "event_log"]
+    )
+    assert (args.out, args.since_days, args.tables, args.format) == ("exports", 3, ["event_log"], None)
@@ -339,3 +339,149 @@ class TestPolicyRepository:
         # Assert
         assert result is not None
         assert result.brand_id == "brand1"
+
+
+class TestCompiledPolicyCache:
+    """Test memoized resolution and its invalidation."""
+
+    @pytest.fixture
+    def file_engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'policies.sqlite3'}")
+        Base.metadata.create_all(engine)
+        return engine
+
+    @staticmethod
+    def _seed(session):
+        from vm_webapp.policy_hierarchy import upsert_policy
+
+        upsert_policy(session, level=PolicyLevel.GLOBAL, params={"threshold": 0.5, "timeout": 60})
+        upsert_policy(session, level=PolicyLevel.BRAND, brand_id="brand1", params={"mode": "strict"})
+        upsert_policy(
+            session,
+            level=PolicyLevel.SEGMENT,
+            brand_id="brand1",
+            segment="enterprise",
+            objective_key="conversion",
+            params={"threshold": 0.9},
+        )
+        session.commit()
+
+    def test_repeated_resolution_skips_database(self, file_engine):
+        from sqlalchemy import event
+
+        session = sessionmaker(bind=file_engine)()
+        self._seed(session)
+        resolve_effective_policy(session, brand_id="brand1", segment="enterprise")
+
+        statements = []
+        event.listen(file_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for _ in range(5):
+            result = resolve_effective_policy(
+                session, brand_id="brand1", segment="enterprise", objective_key="conversion"
+            )
+
+        assert statements == []
+        assert result.threshold == 0.9
+        assert result.mode == "strict"
+        assert result.timeout == 60
+        assert result.source == PolicySource.SEGMENT
+
+    def test_committed_upsert_invalidates_other_sessions(self, file_engine):
+        from vm_webapp.policy_hierarchy import upsert_policy
+
+        Session = sessionmaker(bind=file_engine)
+        reader, writer = Session(), Session()
+        self._seed(writer)
+        assert resolve_effective_policy(reader, brand_id="brand1").mode == "strict"
+        reader.commit()
+
+        upsert_policy(writer, level=PolicyLevel.BRAND, brand_id="brand1", params={"mode": "relaxed"})
+        # The writer sees its own uncommitted change; other sessions do not.
+        assert resolve_effective_policy(writer, brand_id="brand1").mode == "relaxed"
+        assert resolve_effective_policy(reader, brand_id="brand1").mode == "strict"
+        reader.commit()
+
+        writer.commit()
+        assert resolve_effective_policy(reader, brand_id="brand1").mode == "relaxed"
+
+    def test_out_of_process_write_is_seen_after_ttl(self, file_engine, monkeypatch):
+        from sqlalchemy import event, text
+        from vm_webapp import policy_hierarchy
+
+        session = sessionmaker(bind=file_engine)()
+        self._seed(session)
+        assert resolve_effective_policy(session, brand_id="brand1").mode == "strict"
+        session.commit()
+
+        # Another process writes without touching this process' version counter.
+        with file_engine.begin() as conn:
+            conn.execute(text(
+                "UPDATE policies SET params_json = '{\"mode\": \"relaxed\"}', "
+                "updated_at = '2999-01-01T00:00:00+00:00' WHERE level = 'BRAND'"
+            ))
+        # Within the TTL the compiled view is served without a query.
+        assert resolve_effective_policy(session, brand_id="brand1").mode == "strict"
+        session.commit()
+
+        monkeypatch.setattr(policy_hierarchy, "POLICY_CACHE_TTL_SECONDS", 0.0)
+        assert resolve_effective_policy(session, brand_id="brand1").mode == "relaxed"
+        session.commit()
+
+        statements = []
+        event.listen(file_engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        resolve_effective_policy(session, brand_id="brand1")
+        session.commit()
+        # An unchanged fingerprint only costs the aggregate, not a reload.
+        assert len(statements) == 1 and "count(*)" in statements[0]
+
+        with file_engine.begin() as conn:
+            conn.execute(text("DELETE FROM policies WHERE level = 'BRAND'"))
+        assert resolve_effective_policy(session, brand_id="brand1").source == PolicySource.GLOBAL
+
+    def test_rolled_back_write_never_reaches_cache(self, file_engine):
+        from vm_webapp.policy_hierarchy import upsert_policy
+
+        Session = sessionmaker(bind=file_engine)
+        session = Session()
+        self._seed(session)
+        upsert_policy(session, level=PolicyLevel.BRAND, brand_id="brand1", params={"mode": "temp"})
+        assert resolve_effective_policy(session, brand_id="brand1").mode == "temp"
+        session.rollback()
+
+        assert resolve_effective_policy(Session(), brand_id="brand1").mode == "strict"
+
+    def test_resolve_many_matches_single_resolution(self, file_engine):
+        from vm_webapp.policy_hierarchy import resolve_many
+
+        session = sessionmaker(bind=file_engine)()
+        self._seed(session)
+        keys = [
+            ("brand1", "enterprise", "conversion"),
+            ("brand1", "enterprise", None),
+            ("brand2", None, None),
+            ("brand1", None, "conversion"),
+        ]
+
+        batch = resolve_many(session, keys)
+
+        assert [p.to_snapshot() for p in batch] == [
+            resolve_effective_policy(
+                session, brand_id=brand, segment=segment, objective_key=objective
+            ).to_snapshot()
+            for brand, segment, objective in keys
+        ]
+        assert [p.source for p in batch] == [
+            PolicySource.SEGMENT,
+            PolicySource.BRAND,
+            PolicySource.GLOBAL,
+            PolicySource.BRAND,
+        ]
+
+    def test_results_do_not_share_params(self, file_engine):
+        session = sessionmaker(bind=file_engine)()
+        self._seed(session)
+
+        first = resolve_effective_policy(session, brand_id="brand1")
+        first._raw_params["mode"] = "mutated"
+
+        assert resolve_effective_policy(session, brand_id="brand1").mode == "strict"
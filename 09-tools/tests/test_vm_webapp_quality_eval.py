@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import func, select
+
+from vm_webapp import quality_eval
+from vm_webapp.__main__ import build_parser
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.models import QualityScore
+from vm_webapp.quality_eval import (
+    _compute_heuristic_score,
+    backfill_quality_scores,
+    content_sha256,
+    evaluate_run_quality,
+    evaluate_runs_quality,
+)
+from vm_webapp.repo import create_run
+
+LANDING = (
+    "# Landing\n\n## Oferta\n- Defina o publico\n- Liste beneficios\n* Teste a headline\n"
+    "Clique e cadastre-se hoje. Agende uma demo e otimize o funil; publique e execute.\n"
+)
+
+
+def _reference_score(markdown: str) -> dict:
+    # The multi-pass heuristic the single-pass scorer replaces.
+    text = markdown.strip()
+    words = len([token for token in text.replace("\n", " ").split(" ") if token])
+    heading_count = sum(1 for line in text.splitlines() if line.strip().startswith("#"))
+    list_count = sum(1 for line in text.splitlines() if line.strip().startswith(("-", "*")))
+    lower = text.lower()
+    cta_hits = sum(
+        1 for key in ["cta", "clique", "cadastre", "agende", "compre", "responda"] if key in lower
+    )
+    action_hits = sum(
+        1 for key in ["defina", "liste", "execute", "publique", "teste", "otimize"] if key in lower
+    )
+    return {
+        "words": words,
+        "estrutura": min(100, heading_count * 20 + list_count * 12),
+        "cta": min(100, cta_hits * 30 + action_hits * 8),
+        "acionabilidade": min(100, list_count * 18 + action_hits * 15 + cta_hits * 8),
+    }
+
+
+def _engine(tmp_path: Path):
+    engine = build_engine(tmp_path / "workspace.sqlite3")
+    init_db(engine)
+    return engine
+
+
+def _write_artifact(workspace_root: Path, run_id: str, content: str) -> None:
+    stage_dir = workspace_root / "runs" / run_id / "stages" / "01-draft"
+    stage_dir.mkdir(parents=True, exist_ok=True)
+    (stage_dir / "draft.md").write_text(content, encoding="utf-8")
+    (stage_dir / "manifest.json").write_text(
+        json.dumps({"artifacts": [{"path": "draft.md"}]}), encoding="utf-8"
+    )
+
+
+@pytest.mark.parametrize(
+    "markdown",
+    [
+        LANDING,
+        "",
+        "palavra\tcom tab\r\n  - item\n\n#titulo   cta CTA\n" * 7,
+        "executeste: overlapping keywords share characters",
+        "  * a\n-\n### h\ncompre  responda   ",
+    ],
+)
+def test_single_pass_score_matches_reference(markdown: str) -> None:
+    reference = _reference_score(markdown)
+    score = _compute_heuristic_score(markdown)
+
+    for name in ("estrutura", "cta", "acionabilidade"):
+        assert score["criteria"][name] == reference[name]
+    assert score["criteria"]["completude"] == min(100, 20 + min(60, reference["words"] // 4))
+
+
+def test_batch_evaluation_scores_each_distinct_document_once(tmp_path: Path, monkeypatch) -> None:
+    workspace_root = tmp_path / "vm"
+    _write_artifact(workspace_root, "run-a", LANDING)
+    _write_artifact(workspace_root, "run-b", LANDING)
+    engine = _engine(tmp_path)
+    calls: list[str] = []
+    original = quality_eval._compute_heuristic_score
+    monkeypatch.setattr(
+        quality_eval,
+        "_compute_heuristic_score",
+        lambda markdown: calls.append(markdown) or original(markdown),
+    )
+
+    results = evaluate_runs_quality(
+        [("run-a", ""), ("run-b", ""), ("run-c", "Sem artefato ainda.")],
+        workspace_root=workspace_root,
+        engine=engine,
+    )
+
+    assert [item["run_id"] for item in results] == ["run-a", "run-b", "run-c"]
+    assert results[0]["score"] == results[1]["score"]
+    assert results[0]["content_sha256"] == content_sha256(LANDING)
+    assert results[2]["content_length"] == len("Sem artefato ainda.")
+    assert len(calls) == 2
+
+    again = evaluate_run_quality(
+        run_id="run-b",
+        request_text="",
+        workspace_root=workspace_root,
+        depth="deep",
+        rubric_version="v1",
+        engine=engine,
+    )
+    assert len(calls) == 2
+    assert again["score"] == results[1]["score"]
+    assert again["fallback_applied"] is True
+
+    evaluate_runs_quality(
+        [("run-a", "")], workspace_root=workspace_root, rubric_version="v2", engine=engine
+    )
+    assert len(calls) == 3
+    with session_scope(engine) as session:
+        assert session.scalar(select(func.count()).select_from(QualityScore)) == 3
+
+
+def test_backfill_scores_historical_runs(tmp_path: Path) -> None:
+    workspace_root = tmp_path / "vm"
+    engine = _engine(tmp_path)
+    with session_scope(engine) as session:
+        for index in range(5):
+            run_id = f"run-{index}"
+            create_run(
+                session,
+                run_id=run_id,
+                brand_id="b1",
+                product_id="p1",
+                thread_id="t1",
+                stack_path="stack.yaml",
+                user_request=f"Pedido {index}",
+                status="completed",
+            )
+            if index % 2 == 0:
+                _write_artifact(workspace_root, run_id, LANDING)
+
+    stats = backfill_quality_scores(engine, workspace_root=workspace_root, workers=2, batch_size=2)
+
+    assert stats == {"runs": 5, "documents": 3, "stored": 3}
+    with session_scope(engine) as session:
+        row = session.get(QualityScore, (content_sha256(LANDING), "v1"))
+        assert json.loads(row.score_json) == _compute_heuristic_score(LANDING)
+
+    assert backfill_quality_scores(engine, workspace_root=workspace_root, workers=1)["stored"] == 0
+    stats = backfill_quality_scores(engine, workspace_root=workspace_root, workers=1, replace=True)
+    assert stats == {"runs": 5, "documents": 3, "stored": 3}
+
+
+def test_cli_parses_backfill_quality_scores() -> None:
+    args = build_parser().parse_args(
+        ["backfill-quality-scores", "--workers", "4", "--rubric-version", "v2", "--force"]
+    )
+    assert (args.workers, args.rubric_version, args.batch_size, args.force) == (4, "v2", 200, True)
@@ -397,3 +397,44 @@ class TestApplyFreezeRollback:
         assert status["state"] == ProposalState.PENDING.value
         assert "feasibility_check_passed" in status
         assert "estimated_v1_improvement" in status
+
+
+class TestQualityBatchScoring:
+    """Batch quality scoring must match the scalar path exactly."""
+
+    def test_batch_scores_equal_scalar_scores(self):
+        import random
+
+        rng = random.Random(5)
+        rows = [(rng.uniform(0, 100), rng.random(), rng.uniform(0, 0.4)) for _ in range(500)]
+        optimizer = QualityOptimizer()
+
+        batch = optimizer.calculate_quality_scores_batch(*zip(*rows))
+
+        for index, (v1, approval, incidents) in enumerate(rows):
+            scalar = optimizer.calculate_quality_score(v1, approval, incidents)
+            assert batch.overall[index] == scalar.overall
+            assert batch.at(index).incident_rate == scalar.incident_rate
+
+    def test_generate_proposals_batch_matches_scalar(self):
+        runs = [
+            {"run_id": "r1", "v1_score": 40.0, "approval_without_regen_24h": 0.5, "incident_rate": 0.01},
+            {"run_id": "r2", "v1_score": 95.0, "approval_without_regen_24h": 0.99, "incident_rate": 0.0},
+            {"run_id": "r3", "v1_score": 70.0, "params": {"max_tokens": 2600}},
+        ]
+        constraints = ConstraintBounds()
+
+        scores, proposals = QualityOptimizer().generate_proposals_batch(runs, [], constraints)
+        scalar = QualityOptimizer()
+
+        assert len(scores) == 3
+        for run, proposal in zip(runs, proposals):
+            expected = scalar.generate_proposal(run, [], constraints)
+            assert proposal.run_id == expected.run_id
+            assert proposal.quality_score.overall == expected.quality_score.overall
+            assert proposal.recommended_params == expected.recommended_params
+            assert proposal.feasibility_check_passed == expected.feasibility_check_passed
+
+    def test_batch_rejects_mismatched_lengths(self):
+        with pytest.raises(ValueError):
+            QualityOptimizer().calculate_quality_scores_batch([1.0, 2.0], [0.5], [0.0, 0.0])
@@ -19,6 +19,10 @@ from vm_webapp.regression_alerts import (
     get_active_alerts,
     confirm_alert,
     dismiss_false_positive,
+    RegressionAlertStatus,
+    RegressionAlertStore,
+    configure_regression_alert_storage,
+    _alert_store,
 )
 
 
@@ -518,3 +522,143 @@ class TestWindowConfiguration:
         
         assert result is not None
         assert result.window_hours == 168
+
+
+def _make_alert(alert_id, segment_key="brand1:awareness", metric_name="approval_without_regen_24h",
+                detected_at=None):
+    return RegressionAlert(
+        alert_id=alert_id,
+        segment_key=segment_key,
+        severity=RegressionSeverity.WARNING,
+        reason_code=RegressionReasonCode.APPROVAL_RATE_DROP,
+        metric_name=metric_name,
+        current_value=0.45,
+        baseline_value=0.50,
+        delta=-0.05,
+        window_hours=24,
+        detected_at=detected_at or datetime.now(UTC),
+    )
+
+
+class TestDeduplicatorTimingWheel:
+    """Test amortized expiry of dedup keys."""
+    
+    def test_expired_keys_are_dropped_without_full_scan(self):
+        """Keys leave the dedup map once their wheel slot has elapsed."""
+        now = [datetime(2026, 1, 1, tzinfo=UTC)]
+        dedup = AlertDeduplicator(dedup_window_hours=1, clock=lambda: now[0])
+        
+        for index in range(500):
+            dedup.record_alert(_make_alert(f"a{index}", segment_key=f"seg{index}", detected_at=now[0]))
+        assert len(dedup._recent_alerts) == 500
+        
+        now[0] += timedelta(hours=1, minutes=2)
+        dedup.record_alert(_make_alert("fresh", segment_key="fresh", detected_at=now[0]))
+        
+        assert list(dedup._recent_alerts) == ["fresh:approval_rate_drop:approval_without_regen_24h"]
+    
+    def test_refreshed_key_survives_stale_slot(self):
+        """A key recorded again is not evicted by its older wheel entry."""
+        start = datetime(2026, 1, 1, tzinfo=UTC)
+        now = [start]
+        dedup = AlertDeduplicator(dedup_window_hours=1, clock=lambda: now[0])
+        
+        dedup.record_alert(_make_alert("a1", detected_at=start))
+        now[0] = start + timedelta(minutes=50)
+        dedup.record_alert(_make_alert("a2", detected_at=now[0]))
+        now[0] = start + timedelta(minutes=70)
+        dedup.record_alert(_make_alert("other", segment_key="other", detected_at=now[0]))
+        
+        assert dedup.should_alert(_make_alert("a3", detected_at=now[0])) is False
+        now[0] = start + timedelta(minutes=115)
+        assert dedup.should_alert(_make_alert("a4", detected_at=now[0])) is True
+    
+    def test_invalid_resolution_rejected(self):
+        with pytest.raises(ValueError):
+            AlertDeduplicator(wheel_resolution_seconds=0)
+
+
+class TestRegressionAlertStore:
+    """Test in-memory and SQL-backed alert storage."""
+    
+    @pytest.fixture(autouse=True)
+    def reset_store(self):
+        _alert_store.clear()
+        configure_regression_alert_storage(None)
+        yield
+        _alert_store.clear()
+        configure_regression_alert_storage(None)
+    
+    @pytest.fixture
+    def engine(self, tmp_path):
+        from vm_webapp.db import build_engine, init_db
+        engine = build_engine(tmp_path / "alerts.sqlite3")
+        init_db(engine)
+        return engine
+    
+    def test_in_memory_lifecycle_uses_status_index(self):
+        """Confirmed and dismissed alerts leave the active index."""
+        base = datetime.now(UTC)
+        for index, segment in enumerate(["s1", "s1", "s2", "s1"]):
+            _alert_store.add(_make_alert(f"a{index}", segment_key=segment,
+                                         detected_at=base - timedelta(minutes=index)))
+        
+        assert [a.alert_id for a in get_active_alerts("s1")] == ["a3", "a1", "a0"]
+        confirm_alert("a1")
+        dismiss_false_positive("a3", dismissed_by="ops")
+        
+        assert [a.alert_id for a in get_active_alerts("s1")] == ["a0"]
+        assert [a.alert_id for a in get_active_alerts()] == ["a2", "a0"]
+        assert [a.alert_id for a in _alert_store.list("s1", RegressionAlertStatus.CONFIRMED)] == ["a1"]
+        assert confirm_alert("missing") is None
+    
+    def test_in_memory_store_drops_oldest_detected_alerts_past_cap(self):
+        store = RegressionAlertStore(max_alerts=3)
+        base = datetime.now(UTC)
+        for index, minutes_ago in enumerate([5, 1, 9, 3, 7]):
+            store.add(_make_alert(f"a{index}", segment_key="s1",
+                                  detected_at=base - timedelta(minutes=minutes_ago)))
+        store.update(store.get("a3"))
+        
+        assert [a.alert_id for a in store.list("s1")] == ["a0", "a3", "a1"]
+        assert store.get("a2") is None and store.get("a4") is None
+    
+    def test_alerts_survive_restart(self, engine):
+        """Alerts written through one store are visible to a fresh one."""
+        configure_regression_alert_storage(engine)
+        base = datetime.now(UTC)
+        _alert_store.add(_make_alert("a1", segment_key="s1", detected_at=base))
+        _alert_store.add(_make_alert("a2", segment_key="s1", detected_at=base - timedelta(hours=1)))
+        _alert_store.add(_make_alert("a3", segment_key="s2", detected_at=base))
+        dismiss_false_positive("a3", dismissed_by="ops")
+        
+        restarted = RegressionAlertStore(engine)
+        active = restarted.list("s1", RegressionAlertStatus.ACTIVE)
+        assert [a.alert_id for a in active] == ["a2", "a1"]
+        assert active[1].detected_at == base
+        
+        dismissed = restarted.get("a3")
+        assert dismissed.false_positive is True
+        assert dismissed.dismissed_by == "ops"
+        assert [a.alert_id for a in get_active_alerts()] == ["a2", "a1"]
+    
+    def test_active_lookup_uses_composite_index(self, engine):
+        from sqlalchemy import text
+        with engine.connect() as conn:
+            plan = conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT * FROM regression_alerts "
+                "WHERE segment_key = 's1' AND status = 'active' ORDER BY detected_at"
+            )).fetchall()
+        detail = " ".join(str(row[-1]) for row in plan)
+        assert "ix_regression_alerts_segment_status_detected" in detail
+        assert "TEMP B-TREE" not in detail
+    
+    @patch("vm_webapp.regression_alerts._fetch_segment_metrics")
+    def test_detected_alerts_are_stored(self, mock_fetch):
+        mock_fetch.return_value = {
+            "approval_without_regen_24h": {"current": 0.42, "baseline": 0.50},
+        }
+        
+        alerts = detect_segment_regression("brand9:awareness")
+        
+        assert [a.alert_id for a in get_active_alerts("brand9:awareness")] == [alerts[0].alert_id]
@@ -331,3 +331,76 @@ class TestRoiScoreInputValidation:
                 avg_latency_ms=150,
                 cost_per_job_usd=0.05,
             )
+
+
+class TestRoiBatchScoring:
+    """Batch scoring must match the scalar path exactly."""
+
+    @staticmethod
+    def _inputs(count=500):
+        import random
+
+        rng = random.Random(7)
+        return [
+            RoiScoreInput(
+                approval_without_regen_24h=rng.random(),
+                revenue_attribution_usd=rng.uniform(0, 900000),
+                regen_per_job=rng.uniform(0, 3),
+                quality_score_avg=rng.random(),
+                avg_latency_ms=rng.uniform(0, 800),
+                cost_per_job_usd=rng.uniform(0, 0.3),
+                incident_rate=rng.uniform(0, 0.06),
+            )
+            for _ in range(count)
+        ]
+
+    def test_batch_scores_equal_scalar_scores(self):
+        from vm_webapp.roi_optimizer import RoiScoreInputBatch
+
+        inputs = self._inputs()
+        calculator = RoiScoreCalculator()
+        scores = calculator.calculate_batch(RoiScoreInputBatch.from_inputs(inputs))
+
+        for index, input_data in enumerate(inputs):
+            scalar = calculator.calculate(input_data)
+            batched = scores.at(index)
+            assert batched.total_score == scalar.total_score
+            assert batched.pillar_scores == scalar.pillar_scores
+            assert batched.contributions == scalar.contributions
+
+    def test_batch_proposals_equal_scalar_proposals(self):
+        import numpy as np
+        from vm_webapp.roi_optimizer import RoiScoreInputBatch
+
+        inputs = self._inputs(300)
+        projected = np.array([item.incident_rate + (0.01 if i % 7 == 0 else -0.001) for i, item in enumerate(inputs)])
+        projected = np.clip(projected, 0, 1)
+
+        _, batched = RoiOptimizer().generate_proposals_batch(
+            RoiScoreInputBatch.from_inputs(inputs), projected_incident_rate=projected
+        )
+        scalar_optimizer = RoiOptimizer()
+        for index, input_data in enumerate(inputs):
+            expected = scalar_optimizer.generate_proposals(
+                input_data, projected_incident_rate=float(projected[index])
+            )
+            assert len(batched[index]) == len(expected)
+            for got, want in zip(batched[index], expected):
+                got.created_at = want.created_at
+                assert got == want
+
+    def test_batch_validates_ranges_and_lengths(self):
+        from vm_webapp.roi_optimizer import RoiScoreInputBatch
+
+        columns = dict(
+            approval_without_regen_24h=[0.5, 1.2],
+            revenue_attribution_usd=[0, 0],
+            regen_per_job=[0, 0],
+            quality_score_avg=[0.5, 0.5],
+            avg_latency_ms=[0, 0],
+            cost_per_job_usd=[0, 0],
+        )
+        with pytest.raises(ValueError, match=r"approval_without_regen_24h\[1\]"):
+            RoiScoreInputBatch(**columns)
+        with pytest.raises(ValueError, match="length"):
+            RoiScoreInputBatch(**{**columns, "approval_without_regen_24h": [0.5], "regen_per_job": [0]})
@@ -0,0 +1,247 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.memory import MemoryIndex
+from vm_webapp.observability import MetricsCollector
+from vm_webapp.repo import create_run, get_run, update_run_status
+from vm_webapp.run_pool import FairBrandScheduler, QueuedRun, RunExecutionPool, RunPoolConfig
+from vm_webapp.workflow_runtime_v2 import WorkflowRuntimeV2
+from vm_webapp.workspace import Workspace
+
+
+def _queued(brand_id: str, count: int) -> list[QueuedRun]:
+    return [
+        QueuedRun(run_id=f"{brand_id}-{index}", brand_id=brand_id, queued_at="")
+        for index in range(count)
+    ]
+
+
+def _seed_runs(engine, brand_id: str, count: int) -> None:
+    with session_scope(engine) as session:
+        for index in range(count):
+            create_run(
+                session,
+                run_id=f"{brand_id}-{index:03d}",
+                brand_id=brand_id,
+                product_id="p1",
+                thread_id="t1",
+                stack_path="plan_90d",
+                user_request="go",
+                status="queued",
+            )
+
+
+def test_scheduler_interleaves_brands_instead_of_fifo() -> None:
+    scheduler = FairBrandScheduler(RunPoolConfig(global_concurrency=4, per_brand_concurrency=4))
+    queued = _queued("heavy", 200) + _queued("light", 2)
+
+    admitted = scheduler.select(queued, in_flight_by_brand={}, slots=4)
+
+    assert [item.brand_id for item in admitted].count("light") == 2
+
+
+def test_scheduler_respects_per_brand_limit_and_in_flight() -> None:
+    scheduler = FairBrandScheduler(RunPoolConfig(global_concurrency=8, per_brand_concurrency=2))
+    queued = _queued("a", 10) + _queued("b", 10)
+
+    admitted = scheduler.select(queued, in_flight_by_brand={"a": 2}, slots=8)
+
+    assert {item.brand_id for item in admitted} == {"b"}
+    assert len(admitted) == 2
+
+
+def test_scheduler_honors_brand_weights() -> None:
+    config = RunPoolConfig(
+        global_concurrency=30,
+        per_brand_concurrency=30,
+        brand_weights={"gold": 2.0},
+    )
+    scheduler = FairBrandScheduler(config)
+    queued = _queued("gold", 50) + _queued("basic", 50)
+
+    admitted = scheduler.select(queued, in_flight_by_brand={}, slots=30)
+
+    brands = [item.brand_id for item in admitted]
+    assert brands.count("gold") == 20
+    assert brands.count("basic") == 10
+
+
+def test_config_rejects_non_positive_limits() -> None:
+    with pytest.raises(ValueError):
+        RunPoolConfig(global_concurrency=0)
+    with pytest.raises(ValueError):
+        RunPoolConfig(brand_weights={"b1": 0})
+
+
+def test_pool_admits_queued_runs_within_concurrency_limits(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    _seed_runs(engine, "heavy", 20)
+    _seed_runs(engine, "light", 2)
+
+    lock = threading.Lock()
+    active: dict[str, int] = {}
+    peak = {"global": 0, "heavy": 0}
+    order: list[str] = []
+
+    def executor(*, session, run_id, **_kwargs):
+        run = get_run(session, run_id)
+        with lock:
+            active[run.brand_id] = active.get(run.brand_id, 0) + 1
+            peak["global"] = max(peak["global"], sum(active.values()))
+            peak["heavy"] = max(peak["heavy"], active.get("heavy", 0))
+            order.append(run.brand_id)
+        update_run_status(session, run_id=run_id, status="completed")
+        with lock:
+            active[run.brand_id] -= 1
+        return {"run_id": run_id, "status": "completed"}
+
+    metrics = MetricsCollector()
+    pool = RunExecutionPool(
+        engine=engine,
+        executor=executor,
+        config=RunPoolConfig(global_concurrency=3, per_brand_concurrency=2),
+        metrics=metrics,
+    )
+    try:
+        assert pool.drain(timeout=10)
+    finally:
+        pool.shutdown()
+
+    assert len(order) == 22
+    assert peak["global"] <= 3
+    assert peak["heavy"] <= 2
+    assert "light" in order[:4]
+
+    snapshot = pool.snapshot()
+    assert snapshot["admitted_total"] == 22
+    assert snapshot["queue_depth"] == 0
+    assert snapshot["in_flight"] == 0
+    assert snapshot["wait_seconds"]["count"] == 22
+    assert metrics.snapshot()["counts"]["run_pool_admitted"] == 22
+
+
+def test_pool_reports_queue_depth_per_brand(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    _seed_runs(engine, "b1", 5)
+    _seed_runs(engine, "b2", 1)
+    release = threading.Event()
+
+    def executor(*, session, run_id, **_kwargs):
+        release.wait(timeout=5)
+        update_run_status(session, run_id=run_id, status="completed")
+        return {"run_id": run_id, "status": "completed"}
+
+    pool = RunExecutionPool(
+        engine=engine,
+        executor=executor,
+        config=RunPoolConfig(global_concurrency=2, per_brand_concurrency=1),
+    )
+    try:
+        assert pool.dispatch() == 2
+        snapshot = pool.snapshot()
+        assert snapshot["in_flight_by_brand"] == {"b1": 1, "b2": 1}
+        assert snapshot["queue_depth_by_brand"] == {"b1": 4}
+        release.set()
+        assert pool.drain(timeout=10)
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+def test_runtime_defers_runs_to_pool_when_inline_execution_disabled(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    runtime = WorkflowRuntimeV2(
+        engine=engine,
+        workspace=Workspace(root=tmp_path / "runtime" / "vm"),
+        memory=MemoryIndex(root=tmp_path / "zvec"),
+        llm=None,
+        inline_execution=False,
+    )
+
+    with session_scope(engine) as session:
+        result = runtime.process_event(
+            session=session,
+            event_type="WorkflowRunRequested",
+            payload={
+                "run_id": "run-pool-1",
+                "thread_id": "t1",
+                "brand_id": "b1",
+                "project_id": "p1",
+                "request_text": "Plan",
+                "mode": "content_calendar",
+            },
+            actor_id="agent:vm-workflow",
+            causation_id="evt-1",
+            correlation_id="evt-1",
+        )
+    assert result == {"run_id": "run-pool-1", "status": "queued"}
+
+    pool = RunExecutionPool(engine=engine, executor=runtime.execute_queued_run)
+    try:
+        assert pool.drain(timeout=30)
+    finally:
+        pool.shutdown()
+
+    with session_scope(engine) as session:
+        run = get_run(session, "run-pool-1")
+        assert run is not None
+        assert run.status in {"completed", "waiting_approval"}
+
+
+def test_pool_loads_candidates_per_brand_past_a_large_backlog(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    _seed_runs(engine, "heavy", 30)
+    _seed_runs(engine, "light", 1)
+    order: list[str] = []
+
+    def executor(*, session, run_id, **_kwargs):
+        order.append(get_run(session, run_id).brand_id)
+        update_run_status(session, run_id=run_id, status="completed")
+        return {"run_id": run_id, "status": "completed"}
+
+    pool = RunExecutionPool(
+        engine=engine,
+        executor=executor,
+        config=RunPoolConfig(global_concurrency=1, per_brand_concurrency=1, per_brand_scan_limit=5),
+    )
+    try:
+        assert pool.dispatch() == 1
+        assert pool.snapshot()["queue_depth_by_brand"] == {"heavy": 29, "light": 1}
+        assert pool.drain(timeout=10)
+    finally:
+        pool.shutdown()
+
+    assert "light" in order[:2]
+    assert len(order) == 31
+
+
+def test_pool_waits_out_retry_backoff_before_readmitting(tmp_path: Path) -> None:
+    engine = build_engine(tmp_path / "db.sqlite3")
+    init_db(engine)
+    _seed_runs(engine, "b1", 1)
+    started: list[float] = []
+
+    def executor(*, session, run_id, **_kwargs):
+        started.append(time.monotonic())
+        if len(started) == 1:
+            update_run_status(session, run_id=run_id, status="queued")
+            return {"run_id": run_id, "status": "queued", "retry_delay_seconds": "0.3"}
+        update_run_status(session, run_id=run_id, status="completed")
+        return {"run_id": run_id, "status": "completed"}
+
+    pool = RunExecutionPool(engine=engine, executor=executor)
+    try:
+        assert pool.drain(timeout=10)
+    finally:
+        pool.shutdown()
+
+    assert len(started) == 2
+    assert started[1] - started[0] >= 0.3
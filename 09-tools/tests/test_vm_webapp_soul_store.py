@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import multiprocessing
+import os
 import threading
+import time
 from pathlib import Path
 
 import pytest
 
+from vm_webapp import soul_store
 from vm_webapp.soul_parser import SoulParseError, parse_and_validate
 from vm_webapp.soul_store import SoulStore
 from vm_webapp.soul_templates import required_sections, template_for
@@ -252,3 +255,87 @@ def test_cross_process_save_is_optimistically_locked(tmp_path: Path) -> None:
 
     latest = store.get_brand_soul("brand-001")
     assert latest.markdown in (markdown_a, markdown_b)
+
+
+def _age(path: Path, seconds: int = 60) -> None:
+    old = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(old, old))
+
+
+def test_reads_are_served_from_parsed_document_cache(tmp_path: Path, monkeypatch) -> None:
+    store = SoulStore(runtime_root=tmp_path)
+    path = store.get_brand_soul("brand-001").path
+    _age(path)
+    calls: list[str] = []
+    original = soul_store.parse_and_validate
+
+    def _counting_parse(*, level: str, markdown: str) -> dict[str, str]:
+        calls.append(level)
+        return original(level=level, markdown=markdown)
+
+    monkeypatch.setattr(soul_store, "parse_and_validate", _counting_parse)
+
+    first = store.get_brand_soul("brand-001")
+    second = SoulStore(runtime_root=tmp_path).get_brand_soul("brand-001")
+    assert second is first
+    assert first.recovered is False
+    assert len(calls) <= 1
+
+    path.write_text(_markdown_with_sections("Edited Soul", required_sections("brand")), encoding="utf-8")
+    edited = store.get_brand_soul("brand-001")
+    assert edited.markdown.startswith("# Edited Soul")
+    assert edited.version_hash != first.version_hash
+
+
+def test_recent_same_size_rewrite_is_caught_by_hash(tmp_path: Path) -> None:
+    store = SoulStore(runtime_root=tmp_path)
+    markdown_a = _markdown_with_sections("Brand Soul A", required_sections("brand"))
+    markdown_b = _markdown_with_sections("Brand Soul B", required_sections("brand"))
+    doc = store.get_brand_soul("brand-001")
+    store.save_brand_soul("brand-001", markdown_a, doc.version_hash)
+    stat = doc.path.stat()
+
+    doc.path.write_text(markdown_b, encoding="utf-8")
+    os.utime(doc.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert store.get_brand_soul("brand-001").markdown == markdown_b
+
+
+def test_concurrent_readers_share_the_lock_and_writers_wait(tmp_path: Path) -> None:
+    store = SoulStore(runtime_root=tmp_path)
+    doc = store.get_brand_soul("brand-001")
+    markdown = _markdown_with_sections("Brand Soul New", required_sections("brand"))
+    read_done = threading.Event()
+    write_done = threading.Event()
+
+    with soul_store._lock_for_path(doc.path, exclusive=False):
+        threading.Thread(
+            target=lambda: (store.get_brand_soul("brand-001"), read_done.set()), daemon=True
+        ).start()
+        assert read_done.wait(2)
+        threading.Thread(
+            target=lambda: (
+                store.save_brand_soul("brand-001", markdown, doc.version_hash),
+                write_done.set(),
+            ),
+            daemon=True,
+        ).start()
+        assert not write_done.wait(0.2)
+
+    assert write_done.wait(2)
+    assert store.get_brand_soul("brand-001").markdown == markdown
+
+
+def test_load_chain_resolves_all_levels(tmp_path: Path) -> None:
+    store = SoulStore(runtime_root=tmp_path)
+
+    chain = store.load_chain("brand-001", "proj-001", "thread-001")
+
+    assert [doc.level for doc in chain.documents()] == ["brand", "project", "thread"]
+    assert chain.thread.recovered is True
+    again = store.load_chain("brand-001", "proj-001", "thread-001")
+    assert again.thread.recovered is False
+    assert again.thread.version_hash == chain.thread.version_hash
+    assert store.load_chain("brand-001").documents() == [again.brand]
+    with pytest.raises(ValueError):
+        store.load_chain("brand-001", thread_id="thread-001")
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from vm_webapp.import_profile import profile_imports, total_seconds
+
+# Generous against the ~1.5s measured locally; override on slow runners.
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.environ.get("VM_STARTUP_IMPORT_BUDGET_SECONDS", "5.0"))
+
+FEATURE_ROUTER_MODULES = {
+    "_api_module",
+    "vm_webapp.api_agent_dag",
+    "vm_webapp.api_approval_optimizer",
+    "vm_webapp.api_onboarding",
+    "vm_webapp.api_onboarding_activation",
+    "vm_webapp.api_quality_optimizer",
+}
+
+
+def test_app_module_does_not_import_feature_routers() -> None:
+    timings = profile_imports("import vm_webapp.app")
+
+    imported = {item.module for item in timings}
+    assert "vm_webapp.app" in imported
+    assert imported & FEATURE_ROUTER_MODULES == set()
+
+
+def test_lazy_app_startup_stays_within_import_budget(tmp_path: Path) -> None:
+    root = tmp_path / "vm"
+    timings = profile_imports(
+        "from pathlib import Path\n"
+        "from vm_webapp.app import create_app\n"
+        "from vm_webapp.settings import Settings\n"
+        f"root = Path({str(root)!r})\n"
+        "create_app(Settings(vm_workspace_root=root, vm_db_path=root / 'db.sqlite3',"
+        " vm_lazy_routers=True), enable_in_process_worker=False)\n"
+    )
+
+    assert {item.module for item in timings} & FEATURE_ROUTER_MODULES == set()
+    assert total_seconds(timings) < STARTUP_IMPORT_BUDGET_SECONDS
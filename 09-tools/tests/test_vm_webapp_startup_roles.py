@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import vm_webapp.__main__ as cli_main
+from vm_webapp import orchestrator_v2
+from vm_webapp.app import create_app
+from vm_webapp.bootstrap import StartupPhases, build_runtime, open_database
+from vm_webapp.db import SchemaNotReadyError
+from vm_webapp.settings import Settings
+
+
+def _settings(tmp_path: Path, **overrides) -> Settings:
+    return Settings(
+        vm_workspace_root=tmp_path / "runtime" / "vm",
+        vm_db_path=tmp_path / "runtime" / "vm" / "workspace.sqlite3",
+        **overrides,
+    )
+
+
+def test_api_role_skips_worker_subsystems_and_reports_startup_phases(tmp_path: Path) -> None:
+    app = create_app(_settings(tmp_path, vm_role="api", vm_run_pool_enabled=True))
+
+    assert app.state.event_worker is None
+    assert app.state.run_pool is None
+    assert app.state.run_engine is not None
+
+    payload = TestClient(app).get("/api/v2/health/ready").json()
+    assert payload["status"] == "ready"
+    assert payload["dependencies"]["worker"] == {"status": "ok", "mode": "external"}
+    startup = payload["startup"]
+    assert startup["role"] == "api"
+    assert list(startup["phases_ms"]) == ["app", "database", "stores", "runtime", "worker", "routers"]
+    assert startup["total_ms"] == pytest.approx(sum(startup["phases_ms"].values()), abs=0.01)
+    assert startup["memory_loaded"] is False
+
+
+def test_all_role_keeps_in_process_worker(tmp_path: Path) -> None:
+    app = create_app(_settings(tmp_path, vm_run_pool_enabled=True))
+
+    payload = TestClient(app).get("/api/v2/health/ready").json()
+
+    assert app.state.event_worker is not None
+    assert app.state.run_pool is not None
+    assert payload["dependencies"]["worker"]["mode"] == "in_process"
+    assert payload["startup"]["role"] == "all"
+    assert "run_pool" in payload["startup"]["phases_ms"]
+
+
+def test_worker_role_builds_runtime_without_http_layer(tmp_path: Path) -> None:
+    settings = _settings(tmp_path, vm_role="worker", vm_run_pool_enabled=True)
+    with pytest.raises(ValueError, match="worker role has no HTTP app"):
+        create_app(settings)
+
+    phases = StartupPhases("worker")
+    services = build_runtime(settings, open_database(settings, phases), phases=phases)
+
+    assert services.run_engine is None
+    assert services.run_pool is not None
+    assert orchestrator_v2._workflow_executor == services.workflow_runtime.process_event
+    assert list(phases.snapshot()["phases_ms"]) == ["database", "stores", "runtime", "run_pool"]
+
+
+def test_read_replica_refuses_to_run_ddl(tmp_path: Path) -> None:
+    with pytest.raises(SchemaNotReadyError):
+        create_app(_settings(tmp_path, vm_role="api", vm_db_auto_migrate=False))
+
+    create_app(_settings(tmp_path))
+    replica = create_app(_settings(tmp_path, vm_role="api", vm_db_auto_migrate=False))
+    assert replica.state.startup.snapshot()["role"] == "api"
+
+
+def test_serve_role_worker_runs_worker_loop(monkeypatch) -> None:
+    uvicorn_run = MagicMock()
+    worker_calls: list[int] = []
+    monkeypatch.setattr(cli_main.uvicorn, "run", uvicorn_run)
+    monkeypatch.setattr(
+        cli_main,
+        "run_worker",
+        lambda *, poll_interval_ms: worker_calls.append(poll_interval_ms) or 0,
+    )
+    # run_serve exports VM_ROLE for the uvicorn factory; restored on teardown.
+    monkeypatch.setenv("VM_ROLE", "all")
+
+    assert cli_main.main(["serve", "--role", "worker"]) == 0
+    assert worker_calls == [500]
+    uvicorn_run.assert_not_called()
+
+    assert cli_main.main(["serve", "--role", "api"]) == 0
+    uvicorn_run.assert_called_once()
+    with pytest.raises(ValueError):
+        Settings(vm_role="replica")
+
+
+def test_app_shutdown_stops_run_pool_and_stage_output_workers(tmp_path: Path) -> None:
+    app = create_app(
+        _settings(tmp_path, vm_run_pool_enabled=True, vm_stage_output_workers=1),
+        enable_in_process_worker=False,
+    )
+
+    with TestClient(app):
+        assert app.state.run_pool._closed is False
+
+    assert app.state.run_pool._closed is True
+    with pytest.raises(RuntimeError):
+        app.state.stage_output_executor.submit(int)
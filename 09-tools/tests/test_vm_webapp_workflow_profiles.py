@@ -48,3 +48,15 @@ def test_resolve_workflow_plan_uses_foundation_effective_mode_when_forced() -> N
     assert resolved["effective_mode"] == "foundation_stack"
     assert resolved["fallback_applied"] is True
     assert resolved["profile_version"] == "v1"
+
+
+def test_load_workflow_profiles_is_served_from_registry() -> None:
+    first = load_workflow_profiles(DEFAULT_PROFILES_PATH)
+    second = load_workflow_profiles(DEFAULT_PROFILES_PATH)
+
+    assert first is not second
+    assert first["plan_90d"] is second["plan_90d"]
+    keys = [stage.key for stage in first["plan_90d"].stages]
+    assert first["plan_90d"].stage_index == {key: pos for pos, key in enumerate(keys)}
+    assert first["plan_90d"].next_stage_key(keys[0]) == keys[1]
+    assert first["plan_90d"].next_stage_key(keys[-1]) is None
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import os
 from typing import Sequence
 
 import uvicorn
 
 from vm_webapp.event_worker import run_worker_loop
-from vm_webapp.settings import Settings
+from vm_webapp.settings import ROLE_ALL, ROLE_API, ROLE_WORKER, Settings
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -16,25 +17,193 @@ def build_parser() -> argparse.ArgumentParser:
     serve = subparsers.add_parser("serve", help="Run the VM Web App server")
     serve.add_argument("--host", default="127.0.0.1")
     serve.add_argument("--port", type=int, default=8766)
+    serve.add_argument(
+        "--role",
+        choices=[ROLE_API, ROLE_WORKER, ROLE_ALL],
+        default=None,
+        help="api: HTTP only; worker: events and runs only; all: both (default: VM_ROLE)",
+    )
 
     worker = subparsers.add_parser("worker", help="Run background event worker")
     worker.add_argument("--poll-interval-ms", type=int, default=500)
+
+    rollups = subparsers.add_parser(
+        "rebuild-onboarding-rollups", help="Recompute onboarding telemetry rollups"
+    )
+    rollups.add_argument(
+        "--since-days",
+        type=int,
+        default=None,
+        help="Only rebuild the last N days (default: everything)",
+    )
+
+    export = subparsers.add_parser(
+        "export-columnar", help="Export ops tables as date/brand partitioned Parquet"
+    )
+    export.add_argument("--out", required=True, help="Export root directory")
+    export.add_argument(
+        "--since-days",
+        type=int,
+        default=None,
+        help="Only replace partitions from the last N days (default: full export)",
+    )
+    export.add_argument(
+        "--format",
+        choices=["parquet", "csv"],
+        default=None,
+        help="Partition file format (default: parquet when available, else csv)",
+    )
+    export.add_argument(
+        "--table",
+        action="append",
+        dest="tables",
+        default=None,
+        help="Table to export (repeatable; default: all)",
+    )
+
+    backfill = subparsers.add_parser(
+        "backfill-quality-scores", help="Rescore historical runs into the quality score cache"
+    )
+    backfill.add_argument("--rubric-version", default="v1")
+    backfill.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Scoring processes (default: one per core; 1 runs inline)",
+    )
+    backfill.add_argument("--batch-size", type=int, default=200)
+    backfill.add_argument(
+        "--force",
+        action="store_true",
+        help="Replace cached scores instead of keeping existing rows",
+    )
+
+    profile = subparsers.add_parser(
+        "profile-imports", help="Report import time of app startup (python -X importtime)"
+    )
+    profile.add_argument(
+        "--statement",
+        default=None,
+        help="Python statement to profile (default: import vm_webapp.app)",
+    )
+    profile.add_argument("--top", type=int, default=25, help="Modules to list")
     return parser
 
 
+def run_serve(*, host: str, port: int, role: str | None) -> int:
+    if role is not None:
+        # create_app runs in uvicorn's factory call and reads the role from Settings.
+        os.environ["VM_ROLE"] = role
+    if (role or Settings().vm_role) == ROLE_WORKER:
+        return run_worker(poll_interval_ms=500)
+    uvicorn.run("vm_webapp.app:create_app", factory=True, host=host, port=port)
+    return 0
+
+
 def run_worker(*, poll_interval_ms: int) -> int:
     settings = Settings()
     run_worker_loop(settings=settings, poll_interval_ms=poll_interval_ms)
     return 0
 
 
+def run_rebuild_onboarding_rollups(*, since_days: int | None) -> int:
+    from datetime import datetime, timedelta, timezone
+
+    from vm_webapp.db import build_engine, init_db, session_scope
+    from vm_webapp.onboarding_rollups import rebuild_rollups
+
+    settings = Settings()
+    engine = build_engine(settings.vm_db_path, db_url=settings.vm_db_url)
+    init_db(engine)
+    since = (
+        datetime.now(timezone.utc) - timedelta(days=since_days)
+        if since_days is not None
+        else None
+    )
+    with session_scope(engine) as session:
+        folded = rebuild_rollups(session, since=since)
+    print(f"onboarding rollups rebuilt from {folded} events")
+    return 0
+
+
+def run_export_columnar(
+    *, out: str, since_days: int | None, fmt: str | None, tables: list[str] | None
+) -> int:
+    from datetime import datetime, timedelta, timezone
+    from pathlib import Path
+
+    from vm_webapp.db import build_engine, init_db
+    from vm_webapp.ops_columnar import export_columnar
+
+    settings = Settings()
+    engine = build_engine(settings.vm_db_path, db_url=settings.vm_db_url)
+    init_db(engine)
+    since = (
+        datetime.now(timezone.utc) - timedelta(days=since_days)
+        if since_days is not None
+        else None
+    )
+    manifest = export_columnar(engine, Path(out), tables=tables, since=since, fmt=fmt)
+    for name, stats in manifest["tables"].items():
+        print(f"{name}: {stats['rows']} rows in {stats['partitions']} partitions ({manifest['format']})")
+    return 0
+
+
+def run_backfill_quality_scores(
+    *, rubric_version: str, workers: int | None, batch_size: int, force: bool
+) -> int:
+    from vm_webapp.blob_store import existing_blob_store
+    from vm_webapp.db import build_engine, init_db
+    from vm_webapp.quality_eval import backfill_quality_scores
+
+    settings = Settings()
+    engine = build_engine(settings.vm_db_path, db_url=settings.vm_db_url)
+    init_db(engine)
+    blob_store = existing_blob_store(settings.vm_workspace_root / "cas")
+    stats = backfill_quality_scores(
+        engine,
+        workspace_root=settings.vm_workspace_root,
+        rubric_version=rubric_version,
+        blob_store=blob_store,
+        workers=workers,
+        batch_size=batch_size,
+        replace=force,
+    )
+    print(
+        f"quality scores: {stats['runs']} runs, {stats['documents']} distinct documents, "
+        f"{stats['stored']} rows written"
+    )
+    return 0
+
+
+def run_profile_imports(*, statement: str | None, top: int) -> int:
+    from vm_webapp.import_profile import DEFAULT_STATEMENT, format_report, profile_imports
+
+    print(format_report(profile_imports(statement or DEFAULT_STATEMENT), top=top))
+    return 0
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     args = build_parser().parse_args(list(argv) if argv is not None else None)
     if args.command == "serve":
-        uvicorn.run("vm_webapp.app:create_app", factory=True, host=args.host, port=args.port)
-        return 0
+        return run_serve(host=args.host, port=args.port, role=args.role)
     if args.command == "worker":
         return run_worker(poll_interval_ms=args.poll_interval_ms)
+    if args.command == "rebuild-onboarding-rollups":
+        return run_rebuild_onboarding_rollups(since_days=args.since_days)
+    if args.command == "export-columnar":
+        return run_export_columnar(
+            out=args.out, since_days=args.since_days, fmt=args.format, tables=args.tables
+        )
+    if args.command == "backfill-quality-scores":
+        return run_backfill_quality_scores(
+            rubric_version=args.rubric_version,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            force=args.force,
+        )
+    if args.command == "profile-imports":
+        return run_profile_imports(statement=args.statement, top=args.top)
     return 1
 
 
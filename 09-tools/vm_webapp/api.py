@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-from typing import Optional
+from collections.abc import Callable, Iterator
+from functools import partial
+from typing import BinaryIO, Optional
+import io
 import json
 import logging
+import mimetypes
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException, Header, Request
-from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import text
 
+from vm_webapp.artifacts import find_manifest_artifact, load_stage_manifest
 from vm_webapp.commands_v2 import (
     add_comment_command,
     add_thread_mode_command,
@@ -80,7 +85,7 @@ from vm_webapp.editorial_policy import (
     create_evaluator_from_session,
 )
 from vm_webapp.observability import render_prometheus
-from vm_webapp.stacking import build_context_pack
+from vm_webapp.stacking import pack_context
 
 
 router = APIRouter()
@@ -887,9 +892,8 @@ def list_workflow_run_artifacts_v2(run_id: str, request: Request) -> dict[str, o
     stages: list[dict[str, object]] = []
     if root.exists():
         for stage_dir in sorted(root.iterdir()):
-            manifest = stage_dir / "manifest.json"
-            if manifest.exists():
-                payload = json.loads(manifest.read_text(encoding="utf-8"))
+            payload = load_stage_manifest(stage_dir)
+            if payload is not None:
                 payload["stage_dir"] = stage_dir.name
                 stages.append(payload)
     return {"run_id": run_id, "stages": stages}
@@ -919,9 +923,8 @@ def get_workflow_run_v2(run_id: str, request: Request) -> dict[str, object]:
     stages_root = run_root / "stages"
     if stages_root.exists():
         for stage_dir in sorted(stages_root.iterdir()):
-            manifest_path = stage_dir / "manifest.json"
-            if manifest_path.exists():
-                payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+            payload = load_stage_manifest(stage_dir)
+            if payload is not None:
                 payload["stage_dir"] = stage_dir.name
                 manifests_by_stage[str(payload.get("stage_key", ""))] = payload
 
@@ -1087,6 +1090,8 @@ def evaluate_workflow_run_quality_v2(
         workspace_root=Path(request.app.state.workspace.root),
         depth=depth,
         rubric_version=rubric_version,
+        blob_store=getattr(request.app.state, "blob_store", None),
+        engine=request.app.state.engine,
     )
 
 
@@ -1109,10 +1114,9 @@ def resume_workflow_run_v2(run_id: str, request: Request) -> dict[str, str]:
     }
 
 
-@router.get("/api/v2/workflow-runs/{run_id}/artifact-content")
-def get_workflow_artifact_content_v2(
-    run_id: str, stage_dir: str, artifact_path: str, request: Request
-) -> dict[str, str]:
+def _resolve_stage_artifact(
+    request: Request, run_id: str, stage_dir: str, artifact_path: str
+) -> tuple[Path, Path, dict[str, object] | None]:
     root = Path(request.app.state.workspace.root) / "runs" / run_id / "stages" / stage_dir
     if not root.exists():
         raise HTTPException(status_code=404, detail="stage not found")
@@ -1120,14 +1124,120 @@ def get_workflow_artifact_content_v2(
     root_resolved = root.resolve()
     if root_resolved not in target.parents and target != root_resolved:
         raise HTTPException(status_code=400, detail="invalid artifact path")
-    if not target.exists():
+    return root, target, find_manifest_artifact(root, artifact_path)
+
+
+def _artifact_etag(item: dict[str, object] | None) -> str | None:
+    if item is None or not item.get("sha256"):
+        return None
+    return f'"{item["sha256"]}"'
+
+
+def _etag_matches(request: Request, etag: str | None) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header or etag is None:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _blob_for_item(request: Request, item: dict[str, object] | None):
+    blob_store = getattr(request.app.state, "blob_store", None)
+    if blob_store is None or item is None or not isinstance(item.get("blob"), dict):
+        return None
+    return blob_store
+
+
+# Streamed artifact bodies go out in chunks of this many characters
+# (artifact-content) or bytes (decompressed artifact-raw blobs).
+ARTIFACT_STREAM_CHUNK = 64 * 1024
+
+
+@router.get("/api/v2/workflow-runs/{run_id}/artifact-content")
+def get_workflow_artifact_content_v2(
+    run_id: str, stage_dir: str, artifact_path: str, request: Request
+) -> Response:
+    """Artifact body wrapped in JSON, streamed so large artifacts are never buffered."""
+    root, target, item = _resolve_stage_artifact(request, run_id, stage_dir, artifact_path)
+    etag = _artifact_etag(item)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    open_body: Callable[[], BinaryIO]
+    if target.exists():
+        open_body = partial(target.open, "rb")
+    else:
+        blob_store = _blob_for_item(request, item)
+        if blob_store is None:
+            raise HTTPException(status_code=404, detail="artifact not found")
+        sha256 = str(item["blob"]["sha256"])
+        if not blob_store.exists(sha256):
+            raise HTTPException(status_code=404, detail="artifact not found")
+        open_body = partial(blob_store.open, sha256)
+    envelope = {"run_id": run_id, "stage_dir": stage_dir, "artifact_path": artifact_path}
+    return StreamingResponse(
+        _stream_json_content(envelope, open_body),
+        media_type="application/json",
+        headers={"ETag": etag} if etag else None,
+    )
+
+
+def _stream_json_content(
+    envelope: dict[str, str], open_body: Callable[[], BinaryIO]
+) -> Iterator[bytes]:
+    # Same document JSONResponse would build, with "content" as the last key:
+    # everything up to its opening quote, the escaped text chunk by chunk, then
+    # the closing quote and brace.
+    head = json.dumps({**envelope, "content": ""}, ensure_ascii=False, separators=(",", ":"))
+    yield head[:-2].encode("utf-8")
+    with io.TextIOWrapper(open_body(), encoding="utf-8") as body:
+        while chunk := body.read(ARTIFACT_STREAM_CHUNK):
+            yield json.dumps(chunk, ensure_ascii=False)[1:-1].encode("utf-8")
+    yield b'"}'
+
+
+@router.get("/api/v2/workflow-runs/{run_id}/artifact-raw")
+def get_workflow_artifact_raw_v2(
+    run_id: str, stage_dir: str, artifact_path: str, request: Request
+) -> Response:
+    """Serve an artifact body as a file: sendfile, Range and strong ETag from the manifest."""
+    root, target, item = _resolve_stage_artifact(request, run_id, stage_dir, artifact_path)
+    etag = _artifact_etag(item)
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    headers = {"Cache-Control": "private, no-cache"}
+    if etag:
+        headers["ETag"] = etag
+    if target.exists():
+        return FileResponse(target, headers=headers, media_type=_media_type_for(artifact_path))
+
+    blob_store = _blob_for_item(request, item)
+    if blob_store is None:
         raise HTTPException(status_code=404, detail="artifact not found")
-    return {
-        "run_id": run_id,
-        "stage_dir": stage_dir,
-        "artifact_path": artifact_path,
-        "content": target.read_text(encoding="utf-8"),
-    }
+    blob = item["blob"]
+    blob_path = blob_store.path_for(str(blob["sha256"]))
+    if blob_path is None:
+        raise HTTPException(status_code=404, detail="artifact not found")
+    if blob_path.suffix != ".zst":
+        return FileResponse(blob_path, headers=headers, media_type=_media_type_for(artifact_path))
+    # Compressed blobs cannot be sent zero-copy; decompress while streaming.
+    return StreamingResponse(
+        _iter_stream(blob_store.open(str(blob["sha256"]))),
+        media_type=_media_type_for(artifact_path),
+        headers=headers,
+    )
+
+
+def _iter_stream(stream: BinaryIO) -> Iterator[bytes]:
+    with stream:
+        while chunk := stream.read(ARTIFACT_STREAM_CHUNK):
+            yield chunk
+
+
+def _media_type_for(artifact_path: str) -> str:
+    media_type, _ = mimetypes.guess_type(artifact_path)
+    if media_type is None and artifact_path.endswith(".md"):
+        return "text/markdown"
+    return media_type or "application/octet-stream"
 
 
 @router.get("/api/v2/threads/{thread_id}/timeline")
@@ -1508,6 +1618,7 @@ def chat(payload: ChatRequest, request: Request) -> dict[str, str]:
         {
             "title": str(hit.meta.get("title", hit.doc_id)),
             "text": hit.text,
+            "score": hit.score,
         }
         for hit in retrieved_hits
     ]
@@ -1517,7 +1628,7 @@ def chat(payload: ChatRequest, request: Request) -> dict[str, str]:
     soul_md = soul_path.read_text(encoding="utf-8") if soul_path.exists() else ""
     essence_md = essence_path.read_text(encoding="utf-8") if essence_path.exists() else ""
 
-    context = build_context_pack(
+    context = pack_context(
         brand_soul_md=soul_md,
         product_essence_md=essence_md,
         retrieved=retrieved,
@@ -1526,7 +1637,7 @@ def chat(payload: ChatRequest, request: Request) -> dict[str, str]:
     )
 
     messages = [
-        {"role": "system", "content": context},
+        {"role": "system", "content": context.text},
         {"role": "user", "content": payload.message},
     ]
     assistant_message = "(llm not configured)"
@@ -1565,6 +1676,7 @@ def chat(payload: ChatRequest, request: Request) -> dict[str, str]:
                     "brand_id": payload.brand_id,
                     "product_id": payload.product_id,
                     "thread_id": payload.thread_id,
+                    "context_prefix_hash": context.prefix_hash,
                 },
                 ensure_ascii=False,
             )
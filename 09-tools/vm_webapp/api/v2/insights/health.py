@@ -31,20 +31,36 @@ async def health_ready_v2(request: Request) -> dict[str, object]:
     except Exception:
         db_status = "error"
     
-    is_ready = db_status == "ok"
-    
-    return {
+    worker = getattr(request.app.state, "event_worker", None)
+    worker_mode = getattr(
+        request.app.state,
+        "worker_mode",
+        "in_process" if worker is not None else "external",
+    )
+    worker_status = "missing" if worker_mode == "in_process" and worker is None else "ok"
+    is_ready = db_status == "ok" and worker_status == "ok"
+
+    payload: dict[str, object] = {
         "status": "ready" if is_ready else "not_ready",
         "dependencies": {
             "database": {
                 "status": db_status,
             },
             "worker": {
-                "status": "ok",
-                "mode": "in_process",
+                "status": worker_status,
+                "mode": str(worker_mode),
             },
         },
     }
+    # Startup phase timings (role, per-phase ms) recorded by create_app.
+    startup = getattr(request.app.state, "startup", None)
+    if startup is not None:
+        memory = getattr(request.app.state, "memory", None)
+        payload["startup"] = {
+            **startup.snapshot(),
+            "memory_loaded": bool(getattr(memory, "loaded", True)),
+        }
+    return payload
 
 
 @router.get("/metrics")
@@ -77,4 +93,14 @@ async def metrics_v2(request: Request) -> dict[str, object]:
             row[0]: row[1] for row in runs_by_status
         }
     
+    # Run execution pool: queue depth, in-flight and wait-time per brand
+    run_pool = getattr(request.app.state, "run_pool", None)
+    if run_pool is not None:
+        metrics["run_pool"] = run_pool.snapshot()
+
+    # Onboarding telemetry write buffer: pending rows, rejections and flushes
+    onboarding_event_buffer = getattr(request.app.state, "onboarding_event_buffer", None)
+    if onboarding_event_buffer is not None:
+        metrics["onboarding_event_buffer"] = onboarding_event_buffer.snapshot()
+    
     return metrics
@@ -229,19 +229,32 @@ async def list_workflow_run_artifacts_v2(
         if run is None:
             raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
     
-    # Read artifacts from filesystem
+    from vm_webapp.artifacts import load_stage_manifest
+
+    # Stage files are on disk; artifact bodies may live only in the CAS, so
+    # they are listed from the stage manifest.
     run_root = Path(request.app.state.workspace.root) / "runs" / run_id / "stages"
     artifacts = []
     
     if run_root.exists():
-        for stage_dir in run_root.iterdir():
-            if stage_dir.is_dir():
-                for artifact_file in stage_dir.iterdir():
-                    if artifact_file.is_file():
-                        artifacts.append({
-                            "stage": stage_dir.name,
-                            "name": artifact_file.name,
-                            "path": str(artifact_file.relative_to(run_root)),
-                        })
+        for stage_dir in sorted(run_root.iterdir()):
+            if not stage_dir.is_dir():
+                continue
+            for stage_file in sorted(stage_dir.iterdir()):
+                if stage_file.is_file():
+                    artifacts.append({
+                        "stage": stage_dir.name,
+                        "name": stage_file.name,
+                        "path": str(stage_file.relative_to(run_root)),
+                    })
+            manifest = load_stage_manifest(stage_dir) or {}
+            for item in manifest.get("artifacts", []):
+                if isinstance(item, dict) and item.get("path"):
+                    artifact_path = Path(stage_dir.name) / str(item["path"])
+                    artifacts.append({
+                        "stage": stage_dir.name,
+                        "name": artifact_path.name,
+                        "path": str(artifact_path),
+                    })
     
     return {"artifacts": artifacts}
@@ -10,13 +10,16 @@ CHANGELOG v23:
 - Added /optimizer/batch/{id}/approve|reject|expand - Batch actions
 - Added /optimizer/freeze|unfreeze - Emergency controls
 - Metrics: approval_batches_created_total, approval_human_minutes_saved_total
+
+- /optimizer/queue accepts ?limit= for top-k reads from the indexed heap
+- Added /optimizer/request/{id}/complete - Evict a resolved request
 """
 
 from __future__ import annotations
 
 from typing import Any, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, Field
 
 from vm_webapp.approval_optimizer import ApprovalOptimizer
@@ -72,9 +75,11 @@ class BrandFreezeResponse(BaseModel):
 
 
 @router.get("/api/v2/optimizer/queue")
-def get_optimizer_queue() -> list[dict[str, Any]]:
+def get_optimizer_queue(
+    limit: int = Query(default=100, ge=1, le=1000),
+) -> list[dict[str, Any]]:
     """Retorna fila priorizada de aprovações."""
-    return _optimizer.get_queue()
+    return _optimizer.get_queue(limit=limit)
 
 
 @router.post("/api/v2/optimizer/request")
@@ -90,6 +95,14 @@ def add_optimizer_request(request: AddRequestInput) -> dict[str, Any]:
     return result
 
 
+@router.post("/api/v2/optimizer/request/{request_id}/complete")
+def complete_optimizer_request(request_id: str) -> dict[str, Any]:
+    """Remove da fila um request já resolvido."""
+    if not _optimizer.complete_request(request_id):
+        raise HTTPException(status_code=404, detail=f"Request not queued: {request_id}")
+    return {"request_id": request_id, "status": "completed"}
+
+
 @router.get("/api/v2/optimizer/batches")
 def get_optimizer_batches() -> dict[str, Any]:
     """Retorna lotes existentes."""
@@ -2,12 +2,13 @@
 
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from uuid import uuid4
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from fastapi import APIRouter, HTTPException, Query, Request
 
 from vm_webapp.db import session_scope
-from vm_webapp.models_onboarding import OnboardingEvent, OnboardingFrictionPoint, OnboardingState
+from vm_webapp.models_onboarding import OnboardingFrictionPoint, OnboardingState
+from vm_webapp.onboarding_ingest import build_event_row, insert_event_rows
+from vm_webapp.onboarding_rollups import RollupAggregate, load_window, merge_by
 
 # v40: Import progress save/resume functionality
 from vm_webapp.onboarding_progress import (
@@ -150,6 +151,8 @@ FIRST_SUCCESS_TEMPLATES = [
 
 RECOMMENDED_TEMPLATE_ID = "blog-post"
 
+MAX_EVENT_BATCH_SIZE = 1000
+
 
 # Pydantic models
 class OnboardingStateSchema(BaseModel):
@@ -174,6 +177,16 @@ class OnboardingEventSchema(BaseModel):
     metadata: Optional[Dict[str, Any]] = None
 
 
+class OnboardingEventBatchSchema(BaseModel):
+    events: List[OnboardingEventSchema] = Field(..., min_length=1, max_length=MAX_EVENT_BATCH_SIZE)
+
+
+class EventBatchResponse(BaseModel):
+    success: bool
+    accepted: int
+    buffered: bool
+
+
 class OnboardingMetrics(BaseModel):
     total_started: int
     total_completed: int
@@ -291,26 +304,34 @@ async def get_template(template_id: str) -> dict:
 
 
 # Events endpoints
+def _ingest_event_rows(request: Request, rows: List[Dict[str, Any]]) -> bool:
+    """Hand rows to the write buffer when enabled, else insert them now.
+
+    Returns True when the rows were buffered. Raises 429 when the buffer is full.
+    """
+    buffer = getattr(request.app.state, "onboarding_event_buffer", None)
+    if buffer is None:
+        insert_event_rows(request.app.state.engine, rows)
+        return False
+    if not buffer.offer(rows):
+        raise HTTPException(
+            status_code=429,
+            detail="Onboarding event buffer is full, retry later",
+            headers={"Retry-After": "1"},
+        )
+    return True
+
+
+def _flush_event_buffer(request: Request) -> None:
+    buffer = getattr(request.app.state, "onboarding_event_buffer", None)
+    if buffer is not None:
+        buffer.flush()
+
+
 @router.post("/events")
-async def track_event(event: OnboardingEventSchema, request: Request = None) -> EventResponse:
+def track_event(event: OnboardingEventSchema, request: Request = None) -> EventResponse:
     """Track an onboarding event."""
-    engine = request.app.state.engine
-    event_id = str(uuid4())
-    
-    with session_scope(engine) as session:
-        db_event = OnboardingEvent(
-            event_id=event_id,
-            event_type=event.event,
-            user_id=event.user_id,
-            brand_id=event.brand_id,
-            session_id=event.session_id,
-            step=event.step,
-            template_id=event.template_id,
-            duration_ms=event.duration_ms,
-            metadata=event.metadata or {},
-            created_at=datetime.now(timezone.utc),
-        )
-        session.add(db_event)
+    _ingest_event_rows(request, [build_event_row(event.model_dump())])
     
     return EventResponse(
         success=True,
@@ -319,6 +340,15 @@ async def track_event(event: OnboardingEventSchema, request: Request = None) ->
     )
 
 
+@router.post("/events/batch")
+def track_events_batch(batch: OnboardingEventBatchSchema, request: Request = None) -> EventBatchResponse:
+    """Track a burst of onboarding events with a single bulk insert."""
+    rows = [build_event_row(event.model_dump()) for event in batch.events]
+    buffered = _ingest_event_rows(request, rows)
+    
+    return EventBatchResponse(success=True, accepted=len(rows), buffered=buffered)
+
+
 # Metrics endpoints
 @router.get("/metrics")
 async def get_metrics(
@@ -328,39 +358,40 @@ async def get_metrics(
 ) -> OnboardingMetrics:
     """Get onboarding funnel metrics."""
     engine = request.app.state.engine
+    _flush_event_buffer(request)
     
     with session_scope(engine) as session:
         from datetime import timedelta
-        from sqlalchemy import func
         
         since = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Build base query
-        query = session.query(OnboardingEvent).filter(OnboardingEvent.created_at >= since)
-        if brand_id:
-            query = query.filter(OnboardingEvent.brand_id == brand_id)
-        
-        events = query.all()
-        
-        # Calculate metrics
-        started_events = [e for e in events if e.event_type == "onboarding_started"]
-        completed_events = [e for e in events if e.event_type == "onboarding_completed"]
-        ttfv_events = [e for e in events if e.event_type == "time_to_first_value"]
-        dropoff_events = [e for e in events if e.event_type == "onboarding_dropoff"]
+        # Answered from hourly/daily rollups, not from every event in the window
+        window = load_window(
+            session,
+            since=since,
+            brand_id=brand_id,
+            event_types=[
+                "onboarding_started",
+                "onboarding_completed",
+                "time_to_first_value",
+                "onboarding_dropoff",
+            ],
+        )
+        by_type = merge_by(window, group="event_type")
+        empty = RollupAggregate()
         
-        total_started = len(started_events)
-        total_completed = len(completed_events)
+        total_started = by_type.get("onboarding_started", empty).event_count
+        total_completed = by_type.get("onboarding_completed", empty).event_count
         completion_rate = total_completed / total_started if total_started > 0 else 0.0
         
         # Calculate average TTFV
-        ttfv_durations = [e.duration_ms for e in ttfv_events if e.duration_ms]
-        avg_ttfv = sum(ttfv_durations) / len(ttfv_durations) if ttfv_durations else 0.0
+        ttfv = by_type.get("time_to_first_value", empty)
+        avg_ttfv = ttfv.duration_sum_ms / ttfv.duration_count if ttfv.duration_count else 0.0
         
         # Calculate dropoffs by step
         dropoff_by_step: Dict[str, int] = {}
-        for event in dropoff_events:
-            step = event.step or "unknown"
-            dropoff_by_step[step] = dropoff_by_step.get(step, 0) + 1
+        for step, aggregate in merge_by(window, event_type="onboarding_dropoff", group="step").items():
+            dropoff_by_step[step or "unknown"] = aggregate.event_count
     
     return OnboardingMetrics(
         total_started=total_started,
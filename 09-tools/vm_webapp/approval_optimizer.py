@@ -9,13 +9,33 @@ Otimização de custo de aprovação humana para medium/high risk via:
 
 from __future__ import annotations
 
+import heapq
 import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
 from uuid import uuid4
 
 
+# Campos que alimentam refine_risk/calculate_priority; mudanças em outros
+# campos não exigem recálculo do score.
+PRIORITY_INPUT_FIELDS = frozenset(
+    {
+        "risk_level",
+        "node_type",
+        "params",
+        "impact_score",
+        "business_impact",
+        "urgency",
+        "urgency_hours",
+        "wait_time_seconds",
+    }
+)
+
+# Status que encerram um request e o removem da fila.
+TERMINAL_STATUSES = frozenset({"approved", "rejected", "expired", "completed"})
+
+
 class RiskLevel:
     """Níveis de risco."""
 
@@ -279,6 +299,143 @@ class PriorityScorer:
         )
 
 
+class IndexedPriorityQueue:
+    """Heap binário indexado (min-heap por sort key) com mapa de posições.
+
+    Inserção, atualização e remoção por id custam O(log n); ``top_k`` lê os
+    k primeiros sem alterar o heap em O(k log k).
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[tuple[Any, ...], str]] = []
+        self._position: dict[str, int] = {}
+        self._items: dict[str, dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._position
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        return iter(self._items.values())
+
+    def get(self, item_id: str) -> Optional[dict[str, Any]]:
+        return self._items.get(item_id)
+
+    def push(self, item_id: str, sort_key: tuple[Any, ...], item: dict[str, Any]) -> None:
+        """Insere ou atualiza ``item_id``."""
+        if item_id in self._position:
+            self.update(item_id, sort_key, item)
+            return
+        self._items[item_id] = item
+        self._heap.append((sort_key, item_id))
+        self._position[item_id] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def update(self, item_id: str, sort_key: tuple[Any, ...], item: dict[str, Any]) -> None:
+        index = self._position[item_id]
+        previous = self._heap[index][0]
+        self._items[item_id] = item
+        self._heap[index] = (sort_key, item_id)
+        if sort_key < previous:
+            self._sift_up(index)
+        elif sort_key > previous:
+            self._sift_down(index)
+
+    def remove(self, item_id: str) -> Optional[dict[str, Any]]:
+        index = self._position.pop(item_id, None)
+        if index is None:
+            return None
+        item = self._items.pop(item_id)
+        last = self._heap.pop()
+        if index < len(self._heap):
+            self._heap[index] = last
+            self._position[last[1]] = index
+            self._sift_down(index)
+            self._sift_up(index)
+        return item
+
+    def pop(self) -> Optional[dict[str, Any]]:
+        if not self._heap:
+            return None
+        return self.remove(self._heap[0][1])
+
+    def pop_top_k(self, k: int) -> list[dict[str, Any]]:
+        result: list[dict[str, Any]] = []
+        while self._heap and len(result) < k:
+            item = self.pop()
+            assert item is not None  # o heap não está vazio
+            result.append(item)
+        return result
+
+    def iter_ordered(self) -> Iterator[dict[str, Any]]:
+        """Percorre os itens em ordem sob demanda: O(log k) por item lido."""
+        frontier: list[tuple[tuple[Any, ...], int]] = []
+        if self._heap:
+            frontier.append((self._heap[0][0], 0))
+        while frontier:
+            _, index = heapq.heappop(frontier)
+            yield self._items[self._heap[index][1]]
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(self._heap):
+                    heapq.heappush(frontier, (self._heap[child][0], child))
+
+    def top_k(
+        self,
+        k: Optional[int] = None,
+        *,
+        where: Optional[Callable[[dict[str, Any]], bool]] = None,
+    ) -> list[dict[str, Any]]:
+        """Retorna os k primeiros itens (que passam em ``where``) em ordem, sem removê-los."""
+        if where is None and (k is None or k >= len(self._heap)):
+            return [self._items[item_id] for _, item_id in sorted(self._heap)]
+        result: list[dict[str, Any]] = []
+        if k is not None and k <= 0:
+            return result
+        for item in self.iter_ordered():
+            if where is not None and not where(item):
+                continue
+            result.append(item)
+            if k is not None and len(result) >= k:
+                break
+        return result
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._position.clear()
+        self._items.clear()
+
+    def _swap(self, i: int, j: int) -> None:
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._position[heap[i][1]] = i
+        self._position[heap[j][1]] = j
+
+    def _sift_up(self, index: int) -> None:
+        heap = self._heap
+        while index > 0:
+            parent = (index - 1) // 2
+            if heap[index][0] < heap[parent][0]:
+                self._swap(index, parent)
+                index = parent
+            else:
+                break
+
+    def _sift_down(self, index: int) -> None:
+        heap = self._heap
+        size = len(heap)
+        while True:
+            smallest = index
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < size and heap[child][0] < heap[smallest][0]:
+                    smallest = child
+            if smallest == index:
+                return
+            self._swap(index, smallest)
+            index = smallest
+
+
 @dataclass
 class ApprovalBatch:
     """Lote de aprovações."""
@@ -507,8 +664,9 @@ class ApprovalOptimizer:
         self._batching_engine = BatchingEngine()
         self._batch_guard = BatchGuard()
 
-        self._queue: list[dict[str, Any]] = []
+        self._queue = IndexedPriorityQueue()
         self._queue_lock = threading.Lock()
+        self._sequence = 0
 
     def _request_to_dict(self, request: Any) -> dict[str, Any]:
         """Converte request para dict."""
@@ -539,22 +697,85 @@ class ApprovalOptimizer:
         if "created_at" not in request_dict:
             request_dict["created_at"] = datetime.now(timezone.utc).isoformat()
 
-        # Refine risk
-        refined = self._risk_refiner.refine_risk(request_dict)
+        prioritized = self._score(request_dict)
+
+        # Add to queue (terminal requests are never queued)
+        if prioritized.get("status") not in TERMINAL_STATUSES:
+            with self._queue_lock:
+                self._enqueue(prioritized)
 
-        # Calculate priority
-        prioritized = self._priority_scorer.calculate_priority(refined)
+        return prioritized
+
+    def update_request(self, request_id: str, **changes: Any) -> Optional[dict[str, Any]]:
+        """
+        Atualiza um request na fila.
 
-        # Add to queue
+        O score só é recalculado quando um campo de entrada de risco muda; um
+        status terminal remove o request da fila.
+
+        Returns:
+            Request atualizado, ou None se não estiver na fila
+        """
+        with self._queue_lock:
+            current = self._queue.get(request_id)
+            if current is None:
+                return None
+            updated = {**current, **changes}
+            if updated.get("status") in TERMINAL_STATUSES:
+                self._queue.remove(request_id)
+                return updated
+            if any(
+                key in PRIORITY_INPUT_FIELDS and current.get(key) != value
+                for key, value in changes.items()
+            ):
+                updated = self._score(updated)
+            sequence = current["_sequence"]
+            self._queue.update(request_id, self._sort_key(updated, sequence), updated)
+            return self._public(updated)
+
+    def complete_request(self, request_id: str) -> bool:
+        """Remove um request resolvido da fila."""
         with self._queue_lock:
-            self._queue.append(prioritized)
+            return self._queue.remove(request_id) is not None
 
-        return prioritized
+    def get_queue(self, limit: Optional[int] = None) -> list[dict[str, Any]]:
+        """Retorna fila ordenada por prioridade (opcionalmente só o top-k)."""
+        with self._queue_lock:
+            return [self._public(item) for item in self._queue.top_k(limit)]
 
-    def get_queue(self) -> list[dict[str, Any]]:
-        """Retorna fila ordenada por prioridade."""
+    def pop_top_k(self, k: int) -> list[dict[str, Any]]:
+        """Remove e retorna os k requests de maior prioridade."""
         with self._queue_lock:
-            return self._priority_scorer.order_queue(self._queue.copy())
+            return [self._public(item) for item in self._queue.pop_top_k(k)]
+
+    def _score(self, request_dict: dict[str, Any]) -> dict[str, Any]:
+        refined = self._risk_refiner.refine_risk(request_dict)
+        return self._priority_scorer.calculate_priority(refined)
+
+    @staticmethod
+    def _sort_key(item: dict[str, Any], sequence: int) -> tuple[Any, ...]:
+        # Mesma ordem de PriorityScorer.order_queue: score DESC, created_at ASC,
+        # ordem de chegada como desempate final.
+        return (-item["priority_score"], item.get("created_at", ""), sequence)
+
+    @staticmethod
+    def _public(item: dict[str, Any]) -> dict[str, Any]:
+        result = dict(item)
+        result.pop("_sequence", None)
+        return result
+
+    def _enqueue(self, prioritized: dict[str, Any]) -> None:
+        request_id = prioritized.get("request_id")
+        existing = self._queue.get(request_id) if request_id is not None else None
+        if existing is not None:
+            sequence = existing["_sequence"]
+        else:
+            self._sequence += 1
+            sequence = self._sequence
+        if request_id is None:
+            request_id = f"anon-{sequence}"
+        item = {**prioritized, "_sequence": sequence}
+        self._queue.push(request_id, self._sort_key(item, sequence), item)
 
     # Alias para compatibilidade com testes
     get_prioritized_queue = get_queue
@@ -574,21 +795,16 @@ class ApprovalOptimizer:
         Returns:
             Batch criado ou None
         """
-        queue = self.get_queue()
-
-        # Filter by brand if specified
-        if brand_id:
-            candidates = [r for r in queue if r.get("brand_id") == brand_id]
-        else:
-            candidates = queue
+        # Lê só os max_size primeiros da brand direto do heap, sem ordenar a fila.
+        where = (lambda item: item.get("brand_id") == brand_id) if brand_id else None
+        with self._queue_lock:
+            candidates = [
+                self._public(item) for item in self._queue.top_k(max_size or None, where=where)
+            ]
 
         if not candidates:
             return None
 
-        # Limit size
-        if max_size:
-            candidates = candidates[:max_size]
-
         # Validate batch
         if not self._batch_guard.validate_batch(candidates):
             return None
@@ -616,7 +832,7 @@ class ApprovalOptimizer:
     def get_stats(self) -> dict[str, Any]:
         """Retorna estatísticas do optimizer."""
         with self._queue_lock:
-            queue = self._queue.copy()
+            queue = list(self._queue)
 
         if not queue:
             return {
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import hashlib
 import json
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from vm_webapp.blob_store import BlobStore
 
 
 def _write_text_atomic(path: Path, content: str) -> None:
@@ -30,9 +36,12 @@ def write_stage_outputs(
     artifacts: dict[str, str],
     event_id: str,
     status: str,
+    blob_store: BlobStore | None = None,
 ) -> dict[str, Any]:
     artifacts_dir = stage_dir / "artifacts"
     artifacts_dir.mkdir(parents=True, exist_ok=True)
+    # Blobs referenced by the manifest being replaced (rerun of the same stage).
+    previous_blobs = _manifest_blob_hashes(stage_dir / "manifest.json") if blob_store else []
 
     _write_text_atomic(
         stage_dir / "input.json",
@@ -47,15 +56,18 @@ def write_stage_outputs(
     for name, content in artifacts.items():
         data = content.encode("utf-8")
         file_path = artifacts_dir / name
-        _write_text_atomic(file_path, content)
-        manifest_items.append(
-            {
-                "path": str(file_path.relative_to(stage_dir)),
-                "kind": file_path.suffix.lstrip("."),
-                "sha256": _sha256_bytes(data),
-                "size": len(data),
-            }
-        )
+        digest = _sha256_bytes(data)
+        item: dict[str, Any] = {
+            "path": str(file_path.relative_to(stage_dir)),
+            "kind": file_path.suffix.lstrip("."),
+            "sha256": digest,
+            "size": len(data),
+        }
+        if blob_store is None:
+            _write_text_atomic(file_path, content)
+        else:
+            item["blob"] = blob_store.put(data, sha256=digest).to_manifest()
+        manifest_items.append(item)
 
     manifest = {
         "run_id": run_id,
@@ -72,4 +84,89 @@ def write_stage_outputs(
         stage_dir / "manifest.json",
         json.dumps(manifest, ensure_ascii=False, indent=2),
     )
+    if blob_store is not None:
+        for digest in previous_blobs:
+            blob_store.release(digest)
     return manifest
+
+
+def _manifest_blob_hashes(manifest_path: Path) -> list[str]:
+    if not manifest_path.exists():
+        return []
+    try:
+        payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return []
+    hashes: list[str] = []
+    for item in payload.get("artifacts", []):
+        if isinstance(item, dict) and isinstance(item.get("blob"), dict):
+            hashes.append(str(item["blob"]["sha256"]))
+    return hashes
+
+
+def load_stage_manifest(stage_dir: Path) -> dict[str, Any] | None:
+    """Parsed ``manifest.json`` of a stage, cached by ``(mtime_ns, size)``.
+
+    Returns a shallow copy; callers may add keys but must not mutate nested values.
+    """
+    path = stage_dir / "manifest.json"
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return dict(_parse_manifest(str(path), stat.st_mtime_ns, stat.st_size))
+
+
+@lru_cache(maxsize=1024)
+def _parse_manifest(path: str, _mtime_ns: int, _size: int) -> dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def find_manifest_artifact(stage_dir: Path, artifact_path: str) -> dict[str, Any] | None:
+    manifest = load_stage_manifest(stage_dir)
+    if manifest is None:
+        return None
+    for item in manifest.get("artifacts", []):
+        if isinstance(item, dict) and item.get("path") == artifact_path:
+            return item
+    return None
+
+
+def read_artifact_bytes(
+    stage_dir: Path,
+    item: dict[str, Any],
+    *,
+    blob_store: BlobStore | None = None,
+) -> bytes:
+    """Read an artifact listed in a stage manifest, from the CAS or the stage dir."""
+    blob = item.get("blob")
+    if isinstance(blob, dict) and blob_store is not None:
+        return blob_store.read_bytes(str(blob["sha256"]))
+    return (stage_dir / str(item["path"])).read_bytes()
+
+
+def build_stage_output_executor(max_workers: int) -> ProcessPoolExecutor | None:
+    """Process pool for stage post-processing, or ``None`` to stay inline.
+
+    Uses ``spawn`` so workers never inherit locks held by request threads.
+    """
+    if max_workers <= 0:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def write_stage_outputs_offloaded(
+    executor: Executor | None,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Run ``write_stage_outputs`` on ``executor`` and join the result.
+
+    Hashing and ``indent=2`` JSON encoding hold the GIL; running them in a
+    worker process lets the calling thread block without starving other runs.
+    """
+    if executor is None:
+        return write_stage_outputs(**kwargs)
+    return executor.submit(write_stage_outputs, **kwargs).result()
@@ -0,0 +1,243 @@
+"""Content-addressed blob store for stage artifacts.
+
+Blobs live under ``<root>/objects/<aa>/<sha256>`` (``.zst`` when compressed)
+and are shared by every manifest that references the same content. Reference
+counts are kept in a small SQLite file next to the objects so the store can be
+used from worker processes as well as from the API process; ``gc`` removes
+blobs nobody references anymore.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator
+from uuid import uuid4
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZSTD = "zstd"
+
+
+@dataclass(frozen=True)
+class BlobRef:
+    sha256: str
+    size: int
+    stored_size: int
+    compression: str
+    created: bool
+
+    def to_manifest(self) -> dict[str, object]:
+        return {
+            "sha256": self.sha256,
+            "stored_size": self.stored_size,
+            "compression": self.compression,
+        }
+
+
+class BlobStore:
+    def __init__(self, root: Path, *, compression: str = COMPRESSION_NONE, zstd_level: int = 3) -> None:
+        if compression not in {COMPRESSION_NONE, COMPRESSION_ZSTD}:
+            raise ValueError(f"unsupported blob compression: {compression}")
+        if compression == COMPRESSION_ZSTD and zstandard is None:
+            raise RuntimeError("zstd compression requires the 'zstandard' package")
+        self.root = Path(root)
+        self.compression = compression
+        self.zstd_level = zstd_level
+        self.objects_dir = self.root / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self._db_path = self.root / "refs.sqlite3"
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS blob_refs ("
+                " sha256 TEXT PRIMARY KEY,"
+                " refcount INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_size INTEGER NOT NULL,"
+                " compression TEXT NOT NULL,"
+                " created_at TEXT NOT NULL)"
+            )
+
+    def __getstate__(self) -> dict[str, object]:
+        return {
+            "root": self.root,
+            "compression": self.compression,
+            "zstd_level": self.zstd_level,
+        }
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__init__(
+            Path(str(state["root"])),
+            compression=str(state["compression"]),
+            zstd_level=int(state["zstd_level"]),  # type: ignore[arg-type]
+        )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self._db_path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _object_path(self, sha256: str, compression: str) -> Path:
+        suffix = ".zst" if compression == COMPRESSION_ZSTD else ""
+        return self.objects_dir / sha256[:2] / f"{sha256}{suffix}"
+
+    def put(self, data: bytes, *, sha256: str | None = None) -> BlobRef:
+        """Store ``data`` (if new) and take one reference to it."""
+        digest = sha256 or hashlib.sha256(data).hexdigest()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT size, stored_size, compression FROM blob_refs WHERE sha256 = ?",
+                (digest,),
+            ).fetchone()
+            if row is not None and self._object_path(digest, row[2]).exists():
+                conn.execute(
+                    "UPDATE blob_refs SET refcount = refcount + 1 WHERE sha256 = ?",
+                    (digest,),
+                )
+                return BlobRef(
+                    sha256=digest,
+                    size=int(row[0]),
+                    stored_size=int(row[1]),
+                    compression=str(row[2]),
+                    created=False,
+                )
+
+            payload = data
+            if self.compression == COMPRESSION_ZSTD:
+                payload = zstandard.ZstdCompressor(level=self.zstd_level).compress(data)
+            path = self._object_path(digest, self.compression)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{uuid4().hex[:8]}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, path)
+            conn.execute(
+                "INSERT INTO blob_refs (sha256, refcount, size, stored_size, compression, created_at)"
+                " VALUES (?, 1, ?, ?, ?, ?)"
+                " ON CONFLICT(sha256) DO UPDATE SET refcount = refcount + 1,"
+                " stored_size = excluded.stored_size, compression = excluded.compression",
+                (
+                    digest,
+                    len(data),
+                    len(payload),
+                    self.compression,
+                    datetime.now(timezone.utc).isoformat(),
+                ),
+            )
+            return BlobRef(
+                sha256=digest,
+                size=len(data),
+                stored_size=len(payload),
+                compression=self.compression,
+                created=True,
+            )
+
+    def release(self, sha256: str) -> int:
+        """Drop one reference; returns the remaining count."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE blob_refs SET refcount = MAX(refcount - 1, 0) WHERE sha256 = ?",
+                (sha256,),
+            )
+            row = conn.execute(
+                "SELECT refcount FROM blob_refs WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def refcount(self, sha256: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT refcount FROM blob_refs WHERE sha256 = ?", (sha256,)
+            ).fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def exists(self, sha256: str) -> bool:
+        return self.path_for(sha256) is not None
+
+    def path_for(self, sha256: str) -> Path | None:
+        for compression in (COMPRESSION_NONE, COMPRESSION_ZSTD):
+            path = self._object_path(sha256, compression)
+            if path.exists():
+                return path
+        return None
+
+    def read_bytes(self, sha256: str) -> bytes:
+        path = self.path_for(sha256)
+        if path is None:
+            raise FileNotFoundError(f"blob not found: {sha256}")
+        payload = path.read_bytes()
+        if path.suffix == ".zst":
+            if zstandard is None:
+                raise RuntimeError("reading zstd blobs requires the 'zstandard' package")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        return payload
+
+    def open(self, sha256: str) -> BinaryIO:
+        """Binary stream over the blob's content, decompressing as it is read."""
+        path = self.path_for(sha256)
+        if path is None:
+            raise FileNotFoundError(f"blob not found: {sha256}")
+        if path.suffix != ".zst":
+            return path.open("rb")
+        if zstandard is None:
+            raise RuntimeError("reading zstd blobs requires the 'zstandard' package")
+        return zstandard.ZstdDecompressor().stream_reader(path.open("rb"), closefd=True)
+
+    def gc(self) -> dict[str, int]:
+        """Delete unreferenced blobs and return what was reclaimed."""
+        removed = 0
+        reclaimed = 0
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT sha256, stored_size, compression FROM blob_refs WHERE refcount <= 0"
+            ).fetchall()
+            for sha256, stored_size, compression in rows:
+                path = self._object_path(sha256, compression)
+                if path.exists():
+                    path.unlink()
+                    reclaimed += int(stored_size)
+                removed += 1
+                conn.execute("DELETE FROM blob_refs WHERE sha256 = ?", (sha256,))
+        return {"blobs_removed": removed, "bytes_reclaimed": reclaimed}
+
+    def stats(self) -> dict[str, int]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(stored_size), 0),"
+                " COALESCE(SUM(size * refcount), 0), COALESCE(SUM(refcount), 0)"
+                " FROM blob_refs"
+            ).fetchone()
+        return {
+            "blobs": int(row[0]),
+            "stored_bytes": int(row[1]),
+            "referenced_bytes": int(row[2]),
+            "references": int(row[3]),
+        }
+
+
+def existing_blob_store(root: Path) -> BlobStore | None:
+    """Store at ``root`` if one was ever created there, for reading manifest blobs.
+
+    Manifests written while the CAS was enabled keep resolving after it is
+    turned off again.
+    """
+    if not (Path(root) / "refs.sqlite3").exists():
+        return None
+    return BlobStore(root)
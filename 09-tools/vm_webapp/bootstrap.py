@@ -0,0 +1,174 @@
+"""Role-based startup shared by the HTTP app and the standalone worker.
+
+``api`` serves HTTP and leaves event processing and queued runs to a worker
+process; ``worker`` processes events and runs without the HTTP layer; ``all``
+does both in one process. Each role builds only its subsystems and records how
+long every startup phase took.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy.engine import Engine
+
+from vm_webapp.artifacts import build_stage_output_executor
+from vm_webapp.blob_store import BlobStore, existing_blob_store
+from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.decision_audit import configure_decision_audit_storage
+from vm_webapp.llm import KimiClient
+from vm_webapp.memory import MemoryIndex
+from vm_webapp.onboarding_rollups import backfill_rollups_if_empty
+from vm_webapp.onboarding_store import configure_onboarding_storage
+from vm_webapp.orchestrator_v2 import configure_workflow_executor
+from vm_webapp.regression_alerts import configure_regression_alert_storage
+from vm_webapp.run_engine import RunEngine
+from vm_webapp.run_pool import RunExecutionPool, RunPoolConfig
+from vm_webapp.settings import ROLE_API, ROLE_WORKER, Settings
+from vm_webapp.workflow_runtime_v2 import WorkflowRuntimeV2
+from vm_webapp.workspace import Workspace
+
+
+class StartupPhases:
+    def __init__(self, role: str) -> None:
+        self.role = role
+        self._seconds: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._seconds[name] = self._seconds.get(name, 0.0) + time.perf_counter() - started
+
+    def snapshot(self) -> dict[str, object]:
+        phases_ms = {name: round(seconds * 1000, 3) for name, seconds in self._seconds.items()}
+        return {
+            "role": self.role,
+            "phases_ms": phases_ms,
+            "total_ms": round(sum(phases_ms.values()), 3),
+        }
+
+
+@dataclass
+class RuntimeServices:
+    workspace: Workspace
+    engine: Engine
+    memory: Any
+    llm: Any
+    workflow_runtime: WorkflowRuntimeV2
+    run_engine: RunEngine | None
+    run_pool: RunExecutionPool | None
+    stage_output_executor: Executor | None
+    # Writes new artifacts; only set while the CAS is enabled.
+    blob_store: BlobStore | None
+    # Reads manifest blobs whenever a CAS exists, enabled or not.
+    blob_reader: BlobStore | None
+
+    def close(self) -> None:
+        """Finish in-flight runs, then stop the stage-output worker processes."""
+        if self.run_pool is not None:
+            self.run_pool.shutdown()
+        if self.stage_output_executor is not None:
+            self.stage_output_executor.shutdown()
+
+
+def open_database(settings: Settings, phases: StartupPhases) -> Engine:
+    with phases.phase("database"):
+        engine = build_engine(settings.vm_db_path, db_url=settings.vm_db_url)
+        init_db(engine, create_missing=settings.vm_db_auto_migrate)
+        if settings.vm_db_auto_migrate:
+            with session_scope(engine) as session:
+                backfill_rollups_if_empty(session)
+    with phases.phase("stores"):
+        if settings.vm_onboarding_durable_stores:
+            configure_onboarding_storage(
+                engine,
+                cache_size=settings.vm_onboarding_store_cache_size,
+                cache_ttl_seconds=settings.vm_onboarding_store_cache_ttl_seconds,
+            )
+        if settings.vm_regression_alerts_durable_store:
+            configure_regression_alert_storage(engine)
+        if settings.vm_decision_audit_durable_store:
+            configure_decision_audit_storage(engine)
+    return engine
+
+
+def build_runtime(
+    settings: Settings,
+    engine: Engine,
+    *,
+    phases: StartupPhases,
+    memory: Any | None = None,
+    llm: Any | None = None,
+) -> RuntimeServices:
+    """Workflow runtime for ``phases.role``.
+
+    The v1 ``RunEngine`` only backs HTTP endpoints and the run pool only
+    admits queued runs, so each is skipped by the role that never uses it.
+    """
+    role = phases.role
+    with phases.phase("runtime"):
+        workspace = Workspace(root=settings.vm_workspace_root)
+        stage_output_executor = build_stage_output_executor(settings.vm_stage_output_workers)
+        blob_store = (
+            BlobStore(workspace.root / "cas", compression=settings.vm_artifact_cas_compression)
+            if settings.vm_artifact_cas_enabled
+            else None
+        )
+        blob_reader = blob_store or existing_blob_store(workspace.root / "cas")
+        # The corpus itself is only read on first search.
+        memory = memory or MemoryIndex(root=workspace.root / "zvec")
+        if llm is None and settings.kimi_api_key:
+            llm = KimiClient(base_url=settings.kimi_base_url, api_key=settings.kimi_api_key)
+        run_engine = (
+            RunEngine(engine=engine, workspace=workspace, memory=memory, llm=llm)
+            if role != ROLE_WORKER
+            else None
+        )
+        workflow_runtime = WorkflowRuntimeV2(
+            engine=engine,
+            workspace=workspace,
+            memory=memory,
+            llm=llm,
+            profiles_path=settings.vm_workflow_profiles_path,
+            force_foundation_fallback=settings.vm_workflow_force_foundation_fallback,
+            foundation_mode=settings.vm_workflow_foundation_mode,
+            llm_model=settings.kimi_model,
+            inline_execution=not settings.vm_run_pool_enabled,
+            stage_output_executor=stage_output_executor,
+            blob_store=blob_store,
+        )
+        configure_workflow_executor(workflow_runtime.process_event)
+
+    run_pool = None
+    if settings.vm_run_pool_enabled and role != ROLE_API:
+        with phases.phase("run_pool"):
+            run_pool = RunExecutionPool(
+                engine=engine,
+                executor=workflow_runtime.execute_queued_run,
+                config=RunPoolConfig(
+                    global_concurrency=settings.vm_run_pool_global_concurrency,
+                    per_brand_concurrency=settings.vm_run_pool_per_brand_concurrency,
+                    brand_weights=dict(settings.vm_run_pool_brand_weights),
+                ),
+                metrics=workflow_runtime.metrics,
+            )
+    return RuntimeServices(
+        workspace=workspace,
+        engine=engine,
+        memory=memory,
+        llm=llm,
+        workflow_runtime=workflow_runtime,
+        run_engine=run_engine,
+        run_pool=run_pool,
+        stage_output_executor=stage_output_executor,
+        blob_store=blob_store,
+        blob_reader=blob_reader,
+    )
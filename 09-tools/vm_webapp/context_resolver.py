@@ -1,11 +1,27 @@
+"""Hierarchical context resolution (brand > campaign > task).
+
+Runs resolve the same brand/campaign/task context on every start and again on
+each ``execute_queued_run`` re-entry, so merged contexts are kept in a bounded
+per-engine LRU stamped with the version ids they were built from. A lookup
+within ``CONTEXT_CACHE_TTL_SECONDS`` with no context writes in this process
+since is served without touching the database; otherwise one primary-key read
+of ``context_latest_versions`` confirms the stamp before payloads are reloaded.
+The TTL bounds how long a write from another process can go unnoticed.
+"""
+
 from __future__ import annotations
 
+import copy
 import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import and_, event, or_, select
 from sqlalchemy.orm import Session
-from vm_webapp.models import ContextVersion
+from vm_webapp.models import ContextLatestVersion, ContextVersion
 
 
 class ContextPolicyError(ValueError):
@@ -14,6 +30,65 @@ class ContextPolicyError(ValueError):
 
 ALLOWED_OVERRIDES = {"tone", "target_audience", "objective", "channels"}
 
+CONTEXT_CACHE_SIZE = 256
+CONTEXT_CACHE_TTL_SECONDS = 2.0
+
+# Session.info flag: context versions were written in the open transaction.
+# Such sessions bypass the cache so uncommitted payloads are never shared.
+_UNCOMMITTED_KEY = "vm_context_writes_uncommitted"
+
+ContextKey = tuple[str, "str | None", "str | None"]
+VersionStamp = tuple["str | None", "str | None", "str | None"]
+
+
+class _ContextCache:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        # (brand, campaign, task) -> (versions, merged context, checked_at, generation)
+        self._entries: OrderedDict[ContextKey, tuple[VersionStamp, dict[str, Any], float, int]] = (
+            OrderedDict()
+        )
+
+    def get(self, key: ContextKey) -> tuple[VersionStamp, dict[str, Any], float, int] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(
+        self, key: ContextKey, versions: VersionStamp, context: dict[str, Any], generation: int
+    ) -> None:
+        self._entries[key] = (versions, context, time.monotonic(), generation)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+_generation = 0
+_caches: "weakref.WeakKeyDictionary[Any, _ContextCache]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def mark_context_written(session: Session) -> None:
+    """Record that ``session`` wrote context versions; invalidates cached contexts."""
+    global _generation
+    session.info[_UNCOMMITTED_KEY] = True
+    with _lock:
+        _generation += 1
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _on_transaction_end(session: Session, transaction: Any) -> None:
+    global _generation
+    if transaction.parent is None and session.info.pop(_UNCOMMITTED_KEY, False):
+        with _lock:
+            _generation += 1
+
+
+def clear_context_cache() -> None:
+    with _lock:
+        _caches.clear()
+
 
 def resolve_hierarchical_context(
     session: Session,
@@ -21,36 +96,115 @@ def resolve_hierarchical_context(
     brand_id: str,
     campaign_id: str | None = None,
     task_id: str | None = None
+) -> dict[str, Any]:
+    key: ContextKey = (brand_id, campaign_id or None, task_id or None)
+    if session.info.get(_UNCOMMITTED_KEY):
+        return _merge(*_load_payloads(session, _latest_versions(session, key)), key)
+
+    bind = session.get_bind()
+    with _lock:
+        cache = _caches.get(bind)
+        if cache is None:
+            cache = _caches[bind] = _ContextCache(CONTEXT_CACHE_SIZE)
+        generation = _generation
+        entry = cache.get(key)
+
+    if entry is not None:
+        versions, context, checked_at, entry_generation = entry
+        if entry_generation == generation and time.monotonic() - checked_at < CONTEXT_CACHE_TTL_SECONDS:
+            return copy.deepcopy(context)
+
+    latest = _latest_versions(session, key)
+    if entry is not None and entry[0] == latest:
+        context = entry[1]
+    else:
+        context = _merge(*_load_payloads(session, latest), key)
+    with _lock:
+        cache.put(key, latest, context, generation)
+    return copy.deepcopy(context)
+
+
+def _merge(
+    brand_ctx: dict[str, Any],
+    campaign_ctx: dict[str, Any],
+    task_ctx: dict[str, Any],
+    key: ContextKey,
 ) -> dict[str, Any]:
     context: dict[str, Any] = {}
 
     # 1. Load Brand (base)
-    brand_ctx = _get_latest_payload(session, "brand", brand_id)
     context.update(brand_ctx)
 
     # 2. Load Campaign
-    if campaign_id:
-        campaign_ctx = _get_latest_payload(session, "campaign", campaign_id)
+    if key[1]:
         _apply_overrides(context, campaign_ctx, source="campaign")
 
     # 3. Load Task
-    if task_id:
-        task_ctx = _get_latest_payload(session, "task", task_id)
+    if key[2]:
         _apply_overrides(context, task_ctx, source="task")
 
     return context
 
 
-def _get_latest_payload(session: Session, scope: str, scope_id: str) -> dict[str, Any]:
-    row = session.scalar(
-        select(ContextVersion)
+def _latest_versions(session: Session, key: ContextKey) -> VersionStamp:
+    scopes = [
+        (scope, scope_id)
+        for scope, scope_id in zip(("brand", "campaign", "task"), key)
+        if scope_id
+    ]
+    pointers = {
+        (row.scope, row.scope_id): row.version_id
+        for row in session.scalars(
+            select(ContextLatestVersion).where(
+                or_(
+                    *(
+                        and_(
+                            ContextLatestVersion.scope == scope,
+                            ContextLatestVersion.scope_id == scope_id,
+                        )
+                        for scope, scope_id in scopes
+                    )
+                )
+            )
+        )
+    }
+    versions: list[str | None] = []
+    for scope, scope_id in zip(("brand", "campaign", "task"), key):
+        if not scope_id:
+            versions.append(None)
+        elif (scope, scope_id) in pointers:
+            versions.append(pointers[(scope, scope_id)])
+        else:
+            # Rows appended before the pointer table existed.
+            versions.append(_get_latest_version_id(session, scope, scope_id))
+    return versions[0], versions[1], versions[2]
+
+
+def _load_payloads(
+    session: Session, versions: VersionStamp
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    wanted = [version_id for version_id in versions if version_id]
+    payloads: dict[str, dict[str, Any]] = {}
+    if wanted:
+        for version_id, payload_json in session.execute(
+            select(ContextVersion.version_id, ContextVersion.payload_json).where(
+                ContextVersion.version_id.in_(wanted)
+            )
+        ):
+            payloads[version_id] = json.loads(payload_json)
+    brand, campaign, task = (
+        payloads.get(version_id, {}) if version_id else {} for version_id in versions
+    )
+    return brand, campaign, task
+
+
+def _get_latest_version_id(session: Session, scope: str, scope_id: str) -> str | None:
+    return session.scalar(
+        select(ContextVersion.version_id)
         .where(ContextVersion.scope == scope, ContextVersion.scope_id == scope_id)
         .order_by(ContextVersion.created_at.desc())
         .limit(1)
     )
-    if row is None:
-        return {}
-    return json.loads(row.payload_json)
 
 
 def _apply_overrides(base: dict[str, Any], overrides: dict[str, Any], source: str) -> None:
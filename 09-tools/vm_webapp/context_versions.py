@@ -4,8 +4,10 @@ import json
 from typing import Any
 from uuid import uuid4
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from vm_webapp.models import ContextVersion
+from vm_webapp.context_resolver import mark_context_written
+from vm_webapp.models import ContextLatestVersion, ContextVersion
 
 
 def append_context_version(
@@ -24,4 +26,28 @@ def append_context_version(
     )
     session.add(row)
     session.flush()
+    _move_latest_pointer(session, scope=scope, scope_id=scope_id, row=row)
+    mark_context_written(session)
     return version_id
+
+
+def _move_latest_pointer(session: Session, *, scope: str, scope_id: str, row: ContextVersion) -> None:
+    pointer = session.get(ContextLatestVersion, (scope, scope_id))
+    if pointer is None:
+        try:
+            with session.begin_nested():
+                session.add(
+                    ContextLatestVersion(
+                        scope=scope,
+                        scope_id=scope_id,
+                        version_id=row.version_id,
+                        updated_at=row.created_at,
+                    )
+                )
+            return
+        except IntegrityError:
+            # A concurrent append created the pointer first; move it instead.
+            pointer = session.get(ContextLatestVersion, (scope, scope_id))
+    pointer.version_id = row.version_id
+    pointer.updated_at = row.created_at
+    session.flush()
@@ -2,10 +2,19 @@
 
 Sentinel de regressão para detecção precoce em loop de controle online.
 Implementa detecção em múltiplas janelas de tempo com histerese.
+
+O histórico de cada run fica em um ring buffer de tamanho fixo (um
+``array('d')`` por métrica), e cada janela (short/medium/long) mantém média e
+variância incrementais (Welford) sobre os pontos que estão nela, além de uma
+EWMA por métrica. Adicionar um ponto e calcular o baseline custam O(1), e a
+memória por run é constante.
 """
 
 from __future__ import annotations
 
+import math
+from array import array
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
@@ -13,6 +22,15 @@ from typing import Optional
 from uuid import uuid4
 
 
+# Métricas mantidas no histórico e usadas no baseline
+TRACKED_METRICS = ("v1_score", "approval_rate", "incident_rate", "cost_per_job", "mttc")
+
+# Histórico de 48h com pontos a cada 4 min
+HISTORY_POINTS = 720
+SAMPLE_INTERVAL_MINUTES = 4
+DEFAULT_EWMA_ALPHA = 0.2
+
+
 class RegressionSeverity(str, Enum):
     """Níveis de severidade de regressão."""
     
@@ -71,6 +89,163 @@ class HysteresisState:
         return datetime.now(timezone.utc) < cooldown_end
 
 
+class WindowStats:
+    """Média e variância (Welford) de cada métrica em uma janela deslizante.
+    
+    Guardado como listas paralelas indexadas por métrica para manter o
+    caminho quente sem chamadas de método.
+    """
+    
+    __slots__ = ("points", "count", "mean", "m2")
+    
+    def __init__(self, points: int, metrics: int) -> None:
+        self.points = points
+        self.count = [0] * metrics
+        self.mean = [0.0] * metrics
+        self.m2 = [0.0] * metrics
+    
+    def update(self, index: int, old: float, new: float) -> None:
+        """Entra ``new`` e sai ``old`` (NaN = nenhum) na métrica ``index``."""
+        count = self.count[index]
+        mean = self.mean[index]
+        if old != old:  # só entrada
+            if new != new:
+                return
+            count += 1
+            delta = new - mean
+            mean += delta / count
+            self.m2[index] += delta * (new - mean)
+        elif new != new:  # só saída
+            if count <= 1:
+                count, mean = 0, 0.0
+                self.m2[index] = 0.0
+            else:
+                count -= 1
+                previous = mean
+                mean = (previous * (count + 1) - old) / count
+                self.m2[index] = max(0.0, self.m2[index] - (old - previous) * (old - mean))
+        else:  # substituição com tamanho constante
+            previous = mean
+            mean += (new - old) / count
+            self.m2[index] = max(0.0, self.m2[index] + (new - old) * (new - mean + old - previous))
+        self.count[index] = count
+        self.mean[index] = mean
+    
+    def variance(self, index: int) -> float:
+        count = self.count[index]
+        return self.m2[index] / (count - 1) if count > 1 else 0.0
+
+
+class RunMetricBuffer:
+    """Histórico de tamanho fixo de um run, com estatísticas por janela.
+    
+    Valores ausentes são guardados como NaN e ignorados pelas estatísticas.
+    """
+    
+    __slots__ = ("capacity", "size", "head", "timestamps", "values", "windows", "ewma", "ewma_alpha")
+    
+    def __init__(
+        self,
+        capacity: int,
+        window_sizes: Mapping[str, int],
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+    ) -> None:
+        self.capacity = capacity
+        self.size = 0
+        self.head = 0
+        self.timestamps = array("d", [math.nan]) * capacity
+        self.values = [array("d", [math.nan]) * capacity for _ in TRACKED_METRICS]
+        self.windows = {
+            name: WindowStats(max(1, min(points, capacity)), len(TRACKED_METRICS))
+            for name, points in window_sizes.items()
+        }
+        self.ewma: list[Optional[float]] = [None] * len(TRACKED_METRICS)
+        self.ewma_alpha = ewma_alpha
+    
+    def append(self, timestamp: float, metrics: Mapping) -> None:
+        """Adiciona um ponto; cada janela recebe o novo valor e solta o que sai dela."""
+        head = self.head
+        capacity = self.capacity
+        size = self.size
+        alpha = self.ewma_alpha
+        windows = tuple(self.windows.values())
+        self.timestamps[head] = timestamp
+        for index, metric in enumerate(TRACKED_METRICS):
+            raw = metrics.get(metric)
+            new = float(raw) if raw is not None else math.nan
+            column = self.values[index]
+            for stats in windows:
+                points = stats.points
+                old = column[(head - points) % capacity] if size >= points else math.nan
+                stats.update(index, old, new)
+            column[head] = new
+            if new == new:
+                previous = self.ewma[index]
+                self.ewma[index] = new if previous is None else alpha * new + (1 - alpha) * previous
+        self.head = (head + 1) % capacity
+        self.size = min(size + 1, capacity)
+    
+    def baseline(self, window: str) -> Optional[dict]:
+        """Média por métrica na janela (pontos já registrados)."""
+        stats = self.windows.get(window)
+        if stats is None or self.size == 0:
+            return None
+        baseline = {
+            metric: stats.mean[index]
+            for index, metric in enumerate(TRACKED_METRICS)
+            if stats.count[index]
+        }
+        return baseline or None
+    
+    def stats(self, window: str) -> dict:
+        """Média, desvio padrão, contagem e EWMA por métrica na janela."""
+        stats = self.windows[window]
+        return {
+            metric: {
+                "mean": stats.mean[index],
+                "std": math.sqrt(stats.variance(index)),
+                "count": stats.count[index],
+                "ewma": self.ewma[index],
+            }
+            for index, metric in enumerate(TRACKED_METRICS)
+            if stats.count[index]
+        }
+    
+    def points(self) -> list[dict]:
+        """Reconstrói o histórico em ordem cronológica."""
+        start = (self.head - self.size) % self.capacity
+        history = []
+        for offset in range(self.size):
+            slot = (start + offset) % self.capacity
+            point = {
+                metric: self.values[index][slot]
+                for index, metric in enumerate(TRACKED_METRICS)
+                if not math.isnan(self.values[index][slot])
+            }
+            point["timestamp"] = datetime.fromtimestamp(self.timestamps[slot], timezone.utc).isoformat()
+            history.append(point)
+        return history
+    
+    def nbytes(self) -> int:
+        """Bytes ocupados pelos arrays do ring buffer (constante por run)."""
+        return self.timestamps.itemsize * self.capacity * (1 + len(self.values))
+
+
+def _timestamp_seconds(value: object) -> float:
+    if isinstance(value, datetime):
+        moment = value
+    elif isinstance(value, str):
+        try:
+            moment = datetime.fromisoformat(value)
+        except ValueError:
+            moment = datetime.now(timezone.utc)
+    else:
+        moment = datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
 @dataclass
 class RegressionSignal:
     """Sinal de regressão detectado."""
@@ -115,13 +290,34 @@ class RegressionSentinel:
     
     version: str = "v26"
     
-    def __init__(self):
-        self._metric_history: dict[str, list[dict]] = {}
+    def __init__(
+        self,
+        windows: Optional[DetectionWindow] = None,
+        sample_interval_minutes: int = SAMPLE_INTERVAL_MINUTES,
+        history_points: int = HISTORY_POINTS,
+        ewma_alpha: float = DEFAULT_EWMA_ALPHA,
+    ):
+        self._buffers: dict[str, RunMetricBuffer] = {}
         self._signals: dict[str, list[RegressionSignal]] = {}
         self._hysteresis: dict[str, dict[str, HysteresisState]] = {}
-        self._windows = DetectionWindow()
+        self._windows = windows or DetectionWindow()
         self._thresholds = MetricThresholds()
         self._cooldown_minutes = 15  # Cooldown entre sinais do mesmo tipo
+        self._history_points = history_points
+        self._ewma_alpha = ewma_alpha
+        # Pontos por janela: minutos da janela / intervalo entre pontos
+        self._window_points = {
+            "short": math.ceil(self._windows.short_term_minutes / sample_interval_minutes),
+            "medium": math.ceil(self._windows.medium_term_minutes / sample_interval_minutes),
+            "long": math.ceil(self._windows.long_term_minutes / sample_interval_minutes),
+        }
+    
+    def _buffer(self, run_id: str) -> RunMetricBuffer:
+        buffer = self._buffers.get(run_id)
+        if buffer is None:
+            buffer = RunMetricBuffer(self._history_points, self._window_points, self._ewma_alpha)
+            self._buffers[run_id] = buffer
+        return buffer
     
     def add_metric_point(self, run_id: str, metrics: dict) -> None:
         """Adiciona ponto de métrica ao histórico.
@@ -130,24 +326,26 @@ class RegressionSentinel:
             run_id: ID do run
             metrics: Dict com métricas (v1_score, approval_rate, etc.)
         """
-        if run_id not in self._metric_history:
-            self._metric_history[run_id] = []
-        
-        # Adicionar timestamp se não presente
-        metrics_copy = dict(metrics)
-        if "timestamp" not in metrics_copy:
-            metrics_copy["timestamp"] = datetime.now(timezone.utc).isoformat()
-        
-        self._metric_history[run_id].append(metrics_copy)
-        
-        # Limitar histórico a 48h (720 pontos de 4 min)
-        max_points = 720
-        if len(self._metric_history[run_id]) > max_points:
-            self._metric_history[run_id] = self._metric_history[run_id][-max_points:]
+        # Histórico limitado a 48h (720 pontos de 4 min) pelo ring buffer
+        self._buffer(run_id).append(_timestamp_seconds(metrics.get("timestamp")), metrics)
     
     def get_metric_history(self, run_id: str) -> list[dict]:
-        """Retorna histórico de métricas para um run."""
-        return list(self._metric_history.get(run_id, []))
+        """Retorna histórico de métricas (métricas rastreadas) para um run."""
+        buffer = self._buffers.get(run_id)
+        return buffer.points() if buffer is not None else []
+    
+    def get_baseline_stats(self, run_id: str, window: str = "short") -> dict:
+        """Retorna média, desvio padrão, contagem e EWMA por métrica na janela."""
+        buffer = self._buffers.get(run_id)
+        if buffer is None or window not in self._window_points:
+            return {}
+        return buffer.stats(window)
+    
+    def forget_run(self, run_id: str) -> None:
+        """Libera histórico, sinais e histerese de um run encerrado."""
+        self._buffers.pop(run_id, None)
+        self._signals.pop(run_id, None)
+        self._hysteresis.pop(run_id, None)
     
     def detect_regression(
         self,
@@ -167,11 +365,9 @@ class RegressionSentinel:
         """
         signals = []
         
-        # Adicionar métrica atual ao histórico
-        self.add_metric_point(run_id, current_metrics)
-        
-        # Obter baseline (média das últimas N medições estáveis)
+        # Baseline = média da janela antes do ponto atual; depois registrar o ponto
         baseline = self._calculate_baseline(run_id, window)
+        self.add_metric_point(run_id, current_metrics)
         if baseline is None:
             return signals
         
@@ -268,33 +464,17 @@ class RegressionSentinel:
         return signals
     
     def _calculate_baseline(self, run_id: str, window: str) -> Optional[dict]:
-        """Calcula baseline a partir do histórico.
+        """Calcula baseline a partir das estatísticas incrementais da janela.
         
-        Retorna média das últimas N medições estáveis (excluindo última).
+        Retorna a média dos pontos já registrados na janela (o ponto atual
+        ainda não entrou). Janelas desconhecidas usam "short". O(1).
         """
-        history = self._metric_history.get(run_id, [])
-        if len(history) < 2:
+        buffer = self._buffers.get(run_id)
+        if buffer is None:
             return None
-        
-        # Usar primeira medição como baseline (ponto de referência estável)
-        # ou média das primeiras medições
-        if len(history) == 2:
-            # Com apenas 2 pontos, usar o primeiro como baseline
-            baseline_points = [history[0]]
-        else:
-            # Com 3+ pontos, usar média dos primeiros (excluindo o atual)
-            baseline_points = history[:-1]  # Tudo exceto o último (atual)
-            if len(baseline_points) > 5:
-                baseline_points = baseline_points[-5:]  # Últimos 5 estáveis
-        
-        # Calcular média para cada métrica
-        baseline = {}
-        for metric in ["v1_score", "approval_rate", "incident_rate", "cost_per_job", "mttc"]:
-            values = [p.get(metric) for p in baseline_points if p.get(metric) is not None]
-            if values:
-                baseline[metric] = sum(values) / len(values)
-        
-        return baseline if baseline else None
+        if window not in self._window_points:
+            window = "short"
+        return buffer.baseline(window)
     
     def _classify_severity_v1(self, delta_pct: float) -> Optional[RegressionSeverity]:
         """Classifica severidade para métricas V1/approval (queda negativa)."""
@@ -377,7 +557,7 @@ class RegressionSentinel:
         
         return {
             "version": self.version,
-            "monitored_runs": len(self._metric_history),
+            "monitored_runs": len(self._buffers),
             "total_signals_generated": total_signals,
             "active_signals": active_signals,
             "window_config": {
@@ -385,4 +565,7 @@ class RegressionSentinel:
                 "medium_minutes": self._windows.medium_term_minutes,
                 "long_minutes": self._windows.long_term_minutes,
             },
+            "window_points": dict(self._window_points),
+            "history_points": self._history_points,
+            "history_bytes": sum(buffer.nbytes() for buffer in self._buffers.values()),
         }
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Iterator
 
-from sqlalchemy import create_engine
+from sqlalchemy import Table, create_engine, inspect
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
@@ -25,12 +26,101 @@ def build_engine(db_path: Path | None = None, *, db_url: str | None = None) -> E
     return create_engine(f"sqlite+pysqlite:///{db_path}")
 
 
-def init_db(engine: Engine) -> None:
-    """Initialize database tables."""
+class SchemaNotReadyError(RuntimeError):
+    """The database schema is behind the models and startup may not fix it."""
+
+
+@dataclass(frozen=True)
+class SchemaDiff:
+    """Model objects missing from the database."""
+
+    tables: list[str] = field(default_factory=list)
+    indexes: list[str] = field(default_factory=list)
+    # ``table.column`` entries; ``create_all`` cannot add these.
+    columns: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.tables or self.indexes or self.columns)
+
+    def describe(self) -> str:
+        parts = [
+            f"{label}: {', '.join(names)}"
+            for label, names in (
+                ("tables", self.tables),
+                ("indexes", self.indexes),
+                ("columns", self.columns),
+            )
+            if names
+        ]
+        return "; ".join(parts)
+
+
+def _model_tables() -> list[Table]:
+    return [
+        table
+        for metadata in (Base.metadata, OnboardingBase.metadata)
+        for table in metadata.sorted_tables
+    ]
+
+
+def pending_schema(engine: Engine) -> SchemaDiff:
+    """Compare the models with the database catalog.
+
+    Existing tables are checked for missing columns and named indexes, which
+    ``create_all`` never adds to a table that is already there.
+    """
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    diff = SchemaDiff()
+    for table in _model_tables():
+        if table.name not in existing:
+            diff.tables.append(table.name)
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        diff.columns.extend(
+            f"{table.name}.{column.name}" for column in table.columns if column.name not in columns
+        )
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        diff.indexes.extend(
+            index.name for index in table.indexes if index.name and index.name not in indexes
+        )
+    diff.tables.sort()
+    diff.indexes.sort()
+    diff.columns.sort()
+    return diff
+
+
+def pending_tables(engine: Engine) -> list[str]:
+    """Model tables missing from the database."""
+    existing = set(inspect(engine).get_table_names())
+    return sorted(table.name for table in _model_tables() if table.name not in existing)
+
+
+def init_db(engine: Engine, *, create_missing: bool = True) -> list[str]:
+    """Bring the schema up to the models; returns the tables and indexes created.
+
+    Missing tables are created with their indexes, and indexes added to models
+    after their table was deployed are created on the existing table. Missing
+    columns need a manual migration and always raise ``SchemaNotReadyError``,
+    as does any difference with ``create_missing=False`` (read replicas).
+    """
+    diff = pending_schema(engine)
+    if not diff:
+        return []
+    if diff.columns or not create_missing:
+        raise SchemaNotReadyError(f"database schema is behind the models ({diff.describe()})")
     # Create existing tables
     Base.metadata.create_all(engine)
     # Create onboarding tables
     OnboardingBase.metadata.create_all(engine)
+    # create_all skips tables that already exist, indexes included.
+    wanted = set(diff.indexes)
+    with engine.begin() as conn:
+        for table in _model_tables():
+            for index in table.indexes:
+                if index.name in wanted:
+                    index.create(conn, checkfirst=True)
+    return diff.tables + diff.indexes
 
 
 @contextmanager
@@ -13,8 +13,19 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, Any, Callable
 from enum import Enum
+import base64
+import bisect
+import json
+import threading
 import uuid
 
+from sqlalchemy import and_, func, insert, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+
+from vm_webapp.db import session_scope
+from vm_webapp.models import DecisionAuditView
+
 from vm_webapp.safety_gates import (
     SafetyGateEngine, 
     SafetyGateResult, 
@@ -231,6 +242,66 @@ class DecisionSimulator:
         return warnings
 
 
+@dataclass
+class AuditPage:
+    """Página de uma query keyset; ``next_cursor`` é None na última página."""
+    logs: list[DecisionAuditLog]
+    next_cursor: Optional[str] = None
+
+
+def encode_audit_cursor(log: DecisionAuditLog) -> str:
+    """Cursor opaco apontando para depois de ``log`` na ordem (mais recente primeiro)."""
+    raw = json.dumps([log.executed_at, log.audit_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_audit_cursor(cursor: str) -> tuple[str, str]:
+    """Decodifica um cursor gerado por :func:`encode_audit_cursor`."""
+    try:
+        executed_at, audit_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as exc:
+        raise ValueError("invalid audit cursor") from exc
+    return str(executed_at), str(audit_id)
+
+
+def _log_to_row(log: DecisionAuditLog) -> dict[str, Any]:
+    return {
+        "audit_id": log.audit_id,
+        "segment_key": log.segment_key,
+        "brand_id": log.brand_id,
+        "input_metrics_json": json.dumps(log.input_metrics),
+        "suggested_decision": log.suggested_decision,
+        "gates_applied_json": json.dumps(log.gates_applied),
+        "gate_results_json": json.dumps(log.gate_results),
+        "final_decision": log.final_decision,
+        "actor": log.actor,
+        "executed_at": log.executed_at,
+        "override_reason": log.override_reason,
+        "executed_by": log.executed_by,
+        "rollback_triggered": log.rollback_triggered,
+        "rollback_reason": log.rollback_reason,
+    }
+
+
+def _row_to_log(row: DecisionAuditView) -> DecisionAuditLog:
+    return DecisionAuditLog(
+        audit_id=row.audit_id,
+        segment_key=row.segment_key,
+        brand_id=row.brand_id,
+        input_metrics=json.loads(row.input_metrics_json),
+        suggested_decision=row.suggested_decision,
+        gates_applied=json.loads(row.gates_applied_json),
+        gate_results=json.loads(row.gate_results_json),
+        final_decision=row.final_decision,
+        actor=row.actor,
+        executed_at=row.executed_at,
+        override_reason=row.override_reason,
+        executed_by=row.executed_by,
+        rollback_triggered=row.rollback_triggered,
+        rollback_reason=row.rollback_reason,
+    )
+
+
 class DecisionAuditStore:
     """
     Store para persistência de logs de auditoria.
@@ -238,19 +309,44 @@ class DecisionAuditStore:
     Fornece:
     - Storage e retrieval por ID
     - Query por segmento, brand, data
-    - Paginação
+    - Paginação por offset e por cursor (keyset)
     - Filtragem múltipla
+    - Inserção em lote
     
-    Nota: Implementação em memória. Para produção,
-    substituir por storage persistente (DB).
+    Sem engine, mantém os logs em memória; os índices por segmento, brand e
+    global são listas ordenadas de ``(executed_at, audit_id)``, então páginas
+    e ranges de data saem por bisect, sem reordenar tudo a cada query. Com
+    engine, persiste na tabela ``decision_audit_log``, cujos índices
+    compostos ``(segment_key|brand_id, executed_at, audit_id)`` servem as
+    mesmas queries.
+    
+    ``query_by_segment``, ``query_by_brand`` e ``query_by_date_range``
+    devolvem os logs na ordem de inserção; no banco, que não guarda essa
+    ordem, saem em ordem cronológica ``(executed_at, audit_id)``, que é a
+    mesma quando os logs são gravados à medida que executam. Paginação e
+    ``query`` continuam mais recente primeiro.
     """
     
-    def __init__(self):
+    def __init__(self, engine: Optional[Engine] = None):
+        self._engine = engine
+        self._lock = threading.RLock()
         # In-memory storage: audit_id -> DecisionAuditLog
         self._logs: dict[str, DecisionAuditLog] = {}
-        # Índices para queries eficientes
-        self._by_segment: dict[str, list[str]] = {}
-        self._by_brand: dict[str, list[str]] = {}
+        # Índices ordenados por (executed_at, audit_id)
+        self._ordered: list[tuple[str, str]] = []
+        self._by_segment: dict[str, list[tuple[str, str]]] = {}
+        self._by_brand: dict[str, list[tuple[str, str]]] = {}
+        # audit_id -> posição de inserção
+        self._inserted: dict[str, int] = {}
+    
+    @property
+    def engine(self) -> Optional[Engine]:
+        return self._engine
+    
+    def bind(self, engine: Optional[Engine]) -> None:
+        """Liga (ou desliga com ``None``) o banco de dados."""
+        with self._lock:
+            self._engine = engine
     
     def store(self, log: DecisionAuditLog) -> str:
         """
@@ -262,47 +358,78 @@ class DecisionAuditStore:
         Returns:
             audit_id do log armazenado
         """
-        # Atualiza índices
-        if log.segment_key not in self._by_segment:
-            self._by_segment[log.segment_key] = []
-        if log.audit_id not in self._by_segment[log.segment_key]:
-            self._by_segment[log.segment_key].append(log.audit_id)
-        
-        if log.brand_id not in self._by_brand:
-            self._by_brand[log.brand_id] = []
-        if log.audit_id not in self._by_brand[log.brand_id]:
-            self._by_brand[log.brand_id].append(log.audit_id)
-        
-        # Armazena log
-        self._logs[log.audit_id] = log
+        if self._engine is not None:
+            with session_scope(self._engine) as session:
+                session.merge(DecisionAuditView(**_log_to_row(log)))
+            return log.audit_id
         
+        with self._lock:
+            self._store_in_memory(log)
         return log.audit_id
     
+    def store_many(self, logs: list[DecisionAuditLog]) -> list[str]:
+        """
+        Armazena vários logs de uma vez (um único executemany no banco).
+        
+        Returns:
+            audit_ids na ordem recebida
+        """
+        if not logs:
+            return []
+        if self._engine is not None:
+            rows = [_log_to_row(log) for log in logs]
+            try:
+                with session_scope(self._engine) as session:
+                    session.execute(insert(DecisionAuditView), rows)
+            except IntegrityError:
+                # Algum audit_id já existia: cai para upsert linha a linha.
+                with session_scope(self._engine) as session:
+                    for row in rows:
+                        session.merge(DecisionAuditView(**row))
+            return [log.audit_id for log in logs]
+        
+        with self._lock:
+            for log in logs:
+                self._store_in_memory(log)
+        return [log.audit_id for log in logs]
+    
     def get(self, audit_id: str) -> Optional[DecisionAuditLog]:
         """Recupera log por ID."""
+        if self._engine is not None:
+            with session_scope(self._engine) as session:
+                row = session.get(DecisionAuditView, audit_id)
+                return _row_to_log(row) if row is not None else None
         return self._logs.get(audit_id)
     
     def query_by_segment(self, segment_key: str) -> list[DecisionAuditLog]:
-        """Query todos os logs de um segmento."""
-        audit_ids = self._by_segment.get(segment_key, [])
-        return [self._logs[aid] for aid in audit_ids if aid in self._logs]
+        """Query todos os logs de um segmento, na ordem de inserção."""
+        if self._engine is not None:
+            return self._select(DecisionAuditView.segment_key == segment_key, newest_first=False)
+        with self._lock:
+            return self._materialize_inserted(self._by_segment.get(segment_key, []))
     
     def query_by_brand(self, brand_id: str) -> list[DecisionAuditLog]:
-        """Query todos os logs de um brand."""
-        audit_ids = self._by_brand.get(brand_id, [])
-        return [self._logs[aid] for aid in audit_ids if aid in self._logs]
+        """Query todos os logs de um brand, na ordem de inserção."""
+        if self._engine is not None:
+            return self._select(DecisionAuditView.brand_id == brand_id, newest_first=False)
+        with self._lock:
+            return self._materialize_inserted(self._by_brand.get(brand_id, []))
     
     def query_by_date_range(
         self,
         start_date: str,
         end_date: str
     ) -> list[DecisionAuditLog]:
-        """Query logs em um range de datas."""
-        results = []
-        for log in self._logs.values():
-            if start_date <= log.executed_at <= end_date:
-                results.append(log)
-        return results
+        """Query logs em um range de datas, na ordem de inserção."""
+        if self._engine is not None:
+            return self._select(
+                DecisionAuditView.executed_at >= start_date,
+                DecisionAuditView.executed_at <= end_date,
+                newest_first=False,
+            )
+        with self._lock:
+            lo, hi = self._date_bounds(self._ordered, start_date, end_date)
+            return self._materialize_inserted(self._ordered[lo:hi])
     
     def query_paginated(
         self,
@@ -313,30 +440,86 @@ class DecisionAuditStore:
         """
         Query paginada de logs.
         
+        Para páginas profundas prefira :meth:`query_page`, que não depende
+        de offset.
+        
         Returns:
             Tuple de (logs da página, total de logs)
         """
         pagination = pagination or AuditPagination()
         
-        # Filtra por segmento ou brand
-        if segment_key:
-            all_logs = self.query_by_segment(segment_key)
-        elif brand_id:
-            all_logs = self.query_by_brand(brand_id)
-        else:
-            all_logs = list(self._logs.values())
-        
-        # Ordena por data (mais recente primeiro)
-        all_logs.sort(key=lambda x: x.executed_at, reverse=True)
-        
-        total = len(all_logs)
+        if self._engine is not None:
+            conditions = self._scope_conditions(segment_key, brand_id)
+            with session_scope(self._engine) as session:
+                total = session.scalar(
+                    select(func.count()).select_from(DecisionAuditView).where(*conditions)
+                ) or 0
+                rows = session.scalars(
+                    select(DecisionAuditView)
+                    .where(*conditions)
+                    .order_by(DecisionAuditView.executed_at.desc(), DecisionAuditView.audit_id.desc())
+                    .offset(pagination.offset)
+                    .limit(pagination.page_size)
+                )
+                return [_row_to_log(row) for row in rows], int(total)
+        
+        with self._lock:
+            index = self._scope_index(segment_key, brand_id)
+            total = len(index)
+            # O índice está em ordem crescente; a página N (mais recente
+            # primeiro) é um slice contado a partir do fim.
+            hi = max(total - pagination.offset, 0)
+            lo = max(hi - pagination.page_size, 0)
+            return self._materialize(reversed(index[lo:hi])), total
+    
+    def query_page(
+        self,
+        segment_key: Optional[str] = None,
+        brand_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+    ) -> AuditPage:
+        """
+        Query paginada por cursor (keyset), mais recente primeiro.
         
-        # Aplica paginação
-        offset = pagination.offset
-        end = offset + pagination.page_size
-        paginated_logs = all_logs[offset:end]
+        O custo de cada página é proporcional a ``limit``, não à
+        profundidade da página.
         
-        return paginated_logs, total
+        Args:
+            segment_key: Filtro opcional por segmento
+            brand_id: Filtro opcional por brand (ignorado se houver segmento)
+            limit: Tamanho da página
+            cursor: ``next_cursor`` da página anterior
+        """
+        if limit < 1:
+            raise ValueError("limit must be >= 1")
+        after = decode_audit_cursor(cursor) if cursor else None
+        
+        if self._engine is not None:
+            conditions = self._scope_conditions(segment_key, brand_id)
+            if after is not None:
+                executed_at, audit_id = after
+                conditions.append(
+                    or_(
+                        DecisionAuditView.executed_at < executed_at,
+                        and_(
+                            DecisionAuditView.executed_at == executed_at,
+                            DecisionAuditView.audit_id < audit_id,
+                        ),
+                    )
+                )
+            logs = self._select(*conditions, limit=limit + 1)
+        else:
+            with self._lock:
+                index = self._scope_index(segment_key, brand_id)
+                hi = bisect.bisect_left(index, after) if after is not None else len(index)
+                lo = max(hi - limit - 1, 0)
+                logs = self._materialize(reversed(index[lo:hi]))
+        
+        if len(logs) > limit:
+            logs = logs[:limit]
+            return AuditPage(logs=logs, next_cursor=encode_audit_cursor(logs[-1]))
+        return AuditPage(logs=logs)
     
     def query(self, query_params: AuditQuery) -> list[DecisionAuditLog]:
         """
@@ -348,12 +531,27 @@ class DecisionAuditStore:
         Returns:
             Lista de logs matching os filtros
         """
-        results = list(self._logs.values())
-        
-        # Aplica filtros
-        if query_params.segment_key:
-            results = [r for r in results if r.segment_key == query_params.segment_key]
-        
+        if self._engine is not None:
+            conditions = self._scope_conditions(query_params.segment_key, query_params.brand_id)
+            if query_params.segment_key and query_params.brand_id:
+                conditions.append(DecisionAuditView.brand_id == query_params.brand_id)
+            if query_params.actor:
+                conditions.append(DecisionAuditView.actor == query_params.actor)
+            if query_params.final_decision:
+                conditions.append(DecisionAuditView.final_decision == query_params.final_decision)
+            if query_params.start_date:
+                conditions.append(DecisionAuditView.executed_at >= query_params.start_date)
+            if query_params.end_date:
+                conditions.append(DecisionAuditView.executed_at <= query_params.end_date)
+            return self._select(*conditions)
+        
+        with self._lock:
+            # Parte do índice mais seletivo e recorta o range de datas por bisect
+            index = self._scope_index(query_params.segment_key, query_params.brand_id)
+            lo, hi = self._date_bounds(index, query_params.start_date, query_params.end_date)
+            results = self._materialize(reversed(index[lo:hi]))
+        
+        # Aplica filtros restantes
         if query_params.brand_id:
             results = [r for r in results if r.brand_id == query_params.brand_id]
         
@@ -363,16 +561,80 @@ class DecisionAuditStore:
         if query_params.final_decision:
             results = [r for r in results if r.final_decision == query_params.final_decision]
         
-        if query_params.start_date:
-            results = [r for r in results if r.executed_at >= query_params.start_date]
-        
-        if query_params.end_date:
-            results = [r for r in results if r.executed_at <= query_params.end_date]
-        
-        # Ordena por data (mais recente primeiro)
-        results.sort(key=lambda x: x.executed_at, reverse=True)
-        
         return results
+    
+    def _store_in_memory(self, log: DecisionAuditLog) -> None:
+        previous = self._logs.get(log.audit_id)
+        if previous is not None:
+            # audit_id repetido substitui o log anterior em todos os índices
+            key = (previous.executed_at, previous.audit_id)
+            for index in (
+                self._ordered,
+                self._by_segment.get(previous.segment_key, []),
+                self._by_brand.get(previous.brand_id, []),
+            ):
+                position = bisect.bisect_left(index, key)
+                if position < len(index) and index[position] == key:
+                    del index[position]
+        else:
+            # regravar um audit_id mantém sua posição de inserção
+            self._inserted[log.audit_id] = len(self._inserted)
+        
+        key = (log.executed_at, log.audit_id)
+        bisect.insort(self._ordered, key)
+        bisect.insort(self._by_segment.setdefault(log.segment_key, []), key)
+        bisect.insort(self._by_brand.setdefault(log.brand_id, []), key)
+        self._logs[log.audit_id] = log
+    
+    def _scope_index(
+        self,
+        segment_key: Optional[str],
+        brand_id: Optional[str],
+    ) -> list[tuple[str, str]]:
+        if segment_key:
+            return self._by_segment.get(segment_key, [])
+        if brand_id:
+            return self._by_brand.get(brand_id, [])
+        return self._ordered
+    
+    @staticmethod
+    def _scope_conditions(segment_key: Optional[str], brand_id: Optional[str]) -> list[Any]:
+        if segment_key:
+            return [DecisionAuditView.segment_key == segment_key]
+        if brand_id:
+            return [DecisionAuditView.brand_id == brand_id]
+        return []
+    
+    @staticmethod
+    def _date_bounds(
+        index: list[tuple[str, str]],
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> tuple[int, int]:
+        # (data,) < (data, qualquer id) e (data, "\uffff") > (data, qualquer id)
+        lo = bisect.bisect_left(index, (start_date,)) if start_date else 0
+        hi = bisect.bisect_right(index, (end_date, "\uffff")) if end_date else len(index)
+        return lo, hi
+    
+    def _materialize(self, keys) -> list[DecisionAuditLog]:
+        return [self._logs[audit_id] for _, audit_id in keys]
+    
+    def _materialize_inserted(self, keys: list[tuple[str, str]]) -> list[DecisionAuditLog]:
+        audit_ids = sorted((audit_id for _, audit_id in keys), key=self._inserted.__getitem__)
+        return [self._logs[audit_id] for audit_id in audit_ids]
+    
+    def _select(
+        self, *conditions: Any, limit: Optional[int] = None, newest_first: bool = True
+    ) -> list[DecisionAuditLog]:
+        if newest_first:
+            order = (DecisionAuditView.executed_at.desc(), DecisionAuditView.audit_id.desc())
+        else:
+            order = (DecisionAuditView.executed_at.asc(), DecisionAuditView.audit_id.asc())
+        statement = select(DecisionAuditView).where(*conditions).order_by(*order)
+        if limit is not None:
+            statement = statement.limit(limit)
+        with session_scope(self._engine) as session:
+            return [_row_to_log(row) for row in session.scalars(statement)]
 
 
 # Global store instance (substituir por injeção de dependência em produção)
@@ -401,26 +663,16 @@ def simulate_decision(context: dict[str, Any]) -> SimulationResult:
     return simulator.simulate(context)
 
 
-def record_decision_execution(
-    execution_data: dict[str, Any],
-    store: DecisionAuditStore = None
-) -> str:
-    """
-    Registra execução de decisão no audit trail.
-    
-    Args:
-        execution_data: Dados da execução
-        store: Store opcional (usa default se não fornecido)
-        
-    Returns:
-        audit_id gerado
-    """
-    store = store or get_default_store()
-    
-    audit_id = f"audit_{uuid.uuid4().hex[:12]}"
-    
-    log = DecisionAuditLog(
-        audit_id=audit_id,
+def configure_decision_audit_storage(engine: Optional[Engine]) -> DecisionAuditStore:
+    """Liga o store padrão a ``engine`` (``None`` volta para memória)."""
+    store = get_default_store()
+    store.bind(engine)
+    return store
+
+
+def _build_audit_log(execution_data: dict[str, Any]) -> DecisionAuditLog:
+    return DecisionAuditLog(
+        audit_id=f"audit_{uuid.uuid4().hex[:12]}",
         segment_key=execution_data["segment_key"],
         brand_id=execution_data["brand_id"],
         input_metrics=execution_data["input_metrics"],
@@ -435,9 +687,44 @@ def record_decision_execution(
         rollback_triggered=execution_data.get("rollback_triggered", False),
         rollback_reason=execution_data.get("rollback_reason")
     )
+
+
+def record_decision_execution(
+    execution_data: dict[str, Any],
+    store: DecisionAuditStore = None
+) -> str:
+    """
+    Registra execução de decisão no audit trail.
     
+    Args:
+        execution_data: Dados da execução
+        store: Store opcional (usa default se não fornecido)
+        
+    Returns:
+        audit_id gerado
+    """
+    store = store or get_default_store()
+    log = _build_audit_log(execution_data)
     store.store(log)
-    return audit_id
+    return log.audit_id
+
+
+def record_decision_executions(
+    executions: list[dict[str, Any]],
+    store: DecisionAuditStore = None
+) -> list[str]:
+    """
+    Registra várias execuções em lote (uma transação, um executemany).
+    
+    Args:
+        executions: Dados de cada execução, no formato de record_decision_execution
+        store: Store opcional (usa default se não fornecido)
+        
+    Returns:
+        audit_ids gerados, na ordem recebida
+    """
+    store = store or get_default_store()
+    return store.store_many([_build_audit_log(data) for data in executions])
 
 
 def get_decision_history(
@@ -1,22 +1,33 @@
 from __future__ import annotations
 
+import logging
 import time
 from typing import Protocol
 
 from sqlalchemy.engine import Engine
 
-from vm_webapp.db import build_engine, init_db, session_scope
+from vm_webapp.db import session_scope
 from vm_webapp.orchestrator_v2 import process_new_events
 from vm_webapp.settings import Settings
 
+logger = logging.getLogger(__name__)
+
+
+class SupportsRunDispatch(Protocol):
+    def dispatch(self) -> int: ...
+
 
 class InProcessEventWorker:
-    def __init__(self, *, engine: Engine) -> None:
+    def __init__(self, *, engine: Engine, run_pool: SupportsRunDispatch | None = None) -> None:
         self.engine = engine
+        self.run_pool = run_pool
 
     def pump(self, *, max_events: int = 50) -> int:
         with session_scope(self.engine) as session:
-            return process_new_events(session, max_events=max_events)
+            processed = process_new_events(session, max_events=max_events)
+        if self.run_pool is not None:
+            self.run_pool.dispatch()
+        return processed
 
 
 class SupportsMetricsCounter(Protocol):
@@ -42,11 +53,21 @@ def run_worker_loop(
     poll_interval_ms: int = 500,
     max_events: int = 50,
 ) -> None:
-    engine = build_engine(settings.vm_db_path, db_url=settings.vm_db_url)
-    init_db(engine)
-    worker = InProcessEventWorker(engine=engine)
+    # Imported here: the runtime imports this module for its worker helpers.
+    from vm_webapp.bootstrap import StartupPhases, build_runtime, open_database
+    from vm_webapp.settings import ROLE_WORKER
+
+    phases = StartupPhases(ROLE_WORKER)
+    engine = open_database(settings, phases)
+    services = build_runtime(settings, engine, phases=phases)
+    worker = InProcessEventWorker(engine=engine, run_pool=services.run_pool)
+    timings = ", ".join(f"{name}={ms:.0f}ms" for name, ms in phases.snapshot()["phases_ms"].items())
+    logger.info("worker started (%s)", timings)
     poll_interval_seconds = max(0, poll_interval_ms) / 1000
-    while True:
-        processed = worker.pump(max_events=max_events)
-        if processed == 0:
-            time.sleep(poll_interval_seconds)
+    try:
+        while True:
+            processed = worker.pump(max_events=max_events)
+            if processed == 0:
+                time.sleep(poll_interval_seconds)
+    finally:
+        services.close()
@@ -0,0 +1,252 @@
+"""Feature-area routers, mounted eagerly or on first request.
+
+Router modules are referenced by import path so ``vm_webapp.app`` does not pay
+for importing them at module load. ``RouterMounter`` imports and includes an
+area's routers when asked to, keeping routes in ``FEATURE_AREAS`` order no
+matter which area was loaded first, so lazy mounting matches the eager route
+table. In lazy mode ``LazyRouterMiddleware`` mounts the areas whose declared
+``paths`` cover the request path before routing it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
+from starlette.routing import BaseRoute, Mount
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+ALL_FEATURES = "all"
+
+
+@dataclass(frozen=True)
+class FeatureRouter:
+    module: str
+    attr: str = "router"
+    prefix: str = ""
+
+
+@dataclass(frozen=True)
+class FeatureArea:
+    name: str
+    routers: tuple[FeatureRouter, ...]
+    # Request path prefixes (whole segments) covering every route of the area.
+    paths: tuple[str, ...]
+
+    def serves(self, path: str) -> bool:
+        return any(path == prefix or path.startswith(prefix + "/") for prefix in self.paths)
+
+
+_BRANDS = "/api/v2/brands"
+
+# Include order of the original eager wiring; routes are matched in this order.
+FEATURE_AREAS: tuple[FeatureArea, ...] = (
+    FeatureArea(
+        "onboarding",
+        (
+            FeatureRouter("vm_webapp.api_onboarding_experiments"),
+            FeatureRouter("vm_webapp.api_onboarding_personalization"),
+            FeatureRouter("vm_webapp.api_onboarding_recovery"),
+            FeatureRouter("vm_webapp.api_onboarding_activation"),
+            FeatureRouter("vm_webapp.api_onboarding_continuity"),
+        ),
+        (_BRANDS, "/status", "/run", "/proposals", "/freeze", "/rollback"),
+    ),
+    FeatureArea(
+        "predictive_resilience",
+        (FeatureRouter("vm_webapp.api_predictive_resilience"),),
+        (_BRANDS,),
+    ),
+    FeatureArea("outcome_roi", (FeatureRouter("vm_webapp.api_outcome_roi"),), (_BRANDS,)),
+    FeatureArea(
+        "copilot",
+        (FeatureRouter("vm_webapp.api_copilot"),),
+        ("/v2/threads", "/api/v2/threads"),
+    ),
+    FeatureArea(
+        "safety_tuning",
+        (FeatureRouter("vm_webapp.api_safety_tuning"),),
+        ("/v2/safety-tuning",),
+    ),
+    FeatureArea(
+        "adaptive_escalation",
+        (FeatureRouter("vm_webapp.api_adaptive_escalation"),),
+        ("/v2/escalation",),
+    ),
+    FeatureArea("control_loop", (FeatureRouter("vm_webapp.api_control_loop"),), (_BRANDS,)),
+    FeatureArea("recovery", (FeatureRouter("vm_webapp.api_recovery"),), (_BRANDS,)),
+    FeatureArea(
+        "approval_learning",
+        (FeatureRouter("vm_webapp.api_approval_learning"),),
+        ("/api/v2/approval-learning",),
+    ),
+    FeatureArea(
+        "core",
+        (
+            # New v2 API structure (Phase 2)
+            FeatureRouter("vm_webapp.api.v2", attr="v2_router"),
+            FeatureRouter("vm_webapp.api", prefix="/api/v1"),
+            # Routes include /api/v2/ prefix directly
+            FeatureRouter("vm_webapp.api"),
+        ),
+        (
+            "/api/v1",
+            "/api/v2",
+            "/health",
+            "/brands",
+            "/products",
+            "/threads",
+            "/runs",
+            "/chat",
+            "/v2/safety-tuning",
+            "/v2/escalation",
+        ),
+    ),
+    FeatureArea("agent_dag", (FeatureRouter("vm_webapp.api_agent_dag"),), ("/api/v2/dag",)),
+    FeatureArea(
+        "approval_optimizer",
+        (FeatureRouter("vm_webapp.api_approval_optimizer"),),
+        ("/api/v2/optimizer",),
+    ),
+    FeatureArea(
+        "quality_optimizer",
+        (FeatureRouter("vm_webapp.api_quality_optimizer"),),
+        ("/v2/optimizer",),
+    ),
+)
+
+# Schema and docs pages describe every enabled area.
+_ALL_AREAS_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+
+def resolve_feature_areas(names: Iterable[str] | None) -> tuple[FeatureArea, ...]:
+    """Areas enabled by ``names`` (``None`` or ``"all"`` enables every area)."""
+    if names is None:
+        return FEATURE_AREAS
+    wanted = {name.strip() for name in names if name.strip()}
+    if ALL_FEATURES in wanted:
+        return FEATURE_AREAS
+    known = {area.name for area in FEATURE_AREAS}
+    unknown = sorted(wanted - known)
+    if unknown:
+        raise ValueError(
+            f"unknown feature areas: {', '.join(unknown)} (known: {', '.join(sorted(known))})"
+        )
+    return tuple(area for area in FEATURE_AREAS if area.name in wanted)
+
+
+class RouterMounter:
+    def __init__(self, app: FastAPI, areas: Sequence[FeatureArea]) -> None:
+        self._app = app
+        self._areas = tuple(areas)
+        self._pending = {area.name: area for area in self._areas}
+        self._routes: dict[str, list[BaseRoute]] = {}
+        self._lock = threading.Lock()
+        self.mount_seconds: dict[str, float] = {}
+
+    @property
+    def enabled(self) -> list[str]:
+        return [area.name for area in self._areas]
+
+    @property
+    def mounted(self) -> list[str]:
+        return [area.name for area in self._areas if area.name in self._routes]
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def mount(self, names: Iterable[str] | None = None) -> list[str]:
+        """Import and include the pending areas in ``names`` (default: all)."""
+        wanted = set(self._pending) if names is None else set(names) & set(self._pending)
+        if not wanted:
+            return []
+        with self._lock:
+            areas = [
+                area
+                for area in self._areas
+                if area.name in wanted and area.name in self._pending
+            ]
+            for area in areas:
+                self._include(area)
+                del self._pending[area.name]
+            if areas:
+                self._reorder()
+                self._app.openapi_schema = None
+        return [area.name for area in areas]
+
+    def pending_for_path(self, path: str) -> list[str]:
+        """Pending areas a request to ``path`` needs; cheap, imports nothing."""
+        pending = list(self._pending.values())
+        if path in _ALL_AREAS_PATHS:
+            return [area.name for area in pending]
+        return [area.name for area in pending if area.serves(path)]
+
+    def _include(self, area: FeatureArea) -> None:
+        started = time.perf_counter()
+        routes = self._app.router.routes
+        before = {id(route) for route in routes}
+        for item in area.routers:
+            router = getattr(importlib.import_module(item.module), item.attr)
+            if item.prefix:
+                self._app.include_router(router, prefix=item.prefix)
+            else:
+                self._app.include_router(router)
+        self._routes[area.name] = [route for route in routes if id(route) not in before]
+        self.mount_seconds[area.name] = time.perf_counter() - started
+
+    def _reorder(self) -> None:
+        # Feature routes sit in registry order after the app's own routes and
+        # before static mounts, as if every area had been included up front.
+        owned = {id(route) for routes in self._routes.values() for route in routes}
+        routes = self._app.router.routes
+        own = [route for route in routes if id(route) not in owned]
+        head = [route for route in own if not isinstance(route, Mount)]
+        mounts = [route for route in own if isinstance(route, Mount)]
+        features = [
+            route for area in self._areas for route in self._routes.get(area.name, ())
+        ]
+        routes[:] = head + features + mounts
+
+
+class LazyRouterMiddleware:
+    def __init__(self, app: ASGIApp, mounter: RouterMounter) -> None:
+        self.app = app
+        self.mounter = mounter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in {"http", "websocket"} and self.mounter.pending:
+            names = self.mounter.pending_for_path(scope["path"])
+            if names:
+                # Importing a router module can take a while; keep the loop free.
+                await run_in_threadpool(self.mounter.mount, names)
+        await self.app(scope, receive, send)
+
+
+def mount_feature_routers(
+    app: FastAPI, features: Iterable[str] | None = None, *, lazy: bool = False
+) -> RouterMounter:
+    mounter = RouterMounter(app, resolve_feature_areas(features))
+    if lazy:
+        app.add_middleware(LazyRouterMiddleware, mounter=mounter)
+    else:
+        mounter.mount()
+    return mounter
+
+
+def route_paths(routes: Sequence[Any]) -> list[str]:
+    """Flatten included routers into the concrete request paths they serve."""
+    paths: list[str] = []
+    for route in routes:
+        candidates = getattr(route, "effective_candidates", None)
+        if candidates is not None:
+            paths.extend(route_paths(candidates()))
+        elif getattr(route, "path", None):
+            paths.append(route.path)
+    return paths
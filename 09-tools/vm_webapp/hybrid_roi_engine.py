@@ -2,6 +2,8 @@
 
 Combines financial and operational metrics into a hybrid ROI score,
 with guardrails to prevent optimization that degrades quality or stability.
+Whole brand/touchpoint sets can be scored at once with the batch methods,
+which take columns of NumPy arrays instead of one dict per segment.
 """
 
 from __future__ import annotations
@@ -9,9 +11,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Mapping, Optional, Callable, Sequence
 import uuid
 
+import numpy as np
+
 from vm_webapp.outcome_attribution import OutcomeType, TouchpointType
 
 
@@ -155,6 +159,35 @@ class HybridScore:
         return "; ".join(parts)
 
 
+@dataclass(frozen=True)
+class HybridScoreBatch:
+    """Hybrid scores for many segments as parallel 1-D arrays."""
+    financial_component: np.ndarray
+    operational_component: np.ndarray
+    hybrid_index: np.ndarray
+    penalized_index: np.ndarray
+    penalties: Optional[Sequence[Optional[QualityPenalty]]] = None
+    
+    def __len__(self) -> int:
+        return len(self.hybrid_index)
+    
+    def risk_levels(self) -> List[ProposalRiskLevel]:
+        """Vectorized ``ProposalRiskLevel.from_hybrid_score``."""
+        codes = np.select(
+            [self.penalized_index >= 0.15, self.penalized_index >= 0.08], [0, 1], default=2
+        )
+        levels = (ProposalRiskLevel.LOW, ProposalRiskLevel.MEDIUM, ProposalRiskLevel.HIGH)
+        return [levels[code] for code in codes.tolist()]
+    
+    def at(self, index: int) -> HybridScore:
+        """Materialize segment ``index`` as a scalar ``HybridScore``."""
+        return HybridScore(
+            financial_component=float(self.financial_component[index]),
+            operational_component=float(self.operational_component[index]),
+            quality_penalty=self.penalties[index] if self.penalties is not None else None,
+        )
+
+
 @dataclass
 class Proposal:
     """Optimization proposal with hybrid ROI score."""
@@ -333,6 +366,85 @@ class HybridROIEngine:
             quality_penalty=penalty,
         )
     
+    def calculate_hybrid_scores_batch(
+        self,
+        financial_data: Mapping[str, Any],
+        operational_data: Mapping[str, Any],
+        penalties: Optional[Sequence[Optional[QualityPenalty]]] = None,
+    ) -> HybridScoreBatch:
+        """Score many segments at once from column arrays.
+        
+        ``financial_data`` and ``operational_data`` use the same keys as the
+        scalar dicts (``revenue``, ``cost``, ``activations``; ``activations``,
+        ``successes``, ``human_minutes``), each mapped to an array with one
+        entry per segment. Missing keys take the scalar defaults. Element
+        ``i`` equals ``calculate_hybrid_score`` for segment ``i`` exactly.
+        """
+        size = _batch_size(financial_data, operational_data, penalties)
+
+        def column(data: Mapping[str, Any], key: str, default: float) -> np.ndarray:
+            values = np.asarray(data.get(key, default), dtype=np.float64)
+            return np.broadcast_to(values, (size,))
+
+        def per_activation(data: Mapping[str, Any]) -> np.ndarray:
+            activations = column(data, "activations", 1)
+            return np.where(activations <= 0, 1.0, activations)
+
+        zeros = np.zeros(size)
+        fin_activations = per_activation(financial_data)
+        revenue = column(financial_data, "revenue", 0) / fin_activations
+        cost = column(financial_data, "cost", 0) / fin_activations
+        financial = np.divide(revenue - cost, cost, out=zeros.copy(), where=cost > 0)
+
+        ops_activations = per_activation(operational_data)
+        success_rate = column(operational_data, "successes", 0) / ops_activations
+        human_hours = (column(operational_data, "human_minutes", 0) / ops_activations) / 60.0
+        operational = np.divide(success_rate, human_hours, out=zeros.copy(), where=human_hours > 0)
+
+        hybrid = financial * 0.6 + operational * 0.4
+        penalized = hybrid
+        if penalties is not None:
+            factors = np.array([p.factor if p else 0.0 for p in penalties], dtype=np.float64)
+            has_penalty = np.array([bool(p) for p in penalties], dtype=bool)
+            penalized = np.where(has_penalty, hybrid * (1 - factors), hybrid)
+
+        return HybridScoreBatch(
+            financial_component=financial,
+            operational_component=operational,
+            hybrid_index=hybrid,
+            penalized_index=penalized,
+            penalties=list(penalties) if penalties is not None else None,
+        )
+    
+    def generate_proposals_batch(
+        self,
+        brand_ids: Sequence[str],
+        touchpoint_types: Sequence[TouchpointType],
+        actions: Sequence[str],
+        expected_impacts: Sequence[Dict[str, Any]],
+        financial_data: Mapping[str, Any],
+        operational_data: Mapping[str, Any],
+        penalties: Optional[Sequence[Optional[QualityPenalty]]] = None,
+    ) -> tuple[HybridScoreBatch, List[Proposal]]:
+        """Batch form of ``generate_proposal``: one proposal per segment."""
+        scores = self.calculate_hybrid_scores_batch(financial_data, operational_data, penalties)
+        if not len(brand_ids) == len(touchpoint_types) == len(actions) == len(expected_impacts) == len(scores):
+            raise ValueError("batch columns must have the same length")
+        
+        proposals = []
+        for index in range(len(scores)):
+            proposal = Proposal(
+                proposal_id=str(uuid.uuid4()),
+                brand_id=brand_ids[index],
+                touchpoint_type=touchpoint_types[index],
+                action=actions[index],
+                expected_impact=expected_impacts[index],
+                score=scores.at(index),
+            )
+            self.proposals[proposal.proposal_id] = proposal
+            proposals.append(proposal)
+        return scores, proposals
+    
     def generate_proposal(
         self,
         brand_id: str,
@@ -456,3 +568,21 @@ class HybridROIEngine:
             "avg_hybrid_index": round(avg_index, 4),
             "by_risk_level": by_risk,
         }
+
+
+def _batch_size(
+    financial_data: Mapping[str, Any],
+    operational_data: Mapping[str, Any],
+    penalties: Optional[Sequence[Any]],
+) -> int:
+    sizes = {
+        np.size(value)
+        for data in (financial_data, operational_data)
+        for value in data.values()
+        if np.ndim(value) > 0
+    }
+    if penalties is not None:
+        sizes.add(len(penalties))
+    if len(sizes) > 1:
+        raise ValueError(f"batch columns have mismatched lengths: {sorted(sizes)}")
+    return sizes.pop() if sizes else 1
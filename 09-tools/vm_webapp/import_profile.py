@@ -0,0 +1,79 @@
+"""Import-time profile of app startup, from ``python -X importtime``.
+
+The statement runs in a fresh interpreter so nothing is already imported;
+the report lists the modules with the largest cumulative import time.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_STATEMENT = "import vm_webapp.app"
+_TOOLS_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    timings: list[ImportTiming] = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # column header
+        name = fields[2].rstrip()
+        stripped = name.lstrip(" ")
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(fields[0]),
+                cumulative_us=int(fields[1]),
+                depth=(len(name) - len(stripped) - 1) // 2,
+            )
+        )
+    return timings
+
+
+def profile_imports(statement: str = DEFAULT_STATEMENT) -> list[ImportTiming]:
+    """Run ``statement`` under ``-X importtime`` and parse the timings."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        part for part in (str(_TOOLS_ROOT), env.get("PYTHONPATH", "")) if part
+    )
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if completed.returncode != 0:
+        tail = "\n".join(completed.stderr.splitlines()[-10:])
+        raise RuntimeError(f"profiled statement failed ({completed.returncode}):\n{tail}")
+    return parse_importtime(completed.stderr)
+
+
+def total_seconds(timings: list[ImportTiming]) -> float:
+    return sum(item.cumulative_us for item in timings if item.depth == 0) / 1_000_000
+
+
+def format_report(timings: list[ImportTiming], *, top: int = 25) -> str:
+    lines = [f"total import time: {total_seconds(timings):.3f}s ({len(timings)} modules)"]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for item in sorted(timings, key=lambda timing: timing.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{item.cumulative_us / 1000:>14.1f} {item.self_us / 1000:>9.1f}  "
+            f"{'  ' * item.depth}{item.module}"
+        )
+    return "\n".join(lines)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
+import os
 import re
+import tempfile
+import threading
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -10,6 +13,20 @@ from typing import Any
 TOKEN_RE = re.compile(r"[a-z0-9]+")
 
 
+def _write_docs_file(path: Path, items: list[dict[str, Any]]) -> None:
+    # A unique temp file per write, so concurrent writers never replace each
+    # other's half-written file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    tmp = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(items, handle, ensure_ascii=False, indent=2)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 @dataclass(frozen=True)
 class Hit:
     doc_id: str
@@ -22,7 +39,8 @@ class MemoryIndex:
     """Simple local index with sparse retrieval and metadata filters.
 
     This keeps an explicit fallback path that does not depend on downloading or
-    initializing dense embedding models.
+    initializing dense embedding models. The corpus is read on first use, so
+    processes that never search do not pay for loading it.
     """
 
     def __init__(self, root: Path) -> None:
@@ -30,11 +48,21 @@ class MemoryIndex:
         self.root.mkdir(parents=True, exist_ok=True)
         self._docs_path = self.root / "docs.json"
         self._docs: dict[str, dict[str, Any]] = {}
-        self._load()
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        # Serializes mutation, snapshot and write so an older snapshot never
+        # lands on disk after a newer one.
+        self._persist_lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
 
     def upsert_doc(self, doc_id: str, text: str, meta: dict[str, Any]) -> None:
-        self._docs[doc_id] = {"doc_id": doc_id, "text": text, "meta": dict(meta)}
-        self._persist()
+        self._ensure_loaded()
+        with self._persist_lock:
+            self._docs[doc_id] = {"doc_id": doc_id, "text": text, "meta": dict(meta)}
+            self._persist()
 
     def search(
         self,
@@ -43,6 +71,7 @@ class MemoryIndex:
         filters: dict[str, Any],
         top_k: int,
     ) -> list[Hit]:
+        self._ensure_loaded()
         query_terms = set(TOKEN_RE.findall(query.lower()))
         hits: list[Hit] = []
         for item in self._docs.values():
@@ -65,6 +94,14 @@ class MemoryIndex:
         hits.sort(key=lambda h: h.score, reverse=True)
         return hits[:top_k]
 
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._load_lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
     def _load(self) -> None:
         if not self._docs_path.exists():
             return
@@ -72,11 +109,8 @@ class MemoryIndex:
         self._docs = {item["doc_id"]: item for item in data}
 
     def _persist(self) -> None:
-        items = list(self._docs.values())
-        self._docs_path.write_text(
-            json.dumps(items, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        with self._persist_lock:
+            _write_docs_file(self._docs_path, list(self._docs.values()))
 
     @staticmethod
     def _sparse_score(query_terms: set[str], text: str) -> float:
@@ -2,7 +2,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
-from sqlalchemy import Boolean, Enum as SQLEnum, Integer, String, Text
+from sqlalchemy import Boolean, Enum as SQLEnum, Float, Index, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -59,7 +59,7 @@ class Run(Base):
     thread_id: Mapped[str] = mapped_column(String(64), nullable=False)
     stack_path: Mapped[str] = mapped_column(String(512), nullable=False)
     user_request: Mapped[str] = mapped_column(Text, nullable=False)
-    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending")
+    status: Mapped[str] = mapped_column(String(32), nullable=False, default="pending", index=True)
     created_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
     updated_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
 
@@ -210,6 +210,9 @@ class ToolCredential(Base):
 
 class ContextVersion(Base):
     __tablename__ = "context_versions"
+    __table_args__ = (
+        Index("ix_context_versions_scope_created", "scope", "scope_id", "created_at"),
+    )
 
     version_id: Mapped[str] = mapped_column(String(64), primary_key=True)
     scope: Mapped[str] = mapped_column(String(32), nullable=False)  # brand, campaign, task
@@ -218,6 +221,17 @@ class ContextVersion(Base):
     created_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
 
 
+class ContextLatestVersion(Base):
+    """Pointer to the newest ``context_versions`` row per scope, kept by append."""
+
+    __tablename__ = "context_latest_versions"
+
+    scope: Mapped[str] = mapped_column(String(32), primary_key=True)
+    scope_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    updated_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
+
+
 class EditorialDecisionView(Base):
     __tablename__ = "editorial_decisions_view"
 
@@ -339,6 +353,81 @@ class CopilotFeedbackView(Base):
     created_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
 
 
+class RegressionAlertView(Base):
+    """Persisted segment regression alerts (v15).
+
+    ``status`` is derived from the confirmed/false-positive flags so active
+    alerts per segment are an index range scan, newest last.
+    """
+
+    __tablename__ = "regression_alerts"
+    __table_args__ = (
+        Index("ix_regression_alerts_segment_status_detected", "segment_key", "status", "detected_at"),
+        Index("ix_regression_alerts_status_detected", "status", "detected_at"),
+    )
+
+    alert_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    segment_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    severity: Mapped[str] = mapped_column(String(16), nullable=False)
+    reason_code: Mapped[str] = mapped_column(String(64), nullable=False)
+    metric_name: Mapped[str] = mapped_column(String(128), nullable=False)
+    current_value: Mapped[float] = mapped_column(Float, nullable=False)
+    baseline_value: Mapped[float] = mapped_column(Float, nullable=False)
+    delta: Mapped[float] = mapped_column(Float, nullable=False)
+    window_hours: Mapped[int] = mapped_column(Integer, nullable=False)
+    detected_at: Mapped[str] = mapped_column(String(64), nullable=False)
+    confirmed_at: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    dismissed_at: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    dismissed_by: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+
+
+class DecisionAuditView(Base):
+    """Audit trail of automated/manual governance decisions (v16).
+
+    Composite indexes end in ``audit_id`` so keyset pagination ordered by
+    ``(executed_at, audit_id)`` is served straight from the index.
+    """
+
+    __tablename__ = "decision_audit_log"
+    __table_args__ = (
+        Index("ix_decision_audit_segment_executed", "segment_key", "executed_at", "audit_id"),
+        Index("ix_decision_audit_brand_executed", "brand_id", "executed_at", "audit_id"),
+        Index("ix_decision_audit_executed", "executed_at", "audit_id"),
+    )
+
+    audit_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    segment_key: Mapped[str] = mapped_column(String(128), nullable=False)
+    brand_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    input_metrics_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    suggested_decision: Mapped[str] = mapped_column(String(32), nullable=False)
+    gates_applied_json: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    gate_results_json: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    final_decision: Mapped[str] = mapped_column(String(32), nullable=False)
+    actor: Mapped[str] = mapped_column(String(16), nullable=False)
+    executed_at: Mapped[str] = mapped_column(String(64), nullable=False)
+    override_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    executed_by: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    rollback_triggered: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    rollback_reason: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+
+class QualityScore(Base):
+    """Heuristic quality scores cached by artifact content hash.
+
+    Runs whose first artifact is byte-identical share one row per rubric
+    version, so re-evaluations and backfills only score new content.
+    """
+
+    __tablename__ = "quality_scores"
+
+    content_sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    rubric_version: Mapped[str] = mapped_column(String(32), primary_key=True)
+    content_length: Mapped[int] = mapped_column(Integer, nullable=False)
+    score_json: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
+
+
 class PolicyLevel(str, Enum):
     """Policy hierarchy levels: segment > brand > global."""
 
@@ -370,4 +459,7 @@ class Policy(Base):
     )
     params_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
     created_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
-    updated_at: Mapped[str] = mapped_column(String(64), nullable=False, default=_now_iso)
+    # Also part of the policy cache fingerprint; bumped on every ORM update.
+    updated_at: Mapped[str] = mapped_column(
+        String(64), nullable=False, default=_now_iso, onupdate=_now_iso
+    )
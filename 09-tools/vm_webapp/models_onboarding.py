@@ -6,7 +6,7 @@ import json
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from sqlalchemy import String, Text, DateTime, Integer, Float
+from sqlalchemy import BigInteger, String, Text, DateTime, Integer, Float, UniqueConstraint
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -66,3 +66,50 @@ class OnboardingState(OnboardingBase):
     duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     template_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True, index=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now_utc, nullable=False)
+
+
+class OnboardingRecord(OnboardingBase):
+    """Key/value record backing the durable onboarding stores."""
+    __tablename__ = "onboarding_records"
+    __table_args__ = (UniqueConstraint("namespace", "record_key", name="uq_onboarding_records_key"),)
+
+    record_pk: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    namespace: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    record_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now_utc, nullable=False)
+
+
+class OnboardingEventRollup(OnboardingBase):
+    """Hourly/daily pre-aggregates of onboarding events.
+
+    ``brand_id``, ``step`` and ``template_id`` use ``""`` for "not set" so the
+    unique key also covers events without them.
+    """
+    __tablename__ = "onboarding_event_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity",
+            "bucket_start",
+            "brand_id",
+            "event_type",
+            "step",
+            "template_id",
+            name="uq_onboarding_event_rollups_key",
+        ),
+    )
+
+    rollup_pk: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    granularity: Mapped[str] = mapped_column(String(8), nullable=False)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    brand_id: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    event_type: Mapped[str] = mapped_column(String(64), nullable=False)
+    step: Mapped[str] = mapped_column(String(128), nullable=False, default="")
+    template_id: Mapped[str] = mapped_column(String(64), nullable=False, default="")
+    event_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_sum_ms: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    duration_min_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    duration_max_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    sketch_json: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=_now_utc, nullable=False)
@@ -9,12 +9,15 @@ v45: Integrated RolloutPolicy support for policy-driven assignment.
 from __future__ import annotations
 
 import hashlib
+import json
 import logging
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional
 
+from vm_webapp.onboarding_store import DurableStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -159,12 +162,35 @@ class VariantAssignment:
     assigned_at: str = field(default_factory=_now_iso)
 
 
+def _assignment_key(experiment_id: str, user_id: str, workspace_id: str) -> str:
+    return json.dumps([experiment_id, user_id, workspace_id])
+
+
+def _decode_assignment(payload: str) -> VariantAssignment:
+    return VariantAssignment(**json.loads(payload))
+
+
+def _decode_rollout_policy(payload: str) -> RolloutPolicy:
+    data = json.loads(payload)
+    data["mode"] = RolloutMode(data["mode"])
+    data["status"] = RolloutPolicyStatus(data["status"])
+    return RolloutPolicy(**data)
+
+
+def _encode_dataclass(value: Any) -> str:
+    return json.dumps(asdict(value))
+
+
 class ExperimentRegistry:
     """Registry for onboarding experiments with deterministic assignment."""
 
     def __init__(self):
         self._experiments: dict[str, Any] = {}
-        self._assignments: dict[tuple[str, str, str], VariantAssignment] = {}
+        self._assignments: DurableStore[VariantAssignment] = DurableStore(
+            "experiment_assignments",
+            encode=_encode_dataclass,
+            decode=_decode_assignment,
+        )
 
     def register(self, experiment: Any) -> None:
         """Register a new experiment."""
@@ -199,9 +225,10 @@ class ExperimentRegistry:
             raise ValueError(f"Experiment not active: {experiment_id}")
 
         # Check for existing assignment
-        key = (experiment_id, user_id, workspace_id)
-        if key in self._assignments:
-            return self._assignments[key]
+        key = _assignment_key(experiment_id, user_id, workspace_id)
+        existing = self._assignments.get(key)
+        if existing is not None:
+            return existing
 
         # Create deterministic assignment
         assignment = self._create_deterministic_assignment(
@@ -267,8 +294,8 @@ class ExperimentRegistry:
     def get_assignment_count(self, experiment_id: str | None = None, variant_id: str | None = None) -> int:
         """Get the number of assignments for an experiment/variant."""
         count = 0
-        for key, assignment in self._assignments.items():
-            if experiment_id is None or key[0] == experiment_id:
+        for assignment in self._assignments.values():
+            if experiment_id is None or assignment.experiment_id == experiment_id:
                 if variant_id is None or assignment.variant_id == variant_id:
                     count += 1
         return count
@@ -279,8 +306,8 @@ class ExperimentRegistry:
             self._assignments.clear()
         else:
             keys_to_remove = [
-                key for key in self._assignments.keys()
-                if key[0] == experiment_id
+                key for key, assignment in self._assignments.items()
+                if assignment.experiment_id == experiment_id
             ]
             for key in keys_to_remove:
                 del self._assignments[key]
@@ -371,8 +398,12 @@ def assign_variant_from_experiment(user_id: str, experiment: Experiment) -> str:
     return assign_variant(user_id, experiment.experiment_id, variants)
 
 
-# Global rollout policy registry (singleton)
-_rollout_policy_registry: dict[str, RolloutPolicy] = {}
+# Global rollout policy registry (singleton); durable once bound via configure_onboarding_storage
+_rollout_policy_registry: DurableStore[RolloutPolicy] = DurableStore(
+    "rollout_policies",
+    encode=_encode_dataclass,
+    decode=_decode_rollout_policy,
+)
 
 
 class RolloutPolicyManager:
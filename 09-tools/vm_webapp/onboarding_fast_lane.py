@@ -9,8 +9,14 @@ from enum import Enum
 from typing import Dict, List, Optional, Any
 import json
 
-# In-memory event store for fast lane telemetry (replace with DB in production)
-_fast_lane_events: List[Dict[str, Any]] = []
+from vm_webapp.onboarding_store import DurableStore
+
+# Event store for fast lane telemetry; durable once bound via configure_onboarding_storage
+_fast_lane_events: DurableStore[Dict[str, Any]] = DurableStore(
+    "fast_lane_events",
+    encode=json.dumps,
+    decode=json.loads,
+)
 
 
 class FastLaneEventType(str, Enum):
@@ -419,7 +425,7 @@ def get_fast_lane_events(
     Returns:
         List of matching events
     """
-    events = _fast_lane_events
+    events = _fast_lane_events.values()
     
     if user_id:
         events = [e for e in events if e["user_id"] == user_id]
@@ -427,7 +433,7 @@ def get_fast_lane_events(
     if event_type:
         events = [e for e in events if e["event_type"] == event_type]
     
-    return events.copy()
+    return events
 
 
 def clear_fast_lane_events() -> None:
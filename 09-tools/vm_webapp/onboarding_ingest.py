@@ -0,0 +1,193 @@
+"""Batched ingestion for onboarding telemetry events.
+
+Onboarding UIs emit bursts of events per step. Committing each one on its own
+costs one fsync-bound transaction per click, so events are written as a single
+multi-row ``INSERT`` (executemany) instead: either directly, for batch
+requests, or through ``OnboardingEventBuffer``, which collects events in
+memory and flushes them when ``max_batch`` rows are pending or
+``flush_interval_seconds`` has passed. The matching ``onboarding_rollups``
+rows are updated in the same transaction.
+
+The buffer is bounded by ``max_pending``; ``offer`` refuses work beyond that
+so the API can answer 429 instead of growing without limit. ``close`` flushes
+whatever is still pending and is registered as an app shutdown hook.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timezone
+from typing import Any, Protocol, cast
+from uuid import uuid4
+
+from sqlalchemy import Table, insert
+from sqlalchemy.engine import Engine
+
+from vm_webapp.db import session_scope
+from vm_webapp.models_onboarding import OnboardingEvent
+from vm_webapp.onboarding_rollups import apply_event_rows
+
+
+class SupportsIngestMetrics(Protocol):
+    def record_count(self, name: str, value: int = 1) -> None: ...
+
+    def record_latency(self, name: str, seconds: float) -> None: ...
+
+
+def build_event_row(event: Mapping[str, Any]) -> dict[str, Any]:
+    """Map an ``OnboardingEventSchema`` payload to an ``onboarding_events`` row."""
+    metadata = event.get("metadata") or {}
+    return {
+        "event_id": str(uuid4()),
+        "event_type": event["event"],
+        "user_id": event.get("user_id"),
+        "brand_id": event.get("brand_id"),
+        "session_id": event.get("session_id"),
+        "step": event.get("step"),
+        "template_id": event.get("template_id"),
+        "duration_ms": event.get("duration_ms"),
+        "metadata_json": json.dumps(metadata) if metadata else "{}",
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def insert_event_rows(engine: Engine, rows: Sequence[dict[str, Any]]) -> int:
+    """Insert ``rows`` as a single executemany and fold them into the rollups.
+
+    Both happen in one transaction, so rollups never disagree with raw events.
+    """
+    if not rows:
+        return 0
+    with session_scope(engine) as session:
+        # Core insert: skips ORM bulk-persistence bookkeeping for plain rows.
+        session.execute(insert(cast(Table, OnboardingEvent.__table__)), list(rows))
+        apply_event_rows(session, rows)
+    return len(rows)
+
+
+class OnboardingEventBuffer:
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        max_batch: int = 500,
+        flush_interval_seconds: float = 0.25,
+        max_pending: int = 10_000,
+        metrics: SupportsIngestMetrics | None = None,
+    ) -> None:
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        if max_pending < max_batch:
+            raise ValueError("max_pending must be >= max_batch")
+        if flush_interval_seconds <= 0:
+            raise ValueError("flush_interval_seconds must be > 0")
+        self.engine = engine
+        self.max_batch = max_batch
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_pending = max_pending
+        self.metrics = metrics
+        self._pending: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._accepted_total = 0
+        self._rejected_total = 0
+        self._flushed_total = 0
+        self._flush_count = 0
+        self._flush_errors = 0
+        self._thread = threading.Thread(
+            target=self._run,
+            name="vm-onboarding-ingest",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def offer(self, rows: Sequence[dict[str, Any]]) -> bool:
+        """Queue ``rows`` for the next flush; ``False`` means the buffer is full."""
+        with self._lock:
+            if self._closed or len(self._pending) + len(rows) > self.max_pending:
+                self._rejected_total += len(rows)
+                rejected = True
+            else:
+                self._pending.extend(rows)
+                self._accepted_total += len(rows)
+                rejected = False
+                if len(self._pending) >= self.max_batch:
+                    self._wakeup.notify()
+        if self.metrics is not None:
+            name = "onboarding_events_rejected" if rejected else "onboarding_events_buffered"
+            self.metrics.record_count(name, len(rows))
+        return not rejected
+
+    def flush(self) -> int:
+        """Write everything pending now; returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[: self.max_batch]
+                    del self._pending[: self.max_batch]
+                if not batch:
+                    return written
+                started = time.perf_counter()
+                try:
+                    insert_event_rows(self.engine, batch)
+                except Exception:
+                    with self._lock:
+                        # Put the batch back at the head so ordering is kept and
+                        # the next flush retries it.
+                        self._pending[:0] = batch
+                        self._flush_errors += 1
+                    if self.metrics is not None:
+                        self.metrics.record_count("onboarding_event_flush_errors")
+                    raise
+                with self._lock:
+                    self._flushed_total += len(batch)
+                    self._flush_count += 1
+                if self.metrics is not None:
+                    self.metrics.record_latency(
+                        "onboarding_event_flush_seconds", time.perf_counter() - started
+                    )
+                written += len(batch)
+
+    def close(self, *, timeout: float = 5.0) -> None:
+        """Stop accepting events and flush what is pending."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join(timeout=timeout)
+        self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "max_pending": self.max_pending,
+                "max_batch": self.max_batch,
+                "accepted_total": self._accepted_total,
+                "rejected_total": self._rejected_total,
+                "flushed_total": self._flushed_total,
+                "flush_count": self._flush_count,
+                "flush_errors": self._flush_errors,
+            }
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._closed and len(self._pending) < self.max_batch:
+                    self._wakeup.wait(timeout=self.flush_interval_seconds)
+                if self._closed:
+                    return
+                has_pending = bool(self._pending)
+            if has_pending:
+                try:
+                    self.flush()
+                except Exception:
+                    # Rows stay pending; back off one interval before retrying.
+                    time.sleep(self.flush_interval_seconds)
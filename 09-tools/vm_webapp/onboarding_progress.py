@@ -5,6 +5,8 @@ from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 from pydantic import BaseModel, Field
 
+from vm_webapp.onboarding_store import DurableStore
+
 
 class OnboardingProgress(BaseModel):
     """Schema for onboarding progress persistence."""
@@ -23,8 +25,12 @@ class OnboardingProgress(BaseModel):
 
 
 class ProgressStore:
-    """In-memory store for progress (production would use DB)."""
-    _progress: Dict[str, OnboardingProgress] = {}
+    """Progress store; durable once bound via ``configure_onboarding_storage``."""
+    _progress: DurableStore[OnboardingProgress] = DurableStore(
+        "onboarding_progress",
+        encode=lambda progress: progress.model_dump_json(),
+        decode=OnboardingProgress.model_validate_json,
+    )
     
     @classmethod
     def save(cls, progress: OnboardingProgress) -> None:
@@ -0,0 +1,386 @@
+"""Hourly/daily rollups for onboarding telemetry.
+
+Every batch written by ``onboarding_ingest.insert_event_rows`` is folded into
+``onboarding_event_rollups`` in the same transaction, keyed by
+``(granularity, bucket_start, brand_id, event_type, step, template_id)``. Each
+row carries the event count, duration count/sum/min/max and a mergeable
+quantile sketch, so funnel, TTFV and template metrics read a bounded number of
+rollup rows instead of every event in the window.
+
+``load_window`` answers a ``[since, now]`` window exactly: raw events only for
+the partial hour at the start, hourly rollups up to the next day boundary and
+daily rollups after that. ``rebuild_rollups`` is the compaction/backfill job
+that recomputes rollups from raw events; ``backfill_rollups_if_empty`` runs it
+at startup for databases that have events but no rollups yet.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from collections.abc import Collection, Iterable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, cast
+
+from sqlalchemy import Row, Table, bindparam, delete, select, text, update
+from sqlalchemy.orm import Session
+
+from vm_webapp.models_onboarding import OnboardingEvent, OnboardingEventRollup
+
+
+HOUR = "hour"
+DAY = "day"
+GRANULARITIES = (HOUR, DAY)
+
+RollupKey = tuple[str, str, str]  # (event_type, step, template_id)
+RollupRowKey = tuple[str, datetime, str, str, str, str]
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with relative accuracy ``alpha``.
+
+    Values land in bucket ``ceil(log_gamma(x))``; merging two sketches adds
+    their bucket counts, so hourly and daily rollups combine losslessly.
+    """
+
+    def __init__(self, alpha: float = 0.01, buckets: Optional[dict[int, int]] = None) -> None:
+        self.alpha = alpha
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = dict(buckets or {})
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            self.zero_count += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.zero_count += other.zero_count
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    def quantile(self, q: float) -> float:
+        total = self.count
+        if total == 0:
+            return 0.0
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self._gamma ** index / (self._gamma + 1)
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_json(self) -> str:
+        payload: dict[str, Any] = {"alpha": self.alpha, "buckets": self.buckets}
+        if self.zero_count:
+            payload["zero"] = self.zero_count
+        # Compact separators: rewritten for every touched rollup on each batch.
+        return json.dumps(payload, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: Optional[str]) -> "QuantileSketch":
+        data = json.loads(raw) if raw else {}
+        sketch = cls(
+            alpha=float(data.get("alpha", 0.01)),
+            buckets={int(k): int(v) for k, v in data.get("buckets", {}).items()},
+        )
+        sketch.zero_count = int(data.get("zero", 0))
+        return sketch
+
+
+@dataclass
+class RollupAggregate:
+    event_count: int = 0
+    duration_count: int = 0
+    duration_sum_ms: int = 0
+    duration_min_ms: Optional[int] = None
+    duration_max_ms: Optional[int] = None
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add_event(self, duration_ms: Optional[int]) -> None:
+        self.event_count += 1
+        # Falsy durations (None or 0) were never counted towards TTFV stats.
+        if duration_ms:
+            self._add_duration(int(duration_ms), int(duration_ms), int(duration_ms), 1)
+            self.sketch.add(duration_ms)
+
+    def merge(self, other: "RollupAggregate") -> None:
+        self.event_count += other.event_count
+        if other.duration_count:
+            self._add_duration(
+                other.duration_sum_ms,
+                other.duration_min_ms,
+                other.duration_max_ms,
+                other.duration_count,
+            )
+        self.sketch.merge(other.sketch)
+
+    def _add_duration(self, total: int, low: Optional[int], high: Optional[int], count: int) -> None:
+        self.duration_count += count
+        self.duration_sum_ms += total
+        if low is not None:
+            self.duration_min_ms = low if self.duration_min_ms is None else min(self.duration_min_ms, low)
+        if high is not None:
+            self.duration_max_ms = high if self.duration_max_ms is None else max(self.duration_max_ms, high)
+
+    @classmethod
+    def from_row(cls, row: OnboardingEventRollup | Row[Any]) -> "RollupAggregate":
+        return cls(
+            event_count=row.event_count,
+            duration_count=row.duration_count,
+            duration_sum_ms=row.duration_sum_ms,
+            duration_min_ms=row.duration_min_ms,
+            duration_max_ms=row.duration_max_ms,
+            sketch=QuantileSketch.from_json(row.sketch_json),
+        )
+
+
+def _utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def bucket_start(value: datetime, granularity: str) -> datetime:
+    value = _utc_naive(value).replace(minute=0, second=0, microsecond=0)
+    if granularity == DAY:
+        value = value.replace(hour=0)
+    return value
+
+
+def _ceil_bucket(value: datetime, granularity: str) -> datetime:
+    start = bucket_start(value, granularity)
+    if start == _utc_naive(value):
+        return start
+    return start + (timedelta(days=1) if granularity == DAY else timedelta(hours=1))
+
+
+def _key_columns(row: Mapping[str, Any]) -> tuple[str, str, str, str]:
+    return (
+        row.get("brand_id") or "",
+        row["event_type"],
+        row.get("step") or "",
+        row.get("template_id") or "",
+    )
+
+
+def aggregate_event_rows(rows: Iterable[Mapping[str, Any]]) -> dict[RollupRowKey, RollupAggregate]:
+    """Group event rows by rollup key for every granularity."""
+    grouped: dict[RollupRowKey, RollupAggregate] = {}
+    for row in rows:
+        created_at = row.get("created_at") or datetime.now(timezone.utc)
+        columns = _key_columns(row)
+        for granularity in GRANULARITIES:
+            key = (granularity, bucket_start(created_at, granularity), *columns)
+            grouped.setdefault(key, RollupAggregate()).add_event(row.get("duration_ms"))
+    return grouped
+
+
+_ROLLUPS = cast(Table, OnboardingEventRollup.__table__)
+_KEY_FIELDS = ("granularity", "bucket_start", "brand_id", "event_type", "step", "template_id")
+
+
+def _row_key(row: Row[Any]) -> RollupRowKey:
+    return tuple(getattr(row, name) for name in _KEY_FIELDS)  # type: ignore[return-value]
+
+
+def _load_stored(session: Session, keys: Collection[RollupRowKey]) -> dict[RollupRowKey, Row[Any]]:
+    # Core rows, narrowed on every key column: only the touched rollups are
+    # read and only their sketches are parsed.
+    stored: dict[RollupRowKey, Row[Any]] = {}
+    for row in session.execute(
+        select(_ROLLUPS)
+        .where(
+            _ROLLUPS.c.bucket_start.in_({key[1] for key in keys}),
+            _ROLLUPS.c.brand_id.in_({key[2] for key in keys}),
+            _ROLLUPS.c.event_type.in_({key[3] for key in keys}),
+            _ROLLUPS.c.step.in_({key[4] for key in keys}),
+        )
+        .with_for_update()
+    ):
+        key = _row_key(row)
+        if key in keys:
+            stored[key] = row
+    return stored
+
+
+def _write_rollups(session: Session, grouped: Mapping[RollupRowKey, RollupAggregate]) -> None:
+    """Merge ``grouped`` into the stored rollups with a fixed number of statements."""
+    if not grouped:
+        return
+    now = datetime.now(timezone.utc)
+    stored = _load_stored(session, grouped.keys())
+    missing = sorted(key for key in grouped if key not in stored)
+    dialect = session.get_bind().dialect.name
+    if missing and dialect in {"sqlite", "postgresql"}:
+        dialect_insert: Callable[[Table], Any]
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        # Claim only the keys not stored yet (the common case after the first
+        # batch of a bucket is none), so concurrent writers serialize on the
+        # rows instead of racing on the unique constraint.
+        claims = [
+            {**dict(zip(_KEY_FIELDS, key)), "sketch_json": "{}", "updated_at": now}
+            for key in missing
+        ]
+        session.execute(dialect_insert(_ROLLUPS).on_conflict_do_nothing(), claims)
+        stored.update(_load_stored(session, set(missing)))
+
+    updates = []
+    for key, aggregate in grouped.items():
+        row = stored.get(key)
+        merged = RollupAggregate.from_row(row) if row is not None else RollupAggregate()
+        merged.merge(aggregate)
+        values = {
+            "event_count": merged.event_count,
+            "duration_count": merged.duration_count,
+            "duration_sum_ms": merged.duration_sum_ms,
+            "duration_min_ms": merged.duration_min_ms,
+            "duration_max_ms": merged.duration_max_ms,
+            "sketch_json": merged.sketch.to_json(),
+            "updated_at": now,
+        }
+        if row is None:
+            session.add(OnboardingEventRollup(**dict(zip(_KEY_FIELDS, key)), **values))
+        else:
+            updates.append({"target_pk": row.rollup_pk, **values})
+    if updates:
+        session.execute(
+            update(_ROLLUPS).where(_ROLLUPS.c.rollup_pk == bindparam("target_pk")),
+            updates,
+        )
+
+
+def apply_event_rows(session: Session, rows: Iterable[Mapping[str, Any]]) -> int:
+    """Fold freshly inserted event rows into the rollups; returns rows touched."""
+    grouped = aggregate_event_rows(rows)
+    _write_rollups(session, grouped)
+    return len(grouped)
+
+
+def rebuild_rollups(session: Session, *, since: Optional[datetime] = None) -> int:
+    """Recompute rollups from raw events (compaction/backfill job).
+
+    ``since`` is widened to the start of its day so daily buckets stay whole.
+    Runs in the caller's transaction; on databases without whole-database write
+    locks, pause ingest while it runs. Returns the number of events folded in.
+    """
+    day_start = bucket_start(since, DAY) if since is not None else None
+    cleanup = delete(OnboardingEventRollup)
+    events = select(
+        OnboardingEvent.brand_id,
+        OnboardingEvent.event_type,
+        OnboardingEvent.step,
+        OnboardingEvent.template_id,
+        OnboardingEvent.duration_ms,
+        OnboardingEvent.created_at,
+    )
+    if day_start is not None:
+        cleanup = cleanup.where(OnboardingEventRollup.bucket_start >= day_start)
+        events = events.where(OnboardingEvent.created_at >= day_start)
+    session.execute(cleanup)
+
+    folded = 0
+
+    def _stream():
+        nonlocal folded
+        for row in session.execute(events.execution_options(yield_per=5000)).mappings():
+            folded += 1
+            yield row
+
+    _write_rollups(session, aggregate_event_rows(_stream()))
+    return folded
+
+
+def backfill_rollups_if_empty(session: Session) -> int:
+    """Build rollups from raw events when the rollup table is still empty.
+
+    Databases upgraded from before rollups existed would otherwise serve zeroed
+    metrics until someone ran the rebuild by hand. An up-to-date database costs
+    one ``LIMIT 1`` query. Returns the number of events folded in.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        # Processes starting together must not each fold the same events in.
+        session.execute(text("SELECT pg_advisory_xact_lock(hashtext('onboarding_event_rollups'))"))
+    if session.scalar(select(_ROLLUPS.c.rollup_pk).limit(1)) is not None:
+        return 0
+    if session.scalar(select(OnboardingEvent.event_id).limit(1)) is None:
+        return 0
+    return rebuild_rollups(session)
+
+
+def load_window(
+    session: Session,
+    *,
+    since: datetime,
+    brand_id: Optional[str] = None,
+    event_types: Optional[Iterable[str]] = None,
+) -> dict[RollupKey, RollupAggregate]:
+    """Aggregate ``[since, now]`` by ``(event_type, step, template_id)``."""
+    since = _utc_naive(since)
+    first_hour = _ceil_bucket(since, HOUR)
+    first_day = _ceil_bucket(first_hour, DAY)
+    types = list(event_types) if event_types is not None else None
+    result: dict[RollupKey, RollupAggregate] = {}
+
+    raw = select(
+        OnboardingEvent.event_type,
+        OnboardingEvent.step,
+        OnboardingEvent.template_id,
+        OnboardingEvent.duration_ms,
+    ).where(OnboardingEvent.created_at >= since, OnboardingEvent.created_at < first_hour)
+    if brand_id:
+        raw = raw.where(OnboardingEvent.brand_id == brand_id)
+    if types is not None:
+        raw = raw.where(OnboardingEvent.event_type.in_(types))
+    for event_type, step, template_id, duration_ms in session.execute(raw):
+        key = (event_type, step or "", template_id or "")
+        result.setdefault(key, RollupAggregate()).add_event(duration_ms)
+
+    def _rollups(granularity: str, start: datetime, end: Optional[datetime]):
+        query = select(OnboardingEventRollup).where(
+            OnboardingEventRollup.granularity == granularity,
+            OnboardingEventRollup.bucket_start >= start,
+        )
+        if end is not None:
+            query = query.where(OnboardingEventRollup.bucket_start < end)
+        if brand_id:
+            query = query.where(OnboardingEventRollup.brand_id == brand_id)
+        if types is not None:
+            query = query.where(OnboardingEventRollup.event_type.in_(types))
+        return session.scalars(query)
+
+    for row in [*_rollups(HOUR, first_hour, first_day), *_rollups(DAY, first_day, None)]:
+        key = (row.event_type, row.step, row.template_id)
+        result.setdefault(key, RollupAggregate()).merge(RollupAggregate.from_row(row))
+    return result
+
+
+def merge_by(
+    window: Mapping[RollupKey, RollupAggregate],
+    *,
+    event_type: Optional[str] = None,
+    group: Optional[str] = None,
+) -> dict[str, RollupAggregate]:
+    """Collapse a window by ``event_type``/``step``/``template_id`` (or all)."""
+    position = {"event_type": 0, "step": 1, "template_id": 2}
+    merged: dict[str, RollupAggregate] = {}
+    for key, aggregate in window.items():
+        if event_type is not None and key[0] != event_type:
+            continue
+        name = key[position[group]] if group else ""
+        merged.setdefault(name, RollupAggregate()).merge(aggregate)
+    return merged
@@ -0,0 +1,282 @@
+"""Durable storage for onboarding state shared across API workers.
+
+Onboarding progress, fast-lane telemetry, experiment assignments and rollout
+policies used to live in module-level dicts, so they were lost on restart and
+diverged between uvicorn workers. ``DurableStore`` keeps the mapping interface
+those modules already use, persists every write to ``onboarding_records`` and
+serves reads from a bounded write-through LRU cache. Cached entries expire
+after ``cache_ttl_seconds`` so writes from other workers become visible.
+
+Stores start unbound (plain in-memory, the previous behaviour) and are bound
+to an engine with :func:`configure_onboarding_storage`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from datetime import datetime, timezone
+from typing import Any, Generic, TypeVar, cast
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.engine import CursorResult, Engine
+from sqlalchemy.exc import IntegrityError
+
+from vm_webapp.db import session_scope
+from vm_webapp.models_onboarding import OnboardingRecord
+
+
+V = TypeVar("V")
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_CACHE_TTL_SECONDS = 2.0
+
+
+class DurableStore(MutableMapping[str, V], Generic[V]):
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        encode: Callable[[V], str],
+        decode: Callable[[str], V],
+        engine: Engine | None = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        cache_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+    ) -> None:
+        if cache_size < 1:
+            raise ValueError("cache_size must be >= 1")
+        self.namespace = namespace
+        self._encode = encode
+        self._decode = decode
+        self._engine = engine
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl_seconds
+        self._cache: OrderedDict[str, tuple[V, float]] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def engine(self) -> Engine | None:
+        return self._engine
+
+    def bind(
+        self,
+        engine: Engine | None,
+        *,
+        cache_size: int | None = None,
+        cache_ttl_seconds: float | None = None,
+    ) -> None:
+        """Attach (or detach with ``None``) the backing database."""
+        with self._lock:
+            self._engine = engine
+            if cache_size is not None:
+                if cache_size < 1:
+                    raise ValueError("cache_size must be >= 1")
+                self._cache_size = cache_size
+            if cache_ttl_seconds is not None:
+                self._cache_ttl = cache_ttl_seconds
+            self._cache.clear()
+
+    # -- cache ---------------------------------------------------------------
+
+    def _cache_get(self, key: str) -> tuple[bool, V | None]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return False, None
+            value, stored_at = entry
+            if self._engine is None:
+                return True, value
+            if time.monotonic() - stored_at > self._cache_ttl:
+                del self._cache[key]
+                return False, None
+            self._cache.move_to_end(key)
+            return True, value
+
+    def _cache_put(self, key: str, value: V) -> None:
+        with self._lock:
+            self._cache[key] = (value, time.monotonic())
+            # Unbound stores have nothing behind the cache: keep insertion
+            # order (callers rely on it for event logs) and never evict.
+            if self._engine is None:
+                return
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+
+    # -- mapping interface ---------------------------------------------------
+
+    def __getitem__(self, key: str) -> V:
+        found, value = self._cache_get(key)
+        if found:
+            with self._lock:
+                self._hits += 1
+            return value  # type: ignore[return-value]
+        with self._lock:
+            self._misses += 1
+        if self._engine is None:
+            raise KeyError(key)
+        with session_scope(self._engine) as session:
+            payload = session.scalar(
+                select(OnboardingRecord.payload_json).where(
+                    OnboardingRecord.namespace == self.namespace,
+                    OnboardingRecord.record_key == key,
+                )
+            )
+        if payload is None:
+            raise KeyError(key)
+        value = self._decode(payload)
+        self._cache_put(key, value)
+        return value
+
+    def __setitem__(self, key: str, value: V) -> None:
+        if self._engine is not None:
+            self._write(self._engine, key, self._encode(value))
+        self._cache_put(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            cached = self._cache.pop(key, None) is not None
+        if self._engine is None:
+            if not cached:
+                raise KeyError(key)
+            return
+        with session_scope(self._engine) as session:
+            result = cast(
+                CursorResult[Any],
+                session.execute(
+                    delete(OnboardingRecord).where(
+                        OnboardingRecord.namespace == self.namespace,
+                        OnboardingRecord.record_key == key,
+                    )
+                ),
+            )
+        if result.rowcount == 0 and not cached:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([key for key, _ in self._scan()])
+
+    def __len__(self) -> int:
+        if self._engine is None:
+            return len(self._cache)
+        with session_scope(self._engine) as session:
+            return int(
+                session.scalar(
+                    select(func.count())
+                    .select_from(OnboardingRecord)
+                    .where(OnboardingRecord.namespace == self.namespace)
+                )
+                or 0
+            )
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def items(self) -> list[tuple[str, V]]:  # type: ignore[override]
+        return self._scan()
+
+    def values(self) -> list[V]:  # type: ignore[override]
+        return [value for _, value in self._scan()]
+
+    def keys(self) -> list[str]:  # type: ignore[override]
+        return [key for key, _ in self._scan()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+        if self._engine is not None:
+            with session_scope(self._engine) as session:
+                session.execute(
+                    delete(OnboardingRecord).where(OnboardingRecord.namespace == self.namespace)
+                )
+
+    def append(self, value: V) -> str:
+        """Store ``value`` under a generated key, preserving insertion order."""
+        key = uuid4().hex
+        self[key] = value
+        return key
+
+    def cache_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "namespace": self.namespace,
+                "durable": self._engine is not None,
+                "cached": len(self._cache),
+                "cache_size": self._cache_size,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    # -- persistence ---------------------------------------------------------
+
+    def _scan(self) -> list[tuple[str, V]]:
+        if self._engine is None:
+            with self._lock:
+                return [(key, value) for key, (value, _) in self._cache.items()]
+        with session_scope(self._engine) as session:
+            rows = session.execute(
+                select(OnboardingRecord.record_key, OnboardingRecord.payload_json)
+                .where(OnboardingRecord.namespace == self.namespace)
+                .order_by(OnboardingRecord.record_pk)
+            ).all()
+        return [(str(key), self._decode(payload)) for key, payload in rows]
+
+    def _write(self, engine: Engine, key: str, payload: str) -> None:
+        now = datetime.now(timezone.utc)
+        statement = (
+            update(OnboardingRecord)
+            .where(
+                OnboardingRecord.namespace == self.namespace,
+                OnboardingRecord.record_key == key,
+            )
+            .values(payload_json=payload, updated_at=now)
+        )
+        with session_scope(engine) as session:
+            if cast(CursorResult[Any], session.execute(statement)).rowcount:
+                return
+        try:
+            with session_scope(engine) as session:
+                session.add(
+                    OnboardingRecord(
+                        namespace=self.namespace,
+                        record_key=key,
+                        payload_json=payload,
+                        updated_at=now,
+                    )
+                )
+        except IntegrityError:
+            # Another worker inserted the key between our update and insert.
+            with session_scope(engine) as session:
+                session.execute(statement)
+
+
+def configure_onboarding_storage(
+    engine: Engine | None,
+    *,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    cache_ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+) -> list[DurableStore[Any]]:
+    """Bind every onboarding store to ``engine`` (``None`` reverts to memory)."""
+    from vm_webapp import onboarding_experiments, onboarding_fast_lane, onboarding_progress
+    from vm_webapp.api_onboarding_experiments import _experiment_registry
+
+    stores: list[DurableStore[Any]] = [
+        onboarding_progress.ProgressStore._progress,
+        onboarding_fast_lane._fast_lane_events,
+        onboarding_experiments._rollout_policy_registry,
+        _experiment_registry._assignments,
+    ]
+    for store in stores:
+        store.bind(engine, cache_size=cache_size, cache_ttl_seconds=cache_ttl_seconds)
+    return stores
@@ -0,0 +1,421 @@
+"""Columnar export of operational tables and vectorized report aggregates.
+
+Ops reports used to load JSON and aggregate row by row in Python, which does
+not scale to months of history. ``export_columnar`` copies ``event_log``,
+``onboarding_events`` and ``first_run_outcomes_view`` into a Hive-style
+partitioned layout::
+
+    <root>/<table>/date=YYYY-MM-DD/brand_id=<brand>/part-00000.parquet
+
+Parquet is written when a Parquet engine (``pyarrow`` or ``fastparquet``) is
+installed; otherwise partitions fall back to gzip CSV with the same layout.
+``read_columnar`` prunes partitions by date and brand from directory names
+alone, and the ``summarize_*`` helpers aggregate the resulting DataFrames
+with pandas/NumPy operations instead of Python loops.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import shutil
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote, unquote
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from vm_webapp.models import EventLog, FirstRunOutcomeView
+from vm_webapp.models_onboarding import OnboardingEvent
+
+
+MANIFEST_NAME = "_manifest.json"
+NULL_BRAND = "__none__"
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+@dataclass(frozen=True)
+class ColumnarTable:
+    name: str
+    model: Any
+    timestamp_column: str
+    columns: tuple[str, ...]
+    # Most tables store ISO-8601 strings; onboarding events use DateTime.
+    iso_timestamps: bool = True
+
+
+COLUMNAR_TABLES: dict[str, ColumnarTable] = {
+    "event_log": ColumnarTable(
+        name="event_log",
+        model=EventLog,
+        timestamp_column="occurred_at",
+        columns=(
+            "event_id",
+            "event_type",
+            "aggregate_type",
+            "aggregate_id",
+            "stream_id",
+            "actor_type",
+            "actor_id",
+            "brand_id",
+            "project_id",
+            "thread_id",
+            "occurred_at",
+        ),
+    ),
+    "onboarding_events": ColumnarTable(
+        name="onboarding_events",
+        model=OnboardingEvent,
+        timestamp_column="created_at",
+        columns=(
+            "event_id",
+            "event_type",
+            "user_id",
+            "brand_id",
+            "session_id",
+            "step",
+            "template_id",
+            "duration_ms",
+            "created_at",
+        ),
+        iso_timestamps=False,
+    ),
+    "first_run_outcomes_view": ColumnarTable(
+        name="first_run_outcomes_view",
+        model=FirstRunOutcomeView,
+        timestamp_column="completed_at",
+        columns=(
+            "outcome_id",
+            "run_id",
+            "thread_id",
+            "brand_id",
+            "project_id",
+            "profile",
+            "mode",
+            "approved",
+            "success_24h",
+            "quality_score",
+            "duration_ms",
+            "completed_at",
+        ),
+    ),
+}
+
+
+def parquet_available() -> bool:
+    return any(importlib.util.find_spec(name) is not None for name in ("pyarrow", "fastparquet"))
+
+
+def default_format() -> str:
+    return "parquet" if parquet_available() else "csv"
+
+
+# -- export -------------------------------------------------------------------
+
+
+def _to_utc(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, utc=True, format="ISO8601", errors="coerce")
+
+
+def _day_start(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    value = value.astimezone(timezone.utc)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _partition_dates(table_dir: Path) -> Iterable[tuple[date, Path]]:
+    for path in table_dir.glob("date=*"):
+        try:
+            yield date.fromisoformat(path.name.split("=", 1)[1]), path
+        except ValueError:
+            continue
+
+
+def _write_partition(frame: pd.DataFrame, path: Path, fmt: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_csv(path, index=False, compression="gzip")
+
+
+def export_columnar(
+    engine: Engine,
+    root: Path,
+    *,
+    tables: Sequence[str] | None = None,
+    since: datetime | None = None,
+    fmt: str | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """Export ``tables`` to ``root`` partitioned by date and brand.
+
+    With ``since`` only partitions from that UTC day onwards are replaced;
+    older partitions are left untouched, so nightly runs stay incremental.
+    Returns the manifest written to ``root/_manifest.json``.
+    """
+    fmt = fmt or default_format()
+    if fmt not in ("parquet", "csv"):
+        raise ValueError(f"unsupported columnar format: {fmt}")
+    if fmt == "parquet" and not parquet_available():
+        raise RuntimeError("parquet export requires pyarrow or fastparquet")
+    extension = "parquet" if fmt == "parquet" else "csv.gz"
+    cutoff = _day_start(since) if since is not None else None
+
+    root = Path(root)
+    manifest: dict[str, Any] = {
+        "format": fmt,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+        "since": cutoff.isoformat() if cutoff is not None else None,
+        "tables": {},
+    }
+    for name in tables or list(COLUMNAR_TABLES):
+        spec = COLUMNAR_TABLES[name]
+        table_dir = root / name
+        for day, path in list(_partition_dates(table_dir)):
+            if cutoff is None or day >= cutoff.date():
+                shutil.rmtree(path)
+
+        model = spec.model
+        statement = select(*(getattr(model, column) for column in spec.columns))
+        if cutoff is not None:
+            ts_column = getattr(model, spec.timestamp_column)
+            bound = cutoff.isoformat() if spec.iso_timestamps else cutoff.replace(tzinfo=None)
+            statement = statement.where(ts_column >= bound)
+
+        rows = 0
+        partitions: set[tuple[str, str]] = set()
+        with engine.connect() as connection:
+            for chunk_index, chunk in enumerate(
+                pd.read_sql_query(statement, connection, chunksize=chunk_size)
+            ):
+                if chunk.empty:
+                    continue
+                stamps = _to_utc(chunk[spec.timestamp_column])
+                chunk = chunk.loc[stamps.notna()]
+                stamps = stamps.loc[stamps.notna()]
+                keys = pd.DataFrame(
+                    {
+                        "date": stamps.dt.strftime("%Y-%m-%d"),
+                        "brand": chunk["brand_id"].fillna(NULL_BRAND).astype(str),
+                    },
+                    index=chunk.index,
+                )
+                for (day, brand), part in chunk.groupby([keys["date"], keys["brand"]], sort=False):
+                    path = (
+                        table_dir
+                        / f"date={day}"
+                        / f"brand_id={quote(brand, safe='')}"
+                        / f"part-{chunk_index:05d}.{extension}"
+                    )
+                    _write_partition(part, path, fmt)
+                    partitions.add((day, brand))
+                rows += len(chunk)
+        manifest["tables"][name] = {"rows": rows, "partitions": len(partitions)}
+
+    root.mkdir(parents=True, exist_ok=True)
+    (root / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+# -- read ---------------------------------------------------------------------
+
+
+def read_columnar(
+    root: Path,
+    table: str,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    brand_ids: Sequence[str] | None = None,
+    columns: Sequence[str] | None = None,
+) -> pd.DataFrame:
+    """Load ``table`` from an export, reading only matching partitions.
+
+    ``since`` is inclusive and ``until`` exclusive; both are applied to whole
+    partitions first and then to the timestamp column.
+    """
+    spec = COLUMNAR_TABLES[table]
+    table_dir = Path(root) / table
+    wanted = set(brand_ids) if brand_ids is not None else None
+    first_day = _day_start(since).date() if since is not None else None
+    last_day = (
+        (until if until.tzinfo else until.replace(tzinfo=timezone.utc))
+        .astimezone(timezone.utc)
+        .date()
+        if until is not None
+        else None
+    )
+
+    frames: list[pd.DataFrame] = []
+    for day, day_dir in sorted(_partition_dates(table_dir)):
+        if first_day is not None and day < first_day:
+            continue
+        if last_day is not None and day > last_day:
+            continue
+        for brand_dir in day_dir.glob("brand_id=*"):
+            brand = unquote(brand_dir.name.split("=", 1)[1])
+            if wanted is not None and brand not in wanted:
+                continue
+            for part in sorted(brand_dir.iterdir()):
+                if part.name.endswith(".parquet"):
+                    frames.append(pd.read_parquet(part, columns=list(columns) if columns else None))
+                elif part.name.endswith(".csv.gz"):
+                    frames.append(pd.read_csv(part, usecols=list(columns) if columns else None))
+
+    if not frames:
+        return pd.DataFrame(columns=list(columns or spec.columns))
+    frame = pd.concat(frames, ignore_index=True)
+    if spec.timestamp_column in frame.columns:
+        frame[spec.timestamp_column] = _to_utc(frame[spec.timestamp_column])
+        mask = pd.Series(True, index=frame.index)
+        if since is not None:
+            mask &= frame[spec.timestamp_column] >= pd.Timestamp(_as_utc(since))
+        if until is not None:
+            mask &= frame[spec.timestamp_column] < pd.Timestamp(_as_utc(until))
+        frame = frame.loc[mask].reset_index(drop=True)
+    return frame
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# -- aggregates ---------------------------------------------------------------
+
+
+def _counts(series: pd.Series) -> dict[str, int]:
+    return {str(key): int(value) for key, value in series.value_counts().sort_index().items()}
+
+
+def _percentiles(values: pd.Series) -> dict[str, float | None]:
+    data = values.to_numpy(dtype=float)
+    data = data[np.isfinite(data) & (data > 0)]
+    if data.size == 0:
+        return {"p50_ms": None, "p90_ms": None, "p95_ms": None}
+    p50, p90, p95 = np.percentile(data, [50, 90, 95])
+    return {"p50_ms": float(p50), "p90_ms": float(p90), "p95_ms": float(p95)}
+
+
+def summarize_event_log(frame: pd.DataFrame) -> dict[str, Any]:
+    if frame.empty:
+        return {"total": 0, "by_event_type": {}, "by_actor_type": {}, "by_day": {}, "active_brands": 0}
+    days = frame["occurred_at"].dt.strftime("%Y-%m-%d")
+    return {
+        "total": int(len(frame)),
+        "by_event_type": _counts(frame["event_type"]),
+        "by_actor_type": _counts(frame["actor_type"]),
+        "by_day": _counts(days),
+        "active_brands": int(frame["brand_id"].nunique()),
+    }
+
+
+def summarize_onboarding_events(frame: pd.DataFrame) -> dict[str, Any]:
+    if frame.empty:
+        return {
+            "total": 0,
+            "started": 0,
+            "completed": 0,
+            "completion_rate": 0.0,
+            "ttfv": _percentiles(pd.Series(dtype=float)),
+            "dropoff_by_step": {},
+            "by_brand": {},
+        }
+    event_type = frame["event_type"]
+    started = frame.loc[event_type == "onboarding_started", "user_id"].nunique()
+    completed = frame.loc[event_type == "onboarding_completed", "user_id"].nunique()
+    by_brand = (
+        frame.assign(brand_id=frame["brand_id"].fillna(NULL_BRAND))
+        .pivot_table(index="brand_id", columns="event_type", values="event_id", aggfunc="count", fill_value=0)
+    )
+    return {
+        "total": int(len(frame)),
+        "started": int(started),
+        "completed": int(completed),
+        "completion_rate": float(completed / started) if started else 0.0,
+        "ttfv": _percentiles(frame.loc[event_type == "time_to_first_value", "duration_ms"]),
+        "dropoff_by_step": _counts(frame.loc[event_type == "onboarding_dropoff", "step"].dropna()),
+        "by_brand": {
+            str(brand): {str(k): int(v) for k, v in row.items()}
+            for brand, row in by_brand.to_dict(orient="index").items()
+        },
+    }
+
+
+def summarize_first_runs(frame: pd.DataFrame) -> dict[str, Any]:
+    if frame.empty:
+        return {
+            "total": 0,
+            "success_rate": 0.0,
+            "approval_rate": 0.0,
+            "avg_quality_score": 0.0,
+            "duration": _percentiles(pd.Series(dtype=float)),
+            "by_profile_mode": [],
+        }
+    success = frame["success_24h"].astype(bool)
+    approved = frame["approved"].astype(bool)
+    grouped = (
+        frame.assign(success_24h=success, approved=approved)
+        .groupby(["profile", "mode"], sort=True)
+        .agg(
+            runs=("outcome_id", "count"),
+            success_rate=("success_24h", "mean"),
+            approval_rate=("approved", "mean"),
+            avg_quality_score=("quality_score", "mean"),
+        )
+        .reset_index()
+        .sort_values(["runs", "success_rate"], ascending=False, kind="stable")
+    )
+    return {
+        "total": int(len(frame)),
+        "success_rate": float(success.mean()),
+        "approval_rate": float(approved.mean()),
+        "avg_quality_score": float(frame["quality_score"].mean()),
+        "duration": _percentiles(frame["duration_ms"]),
+        "by_profile_mode": [
+            {
+                "profile": str(row.profile),
+                "mode": str(row.mode),
+                "runs": int(row.runs),
+                "success_rate": round(float(row.success_rate), 4),
+                "approval_rate": round(float(row.approval_rate), 4),
+                "avg_quality_score": round(float(row.avg_quality_score), 4),
+            }
+            for row in grouped.itertuples(index=False)
+        ],
+    }
+
+
+def build_ops_analytics(
+    root: Path,
+    *,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    brand_ids: Sequence[str] | None = None,
+) -> dict[str, Any]:
+    """Aggregate every exported table for the ``[since, until)`` window."""
+    def read(table: str) -> pd.DataFrame:
+        return read_columnar(root, table, since=since, until=until, brand_ids=brand_ids)
+
+    return {
+        "window": {
+            "since": since.isoformat() if since else None,
+            "until": until.isoformat() if until else None,
+        },
+        "event_log": summarize_event_log(read("event_log")),
+        "onboarding": summarize_onboarding_events(read("onboarding_events")),
+        "first_runs": summarize_first_runs(read("first_run_outcomes_view")),
+    }
+
+
+def history_window(days: int, *, now: datetime | None = None) -> tuple[datetime, datetime]:
+    """Return ``[since, until)`` covering the last ``days`` whole UTC days."""
+    until = _day_start(now or datetime.now(timezone.utc)) + timedelta(days=1)
+    return until - timedelta(days=days), until
@@ -1,16 +1,31 @@
 """Hierarchical policy resolver for multi-brand governance (v18).
 
 Policy resolution precedence: segment > brand > global
+
+Resolution is served from a compiled, per-engine view of the ``policies``
+table: rows are loaded and their ``params_json`` parsed once, and merged
+results are memoized per ``(brand_id, segment, objective_key)``. The view is
+rebuilt when the in-process policy version counter moves (``upsert_policy`` and
+any ORM write to ``Policy`` bump it). Otherwise a resolution is a dictionary
+lookup; at most once per ``POLICY_CACHE_TTL_SECONDS`` the view is re-validated
+against the table's persisted fingerprint (``count(*)`` and ``max(updated_at)``
+in one aggregate query), which bounds how long a write committed by another
+process can go unnoticed.
 """
 
 import json
+import threading
+import time
 import uuid
+import weakref
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
 
 from vm_webapp.models import Policy, PolicyLevel
 
@@ -68,6 +83,189 @@ def _merge_params(base: dict[str, Any], override: dict[str, Any]) -> dict[str, A
     return {**base, **override}
 
 
+POLICY_CACHE_TTL_SECONDS = 2.0
+
+# Marks a session that has flushed policy writes not yet committed; such
+# sessions resolve from a private view so uncommitted rows never reach the
+# shared cache.
+_UNCOMMITTED_KEY = "vm_policy_writes_uncommitted"
+
+PolicyKey = tuple[str, Optional[str], Optional[str]]
+PolicyFingerprint = tuple[int, Optional[str]]  # (row count, max updated_at)
+
+_Layer = tuple[Optional[str], Optional[str], dict[str, Any]]  # (brand_id, objective_key, params)
+_Resolved = tuple[
+    dict[str, Any], PolicySource, Optional[str], Optional[str]
+]  # (params, source, source_brand_id, source_segment)
+
+
+class _CompiledPolicies:
+    """Policies parsed once and grouped by level, with memoized merges."""
+
+    def __init__(
+        self,
+        policies: Iterable[Policy],
+        version: int,
+        fingerprint: Optional[PolicyFingerprint] = None,
+    ) -> None:
+        self.version = version
+        self.fingerprint = fingerprint
+        self.checked_at = time.monotonic()
+        self.global_layers: list[_Layer] = []
+        self.brand_layers: dict[str, list[_Layer]] = {}
+        self.segment_layers: dict[tuple[str, str], list[_Layer]] = {}
+        self.resolved: dict[PolicyKey, _Resolved] = {}
+        # Row order is kept within each level: later rows win on merge.
+        for policy in policies:
+            layer = (policy.brand_id, policy.objective_key, json.loads(policy.params_json))
+            if policy.level == PolicyLevel.GLOBAL:
+                self.global_layers.append(layer)
+            elif policy.level == PolicyLevel.BRAND and policy.brand_id is not None:
+                self.brand_layers.setdefault(policy.brand_id, []).append(layer)
+            elif (
+                policy.level == PolicyLevel.SEGMENT
+                and policy.brand_id is not None
+                and policy.segment is not None
+            ):
+                # A segment row without a segment can never match a lookup.
+                self.segment_layers.setdefault(
+                    (policy.brand_id, policy.segment), []
+                ).append(layer)
+
+    def resolve(self, key: PolicyKey) -> _Resolved:
+        resolved = self.resolved.get(key)
+        if resolved is None:
+            resolved = self.resolved[key] = self._merge(*key)
+        return resolved
+
+    def _merge(
+        self, brand_id: str, segment: Optional[str], objective_key: Optional[str]
+    ) -> _Resolved:
+        effective_params: dict[str, Any] = {}
+        source = PolicySource.DEFAULT
+        source_brand_id: Optional[str] = None
+        source_segment: Optional[str] = None
+
+        # Apply global (lowest priority)
+        for layer_brand, layer_objective, params in self.global_layers:
+            if layer_brand is not None and layer_brand != brand_id:
+                continue
+            if layer_objective is None or layer_objective == objective_key:
+                effective_params = _merge_params(effective_params, params)
+                source = PolicySource.GLOBAL
+
+        # Apply brand (medium priority)
+        for _, layer_objective, params in self.brand_layers.get(brand_id, ()):
+            if layer_objective is None or layer_objective == objective_key:
+                effective_params = _merge_params(effective_params, params)
+                source = PolicySource.BRAND
+                source_brand_id = brand_id
+
+        # Apply segment (highest priority)
+        if segment:
+            for _, layer_objective, params in self.segment_layers.get((brand_id, segment), ()):
+                if layer_objective is None or layer_objective == objective_key:
+                    effective_params = _merge_params(effective_params, params)
+                    source = PolicySource.SEGMENT
+                    source_brand_id = brand_id
+                    source_segment = segment
+
+        return effective_params, source, source_brand_id, source_segment
+
+
+_policy_version = 0
+_compiled_by_bind: "weakref.WeakKeyDictionary[Any, _CompiledPolicies]" = weakref.WeakKeyDictionary()
+_compile_lock = threading.Lock()
+
+
+def bump_policy_version() -> int:
+    """Invalidate every compiled policy view; returns the new version."""
+    global _policy_version
+    with _compile_lock:
+        _policy_version += 1
+        return _policy_version
+
+
+def policy_version() -> int:
+    return _policy_version
+
+
+@event.listens_for(Policy, "after_insert")
+@event.listens_for(Policy, "after_update")
+@event.listens_for(Policy, "after_delete")
+def _on_policy_write(mapper: Any, connection: Any, target: Policy) -> None:
+    session = object_session(target)
+    if session is not None:
+        session.info[_UNCOMMITTED_KEY] = True
+    bump_policy_version()
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _on_transaction_end(session: Session, transaction: Any) -> None:
+    # Outermost transaction only: commit, rollback and close all end here.
+    if transaction.parent is None and session.info.pop(_UNCOMMITTED_KEY, False):
+        bump_policy_version()
+
+
+def _has_pending_policy_writes(session: Session) -> bool:
+    if session.info.get(_UNCOMMITTED_KEY):
+        return True
+    return any(
+        isinstance(obj, Policy)
+        for pending in (session.new, session.dirty, session.deleted)
+        for obj in pending
+    )
+
+
+def _policy_fingerprint(session: Session) -> PolicyFingerprint:
+    count, last_updated = session.execute(
+        select(func.count(), func.max(Policy.updated_at)).select_from(Policy)
+    ).one()
+    return count, last_updated
+
+
+def _compiled_policies(session: Session) -> _CompiledPolicies:
+    if _has_pending_policy_writes(session):
+        return _CompiledPolicies(session.query(Policy).all(), _policy_version)
+
+    bind = session.get_bind()
+    version = _policy_version
+    cached = _compiled_by_bind.get(bind)
+    if cached is not None and cached.version != version:
+        cached = None
+    if cached is not None and time.monotonic() - cached.checked_at < POLICY_CACHE_TTL_SECONDS:
+        return cached
+    # Read before the rows: a write landing in between changes the
+    # fingerprint again, so the next check rebuilds.
+    fingerprint = _policy_fingerprint(session)
+    if cached is not None and cached.fingerprint == fingerprint:
+        cached.checked_at = time.monotonic()
+        return cached
+
+    compiled = _CompiledPolicies(session.query(Policy).all(), version, fingerprint)
+    with _compile_lock:
+        # A write that landed while compiling leaves the new view stale; let
+        # the next call rebuild instead of publishing it.
+        if version == _policy_version:
+            _compiled_by_bind[bind] = compiled
+    return compiled
+
+
+def _to_effective_policy(resolved: _Resolved) -> EffectivePolicy:
+    params, source, source_brand_id, source_segment = resolved
+    return EffectivePolicy(
+        threshold=params.get("threshold", 0.5),
+        mode=params.get("mode", "standard"),
+        timeout=params.get("timeout", 30),
+        source=source,
+        source_brand_id=source_brand_id,
+        source_segment=source_segment,
+        source_objective_key=None,
+        # Callers get their own copy; the memoized params stay untouched.
+        _raw_params=dict(params),
+    )
+
+
 def resolve_effective_policy(
     session: Session,
     *,
@@ -86,72 +284,32 @@ def resolve_effective_policy(
     Returns:
         EffectivePolicy with resolved values and source tracking
     """
-    # Start with default
-    effective_params: dict[str, Any] = {}
-    source = PolicySource.DEFAULT
-    source_brand_id: Optional[str] = None
-    source_segment: Optional[str] = None
-    source_objective_key: Optional[str] = None
+    compiled = _compiled_policies(session)
+    return _to_effective_policy(compiled.resolve((brand_id, segment, objective_key)))
 
-    # Query policies in priority order
-    policies = (
-        session.query(Policy)
-        .filter(
-            (Policy.brand_id.is_(None)) | (Policy.brand_id == brand_id)
-        )
-        .all()
-    )
 
-    # Organize by level for easier processing
-    global_policies = [p for p in policies if p.level == PolicyLevel.GLOBAL]
-    brand_policies = [
-        p for p in policies 
-        if p.level == PolicyLevel.BRAND and p.brand_id == brand_id
-    ]
-    segment_policies = [
-        p for p in policies 
-        if p.level == PolicyLevel.SEGMENT 
-        and p.brand_id == brand_id 
-        and p.segment == segment
+def resolve_many(
+    session: Session,
+    keys: Iterable[PolicyKey],
+) -> list[EffectivePolicy]:
+    """Resolve several ``(brand_id, segment, objective_key)`` keys at once.
+    
+    All keys are resolved against the same compiled view, so the batch is
+    consistent even if a policy is written concurrently.
+    
+    Args:
+        session: Database session
+        keys: Tuples of brand_id, segment and objective_key
+        
+    Returns:
+        EffectivePolicy per key, in input order
+    """
+    compiled = _compiled_policies(session)
+    return [
+        _to_effective_policy(compiled.resolve((brand_id, segment, objective_key)))
+        for brand_id, segment, objective_key in keys
     ]
 
-    # Apply global (lowest priority)
-    for policy in global_policies:
-        if policy.objective_key is None or policy.objective_key == objective_key:
-            params = json.loads(policy.params_json)
-            effective_params = _merge_params(effective_params, params)
-            source = PolicySource.GLOBAL
-
-    # Apply brand (medium priority)
-    for policy in brand_policies:
-        if policy.objective_key is None or policy.objective_key == objective_key:
-            params = json.loads(policy.params_json)
-            effective_params = _merge_params(effective_params, params)
-            source = PolicySource.BRAND
-            source_brand_id = brand_id
-
-    # Apply segment (highest priority)
-    if segment:
-        for policy in segment_policies:
-            if policy.objective_key is None or policy.objective_key == objective_key:
-                params = json.loads(policy.params_json)
-                effective_params = _merge_params(effective_params, params)
-                source = PolicySource.SEGMENT
-                source_brand_id = brand_id
-                source_segment = segment
-
-    # Build EffectivePolicy from merged params
-    return EffectivePolicy(
-        threshold=effective_params.get("threshold", 0.5),
-        mode=effective_params.get("mode", "standard"),
-        timeout=effective_params.get("timeout", 30),
-        source=source,
-        source_brand_id=source_brand_id,
-        source_segment=source_segment,
-        source_objective_key=source_objective_key,
-        _raw_params=effective_params,
-    )
-
 
 def upsert_policy(
     session: Session,
@@ -191,6 +349,7 @@ def upsert_policy(
         existing.params_json = json.dumps(params, ensure_ascii=False)
         existing.updated_at = _now_iso()
         session.flush()
+        bump_policy_version()
         return existing
 
     # Create new policy
@@ -206,6 +365,7 @@ def upsert_policy(
     )
     session.add(policy)
     session.flush()
+    bump_policy_version()
     return policy
 
 
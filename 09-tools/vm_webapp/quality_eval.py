@@ -1,11 +1,35 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import multiprocessing
+import os
+import re
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
 
-def _extract_first_artifact_content(workspace_root: Path, run_id: str, fallback_text: str) -> str:
+from vm_webapp.artifacts import read_artifact_bytes
+from vm_webapp.blob_store import BlobStore
+from vm_webapp.db import session_scope
+from vm_webapp.models import QualityScore, Run
+
+# Keeps ``IN (...)`` lists under SQLite's bound-parameter limit.
+_CACHE_LOOKUP_CHUNK = 500
+BACKFILL_BATCH_SIZE = 200
+
+
+def _extract_first_artifact_content(
+    workspace_root: Path,
+    run_id: str,
+    fallback_text: str,
+    blob_store: BlobStore | None = None,
+) -> str:
     stages_root = workspace_root / "runs" / run_id / "stages"
     if not stages_root.exists():
         return fallback_text
@@ -18,6 +42,12 @@ def _extract_first_artifact_content(workspace_root: Path, run_id: str, fallback_
         if not isinstance(artifacts, list) or not artifacts:
             continue
         first = artifacts[0]
+        if isinstance(first, dict) and isinstance(first.get("blob"), dict) and blob_store is not None:
+            try:
+                return read_artifact_bytes(stage_dir, first, blob_store=blob_store).decode("utf-8")
+            except Exception:
+                continue
+        target: Path | None
         if isinstance(first, str):
             target = stage_dir / first
         elif isinstance(first, dict):
@@ -34,17 +64,35 @@ def _extract_first_artifact_content(workspace_root: Path, run_id: str, fallback_
     return fallback_text
 
 
+_TOKEN_RE = re.compile(r"[^ \n]+")
+_CTA_KEYWORDS = ("cta", "clique", "cadastre", "agende", "compre", "responda")
+_ACTION_KEYWORDS = ("defina", "liste", "execute", "publique", "teste", "otimize")
+# Lookahead so overlapping keywords are all seen in one scan of the text.
+_KEYWORD_RE = re.compile(
+    "(?=(" + "|".join(re.escape(key) for key in _CTA_KEYWORDS + _ACTION_KEYWORDS) + "))"
+)
+_KEYWORD_TOTAL = len(set(_CTA_KEYWORDS + _ACTION_KEYWORDS))
+
+
 def _compute_heuristic_score(markdown: str) -> dict[str, Any]:
     text = markdown.strip()
-    words = len([token for token in text.replace("\n", " ").split(" ") if token])
-    heading_count = sum(1 for line in text.splitlines() if line.strip().startswith("#"))
-    list_count = sum(1 for line in text.splitlines() if line.strip().startswith(("-", "*")))
-    lower = text.lower()
+    words = sum(1 for _ in _TOKEN_RE.finditer(text))
+    heading_count = 0
+    list_count = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#"):
+            heading_count += 1
+        elif line.startswith(("-", "*")):
+            list_count += 1
 
-    cta_keywords = ["cta", "clique", "cadastre", "agende", "compre", "responda"]
-    action_keywords = ["defina", "liste", "execute", "publique", "teste", "otimize"]
-    cta_hits = sum(1 for key in cta_keywords if key in lower)
-    action_hits = sum(1 for key in action_keywords if key in lower)
+    found: set[str] = set()
+    for match in _KEYWORD_RE.finditer(text.lower()):
+        found.add(match.group(1))
+        if len(found) == _KEYWORD_TOTAL:
+            break
+    cta_hits = sum(1 for key in _CTA_KEYWORDS if key in found)
+    action_hits = sum(1 for key in _ACTION_KEYWORDS if key in found)
 
     completude = min(100, max(0, 20 + min(60, words // 4)))
     estrutura = min(100, max(0, heading_count * 20 + list_count * 12))
@@ -82,22 +130,133 @@ def _attempt_deep_evaluation(_markdown: str, _rubric_version: str) -> dict[str,
     raise RuntimeError("deep evaluation unavailable")
 
 
-def evaluate_run_quality(
+class ScoredDocument(NamedTuple):
+    run_id: str
+    content_sha256: str
+    content_length: int
+    heuristic: dict[str, Any]
+
+
+def content_sha256(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def load_cached_scores(
+    engine: Engine, digests: Iterable[str], rubric_version: str
+) -> dict[str, dict[str, Any]]:
+    """Cached heuristic scores for ``digests``, keyed by content sha256."""
+    pending = sorted(set(digests))
+    cached: dict[str, dict[str, Any]] = {}
+    with session_scope(engine) as session:
+        for start in range(0, len(pending), _CACHE_LOOKUP_CHUNK):
+            chunk = pending[start : start + _CACHE_LOOKUP_CHUNK]
+            rows = session.execute(
+                select(QualityScore.content_sha256, QualityScore.score_json).where(
+                    QualityScore.rubric_version == rubric_version,
+                    QualityScore.content_sha256.in_(chunk),
+                )
+            )
+            for digest, score_json in rows:
+                cached[digest] = json.loads(score_json)
+    return cached
+
+
+def store_scores(
+    engine: Engine,
+    documents: Iterable[ScoredDocument],
+    rubric_version: str,
+    *,
+    replace: bool = False,
+) -> int:
+    """Insert heuristic scores for ``documents``; returns the distinct hashes written.
+
+    Existing rows are kept unless ``replace`` is set (used after the heuristic
+    itself changes).
+    """
+    rows: dict[str, dict[str, Any]] = {}
+    for document in documents:
+        if document.content_sha256 in rows:
+            continue
+        rows[document.content_sha256] = {
+            "content_sha256": document.content_sha256,
+            "rubric_version": rubric_version,
+            "content_length": document.content_length,
+            "score_json": json.dumps(document.heuristic, ensure_ascii=False, sort_keys=True),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+    if not rows:
+        return 0
+    digests = sorted(rows)
+    with session_scope(engine) as session:
+        if replace:
+            for start in range(0, len(digests), _CACHE_LOOKUP_CHUNK):
+                session.execute(
+                    delete(QualityScore).where(
+                        QualityScore.rubric_version == rubric_version,
+                        QualityScore.content_sha256.in_(digests[start : start + _CACHE_LOOKUP_CHUNK]),
+                    )
+                )
+        dialect = session.get_bind().dialect.name
+        dialect_insert: Callable[[Any], Any] | None
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        elif dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            dialect_insert = None
+        if dialect_insert is not None:
+            # Concurrent evaluations of the same content race on the key; the
+            # score is deterministic, so the first writer wins.
+            statement = dialect_insert(QualityScore).on_conflict_do_nothing()
+        else:
+            for digest in load_cached_scores(engine, digests, rubric_version):
+                rows.pop(digest, None)
+            statement = insert(QualityScore)
+        if rows:
+            session.execute(statement, [rows[digest] for digest in sorted(rows)])
+    return len(rows)
+
+
+def score_documents(
+    runs: Sequence[tuple[str, str]],
     *,
-    run_id: str,
-    request_text: str,
     workspace_root: Path,
+    blob_store: BlobStore | None = None,
+) -> list[ScoredDocument]:
+    """Read, hash and score each run's first artifact.
+
+    ``runs`` holds ``(run_id, request_text)`` pairs; the request text stands in
+    for runs without artifacts. Identical content is scored once per call.
+    """
+    scored: dict[str, dict[str, Any]] = {}
+    documents: list[ScoredDocument] = []
+    for run_id, request_text in runs:
+        content = _extract_first_artifact_content(
+            workspace_root, run_id, fallback_text=request_text, blob_store=blob_store
+        )
+        digest = content_sha256(content)
+        heuristic = scored.get(digest)
+        if heuristic is None:
+            heuristic = scored[digest] = _compute_heuristic_score(content)
+        documents.append(ScoredDocument(run_id, digest, len(content), heuristic))
+    return documents
+
+
+def _evaluation_response(
+    run_id: str,
+    content: str,
+    digest: str,
+    heuristic: dict[str, Any],
+    *,
     depth: str,
     rubric_version: str,
 ) -> dict[str, Any]:
-    content = _extract_first_artifact_content(workspace_root, run_id, fallback_text=request_text)
-    heuristic = _compute_heuristic_score(content)
-
     response = {
         "run_id": run_id,
         "depth": depth,
         "rubric_version": rubric_version,
         "content_length": len(content),
+        "content_sha256": digest,
         "score": {**heuristic, "source": "heuristic"},
         "fallback_applied": False,
     }
@@ -113,3 +272,131 @@ def evaluate_run_quality(
         response["fallback_applied"] = True
         response["fallback_reason"] = str(exc)
         return response
+
+
+def evaluate_runs_quality(
+    runs: Sequence[tuple[str, str]],
+    *,
+    workspace_root: Path,
+    depth: str = "heuristic",
+    rubric_version: str = "v1",
+    blob_store: BlobStore | None = None,
+    engine: Engine | None = None,
+) -> list[dict[str, Any]]:
+    """Evaluate many ``(run_id, request_text)`` pairs in one call.
+
+    With an ``engine``, heuristic scores are looked up in ``quality_scores`` by
+    artifact sha256 in one query and only unseen content is scored and stored.
+    Results keep the order of ``runs``.
+    """
+    documents = [
+        (
+            run_id,
+            _extract_first_artifact_content(
+                workspace_root, run_id, fallback_text=request_text, blob_store=blob_store
+            ),
+        )
+        for run_id, request_text in runs
+    ]
+    digests = [content_sha256(content) for _, content in documents]
+    scores = load_cached_scores(engine, digests, rubric_version) if engine is not None else {}
+
+    fresh: list[ScoredDocument] = []
+    for (run_id, content), digest in zip(documents, digests):
+        if digest not in scores:
+            scores[digest] = _compute_heuristic_score(content)
+            fresh.append(ScoredDocument(run_id, digest, len(content), scores[digest]))
+    if engine is not None and fresh:
+        store_scores(engine, fresh, rubric_version)
+
+    return [
+        _evaluation_response(
+            run_id, content, digest, scores[digest], depth=depth, rubric_version=rubric_version
+        )
+        for (run_id, content), digest in zip(documents, digests)
+    ]
+
+
+def evaluate_run_quality(
+    *,
+    run_id: str,
+    request_text: str,
+    workspace_root: Path,
+    depth: str,
+    rubric_version: str,
+    blob_store: BlobStore | None = None,
+    engine: Engine | None = None,
+) -> dict[str, Any]:
+    return evaluate_runs_quality(
+        [(run_id, request_text)],
+        workspace_root=workspace_root,
+        depth=depth,
+        rubric_version=rubric_version,
+        blob_store=blob_store,
+        engine=engine,
+    )[0]
+
+
+def _score_batch(
+    workspace_root: Path, blob_store: BlobStore | None, runs: list[tuple[str, str]]
+) -> list[ScoredDocument]:
+    return score_documents(runs, workspace_root=workspace_root, blob_store=blob_store)
+
+
+def backfill_quality_scores(
+    engine: Engine,
+    *,
+    workspace_root: Path,
+    rubric_version: str = "v1",
+    blob_store: BlobStore | None = None,
+    workers: int | None = None,
+    batch_size: int = BACKFILL_BATCH_SIZE,
+    replace: bool = False,
+) -> dict[str, int]:
+    """Score every stored run's first artifact into ``quality_scores``.
+
+    Batches of runs are read and scored across ``workers`` processes (default:
+    one per core; ``1`` stays inline) while this process writes the rows.
+    """
+    with session_scope(engine) as session:
+        runs = [
+            (run_id, str(user_request or ""))
+            for run_id, user_request in session.execute(
+                select(Run.run_id, Run.user_request).order_by(Run.created_at, Run.run_id)
+            )
+        ]
+    batches = [runs[start : start + batch_size] for start in range(0, len(runs), batch_size)]
+    workers = workers if workers is not None else (os.cpu_count() or 1)
+
+    stats = {"runs": len(runs), "documents": 0, "stored": 0}
+    seen: set[str] = set()
+
+    def _collect(documents: list[ScoredDocument]) -> None:
+        fresh = {
+            document.content_sha256: document
+            for document in documents
+            if document.content_sha256 not in seen
+        }
+        seen.update(fresh)
+        if not replace:
+            for digest in load_cached_scores(engine, fresh, rubric_version):
+                del fresh[digest]
+        stats["stored"] += store_scores(engine, fresh.values(), rubric_version, replace=replace)
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            for documents in pool.map(
+                _score_batch,
+                [workspace_root] * len(batches),
+                [blob_store] * len(batches),
+                batches,
+            ):
+                _collect(documents)
+    else:
+        for batch in batches:
+            _collect(_score_batch(workspace_root, blob_store, batch))
+    stats["documents"] = len(seen)
+    return stats
@@ -2,6 +2,7 @@
 
 Otimizador com prioridade em qualidade e restrições explícitas de custo/tempo.
 Implementa ciclo evaluate/optimize/constrain/apply com feasibility check.
+Também oferece scoring em lote (arrays NumPy) para ciclos com muitos runs.
 """
 
 from __future__ import annotations
@@ -9,9 +10,11 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Optional
+from typing import Any, Optional, Sequence
 from uuid import uuid4
 
+import numpy as np
+
 
 class ProposalState(Enum):
     """Estados possíveis de uma proposta."""
@@ -34,6 +37,28 @@ class QualityScore:
     computed_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
 
 
+@dataclass(frozen=True)
+class QualityScoreBatch:
+    """Scores de qualidade de vários runs como arrays 1-D paralelos."""
+    
+    overall: np.ndarray
+    v1_score: np.ndarray
+    approval_rate: np.ndarray
+    incident_rate: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.overall)
+    
+    def at(self, index: int) -> QualityScore:
+        """Materializa o run ``index`` como ``QualityScore``."""
+        return QualityScore(
+            overall=float(self.overall[index]),
+            v1_score=float(self.v1_score[index]),
+            approval_rate=float(self.approval_rate[index]),
+            incident_rate=float(self.incident_rate[index]),
+        )
+
+
 @dataclass
 class ConstraintBounds:
     """Limites de restrição para otimização."""
@@ -127,6 +152,40 @@ class QualityOptimizer:
             incident_rate=incident_rate,
         )
     
+    def calculate_quality_scores_batch(
+        self,
+        v1_score: Any,
+        approval_rate: Any,
+        incident_rate: Any,
+    ) -> QualityScoreBatch:
+        """Calcula scores de qualidade para vários runs de uma vez.
+        
+        Recebe arrays (ou sequências) paralelos e aplica as mesmas operações,
+        na mesma ordem, que ``calculate_quality_score``; cada elemento é
+        idêntico ao resultado escalar.
+        """
+        
+        v1 = np.asarray(v1_score, dtype=np.float64)
+        approval = np.asarray(approval_rate, dtype=np.float64)
+        incidents = np.asarray(incident_rate, dtype=np.float64)
+        if not v1.shape == approval.shape == incidents.shape or v1.ndim != 1:
+            raise ValueError("v1_score, approval_rate e incident_rate devem ser arrays 1-D do mesmo tamanho")
+        
+        incident_penalty = np.minimum(incidents * 100 * 2, 50)
+        overall = (
+            self._quality_weights["v1_score"] * v1 +
+            self._quality_weights["approval_rate"] * (approval * 100) -
+            self._quality_weights["incident_penalty"] * incident_penalty
+        )
+        overall = np.maximum(0.0, np.minimum(100.0, overall))
+        
+        return QualityScoreBatch(
+            overall=overall,
+            v1_score=v1,
+            approval_rate=approval,
+            incident_rate=incidents,
+        )
+    
     def generate_proposal(
         self,
         current_run: dict[str, Any],
@@ -143,6 +202,44 @@ class QualityOptimizer:
         Returns:
             OptimizationProposal com recomendações
         """
+        # Calcular score atual
+        quality_score = self.calculate_quality_score(
+            v1_score=current_run.get("v1_score", 60.0),
+            approval_rate=current_run.get("approval_without_regen_24h", 0.70),
+            incident_rate=current_run.get("incident_rate", 0.05),
+        )
+        return self._build_proposal(current_run, quality_score, historical_runs, constraints)
+    
+    def generate_proposals_batch(
+        self,
+        current_runs: Sequence[dict[str, Any]],
+        historical_runs: list[dict[str, Any]],
+        constraints: ConstraintBounds,
+    ) -> tuple[QualityScoreBatch, list[OptimizationProposal]]:
+        """Gera propostas para vários runs com scoring vetorizado.
+        
+        Returns:
+            Tupla (scores em lote, uma proposta por run, na mesma ordem)
+        """
+        scores = self.calculate_quality_scores_batch(
+            v1_score=[run.get("v1_score", 60.0) for run in current_runs],
+            approval_rate=[run.get("approval_without_regen_24h", 0.70) for run in current_runs],
+            incident_rate=[run.get("incident_rate", 0.05) for run in current_runs],
+        )
+        proposals = [
+            self._build_proposal(run, scores.at(index), historical_runs, constraints)
+            for index, run in enumerate(current_runs)
+        ]
+        return scores, proposals
+    
+    def _build_proposal(
+        self,
+        current_run: dict[str, Any],
+        quality_score: QualityScore,
+        historical_runs: list[dict[str, Any]],
+        constraints: ConstraintBounds,
+    ) -> OptimizationProposal:
+        """Monta e registra a proposta de um run já pontuado."""
         run_id = current_run.get("run_id", str(uuid4()))
         
         # Extrair métricas atuais
@@ -150,14 +247,6 @@ class QualityOptimizer:
         current_cost = current_run.get("cost_per_job", 100.0)
         current_mttc = current_run.get("mttc", 300.0)
         current_incidents = current_run.get("incident_rate", 0.05)
-        current_approval = current_run.get("approval_without_regen_24h", 0.70)
-        
-        # Calcular score atual
-        quality_score = self.calculate_quality_score(
-            v1_score=current_v1,
-            approval_rate=current_approval,
-            incident_rate=current_incidents,
-        )
         
         # Gerar parâmetros recomendados (lógica simplificada)
         current_params = current_run.get("params", {})
@@ -7,10 +7,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 UTC = timezone.utc
 from enum import Enum
-from typing import Optional
+import heapq
+import threading
+from typing import Callable, Optional
 from collections import defaultdict
 
 from prometheus_client import Counter
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from vm_webapp.db import session_scope
+from vm_webapp.models import RegressionAlertView
 
 
 class RegressionSeverity(str, Enum):
@@ -28,6 +35,13 @@ class RegressionReasonCode(str, Enum):
     MULTI_METRIC_REGRESSION = "multi_metric_regression"
 
 
+class RegressionAlertStatus(str, Enum):
+    """Estado do alerta, derivado de ``confirmed``/``false_positive``."""
+    ACTIVE = "active"
+    CONFIRMED = "confirmed"
+    FALSE_POSITIVE = "false_positive"
+
+
 @dataclass
 class RegressionAlert:
     """Alerta de regressão detectado."""
@@ -47,6 +61,14 @@ class RegressionAlert:
     dismissed_at: Optional[datetime] = None
     dismissed_by: Optional[str] = None
 
+    @property
+    def status(self) -> RegressionAlertStatus:
+        if self.false_positive:
+            return RegressionAlertStatus.FALSE_POSITIVE
+        if self.confirmed:
+            return RegressionAlertStatus.CONFIRMED
+        return RegressionAlertStatus.ACTIVE
+
 
 class RegressionDetector:
     """
@@ -181,16 +203,38 @@ class AlertDeduplicator:
     
     Alertas do mesmo segmento/métrica dentro da janela de dedup
     são considerados o mesmo alerta.
+    
+    A expiração usa uma timing wheel: cada chave é colocada no slot do tick
+    em que expira e, a cada registro, só os slots dos ticks já decorridos
+    são varridos. O custo amortizado é O(1) por alerta, em vez de varrer
+    todo o ``_recent_alerts``.
     """
     
-    def __init__(self, dedup_window_hours: int = 4):
+    def __init__(
+        self,
+        dedup_window_hours: int = 4,
+        wheel_resolution_seconds: float = 60.0,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        if wheel_resolution_seconds <= 0:
+            raise ValueError("wheel_resolution_seconds must be > 0")
         self.dedup_window = timedelta(hours=dedup_window_hours)
         self._recent_alerts: dict[str, datetime] = {}
+        self._resolution = wheel_resolution_seconds
+        self._clock = clock or (lambda: datetime.now(UTC))
+        # Um slot a mais que a janela: uma chave nunca cai num slot que
+        # ainda será varrido antes do seu tick de expiração.
+        slot_count = int(self.dedup_window.total_seconds() // wheel_resolution_seconds) + 2
+        self._slots: list[list[tuple[str, int]]] = [[] for _ in range(slot_count)]
+        self._cursor: Optional[int] = None  # último tick já varrido
     
     def _get_dedup_key(self, alert: RegressionAlert) -> str:
         """Gera chave de deduplicação."""
         return f"{alert.segment_key}:{alert.reason_code.value}:{alert.metric_name}"
     
+    def _tick(self, moment: datetime) -> int:
+        return int(moment.timestamp() // self._resolution)
+    
     def should_alert(self, alert: RegressionAlert) -> bool:
         """
         Verifica se alerta deve ser emitido (não está deduplicado).
@@ -202,7 +246,7 @@ class AlertDeduplicator:
             True se deve alertar, False se deduplicado
         """
         key = self._get_dedup_key(alert)
-        now = datetime.now(UTC)
+        now = self._clock()
         
         if key in self._recent_alerts:
             last_alert_time = self._recent_alerts[key]
@@ -213,21 +257,45 @@ class AlertDeduplicator:
     
     def record_alert(self, alert: RegressionAlert):
         """Registra alerta para deduplicação futura."""
+        now_tick = self._cleanup_old_alerts()
         key = self._get_dedup_key(alert)
+        expires_tick = self._tick(alert.detected_at + self.dedup_window)
+        if expires_tick < now_tick:
+            # Já nasceu expirado (ex.: alerta antigo reprocessado).
+            self._recent_alerts.pop(key, None)
+            return
         self._recent_alerts[key] = alert.detected_at
+        self._slots[expires_tick % len(self._slots)].append((key, expires_tick))
+    
+    def _cleanup_old_alerts(self) -> int:
+        """Remove alertas expirados varrendo só os ticks decorridos; retorna o tick atual."""
+        now_tick = self._tick(self._clock())
+        if self._cursor is None:
+            self._cursor = now_tick - 1
+        if now_tick - 1 <= self._cursor:
+            return now_tick
         
-        # Cleanup de alertas antigos
-        self._cleanup_old_alerts()
-    
-    def _cleanup_old_alerts(self):
-        """Remove alertas expirados."""
-        now = datetime.now(UTC)
-        expired = [
-            key for key, timestamp in self._recent_alerts.items()
-            if now - timestamp > self.dedup_window
-        ]
-        for key in expired:
-            del self._recent_alerts[key]
+        slot_count = len(self._slots)
+        # Após uma volta completa todos os slots já foram visitados.
+        first = max(self._cursor + 1, now_tick - slot_count)
+        for tick in range(first, now_tick):
+            index = tick % slot_count
+            slot = self._slots[index]
+            if not slot:
+                continue
+            pending = []
+            for key, expires_tick in slot:
+                if expires_tick >= now_tick:
+                    pending.append((key, expires_tick))
+                    continue
+                last = self._recent_alerts.get(key)
+                # Entradas de chaves re-registradas depois ficam obsoletas no
+                # slot antigo; só remove se o último registro também expirou.
+                if last is not None and self._tick(last + self.dedup_window) < now_tick:
+                    del self._recent_alerts[key]
+            self._slots[index] = pending
+        self._cursor = now_tick - 1
+        return now_tick
 
 
 class RegressionMetrics:
@@ -311,6 +379,194 @@ class RegressionMetrics:
 _metrics = RegressionMetrics()
 
 
+def _iso(moment: Optional[datetime]) -> Optional[str]:
+    # Sempre em UTC para que a ordenação lexicográfica de detected_at no índice
+    # coincida com a ordem cronológica.
+    return moment.astimezone(UTC).isoformat() if moment is not None else None
+
+
+def _parse_iso(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _alert_to_row(alert: RegressionAlert) -> dict:
+    return {
+        "alert_id": alert.alert_id,
+        "segment_key": alert.segment_key,
+        "status": alert.status.value,
+        "severity": alert.severity.value,
+        "reason_code": alert.reason_code.value,
+        "metric_name": alert.metric_name,
+        "current_value": alert.current_value,
+        "baseline_value": alert.baseline_value,
+        "delta": alert.delta,
+        "window_hours": alert.window_hours,
+        "detected_at": _iso(alert.detected_at),
+        "confirmed_at": _iso(alert.confirmed_at),
+        "dismissed_at": _iso(alert.dismissed_at),
+        "dismissed_by": alert.dismissed_by,
+    }
+
+
+def _row_to_alert(row: RegressionAlertView) -> RegressionAlert:
+    return RegressionAlert(
+        alert_id=row.alert_id,
+        segment_key=row.segment_key,
+        severity=RegressionSeverity(row.severity),
+        reason_code=RegressionReasonCode(row.reason_code),
+        metric_name=row.metric_name,
+        current_value=row.current_value,
+        baseline_value=row.baseline_value,
+        delta=row.delta,
+        window_hours=row.window_hours,
+        detected_at=datetime.fromisoformat(row.detected_at),
+        confirmed=row.status == RegressionAlertStatus.CONFIRMED.value,
+        confirmed_at=_parse_iso(row.confirmed_at),
+        false_positive=row.status == RegressionAlertStatus.FALSE_POSITIVE.value,
+        dismissed_at=_parse_iso(row.dismissed_at),
+        dismissed_by=row.dismissed_by,
+    )
+
+
+# Teto do store em memória (sem engine), para o processo não crescer sem limite.
+MAX_IN_MEMORY_ALERTS = 10_000
+
+
+class RegressionAlertStore:
+    """
+    Armazena alertas de regressão.
+    
+    Sem engine, mantém os alertas em memória com um índice
+    ``(segment_key, status) -> alert_ids``, limitado a ``max_alerts`` (os
+    detectados há mais tempo saem primeiro); com engine, persiste na tabela
+    ``regression_alerts`` e as consultas por segmento/status usam o índice
+    ``(segment_key, status, detected_at)``. Os resultados vêm ordenados por
+    ``detected_at``.
+    """
+    
+    def __init__(self, engine: Optional[Engine] = None, *, max_alerts: int = MAX_IN_MEMORY_ALERTS):
+        if max_alerts < 1:
+            raise ValueError("max_alerts must be >= 1")
+        self._engine = engine
+        self.max_alerts = max_alerts
+        self._lock = threading.RLock()
+        self._alerts: dict[str, RegressionAlert] = {}
+        self._by_segment_status: dict[tuple[str, str], dict[str, None]] = defaultdict(dict)
+        self._by_status: dict[str, dict[str, None]] = defaultdict(dict)
+        # (segment_key, status) sob o qual cada alerta foi indexado; os alertas
+        # são mutados no lugar antes de ``update``, então não dá para ler o
+        # status antigo do próprio objeto.
+        self._indexed_as: dict[str, tuple[str, str]] = {}
+        # (detected_at, alert_id) para descartar os mais antigos; entradas de
+        # alertas já removidos ou re-detectados são ignoradas ao sair do heap.
+        self._by_detected: list[tuple[datetime, str]] = []
+    
+    @property
+    def engine(self) -> Optional[Engine]:
+        return self._engine
+    
+    def bind(self, engine: Optional[Engine]) -> None:
+        """Liga (ou desliga com ``None``) o banco de dados."""
+        with self._lock:
+            self._engine = engine
+    
+    def add(self, alert: RegressionAlert) -> None:
+        if self._engine is not None:
+            with session_scope(self._engine) as session:
+                session.merge(RegressionAlertView(**_alert_to_row(alert)))
+            return
+        with self._lock:
+            self._unindex(alert.alert_id)
+            self._alerts[alert.alert_id] = alert
+            self._index(alert)
+            heapq.heappush(self._by_detected, (alert.detected_at, alert.alert_id))
+            self._evict_oldest()
+    
+    def update(self, alert: RegressionAlert) -> None:
+        self.add(alert)
+    
+    def get(self, alert_id: str) -> Optional[RegressionAlert]:
+        if self._engine is not None:
+            with session_scope(self._engine) as session:
+                row = session.get(RegressionAlertView, alert_id)
+                return _row_to_alert(row) if row is not None else None
+        with self._lock:
+            return self._alerts.get(alert_id)
+    
+    def list(
+        self,
+        segment_key: Optional[str] = None,
+        status: Optional[RegressionAlertStatus] = None,
+    ) -> list[RegressionAlert]:
+        if self._engine is not None:
+            statement = select(RegressionAlertView)
+            if segment_key is not None:
+                statement = statement.where(RegressionAlertView.segment_key == segment_key)
+            if status is not None:
+                statement = statement.where(RegressionAlertView.status == status.value)
+            statement = statement.order_by(RegressionAlertView.detected_at)
+            with session_scope(self._engine) as session:
+                return [_row_to_alert(row) for row in session.scalars(statement)]
+        
+        with self._lock:
+            if status is not None and segment_key is not None:
+                ids = list(self._by_segment_status.get((segment_key, status.value), ()))
+            elif status is not None:
+                ids = list(self._by_status.get(status.value, ()))
+            else:
+                ids = [
+                    alert_id for alert_id, alert in self._alerts.items()
+                    if segment_key is None or alert.segment_key == segment_key
+                ]
+            alerts = [self._alerts[alert_id] for alert_id in ids]
+        return sorted(alerts, key=lambda alert: alert.detected_at)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._alerts.clear()
+            self._by_segment_status.clear()
+            self._by_status.clear()
+            self._indexed_as.clear()
+            self._by_detected.clear()
+    
+    def _index(self, alert: RegressionAlert) -> None:
+        key = (alert.segment_key, alert.status.value)
+        self._by_segment_status[key][alert.alert_id] = None
+        self._by_status[key[1]][alert.alert_id] = None
+        self._indexed_as[alert.alert_id] = key
+    
+    def _evict_oldest(self) -> None:
+        while len(self._alerts) > self.max_alerts:
+            detected_at, alert_id = heapq.heappop(self._by_detected)
+            alert = self._alerts.get(alert_id)
+            if alert is None or alert.detected_at != detected_at:
+                continue
+            self._unindex(alert_id)
+            del self._alerts[alert_id]
+        if len(self._by_detected) > 2 * self.max_alerts:
+            self._by_detected = [
+                (alert.detected_at, alert_id) for alert_id, alert in self._alerts.items()
+            ]
+            heapq.heapify(self._by_detected)
+    
+    def _unindex(self, alert_id: str) -> None:
+        key = self._indexed_as.pop(alert_id, None)
+        if key is None:
+            return
+        self._by_segment_status[key].pop(alert_id, None)
+        self._by_status[key[1]].pop(alert_id, None)
+
+
+# Store global de alertas; persistente depois de configure_regression_alert_storage
+_alert_store = RegressionAlertStore()
+
+
+def configure_regression_alert_storage(engine: Optional[Engine]) -> RegressionAlertStore:
+    """Liga o store global de alertas a ``engine`` (``None`` volta para memória)."""
+    _alert_store.bind(engine)
+    return _alert_store
+
+
 def _fetch_segment_metrics(segment_key: str) -> dict:
     """
     Busca métricas de um segmento (stub - implementação real consultaria DB).
@@ -327,18 +583,26 @@ def _fetch_segment_metrics(segment_key: str) -> dict:
 
 
 def _store_alert(alert: RegressionAlert):
-    """Armazena alerta no banco (stub)."""
-    pass
+    """Armazena alerta no store."""
+    _alert_store.add(alert)
 
 
-def _load_alerts(segment_key: Optional[str] = None) -> list[RegressionAlert]:
-    """Carrega alertas do banco (stub)."""
-    return []
+def _load_alerts(
+    segment_key: Optional[str] = None,
+    *,
+    status: Optional[RegressionAlertStatus] = None,
+    alert_id: Optional[str] = None,
+) -> list[RegressionAlert]:
+    """Carrega alertas do store, filtrando por id, segmento e/ou status."""
+    if alert_id is not None:
+        alert = _alert_store.get(alert_id)
+        return [alert] if alert is not None else []
+    return _alert_store.list(segment_key=segment_key, status=status)
 
 
 def _update_alert(alert: RegressionAlert):
-    """Atualiza alerta no banco (stub)."""
-    pass
+    """Atualiza alerta no store."""
+    _alert_store.update(alert)
 
 
 def detect_segment_regression(
@@ -409,7 +673,7 @@ def get_active_alerts(segment_key: Optional[str] = None) -> list[RegressionAlert
     Returns:
         Lista de alertas ativos
     """
-    alerts = _load_alerts(segment_key)
+    alerts = _load_alerts(segment_key, status=RegressionAlertStatus.ACTIVE)
     
     return [
         alert for alert in alerts
@@ -428,7 +692,7 @@ def confirm_alert(alert_id: str, confirmed_by: Optional[str] = None) -> Optional
     Returns:
         Alerta atualizado ou None
     """
-    alerts = _load_alerts()
+    alerts = _load_alerts(alert_id=alert_id)
     alert = next((a for a in alerts if a.alert_id == alert_id), None)
     
     if alert:
@@ -456,7 +720,7 @@ def dismiss_false_positive(
     Returns:
         Alerta atualizado ou None
     """
-    alerts = _load_alerts()
+    alerts = _load_alerts(alert_id=alert_id)
     alert = next((a for a in alerts if a.alert_id == alert_id), None)
     
     if alert:
@@ -212,6 +212,38 @@ def list_runs_by_thread(session: Session, thread_id: str) -> list[Run]:
     )
 
 
+def list_queued_runs(session: Session, *, per_brand: int = 50) -> list[Run]:
+    """Oldest ``per_brand`` queued runs of every brand with queued runs.
+
+    One brand's backlog never hides another brand's runs from the scheduler.
+    """
+    ranked = (
+        select(
+            Run.run_id,
+            func.row_number()
+            .over(partition_by=Run.brand_id, order_by=(Run.updated_at.asc(), Run.run_id.asc()))
+            .label("brand_rank"),
+        )
+        .where(Run.status == "queued")
+        .subquery()
+    )
+    return list(
+        session.scalars(
+            select(Run)
+            .join(ranked, ranked.c.run_id == Run.run_id)
+            .where(ranked.c.brand_rank <= per_brand)
+            .order_by(Run.updated_at.asc(), Run.run_id.asc())
+        )
+    )
+
+
+def count_queued_runs_by_brand(session: Session) -> dict[str, int]:
+    rows = session.execute(
+        select(Run.brand_id, func.count()).where(Run.status == "queued").group_by(Run.brand_id)
+    )
+    return {str(brand_id): int(count) for brand_id, count in rows}
+
+
 def update_run_status(session: Session, run_id: str, status: str) -> None:
     session.execute(
         update(Run)
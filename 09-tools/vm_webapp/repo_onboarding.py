@@ -3,10 +3,10 @@
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from vm_webapp.models_onboarding import OnboardingEvent, OnboardingFrictionPoint, OnboardingState
+from vm_webapp.models_onboarding import OnboardingFrictionPoint, OnboardingState
+from vm_webapp.onboarding_rollups import load_window, merge_by
 
 
 def get_onboarding_metrics(
@@ -26,15 +26,11 @@ def get_onboarding_metrics(
     """
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    query = session.query(OnboardingEvent).filter(OnboardingEvent.created_at >= since)
-    if brand_id:
-        query = query.filter(OnboardingEvent.brand_id == brand_id)
-    
-    events = query.all()
-    
-    events_by_type: dict[str, int] = {}
-    for e in events:
-        events_by_type[e.event_type] = events_by_type.get(e.event_type, 0) + 1
+    window = load_window(session, since=since, brand_id=brand_id)
+    events_by_type = {
+        event_type: aggregate.event_count
+        for event_type, aggregate in merge_by(window, group="event_type").items()
+    }
     
     # Calculate additional metrics
     started = events_by_type.get("onboarding_started", 0)
@@ -42,7 +38,7 @@ def get_onboarding_metrics(
     completion_rate = completed / started if started > 0 else 0.0
     
     return {
-        "total_events": len(events),
+        "total_events": sum(events_by_type.values()),
         "events_by_type": events_by_type,
         "total_started": started,
         "total_completed": completed,
@@ -69,19 +65,12 @@ def get_funnel_metrics(
     """
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    query = session.query(OnboardingEvent).filter(OnboardingEvent.created_at >= since)
-    if brand_id:
-        query = query.filter(OnboardingEvent.brand_id == brand_id)
-    
-    # Group by step
-    step_counts = (
-        query.filter(OnboardingEvent.step.isnot(None))
-        .with_entities(OnboardingEvent.step, func.count(OnboardingEvent.event_id))
-        .group_by(OnboardingEvent.step)
-        .all()
-    )
-    
-    steps = {step: count for step, count in step_counts}
+    window = load_window(session, since=since, brand_id=brand_id)
+    steps = {
+        step: aggregate.event_count
+        for step, aggregate in merge_by(window, group="step").items()
+        if step
+    }
     
     return {
         "steps": steps,
@@ -220,34 +209,34 @@ def get_time_to_first_value_stats(
         days: Number of days to look back
         
     Returns:
-        Dict with avg, min, max TTFV
+        Dict with avg, min, max TTFV and sketch-based p50/p90/p95
     """
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    query = session.query(OnboardingEvent).filter(
-        OnboardingEvent.event_type == "time_to_first_value",
-        OnboardingEvent.created_at >= since,
-        OnboardingEvent.duration_ms.isnot(None)
+    window = load_window(
+        session, since=since, brand_id=brand_id, event_types=["time_to_first_value"]
     )
+    ttfv = merge_by(window).get("")
     
-    if brand_id:
-        query = query.filter(OnboardingEvent.brand_id == brand_id)
-    
-    durations = [e.duration_ms for e in query.all() if e.duration_ms]
-    
-    if not durations:
+    if ttfv is None or not ttfv.duration_count:
         return {
             "count": 0,
             "avg_ms": 0,
             "min_ms": 0,
             "max_ms": 0,
+            "p50_ms": 0,
+            "p90_ms": 0,
+            "p95_ms": 0,
         }
     
     return {
-        "count": len(durations),
-        "avg_ms": round(sum(durations) / len(durations), 2),
-        "min_ms": min(durations),
-        "max_ms": max(durations),
+        "count": ttfv.duration_count,
+        "avg_ms": round(ttfv.duration_sum_ms / ttfv.duration_count, 2),
+        "min_ms": ttfv.duration_min_ms,
+        "max_ms": ttfv.duration_max_ms,
+        "p50_ms": round(ttfv.sketch.quantile(0.5), 2),
+        "p90_ms": round(ttfv.sketch.quantile(0.9), 2),
+        "p95_ms": round(ttfv.sketch.quantile(0.95), 2),
     }
 
 
@@ -268,18 +257,9 @@ def get_events_by_template(
     """
     since = datetime.now(timezone.utc) - timedelta(days=days)
     
-    query = session.query(OnboardingEvent).filter(
-        OnboardingEvent.created_at >= since,
-        OnboardingEvent.template_id.isnot(None)
-    )
-    
-    if brand_id:
-        query = query.filter(OnboardingEvent.brand_id == brand_id)
-    
-    results = (
-        query.with_entities(OnboardingEvent.template_id, func.count(OnboardingEvent.event_id))
-        .group_by(OnboardingEvent.template_id)
-        .all()
-    )
-    
-    return {template_id: count for template_id, count in results}
+    window = load_window(session, since=since, brand_id=brand_id)
+    return {
+        template_id: aggregate.event_count
+        for template_id, aggregate in merge_by(window, group="template_id").items()
+        if template_id
+    }
@@ -10,14 +10,17 @@ Features:
 - Hard guardrails (incident_rate cannot increase)
 - ±10% adjustment clamp per cycle
 - Low-risk autoapply eligibility
+- Batch scoring over struct-of-arrays inputs (NumPy) for nightly cycles
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
 from enum import Enum, auto
-from typing import Optional
+from typing import Optional, Sequence
+
+import numpy as np
 
 
 class RiskLevel(Enum):
@@ -116,6 +119,99 @@ class RoiScoreInput:
             raise ValueError(f"incident_rate must be in [0,1]")
 
 
+@dataclass(frozen=True)
+class RoiScoreInputBatch:
+    """Struct-of-arrays form of ``RoiScoreInput`` for many segments.
+    
+    Every field is a 1-D float64 array of the same length; row ``i`` holds
+    the metrics of segment ``i``. Ranges are validated like the scalar input.
+    """
+    approval_without_regen_24h: np.ndarray
+    revenue_attribution_usd: np.ndarray
+    regen_per_job: np.ndarray
+    quality_score_avg: np.ndarray
+    avg_latency_ms: np.ndarray
+    cost_per_job_usd: np.ndarray
+    incident_rate: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        size = None
+        for f in fields(self):
+            value = getattr(self, f.name)
+            if value is None:
+                value = np.zeros(size or 0)
+            array = np.asarray(value, dtype=np.float64)
+            if array.ndim != 1:
+                raise ValueError(f"{f.name} must be a 1-D array")
+            if size is None:
+                size = len(array)
+            elif len(array) != size:
+                raise ValueError(f"{f.name} has length {len(array)}, expected {size}")
+            object.__setattr__(self, f.name, array)
+
+        self._check_range("approval_without_regen_24h", 0, 1)
+        self._check_range("quality_score_avg", 0, 1)
+        self._check_range("incident_rate", 0, 1)
+        for name in ("revenue_attribution_usd", "regen_per_job", "avg_latency_ms", "cost_per_job_usd"):
+            self._check_range(name, 0, None)
+
+    def _check_range(self, name: str, low: float, high: Optional[float]) -> None:
+        values = getattr(self, name)
+        bad = values < low if high is None else (values < low) | (values > high)
+        if bad.any():
+            index = int(np.argmax(bad))
+            bounds = f">= {low}" if high is None else f"in [{low},{high}]"
+            raise ValueError(f"{name}[{index}] must be {bounds}, got {values[index]}")
+
+    @classmethod
+    def from_inputs(cls, inputs: Sequence[RoiScoreInput]) -> RoiScoreInputBatch:
+        """Stack scalar inputs into a batch."""
+        return cls(**{
+            f.name: np.fromiter((getattr(item, f.name) for item in inputs), dtype=np.float64, count=len(inputs))
+            for f in fields(cls)
+        })
+
+    def __len__(self) -> int:
+        return len(self.approval_without_regen_24h)
+
+    def row(self, index: int) -> RoiScoreInput:
+        """Return segment ``index`` as a scalar ``RoiScoreInput``."""
+        return RoiScoreInput(**{f.name: float(getattr(self, f.name)[index]) for f in fields(self)})
+
+
+@dataclass(frozen=True)
+class RoiBatchScores:
+    """Per-segment pillar scores, contributions and totals (1-D arrays)."""
+    total_score: np.ndarray
+    business: np.ndarray
+    quality: np.ndarray
+    efficiency: np.ndarray
+    business_contribution: np.ndarray
+    quality_contribution: np.ndarray
+    efficiency_contribution: np.ndarray
+    weights: RoiWeights
+
+    def __len__(self) -> int:
+        return len(self.total_score)
+
+    def at(self, index: int) -> RoiCompositeScore:
+        """Materialize segment ``index`` as the scalar result type."""
+        return RoiCompositeScore(
+            total_score=float(self.total_score[index]),
+            pillar_scores=RoiPillarScores(
+                business=float(self.business[index]),
+                quality=float(self.quality[index]),
+                efficiency=float(self.efficiency[index]),
+            ),
+            contributions=RoiContributions(
+                business=float(self.business_contribution[index]),
+                quality=float(self.quality_contribution[index]),
+                efficiency=float(self.efficiency_contribution[index]),
+            ),
+            weights=self.weights,
+        )
+
+
 @dataclass
 class RoiProposal:
     """An optimization proposal with ROI projections."""
@@ -177,6 +273,35 @@ class RoiScoreCalculator:
             weights=self.weights,
         )
     
+    def calculate_batch(self, batch: RoiScoreInputBatch) -> RoiBatchScores:
+        """Score every segment of ``batch`` at once.
+        
+        Applies the same operations in the same order as ``calculate``, so
+        each element equals the scalar result bit for bit.
+        """
+        business = (batch.approval_without_regen_24h * 0.70) + (
+            np.minimum(batch.revenue_attribution_usd / self.MAX_REVENUE, 1.0) * 0.30
+        )
+        quality = (batch.quality_score_avg * 0.60) + (
+            np.maximum(0.0, 1.0 - (batch.regen_per_job / self.MAX_REGEN)) * 0.40
+        )
+        efficiency = (np.maximum(0.0, 1.0 - (batch.avg_latency_ms / self.MAX_LATENCY)) * 0.50) + (
+            np.maximum(0.0, 1.0 - (batch.cost_per_job_usd / self.MAX_COST)) * 0.50
+        )
+        business_contribution = business * self.weights.business
+        quality_contribution = quality * self.weights.quality
+        efficiency_contribution = efficiency * self.weights.efficiency
+        return RoiBatchScores(
+            total_score=business_contribution + quality_contribution + efficiency_contribution,
+            business=business,
+            quality=quality,
+            efficiency=efficiency,
+            business_contribution=business_contribution,
+            quality_contribution=quality_contribution,
+            efficiency_contribution=efficiency_contribution,
+            weights=self.weights,
+        )
+    
     def _calculate_business_score(self, input_data: RoiScoreInput) -> float:
         """Calculate business pillar score (0-1, higher is better).
         
@@ -230,6 +355,10 @@ class RoiOptimizer:
     # Adjustment limits
     MAX_ADJUSTMENT_PER_CYCLE = 0.10  # ±10%
     
+    # Largest |adjustment| of each proposal kind; see the _create_* methods.
+    _PILLAR_MAX_ADJUSTMENT = min(0.10, MAX_ADJUSTMENT_PER_CYCLE)
+    _BALANCED_MAX_ADJUSTMENT = min(0.05, MAX_ADJUSTMENT_PER_CYCLE)
+    
     def __init__(
         self,
         mode: str = "semi-automatic",
@@ -301,14 +430,92 @@ class RoiOptimizer:
         
         return proposals
     
+    def generate_proposals_batch(
+        self,
+        batch: RoiScoreInputBatch,
+        target_improvement: Optional[float] = None,
+        projected_incident_rate: Optional[np.ndarray] = None,
+    ) -> tuple[RoiBatchScores, list[list[RoiProposal]]]:
+        """Generate proposals for every segment of ``batch``.
+        
+        Scores, weakest-pillar selection and risk assessment run as array
+        operations; only the returned proposal objects are built per segment.
+        Row ``i`` of the result equals ``generate_proposals(batch.row(i), ...)``,
+        including proposal ids, since segments are numbered in order.
+        
+        Returns:
+            Tuple of batch scores and one proposal list per segment
+        """
+        scores = self.calculator.calculate_batch(batch)
+        size = len(batch)
+        current_incidents = batch.incident_rate
+        assert current_incidents is not None  # filled in by __post_init__
+        # Without projections every segment keeps its current rate: nothing is blocked.
+        projected = (
+            np.asarray(projected_incident_rate, dtype=np.float64)
+            if projected_incident_rate is not None
+            else current_incidents
+        )
+        blocked = projected > current_incidents
+
+        # np.argmin keeps the first minimum, like min() over the ordered dict.
+        weakest = np.argmin(np.stack([scores.business, scores.quality, scores.efficiency]), axis=0)
+        pillar_risk = self._assess_risk_batch(self._PILLAR_MAX_ADJUSTMENT, batch)
+        balanced_risk = self._assess_risk_batch(self._BALANCED_MAX_ADJUSTMENT, batch)
+        pillars = ("business", "quality", "efficiency")
+
+        proposals: list[list[RoiProposal]] = []
+        for index in range(size):
+            if blocked[index]:
+                proposals.append([
+                    self._create_blocked_proposal(
+                        "Optimization blocked: would increase incident rate",
+                        f"Current: {current_incidents[index]:.3f}, "
+                        f"Projected: {projected[index]:.3f}",
+                    )
+                ])
+                continue
+            pillar = self._create_pillar_proposal(
+                pillars[weakest[index]], None, None, target_improvement,
+                risk_level=pillar_risk[index],
+            )
+            balanced = self._create_balanced_proposal(
+                None, None, target_improvement, risk_level=balanced_risk[index],
+            )
+            proposals.append([pillar, balanced])
+        return scores, proposals
+    
+    def _assess_risk_batch(
+        self,
+        max_adjustment: float,
+        batch: RoiScoreInputBatch,
+    ) -> list[RiskLevel]:
+        """Vectorized ``_assess_risk`` for one adjustment size across segments."""
+        assert batch.incident_rate is not None  # filled in by __post_init__
+        codes = np.select(
+            [
+                batch.incident_rate > 0.03,
+                np.full(len(batch), max_adjustment > 0.08),
+                batch.quality_score_avg < 0.60,
+            ],
+            [2, 1, 1],
+            default=0,
+        )
+        levels = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+        return [levels[code] for code in codes.tolist()]
+    
     def _create_pillar_proposal(
         self,
         pillar: str,
-        current_state: RoiScoreInput,
-        current_score: RoiCompositeScore,
+        current_state: Optional[RoiScoreInput],
+        current_score: Optional[RoiCompositeScore],
         target_improvement: Optional[float],
+        risk_level: Optional[RiskLevel] = None,
     ) -> RoiProposal:
-        """Create a proposal focused on improving a specific pillar."""
+        """Create a proposal focused on improving a specific pillar.
+
+        The batch path passes a precomputed ``risk_level`` and no scalar state.
+        """
         self._proposal_counter += 1
         
         # Define adjustments based on pillar
@@ -336,8 +543,11 @@ class RoiOptimizer:
         expected_delta = target_improvement or 0.05
         expected_delta = min(expected_delta, 0.10)  # Cap at 10%
         
-        # Determine risk level
-        risk_level = self._assess_risk(adjustments, current_state)
+        # Determine risk level (precomputed by the batch path)
+        if risk_level is None:
+            if current_state is None:
+                raise ValueError("current_state is required when risk_level is not given")
+            risk_level = self._assess_risk(adjustments, current_state)
         
         # Autoapply eligibility: only low risk in semi-automatic mode
         autoapply_eligible = risk_level == RiskLevel.LOW
@@ -354,11 +564,15 @@ class RoiOptimizer:
     
     def _create_balanced_proposal(
         self,
-        current_state: RoiScoreInput,
-        current_score: RoiCompositeScore,
+        current_state: Optional[RoiScoreInput],
+        current_score: Optional[RoiCompositeScore],
         target_improvement: Optional[float],
+        risk_level: Optional[RiskLevel] = None,
     ) -> RoiProposal:
-        """Create a balanced proposal improving all pillars slightly."""
+        """Create a balanced proposal improving all pillars slightly.
+
+        The batch path passes a precomputed ``risk_level`` and no scalar state.
+        """
         self._proposal_counter += 1
         
         # Small adjustments across all dimensions
@@ -371,7 +585,10 @@ class RoiOptimizer:
         expected_delta = target_improvement or 0.03
         expected_delta = min(expected_delta, 0.10)
         
-        risk_level = self._assess_risk(adjustments, current_state)
+        if risk_level is None:
+            if current_state is None:
+                raise ValueError("current_state is required when risk_level is not given")
+            risk_level = self._assess_risk(adjustments, current_state)
         autoapply_eligible = risk_level == RiskLevel.LOW
         
         return RoiProposal(
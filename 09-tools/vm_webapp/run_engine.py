@@ -19,7 +19,7 @@ from vm_webapp.repo import (
     update_run_status,
     update_stage_status,
 )
-from vm_webapp.stacking import load_stack
+from vm_webapp.stacking import load_stack_plan
 from vm_webapp.workspace import Workspace
 
 
@@ -47,8 +47,7 @@ class RunEngine:
         user_request: str,
     ) -> Run:
         run_id = uuid4().hex[:16]
-        stack = load_stack(stack_path)
-        stages = stack.get("sequence", [])
+        stack = load_stack_plan(stack_path)
 
         with session_scope(self.engine) as session:
             run = create_run(
@@ -61,13 +60,13 @@ class RunEngine:
                 user_request=user_request,
                 status="running",
             )
-            for pos, stage in enumerate(stages):
+            for stage in stack.stages:
                 create_stage(
                     session,
                     run_id=run_id,
-                    stage_id=str(stage.get("id", f"stage-{pos+1}")),
-                    position=pos,
-                    approval_required=bool(stage.get("approval_required", False)),
+                    stage_id=stage.id,
+                    position=stage.position,
+                    approval_required=stage.approval_required,
                     status="pending",
                 )
 
@@ -0,0 +1,365 @@
+"""Cross-run execution pool with per-brand weighted fair scheduling.
+
+Runs are admitted from the ``queued`` status in ``runs`` instead of being
+executed inline by whichever call path created them. The pool bounds the
+number of concurrently executing runs globally and per brand, and picks the
+next brand with stride scheduling so a brand that queues hundreds of runs
+cannot starve the others. Candidates are loaded per brand (the oldest few of
+each), and a run sent back to the queue for a retry waits out its backoff
+before it is admitted again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Protocol
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from vm_webapp.db import session_scope
+from vm_webapp.repo import count_queued_runs_by_brand, list_queued_runs
+
+
+class SupportsPoolMetrics(Protocol):
+    def record_count(self, name: str, value: int = 1) -> None: ...
+
+    def record_latency(self, name: str, seconds: float) -> None: ...
+
+
+RunExecutor = Callable[..., dict[str, str]]
+
+
+@dataclass(frozen=True)
+class RunPoolConfig:
+    global_concurrency: int = 4
+    per_brand_concurrency: int = 2
+    brand_weights: dict[str, float] = field(default_factory=dict)
+    default_weight: float = 1.0
+    # Oldest queued runs loaded per brand on each dispatch.
+    per_brand_scan_limit: int = 50
+
+    def __post_init__(self) -> None:
+        if self.global_concurrency < 1:
+            raise ValueError("global_concurrency must be >= 1")
+        if self.per_brand_concurrency < 1:
+            raise ValueError("per_brand_concurrency must be >= 1")
+        if self.per_brand_scan_limit < 1:
+            raise ValueError("per_brand_scan_limit must be >= 1")
+        if self.default_weight <= 0:
+            raise ValueError("default_weight must be > 0")
+        for brand_id, weight in self.brand_weights.items():
+            if weight <= 0:
+                raise ValueError(f"weight for brand '{brand_id}' must be > 0")
+
+    def weight_for(self, brand_id: str) -> float:
+        return float(self.brand_weights.get(brand_id, self.default_weight))
+
+
+@dataclass(frozen=True)
+class QueuedRun:
+    run_id: str
+    brand_id: str
+    queued_at: str
+
+
+def _retry_delay(result: Any) -> float:
+    """Backoff requested by an executor that sent its run back to the queue."""
+    if not isinstance(result, dict) or result.get("status") != "queued":
+        return 0.0
+    try:
+        return max(0.0, float(result.get("retry_delay_seconds") or 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_iso(value: str) -> datetime | None:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class FairBrandScheduler:
+    """Stride scheduler over brands.
+
+    Each brand carries a virtual ``pass`` value that advances by ``1 / weight``
+    every time one of its runs is admitted; the eligible brand with the lowest
+    pass goes next. Brands that (re)appear start at the current virtual time so
+    idle periods do not turn into a burst of credit.
+    """
+
+    def __init__(self, config: RunPoolConfig) -> None:
+        self.config = config
+        self._pass: dict[str, float] = {}
+        self._virtual_time = 0.0
+
+    def select(
+        self,
+        queued: list[QueuedRun],
+        *,
+        in_flight_by_brand: dict[str, int],
+        slots: int,
+    ) -> list[QueuedRun]:
+        per_brand: dict[str, list[QueuedRun]] = {}
+        for item in queued:
+            per_brand.setdefault(item.brand_id, []).append(item)
+
+        active = set(per_brand)
+        for brand_id in list(self._pass):
+            if brand_id not in active and in_flight_by_brand.get(brand_id, 0) == 0:
+                del self._pass[brand_id]
+        for brand_id in active:
+            if brand_id not in self._pass:
+                self._pass[brand_id] = self._virtual_time
+
+        running = dict(in_flight_by_brand)
+        cursors = {brand_id: 0 for brand_id in per_brand}
+        admitted: list[QueuedRun] = []
+        while len(admitted) < slots:
+            eligible = [
+                brand_id
+                for brand_id, items in per_brand.items()
+                if cursors[brand_id] < len(items)
+                and running.get(brand_id, 0) < self.config.per_brand_concurrency
+            ]
+            if not eligible:
+                break
+            brand_id = min(eligible, key=lambda key: (self._pass[key], key))
+            admitted.append(per_brand[brand_id][cursors[brand_id]])
+            cursors[brand_id] += 1
+            running[brand_id] = running.get(brand_id, 0) + 1
+            self._virtual_time = self._pass[brand_id]
+            self._pass[brand_id] += 1.0 / self.config.weight_for(brand_id)
+        return admitted
+
+
+class RunExecutionPool:
+    def __init__(
+        self,
+        *,
+        engine: Engine,
+        executor: RunExecutor,
+        config: RunPoolConfig | None = None,
+        metrics: SupportsPoolMetrics | None = None,
+        actor_id: str = "agent:vm-workflow",
+    ) -> None:
+        self.engine = engine
+        self.executor = executor
+        self.config = config or RunPoolConfig()
+        self.metrics = metrics
+        self.actor_id = actor_id
+        self._scheduler = FairBrandScheduler(self.config)
+        self._threads = ThreadPoolExecutor(
+            max_workers=self.config.global_concurrency,
+            thread_name_prefix="vm-run-pool",
+        )
+        self._lock = threading.Lock()
+        self._dispatch_lock = threading.RLock()
+        self._in_flight: dict[str, str] = {}
+        self._futures: dict[str, Future[Any]] = {}
+        self._queue_depth_by_brand: dict[str, int] = {}
+        # run_id -> monotonic time before which a retried run is not admitted.
+        self._not_before: dict[str, float] = {}
+        self._retry_timers: set[threading.Timer] = set()
+        self._wait_count = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._admitted_total = 0
+        self._failed_total = 0
+        self._closed = False
+
+    def dispatch(self) -> int:
+        """Admit queued runs into free slots; returns the number admitted."""
+        if self._closed:
+            return 0
+        with self._dispatch_lock:
+            with self._lock:
+                slots = self.config.global_concurrency - len(self._in_flight)
+                in_flight = set(self._in_flight)
+                in_flight_by_brand = self._in_flight_by_brand()
+                backing_off = self._backing_off()
+            with session_scope(self.engine) as session:
+                depth = count_queued_runs_by_brand(session)
+                loaded = self._load_queued(session, skipped=len(in_flight) + len(backing_off))
+
+            queued: list[QueuedRun] = []
+            for item in loaded:
+                if item.run_id in in_flight:
+                    # Admitted runs stay queued until the executor claims them.
+                    depth[item.brand_id] -= 1
+                elif item.run_id not in backing_off:
+                    queued.append(item)
+            depth = {brand_id: count for brand_id, count in depth.items() if count > 0}
+            with self._lock:
+                self._queue_depth_by_brand = depth
+            if slots <= 0 or not queued:
+                return 0
+
+            admitted = self._scheduler.select(
+                queued,
+                in_flight_by_brand=in_flight_by_brand,
+                slots=slots,
+            )
+            now = datetime.now(timezone.utc)
+            for item in admitted:
+                queued_at = _parse_iso(item.queued_at)
+                wait_seconds = max(0.0, (now - queued_at).total_seconds()) if queued_at else 0.0
+                with self._lock:
+                    self._in_flight[item.run_id] = item.brand_id
+                    self._queue_depth_by_brand[item.brand_id] -= 1
+                    self._wait_count += 1
+                    self._wait_total += wait_seconds
+                    self._wait_max = max(self._wait_max, wait_seconds)
+                    self._admitted_total += 1
+                if self.metrics is not None:
+                    self.metrics.record_count("run_pool_admitted")
+                    self.metrics.record_latency("run_pool_wait_seconds", wait_seconds)
+            # Slots are reserved before submitting so a re-entrant dispatch from a
+            # completion callback never admits the same run twice.
+            for item in admitted:
+                future = self._threads.submit(self._execute, item)
+                with self._lock:
+                    self._futures[item.run_id] = future
+                future.add_done_callback(lambda _f, run_id=item.run_id: self._on_done(run_id))
+            return len(admitted)
+
+    def drain(self, *, timeout: float | None = None) -> bool:
+        """Dispatch until no queued or in-flight runs remain.
+
+        Returns ``False`` when ``timeout`` elapses first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self.dispatch()
+            with self._lock:
+                pending = list(self._futures.values())
+                depth = sum(self._queue_depth_by_brand.values())
+                next_retry = min(self._not_before.values(), default=None)
+            if not pending and depth == 0:
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            if pending:
+                wait(pending, timeout=remaining)
+            elif next_retry is not None:
+                pause = max(0.0, next_retry - time.monotonic())
+                time.sleep(pause if remaining is None else min(pause, remaining))
+
+    def shutdown(self, *, wait_for_runs: bool = True) -> None:
+        self._closed = True
+        with self._lock:
+            timers = list(self._retry_timers)
+            self._retry_timers.clear()
+        for timer in timers:
+            timer.cancel()
+        self._threads.shutdown(wait=wait_for_runs)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            queue_depth_by_brand = {
+                brand_id: count
+                for brand_id, count in sorted(self._queue_depth_by_brand.items())
+                if count > 0
+            }
+            return {
+                "global_concurrency": self.config.global_concurrency,
+                "per_brand_concurrency": self.config.per_brand_concurrency,
+                "in_flight": len(self._in_flight),
+                "in_flight_by_brand": self._in_flight_by_brand(),
+                "queue_depth": sum(queue_depth_by_brand.values()),
+                "queue_depth_by_brand": queue_depth_by_brand,
+                "admitted_total": self._admitted_total,
+                "failed_total": self._failed_total,
+                "wait_seconds": {
+                    "count": self._wait_count,
+                    "avg": self._wait_total / self._wait_count if self._wait_count else 0.0,
+                    "max": self._wait_max,
+                },
+            }
+
+    def _in_flight_by_brand(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for brand_id in self._in_flight.values():
+            counts[brand_id] = counts.get(brand_id, 0) + 1
+        return counts
+
+    def _load_queued(self, session: Session, *, skipped: int) -> list[QueuedRun]:
+        # Widen the per-brand window by the runs that will be skipped, so a
+        # brand whose oldest runs are in flight or backing off still has
+        # candidates.
+        rows = list_queued_runs(session, per_brand=self.config.per_brand_scan_limit + skipped)
+        return [
+            QueuedRun(run_id=row.run_id, brand_id=row.brand_id, queued_at=row.updated_at)
+            for row in rows
+        ]
+
+    def _backing_off(self) -> set[str]:
+        now = time.monotonic()
+        for run_id in [key for key, due in self._not_before.items() if due <= now]:
+            del self._not_before[run_id]
+        return set(self._not_before)
+
+    def _execute(self, item: QueuedRun) -> dict[str, str]:
+        with session_scope(self.engine) as session:
+            return self.executor(
+                session=session,
+                run_id=item.run_id,
+                actor_id=self.actor_id,
+                causation_id=f"evt-pool-{item.run_id}",
+                correlation_id=f"evt-pool-{item.run_id}",
+                trigger_event_type="WorkflowRunAdmitted",
+            )
+
+    def _on_done(self, run_id: str) -> None:
+        with self._lock:
+            future = self._futures.get(run_id)
+        failed = future is not None and future.exception() is not None
+        delay = 0.0 if future is None or failed else _retry_delay(future.result())
+        timer = None
+        with self._lock:
+            self._in_flight.pop(run_id, None)
+            self._futures.pop(run_id, None)
+            if delay > 0 and not self._closed:
+                # Set in the same step that frees the slot so no dispatch sees
+                # the re-queued run as ready.
+                self._not_before[run_id] = time.monotonic() + delay
+                timer = threading.Timer(delay, self._retry_due, args=(run_id,))
+                timer.daemon = True
+                self._retry_timers.add(timer)
+        if timer is not None:
+            timer.start()
+        if failed:
+            with self._lock:
+                self._failed_total += 1
+            if self.metrics is not None:
+                self.metrics.record_count("run_pool_execution_errors")
+            # A failing run stays queued; leave it for the next external dispatch
+            # instead of spinning on it from the callback.
+            return
+        # Keep the pool saturated: a finished run frees a slot for the next brand.
+        self._dispatch_quietly()
+
+    def _retry_due(self, run_id: str) -> None:
+        with self._lock:
+            self._retry_timers.discard(threading.current_thread())  # type: ignore[arg-type]
+            self._not_before.pop(run_id, None)
+        self._dispatch_quietly()
+
+    def _dispatch_quietly(self) -> None:
+        if self._closed:
+            return
+        try:
+            self.dispatch()
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_count("dependency_failures")
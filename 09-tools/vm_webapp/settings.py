@@ -6,9 +6,14 @@ from typing import ClassVar, Optional
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+ROLE_API = "api"
+ROLE_WORKER = "worker"
+ROLE_ALL = "all"
+
 
 class Settings(BaseSettings):
     _ALLOWED_APP_ENVS: ClassVar[set[str]] = {"local", "staging", "production", "prod"}
+    _ALLOWED_ROLES: ClassVar[set[str]] = {ROLE_API, ROLE_WORKER, ROLE_ALL}
 
     app_env: str = "local"
     kimi_base_url: str = "https://api.kimi.com/coding/v1"
@@ -22,6 +27,27 @@ class Settings(BaseSettings):
     vm_workflow_profiles_path: Optional[Path] = None
     vm_workflow_force_foundation_fallback: bool = True
     vm_workflow_foundation_mode: str = "foundation_stack"
+    vm_run_pool_enabled: bool = False
+    vm_run_pool_global_concurrency: int = 4
+    vm_run_pool_per_brand_concurrency: int = 2
+    vm_run_pool_brand_weights: dict[str, float] = {}
+    vm_stage_output_workers: int = 0
+    vm_artifact_cas_enabled: bool = False
+    vm_artifact_cas_compression: str = "none"
+    vm_onboarding_durable_stores: bool = False
+    vm_onboarding_store_cache_size: int = 1024
+    vm_onboarding_store_cache_ttl_seconds: float = 2.0
+    vm_onboarding_event_buffer_enabled: bool = False
+    vm_onboarding_event_buffer_max_batch: int = 500
+    vm_onboarding_event_buffer_flush_ms: int = 250
+    vm_onboarding_event_buffer_max_pending: int = 10000
+    vm_regression_alerts_durable_store: bool = False
+    vm_decision_audit_durable_store: bool = False
+    vm_stack_reload_interval_seconds: float = 0.0
+    vm_features: Optional[list[str]] = None
+    vm_lazy_routers: bool = False
+    vm_role: str = ROLE_ALL
+    vm_db_auto_migrate: bool = True
 
     @field_validator("app_env")
     @classmethod
@@ -31,6 +57,14 @@ class Settings(BaseSettings):
             raise ValueError(f"app_env must be one of: {allowed}")
         return value
 
+    @field_validator("vm_role")
+    @classmethod
+    def validate_vm_role(cls, value: str) -> str:
+        if value not in cls._ALLOWED_ROLES:
+            allowed = ", ".join(sorted(cls._ALLOWED_ROLES))
+            raise ValueError(f"vm_role must be one of: {allowed}")
+        return value
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -5,9 +5,11 @@ import os
 import re
 import tempfile
 import threading
+import time
 import fcntl
+from collections import OrderedDict
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterator, Optional
@@ -32,13 +34,62 @@ class SoulDocument:
     recovered: bool
 
 
+@dataclass(frozen=True)
+class SoulChain:
+    brand: SoulDocument
+    project: Optional[SoulDocument] = None
+    thread: Optional[SoulDocument] = None
+
+    def documents(self) -> list[SoulDocument]:
+        return [doc for doc in (self.brand, self.project, self.thread) if doc is not None]
+
+
 class SoulVersionConflictError(ValueError):
     """Raised when the provided version hash does not match current persisted hash."""
 
 
+class _ReadWriteLock:
+    """Many concurrent readers or one writer; writers are not starved by new readers."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire(self, exclusive: bool) -> None:
+        with self._cond:
+            if exclusive:
+                self._waiting_writers += 1
+                while self._writer or self._readers:
+                    self._cond.wait()
+                self._waiting_writers -= 1
+                self._writer = True
+            else:
+                while self._writer or self._waiting_writers:
+                    self._cond.wait()
+                self._readers += 1
+
+    def release(self, exclusive: bool) -> None:
+        with self._cond:
+            if exclusive:
+                self._writer = False
+            else:
+                self._readers -= 1
+            self._cond.notify_all()
+
+
 _SOUL_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]*$")
 _PATH_LOCK_GUARD = threading.Lock()
-_PATH_LOCKS: dict[str, threading.Lock] = {}
+_PATH_LOCKS: dict[str, _ReadWriteLock] = {}
+
+# Parsed documents keyed by path and validated by the file's (mtime_ns, size).
+# A stamp younger than _RACY_WINDOW_NS cannot rule out a same-size rewrite within
+# the filesystem's timestamp granularity, so such hits are re-checked by sha256.
+SOUL_CACHE_SIZE = 1024
+_RACY_WINDOW_NS = 2_000_000_000
+_DOCUMENT_CACHE: OrderedDict[str, tuple[tuple[int, int], SoulDocument]] = OrderedDict()
+_DOCUMENT_CACHE_LOCK = threading.Lock()
 
 
 def _sha256_markdown(markdown: str) -> str:
@@ -106,20 +157,20 @@ def _ensure_path_within_base(base_dir: Path, target_path: Path) -> Path:
 
 
 @contextmanager
-def _lock_for_path(path: Path) -> Iterator[None]:
+def _lock_for_path(path: Path, *, exclusive: bool = True) -> Iterator[None]:
     path_key = str(path.resolve(strict=False))
     with _PATH_LOCK_GUARD:
         lock = _PATH_LOCKS.get(path_key)
         if lock is None:
-            lock = threading.Lock()
+            lock = _ReadWriteLock()
             _PATH_LOCKS[path_key] = lock
-    lock.acquire()
+    lock.acquire(exclusive)
     lock_file = None
     try:
         lock_path = path.with_name(f"{path.name}.lock")
         lock_path.parent.mkdir(parents=True, exist_ok=True)
         lock_file = lock_path.open("a+")
-        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
         yield
     finally:
         if lock_file is not None:
@@ -127,7 +178,38 @@ def _lock_for_path(path: Path) -> Iterator[None]:
                 fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
             finally:
                 lock_file.close()
-        lock.release()
+        lock.release(exclusive)
+
+
+def _file_stamp(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _cached_document(path: Path, stamp: tuple[int, int]) -> Optional[SoulDocument]:
+    with _DOCUMENT_CACHE_LOCK:
+        entry = _DOCUMENT_CACHE.get(str(path))
+        if entry is None or entry[0] != stamp:
+            return None
+        _DOCUMENT_CACHE.move_to_end(str(path))
+        doc = entry[1]
+    if time.time_ns() - stamp[0] < _RACY_WINDOW_NS:
+        if _sha256_markdown(path.read_text(encoding="utf-8")) != doc.version_hash:
+            return None
+    return doc
+
+
+def _cache_document(doc: SoulDocument, stamp: tuple[int, int]) -> None:
+    with _DOCUMENT_CACHE_LOCK:
+        _DOCUMENT_CACHE[str(doc.path)] = (stamp, doc)
+        _DOCUMENT_CACHE.move_to_end(str(doc.path))
+        while len(_DOCUMENT_CACHE) > SOUL_CACHE_SIZE:
+            _DOCUMENT_CACHE.popitem(last=False)
+
+
+def clear_soul_cache() -> None:
+    with _DOCUMENT_CACHE_LOCK:
+        _DOCUMENT_CACHE.clear()
 
 
 def resolve_soul_path(
@@ -227,13 +309,30 @@ class SoulStore:
             project_id=project_id,
             thread_id=thread_id,
         )
+        return self._load_path(level, path)
+
+    def _load_path(self, level: str, path: Path) -> SoulDocument:
+        with _lock_for_path(path, exclusive=False):
+            if path.exists():
+                return self._read_document(level, path)
+        # Bootstrapping the template is a write; re-check under the exclusive lock.
         with _lock_for_path(path):
-            recovered = False
-            if not path.exists():
-                recovered = True
-                _write_text_atomic(path, template_for(level))
-            markdown = path.read_text(encoding="utf-8")
-            return _build_document(level=level, path=path, markdown=markdown, recovered=recovered)
+            if path.exists():
+                return self._read_document(level, path)
+            _write_text_atomic(path, template_for(level))
+            doc = self._read_document(level, path)
+            return replace(doc, recovered=True)
+
+    @staticmethod
+    def _read_document(level: str, path: Path) -> SoulDocument:
+        stamp = _file_stamp(path)
+        cached = _cached_document(path, stamp)
+        if cached is not None and cached.level == level:
+            return cached
+        markdown = path.read_text(encoding="utf-8")
+        doc = _build_document(level=level, path=path, markdown=markdown, recovered=False)
+        _cache_document(doc, stamp)
+        return doc
 
     def _save(
         self,
@@ -266,7 +365,9 @@ class SoulStore:
 
             parse_and_validate(level=level, markdown=markdown)
             _write_text_atomic(path, markdown)
-            return _build_document(level=level, path=path, markdown=markdown, recovered=False)
+            doc = _build_document(level=level, path=path, markdown=markdown, recovered=False)
+            _cache_document(doc, _file_stamp(path))
+            return doc
 
     def get_brand_soul(self, brand_id: str) -> SoulDocument:
         return self._load(level=SOUL_LEVEL_BRAND, brand_id=brand_id)
@@ -286,6 +387,37 @@ class SoulStore:
             thread_id=thread_id,
         )
 
+    def load_chain(
+        self,
+        brand_id: str,
+        project_id: Optional[str] = None,
+        thread_id: Optional[str] = None,
+    ) -> SoulChain:
+        """Brand, project and thread souls for context building, in one call."""
+        if thread_id and not project_id:
+            raise ValueError("project_id is required when thread_id is given.")
+        brand_path = self._path_for(level=SOUL_LEVEL_BRAND, brand_id=brand_id)
+        project_path = (
+            self._path_for(level=SOUL_LEVEL_PROJECT, brand_id=brand_id, project_id=project_id)
+            if project_id
+            else None
+        )
+        thread_path = (
+            self._path_for(
+                level=SOUL_LEVEL_THREAD,
+                brand_id=brand_id,
+                project_id=project_id,
+                thread_id=thread_id,
+            )
+            if thread_id
+            else None
+        )
+        return SoulChain(
+            brand=self._load_path(SOUL_LEVEL_BRAND, brand_path),
+            project=self._load_path(SOUL_LEVEL_PROJECT, project_path) if project_path else None,
+            thread=self._load_path(SOUL_LEVEL_THREAD, thread_path) if thread_path else None,
+        )
+
     def save_brand_soul(self, brand_id: str, markdown: str, version_hash: str) -> SoulDocument:
         return self._save(
             level=SOUL_LEVEL_BRAND,
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import hashlib
+import re
+from dataclasses import dataclass, field
 from typing import Any
 
+from stack_loader import CompiledStack, load_compiled_stack
 from stack_loader import load_stack as _load_stack
 
 
@@ -9,6 +13,216 @@ def load_stack(path: str) -> dict[str, Any]:
     return _load_stack(path)
 
 
+def load_stack_plan(path: str) -> CompiledStack:
+    return load_compiled_stack(path)
+
+
+# Rough size model (about 4 characters per token); budgets are approximate.
+CHARS_PER_TOKEN = 4
+MIN_CHUNK_TOKENS = 64
+DUPLICATE_SHINGLE_RATIO = 0.8
+_SHINGLE_WORDS = 5
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_TRUNCATION_MARK = "\n(truncated)"
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    brand_soul: int = 1500
+    product_essence: int = 1000
+    stage_contract: int = 400
+    retrieved: int = 2000
+    # Reserved for the request when sizing the stable prefix. The request is
+    # never cut: a longer one takes the difference out of retrieved context.
+    user_request: int = 1000
+    total: int = 6000
+
+
+# Stable sections shrink in this order when they and a full user request would
+# not fit the total; retrieved context only ever gets what is left.
+_TRUNCATION_PRIORITY = ("product_essence", "brand_soul", "stage_contract")
+
+
+@dataclass(frozen=True)
+class ContextPack:
+    text: str
+    prefix: str
+    prefix_hash: str
+    section_tokens: dict[str, int]
+    dropped_chunks: list[str] = field(default_factory=list)
+    truncated_sections: list[str] = field(default_factory=list)
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate(text: str, max_tokens: int) -> tuple[str, bool]:
+    if estimate_tokens(text) <= max_tokens:
+        return text, False
+    limit = max(max_tokens * CHARS_PER_TOKEN - len(_TRUNCATION_MARK), 0)
+    head = text[:limit]
+    # Prefer cutting at a line, then a word boundary.
+    for separator in ("\n", " "):
+        cut = head.rfind(separator)
+        if cut >= limit // 2:
+            head = head[:cut]
+            break
+    return head.rstrip() + _TRUNCATION_MARK, True
+
+
+def _shingles(text: str) -> set[tuple[str, ...]]:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < _SHINGLE_WORDS:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i : i + _SHINGLE_WORDS]) for i in range(len(words) - _SHINGLE_WORDS + 1)}
+
+
+def _rank_retrieved(retrieved: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    # Higher score first; items without a score keep their retrieval order.
+    indexed = list(enumerate(retrieved))
+    indexed.sort(key=lambda pair: (-float(pair[1].get("score", 0.0) or 0.0), pair[0]))
+    return [item for _, item in indexed]
+
+
+def _dedupe_retrieved(
+    retrieved: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[str]]:
+    kept: list[dict[str, Any]] = []
+    dropped: list[str] = []
+    seen: set[tuple[str, ...]] = set()
+    for item in retrieved:
+        title = str(item.get("title", "retrieved"))
+        shingles = _shingles(str(item.get("text", "")))
+        if not shingles:
+            dropped.append(title)
+            continue
+        overlap = len(shingles & seen) / len(shingles)
+        if overlap >= DUPLICATE_SHINGLE_RATIO:
+            dropped.append(title)
+            continue
+        seen |= shingles
+        kept.append(item)
+    return kept, dropped
+
+
+def _pack_retrieved(
+    retrieved: list[dict[str, Any]], budget: int
+) -> tuple[str, list[str], bool]:
+    sections: list[str] = []
+    dropped: list[str] = []
+    truncated = False
+    remaining = budget
+    for item in retrieved:
+        title = str(item.get("title", "retrieved"))
+        block = f"### {title}\n{item.get('text', '')}".strip()
+        cost = estimate_tokens(block) + 1
+        if cost <= remaining:
+            sections.append(block)
+            remaining -= cost
+        elif remaining >= MIN_CHUNK_TOKENS:
+            block, _ = _truncate(block, remaining - 1)
+            sections.append(block)
+            remaining = 0
+            truncated = True
+        else:
+            dropped.append(title)
+    return ("\n\n".join(sections) if sections else "(none)"), dropped, truncated
+
+
+def pack_context(
+    *,
+    brand_soul_md: str,
+    product_essence_md: str,
+    retrieved: list[dict[str, Any]],
+    stage_contract: str,
+    user_request: str,
+    budget: ContextBudget | None = None,
+) -> ContextPack:
+    """Assemble the prompt context stable-prefix-first under a token budget.
+
+    Brand soul, product essence and the stage contract form a prefix that only
+    changes when those documents do; ``prefix_hash`` identifies it for prompt
+    caching. Retrieved chunks are ranked, near-duplicates dropped, and packed
+    into what is left before the user request, which is always kept whole.
+    """
+    budget = budget or ContextBudget()
+    stable = {
+        "brand_soul": brand_soul_md.strip(),
+        "product_essence": product_essence_md.strip(),
+        "stage_contract": stage_contract.strip(),
+    }
+    request_text = user_request.strip()
+    ranked, dropped = _dedupe_retrieved(_rank_retrieved(retrieved))
+
+    # Stable limits depend only on the stable inputs and the budget, never on
+    # retrieved chunks or the request, so the prefix (and its hash) is stable.
+    limits = {name: getattr(budget, name) for name in stable}
+    wanted = {name: min(estimate_tokens(text), limits[name]) for name, text in stable.items()}
+    overflow = sum(wanted.values()) + budget.user_request - budget.total
+    for name in _TRUNCATION_PRIORITY:
+        if overflow <= 0:
+            break
+        cut = min(overflow, wanted[name])
+        limits[name] = wanted[name] - cut
+        overflow -= cut
+    left = budget.total - sum(min(wanted[name], limits[name]) for name in stable)
+    limits["retrieved"] = max(min(budget.retrieved, left - estimate_tokens(request_text)), 0)
+
+    truncated_sections: list[str] = []
+    packed: dict[str, str] = {}
+    for name, text in stable.items():
+        packed[name], was_truncated = _truncate(text, limits[name])
+        if was_truncated:
+            truncated_sections.append(name)
+    retrieved_block, budget_dropped, retrieved_truncated = _pack_retrieved(
+        ranked, limits["retrieved"]
+    )
+    dropped.extend(budget_dropped)
+    if retrieved_truncated or budget_dropped:
+        truncated_sections.append("retrieved")
+
+    prefix = "\n".join(
+        [
+            "# Brand Soul",
+            packed["brand_soul"],
+            "",
+            "# Product Essence",
+            packed["product_essence"],
+            "",
+            "# Stage Contract",
+            packed["stage_contract"],
+            "",
+        ]
+    )
+    tail = "\n".join(
+        [
+            "# Retrieved Context",
+            retrieved_block,
+            "",
+            "# User Request",
+            request_text,
+        ]
+    )
+    text = (prefix + "\n" + tail).strip() + "\n"
+    return ContextPack(
+        text=text,
+        prefix=prefix,
+        prefix_hash=hashlib.sha256(prefix.encode("utf-8")).hexdigest(),
+        section_tokens={
+            **{name: estimate_tokens(value) for name, value in packed.items()},
+            "retrieved": estimate_tokens(retrieved_block),
+            "user_request": estimate_tokens(request_text),
+        },
+        dropped_chunks=dropped,
+        truncated_sections=truncated_sections,
+    )
+
+
 def build_context_pack(
     *,
     brand_soul_md: str,
@@ -16,28 +230,13 @@ def build_context_pack(
     retrieved: list[dict[str, str]],
     stage_contract: str,
     user_request: str,
+    budget: ContextBudget | None = None,
 ) -> str:
-    retrieved_sections = []
-    for item in retrieved:
-        title = item.get("title", "retrieved")
-        text = item.get("text", "")
-        retrieved_sections.append(f"### {title}\n{text}".strip())
-
-    retrieved_block = "\n\n".join(retrieved_sections) if retrieved_sections else "(none)"
-    sections = [
-        "# Brand Soul",
-        brand_soul_md.strip(),
-        "",
-        "# Product Essence",
-        product_essence_md.strip(),
-        "",
-        "# Retrieved Context",
-        retrieved_block,
-        "",
-        "# Stage Contract",
-        stage_contract.strip(),
-        "",
-        "# User Request",
-        user_request.strip(),
-    ]
-    return "\n".join(sections).strip() + "\n"
+    return pack_context(
+        brand_soul_md=brand_soul_md,
+        product_essence_md=product_essence_md,
+        retrieved=retrieved,
+        stage_contract=stage_contract,
+        user_request=user_request,
+        budget=budget,
+    ).text
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from stack_loader import CompiledFileRegistry
+
 
 DEFAULT_PROFILES_PATH = Path(__file__).with_name("workflow_profiles.yaml")
 FOUNDATION_MODE_DEFAULT = "foundation_stack"
@@ -27,6 +29,23 @@ class WorkflowModeProfile:
     mode: str
     description: str
     stages: list[WorkflowStageProfile]
+    stage_index: dict[str, int] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.stage_index:
+            object.__setattr__(
+                self, "stage_index", {stage.key: pos for pos, stage in enumerate(self.stages)}
+            )
+
+    def stage(self, key: str) -> WorkflowStageProfile | None:
+        index = self.stage_index.get(key)
+        return None if index is None else self.stages[index]
+
+    def next_stage_key(self, key: str) -> str | None:
+        index = self.stage_index.get(key)
+        if index is None or index + 1 >= len(self.stages):
+            return None
+        return self.stages[index + 1].key
 
 
 def _require_str(payload: dict[str, Any], field: str) -> str:
@@ -89,9 +108,8 @@ def _parse_stage(payload: Any) -> WorkflowStageProfile:
     )
 
 
-def load_workflow_profiles(path: Path | None = None) -> dict[str, WorkflowModeProfile]:
-    profile_path = path or DEFAULT_PROFILES_PATH
-    payload = yaml.safe_load(profile_path.read_text(encoding="utf-8")) or {}
+def _compile_workflow_profiles(path: Path, raw: bytes) -> dict[str, WorkflowModeProfile]:
+    payload = yaml.safe_load(raw.decode("utf-8")) or {}
     rows = payload.get("profiles")
     if not isinstance(rows, list) or not rows:
         raise ValueError("workflow profile file must contain a non-empty `profiles` list")
@@ -107,6 +125,8 @@ def load_workflow_profiles(path: Path | None = None) -> dict[str, WorkflowModePr
         if not isinstance(stages_raw, list) or not stages_raw:
             raise ValueError(f"workflow mode `{mode}` must define non-empty stages")
         stages = [_parse_stage(item) for item in stages_raw]
+        if len({stage.key for stage in stages}) != len(stages):
+            raise ValueError(f"workflow mode `{mode}` has duplicated stage keys")
         modes[mode] = WorkflowModeProfile(
             mode=mode,
             description=str(row.get("description", "")).strip(),
@@ -115,6 +135,16 @@ def load_workflow_profiles(path: Path | None = None) -> dict[str, WorkflowModePr
     return modes
 
 
+profile_registry: CompiledFileRegistry[dict[str, WorkflowModeProfile]] = CompiledFileRegistry(
+    _compile_workflow_profiles
+)
+
+
+def load_workflow_profiles(path: Path | None = None) -> dict[str, WorkflowModeProfile]:
+    """Parsed profiles for ``path``; reparsed only when the file changes."""
+    return dict(profile_registry.get(path or DEFAULT_PROFILES_PATH))
+
+
 def resolve_workflow_plan(
     profiles: dict[str, WorkflowModeProfile],
     *,
@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import threading
 import time
+from concurrent.futures import Executor
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
@@ -10,7 +11,8 @@ from uuid import uuid4
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from vm_webapp.artifacts import write_stage_outputs
+from vm_webapp.artifacts import write_stage_outputs_offloaded
+from vm_webapp.blob_store import BlobStore
 from vm_webapp.db import session_scope
 from vm_webapp.events import EventEnvelope, now_iso
 from vm_webapp.foundation_runner_service import FoundationRunnerService, FoundationStageResult
@@ -38,6 +40,7 @@ from vm_webapp.resilience import ResiliencePolicy, FallbackChain
 from vm_webapp.workflow_profiles import (
     DEFAULT_PROFILES_PATH,
     FOUNDATION_MODE_DEFAULT,
+    WorkflowModeProfile,
     load_workflow_profiles,
     resolve_workflow_plan_with_contract,
 )
@@ -72,13 +75,17 @@ class WorkflowRuntimeV2:
         force_foundation_fallback: bool = True,
         foundation_mode: str = FOUNDATION_MODE_DEFAULT,
         llm_model: str = "kimi-for-coding",
+        inline_execution: bool = True,
+        stage_output_executor: Executor | None = None,
+        blob_store: BlobStore | None = None,
     ) -> None:
         self.engine = engine
         self.workspace = workspace
         self.memory = memory
         self.llm = llm
         self.profiles_path = profiles_path or DEFAULT_PROFILES_PATH
-        self.profiles = load_workflow_profiles(self.profiles_path)
+        # Fail fast on an invalid file; later reads go through the registry.
+        load_workflow_profiles(self.profiles_path)
         self.foundation_runner = foundation_runner or FoundationRunnerService(
             workspace_root=self.workspace.root,
             llm=llm,
@@ -98,6 +105,14 @@ class WorkflowRuntimeV2:
         self._run_locks_guard = threading.Lock()
         self._run_locks: dict[str, threading.Lock] = {}
         self.llm_model = llm_model
+        # When False, runs are only queued here and a RunExecutionPool admits them.
+        self.inline_execution = inline_execution
+        self.stage_output_executor = stage_output_executor
+        self.blob_store = blob_store
+
+    @property
+    def profiles(self) -> dict[str, WorkflowModeProfile]:
+        return load_workflow_profiles(self.profiles_path)
 
     def pump_worker_dependency(self, *, worker, max_events: int = 30) -> int:
         return pump_worker_with_resilience(
@@ -234,6 +249,8 @@ class WorkflowRuntimeV2:
             mode=mode,
             skill_overrides=skill_overrides,
         )
+        if not self.inline_execution:
+            return self._requeue_for_pool(session=session, run_id=run_id)
         return self.execute_queued_run(
             session=session,
             run_id=run_id,
@@ -243,6 +260,20 @@ class WorkflowRuntimeV2:
             trigger_event_type=event_type,
         )
 
+    def _requeue_for_pool(self, *, session: Session, run_id: str) -> dict[str, str]:
+        run = get_run(session, run_id)
+        if run is None:
+            raise ValueError(f"run not found: {run_id}")
+        if run.status == "waiting_approval" and get_waiting_stage(session, run_id) is not None:
+            claim_run_for_execution(
+                session,
+                run_id=run_id,
+                allowed_statuses=("waiting_approval",),
+                target_status="queued",
+            )
+            return {"run_id": run_id, "status": "queued"}
+        return {"run_id": run.run_id, "status": run.status}
+
     def execute_thread_run(
         self,
         *,
@@ -354,7 +385,8 @@ class WorkflowRuntimeV2:
             )
             self._write_run_context_snapshot(run_id=run_id, context=run_context)
 
-            if initial_status == "queued":
+            # A run re-queued from an approval gate is a resume, not a fresh start.
+            if initial_status == "queued" and get_waiting_stage(session, run_id) is None:
                 self._append_thread_event(
                     session=session,
                     thread_id=run.thread_id,
@@ -545,7 +577,11 @@ class WorkflowRuntimeV2:
                             causation_id=causation_id,
                             correlation_id=correlation_id,
                         )
-                        return {"run_id": run.run_id, "status": "queued"}
+                        return {
+                            "run_id": run.run_id,
+                            "status": "queued",
+                            "retry_delay_seconds": str(decision.delay_seconds),
+                        }
 
                     update_stage_status(
                         session,
@@ -728,7 +764,8 @@ class WorkflowRuntimeV2:
                 "result.json": json.dumps(output_payload, ensure_ascii=False, indent=2)
             }
 
-        manifest = write_stage_outputs(
+        manifest = write_stage_outputs_offloaded(
+            self.stage_output_executor,
             stage_dir=self._stage_dir(run_id, stage_position, stage_key),
             run_id=run_id,
             thread_id=thread_id,
@@ -744,6 +781,7 @@ class WorkflowRuntimeV2:
             artifacts=artifacts,
             event_id=f"evt-stage-{run_id}-{stage_key}-{attempts}",
             status="completed",
+            blob_store=self.blob_store,
         )
         
         # Task 12: Observability metrics